@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+arxiv_mirror.py - Local arXiv metadata mirror harvested via OAI-PMH
+Answers category-filtered arXiv queries locally, in milliseconds.
+
+Harvests arXiv's OAI-PMH interface (https://info.arxiv.org/help/oa/index.html)
+for the archives that contain RELEVANT_CATEGORIES, keeping only records in
+those categories:
+- The first harvest pulls each archive in full; later runs are incremental,
+  asking only for records with a datestamp on or after the last harvest
+- resumptionTokens are saved after every page, so an interrupted harvest
+  continues where it stopped
+- Deleted records are removed from the mirror
+
+Usage:
+    mirror = ArxivMirror()
+    mirror.harvest()                      # run daily (e.g. from cron)
+    papers = mirror.search("Koopman operator", categories=["math.DS"])
+"""
+
+import logging
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import requests
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+from paper_utils import (
+    rate_limit_request,
+    log_api_request,
+    validate_paper_data,
+    REQUEST_TIMEOUT
+)
+from local_store import LocalStore, QUERY_OPERATORS
+from arxiv_search import RELEVANT_CATEGORIES
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# arXiv OAI-PMH endpoint
+OAI_BASE_URL = "https://oaipmh.arxiv.org/oai"
+METADATA_PREFIX = "arXiv"
+
+# XML namespaces
+OAI_NS = "{http://www.openarchives.org/OAI/2.0/}"
+ARXIV_NS = "{http://arxiv.org/OAI/arXiv/}"
+
+# OAI set holding each archive (physics archives are grouped under physics:)
+ARCHIVE_SETS = {
+    'cs': 'cs',
+    'eess': 'eess',
+    'math': 'math',
+    'q-bio': 'q-bio',
+    'stat': 'stat',
+    'nlin': 'physics:nlin',
+    'physics': 'physics:physics',
+}
+
+# Default store file (inside MIRROR_DIR)
+STORE_NAME = "arxiv.sqlite"
+
+# Mirror is used instead of the live API while its last harvest is this recent
+MAX_AGE_DAYS = 2  # Tolerates one missed daily harvest
+
+# Retries for failed/throttled OAI requests
+OAI_RETRIES = 5
+MAX_RETRY_AFTER = 120  # Cap on the server-requested wait (seconds)
+
+# Store layout for arXiv records
+FACET_FIELDS = {'category': 'categories'}
+EXTRA_FIELDS = ['authors']
+
+# arXiv search-field prefixes understood in local queries
+FIELD_PREFIX_PATTERN = re.compile(r'\b(cat|au|ti|abs|all):("[^"]+"|[^\s()]+)')
+FIELD_COLUMNS = {'au': 'extra', 'ti': 'title', 'abs': 'abstract', 'all': None}
+
+
+def open_store(path: Optional[Union[str, Path]] = None) -> LocalStore:
+    """
+    Open the arXiv local store.
+
+    Args:
+        path: Store file (defaults to MIRROR_DIR/arxiv.sqlite)
+
+    Returns:
+        LocalStore configured for arXiv records
+    """
+    return LocalStore(path or STORE_NAME, id_field='arxiv_id', facet_fields=FACET_FIELDS,
+                      extra_fields=EXTRA_FIELDS, date_field='published_date')
+
+
+def category_sets(categories: List[str]) -> List[str]:
+    """
+    Map arXiv categories to the OAI sets that contain them.
+
+    Args:
+        categories: Category codes (e.g. 'q-bio.NC', 'physics.med-ph')
+
+    Returns:
+        Sorted list of OAI set specs
+    """
+    sets = set()
+    for category in categories:
+        archive = category.split('.')[0]
+        sets.add(ARCHIVE_SETS.get(archive, archive))
+    return sorted(sets)
+
+
+def parse_oai_record(record: ET.Element) -> Tuple[Optional[str], Optional[Dict]]:
+    """
+    Parse one OAI-PMH record in arXiv metadata format.
+
+    Args:
+        record: <record> element
+
+    Returns:
+        (arxiv_id, paper) tuple; paper is None for deleted records
+    """
+    header = record.find(f'{OAI_NS}header')
+    identifier = header.findtext(f'{OAI_NS}identifier', '') if header is not None else ''
+    arxiv_id = identifier.split(':')[-1] or None
+
+    if header is not None and header.get('status') == 'deleted':
+        return arxiv_id, None
+
+    meta = record.find(f'{OAI_NS}metadata/{ARXIV_NS}arXiv')
+    if meta is None:
+        return arxiv_id, None
+
+    def text(tag: str) -> str:
+        return ' '.join((meta.findtext(f'{ARXIV_NS}{tag}') or '').split())
+
+    arxiv_id = text('id') or arxiv_id
+
+    authors = []
+    for author in meta.findall(f'{ARXIV_NS}authors/{ARXIV_NS}author'):
+        keyname = author.findtext(f'{ARXIV_NS}keyname', '').strip()
+        forenames = author.findtext(f'{ARXIV_NS}forenames', '').strip()
+        name = f"{forenames} {keyname}".strip()
+        if name:
+            authors.append(name)
+
+    categories = text('categories').split()
+    created = text('created') or None
+    updated = text('updated') or None
+
+    paper = {
+        'title': text('title'),
+        'authors': authors,
+        'year': int(created[:4]) if created else None,
+        'doi': text('doi') or None,
+        'abstract': text('abstract'),
+        'citation_count': 0,  # arXiv doesn't provide citations
+        'journal': 'arXiv preprint',
+        'is_open_access': True,  # All arXiv papers are open access
+        'url': f"http://arxiv.org/abs/{arxiv_id}",
+        'pdf_url': f"http://arxiv.org/pdf/{arxiv_id}",
+        'source': 'arxiv',
+        'arxiv_id': arxiv_id,
+        'categories': categories,
+        'is_relevant_category': any(cat in RELEVANT_CATEGORIES for cat in categories),
+        'published_date': created,
+        'updated_date': updated
+    }
+    return arxiv_id, paper
+
+
+class ArxivMirror:
+    """
+    Local arXiv metadata mirror kept current by incremental OAI-PMH harvests.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None,
+                 base_url: str = OAI_BASE_URL,
+                 categories: Optional[List[str]] = None):
+        """
+        Open the mirror.
+
+        Args:
+            path: Store file (defaults to MIRROR_DIR/arxiv.sqlite)
+            base_url: OAI-PMH endpoint
+            categories: Categories to keep (defaults to RELEVANT_CATEGORIES)
+        """
+        self.api_name = "arxiv"
+        self.base_url = base_url
+        self.categories = categories or RELEVANT_CATEGORIES
+        self.store = open_store(path)
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Science-Grounded-Skill/1.0 (Educational/Research Tool)'
+        })
+
+    def is_available(self) -> bool:
+        """Check whether any records have been harvested."""
+        return self.store.count() > 0
+
+    def last_harvest(self) -> Optional[datetime]:
+        """Return when the last complete harvest finished (None if never)."""
+        value = self.store.get_meta('last_harvest')
+        return datetime.fromisoformat(value) if value else None
+
+    def is_fresh(self, max_age_days: float = MAX_AGE_DAYS) -> bool:
+        """
+        Check whether the mirror is recent enough to answer queries.
+
+        Args:
+            max_age_days: Maximum age of the last complete harvest
+
+        Returns:
+            True if the mirror has records and was harvested recently
+        """
+        last = self.last_harvest()
+        return (last is not None and self.is_available()
+                and datetime.now() - last <= timedelta(days=max_age_days))
+
+    def harvest(self, sets: Optional[List[str]] = None,
+                from_date: Optional[str] = None) -> Dict:
+        """
+        Harvest new and changed records for each OAI set.
+
+        Each set continues from its saved resumptionToken if the previous
+        run was interrupted, otherwise from its last datestamp.
+
+        Args:
+            sets: OAI set specs (defaults to the sets covering the mirror's categories)
+            from_date: Override the start datestamp (YYYY-MM-DD)
+
+        Returns:
+            Summary dict with records, kept and deleted counts
+        """
+        sets = sets or category_sets(self.categories)
+        summary = {'records': 0, 'kept': 0, 'deleted': 0}
+        start = time.time()
+
+        for set_spec in sets:
+            set_from = from_date or self.store.get_meta(f'datestamp:{set_spec}')
+            token = self.store.get_meta(f'token:{set_spec}') if not from_date else None
+            logger.info(f"Harvesting arXiv set {set_spec} "
+                        f"({'resuming' if token else 'from ' + (set_from or 'the beginning')})")
+
+            try:
+                set_summary = self._harvest_set(set_spec, set_from, token)
+            except Exception as e:
+                logger.error(f"Harvest of set {set_spec} failed, will resume next run: {e}")
+                log_api_request(self.api_name, f"oai set {set_spec}", error=str(e))
+                return summary
+
+            for key in summary:
+                summary[key] += set_summary[key]
+
+        self.store.set_meta('last_harvest', datetime.now().isoformat())
+        logger.info(f"arXiv harvest finished in {time.time() - start:.1f}s: {summary}")
+        return summary
+
+    def _harvest_set(self, set_spec: str, from_date: Optional[str],
+                     token: Optional[str]) -> Dict:
+        """
+        Walk one set's ListRecords pages, writing each page as it arrives.
+
+        Args:
+            set_spec: OAI set spec
+            from_date: Start datestamp (None for a full harvest)
+            token: resumptionToken to continue from
+
+        Returns:
+            Summary dict with records, kept and deleted counts
+        """
+        summary = {'records': 0, 'kept': 0, 'deleted': 0}
+        wanted = set(self.categories)
+        newest = from_date or ''
+
+        while True:
+            if token:
+                params = {'verb': 'ListRecords', 'resumptionToken': token}
+            else:
+                params = {'verb': 'ListRecords', 'metadataPrefix': METADATA_PREFIX,
+                          'set': set_spec}
+                if from_date:
+                    params['from'] = from_date
+
+            root = self._request(params)
+            if root is None:
+                break  # noRecordsMatch
+
+            papers = []
+            deleted = []
+            for record in root.iter(f'{OAI_NS}record'):
+                summary['records'] += 1
+                datestamp = record.findtext(f'{OAI_NS}header/{OAI_NS}datestamp', '')
+                newest = max(newest, datestamp)
+
+                arxiv_id, paper = parse_oai_record(record)
+                if paper is None:
+                    if arxiv_id:
+                        deleted.append(arxiv_id)
+                elif wanted.intersection(paper['categories']) and validate_paper_data(paper):
+                    papers.append(paper)
+
+            summary['kept'] += self.store.add_records(papers)
+            summary['deleted'] += self.store.delete_records(deleted)
+
+            token_elem = root.find(f'.//{OAI_NS}resumptionToken')
+            token = (token_elem.text or '').strip() if token_elem is not None else ''
+            # Save progress after every page so an interrupted harvest can resume
+            self.store.set_meta(f'token:{set_spec}', token)
+
+            if not token:
+                break
+
+        # Records are not returned in datestamp order, so the next incremental
+        # start point only moves once the whole list has been walked
+        if newest:
+            self.store.set_meta(f'datestamp:{set_spec}', newest)
+
+        log_api_request(self.api_name, f"oai set {set_spec}", 200)
+        return summary
+
+    def _request(self, params: Dict) -> Optional[ET.Element]:
+        """
+        Make one OAI-PMH request, honouring 503 Retry-After flow control.
+
+        Args:
+            params: OAI-PMH query parameters
+
+        Returns:
+            Parsed response root, or None when no records match
+
+        Raises:
+            RuntimeError: On OAI errors or when retries are exhausted
+        """
+        for attempt in range(1, OAI_RETRIES + 1):
+            rate_limit_request(self.api_name)
+            response = self.session.get(self.base_url, params=params,
+                                        timeout=REQUEST_TIMEOUT * 6)
+
+            if response.status_code == 503:
+                retry_after = response.headers.get('Retry-After', '')
+                wait = min(int(retry_after) if retry_after.isdigit() else 10, MAX_RETRY_AFTER)
+                logger.info(f"OAI-PMH server busy (attempt {attempt}/{OAI_RETRIES}), "
+                            f"retrying in {wait}s")
+                time.sleep(wait)
+                continue
+
+            if response.status_code != 200:
+                raise RuntimeError(f"OAI-PMH HTTP {response.status_code}")
+
+            root = ET.fromstring(response.content)
+            error = root.find(f'{OAI_NS}error')
+            if error is not None:
+                code = error.get('code')
+                if code == 'noRecordsMatch':
+                    return None
+                raise RuntimeError(f"OAI-PMH error {code}: {error.text}")
+            return root
+
+        raise RuntimeError("OAI-PMH server unavailable after retries")
+
+    def get(self, arxiv_id: str) -> Optional[Dict]:
+        """
+        Get one paper by arXiv ID.
+
+        Args:
+            arxiv_id: arXiv identifier (without version)
+
+        Returns:
+            Paper dictionary or None if not mirrored
+        """
+        return self.store.get(arxiv_id)
+
+    def search(self, query: str, limit: int = 10,
+               categories: Optional[List[str]] = None,
+               min_year: Optional[int] = None) -> List[Dict]:
+        """
+        Search the mirror.
+
+        Supports free text plus the arXiv field prefixes cat:, au:, ti:, abs: and all:.
+
+        Args:
+            query: Search query (arXiv syntax subset)
+            limit: Maximum number of results
+            categories: Restrict to any of these categories
+            min_year: Earliest publication year
+
+        Returns:
+            List of paper dictionaries, best matches first
+        """
+        fts_query, query_categories = self._parse_query(query)
+
+        # cat: terms in the query narrow the categories argument, never widen it
+        if query_categories:
+            allowed = {c.lower() for c in categories} if categories else None
+            categories = [c for c in query_categories if allowed is None or c.lower() in allowed]
+            if not categories:
+                return []
+
+        facets = {'category': categories} if categories else None
+        return self.store.search(limit=limit, facets=facets, min_year=min_year,
+                                 fts_query=fts_query)
+
+    def _parse_query(self, query: str) -> Tuple[Optional[str], List[str]]:
+        """
+        Split an arXiv-style query into an FTS expression and category filters.
+
+        Args:
+            query: Search query
+
+        Returns:
+            (fts_query or None, categories) tuple
+        """
+        terms: List[str] = []
+        categories: List[str] = []
+
+        def word_terms(text: str, column: Optional[str] = None) -> List[str]:
+            words = [w for w in re.findall(r'[A-Za-z0-9]+', text)
+                     if w.lower() not in QUERY_OPERATORS]
+            prefix = f"{column} : " if column else ""
+            return [f'{prefix}"{w}"' for w in words]
+
+        def handle_prefix(match: re.Match) -> str:
+            field, value = match.group(1), match.group(2).strip('"')
+            if field == 'cat':
+                categories.append(value)
+            else:
+                terms.extend(word_terms(value, FIELD_COLUMNS[field]))
+            return ' '
+
+        remainder = FIELD_PREFIX_PATTERN.sub(handle_prefix, query or '')
+        terms.extend(word_terms(remainder))
+
+        fts_query = ' '.join(terms) if terms else None
+        return fts_query, categories
+
+
+if __name__ == "__main__":
+    # Handle command line usage:
+    #   python arxiv_mirror.py harvest [from-date]
+    #   python arxiv_mirror.py search Koopman operator cat:math.DS
+    if len(sys.argv) > 1 and sys.argv[1] == "harvest":
+        mirror = ArxivMirror()
+        from_date = sys.argv[2] if len(sys.argv) > 2 else None
+        print(mirror.harvest(from_date=from_date))
+    elif len(sys.argv) > 2 and sys.argv[1] == "search":
+        query = ' '.join(sys.argv[2:])
+        mirror = ArxivMirror()
+        start = time.time()
+        papers = mirror.search(query, limit=10)
+        elapsed_ms = (time.time() - start) * 1000
+
+        print(f"Query: {query}")
+        print(f"Found {len(papers)} papers in {elapsed_ms:.1f} ms\n")
+        for i, paper in enumerate(papers, 1):
+            print(f"{i}. {paper['title']}")
+            print(f"   Year: {paper['year']}  Categories: {', '.join(paper['categories'])}")
+            print(f"   arXiv: https://arxiv.org/abs/{paper['arxiv_id']}")
+            print()
+    else:
+        print("Usage:")
+        print("  python arxiv_mirror.py harvest [from-date YYYY-MM-DD]")
+        print("  python arxiv_mirror.py search <query>")
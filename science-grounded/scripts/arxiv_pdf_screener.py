@@ -77,8 +77,8 @@ class ArxivPDFScreener:
 
         logger.info(f"Found {len(papers)} candidates, screening PDFs...")
 
-        # Step 2: Download and score each paper
-        scored_papers = []
+        # Step 2: Download and extract each paper
+        extracted = []
 
         for i, paper in enumerate(papers, 1):
             try:
@@ -99,28 +99,31 @@ class ArxivPDFScreener:
                     self._cleanup(pdf_path)
                     continue
 
-                # Score relevance
-                score, reasons = self.scorer.score_paper(
-                    title=paper['title'],
-                    abstract=paper.get('abstract', ''),
-                    full_text=full_text
-                )
-
-                # Add scoring info to paper
-                paper['relevance_score'] = score
-                paper['relevance_reasons'] = reasons
-                paper['full_text_length'] = len(full_text)
-                paper['pdf_path'] = str(pdf_path)  # Keep path for later
-
-                scored_papers.append(paper)
-
-                logger.info(f"  Score: {score}/100 - {', '.join(reasons[:2])}")
+                extracted.append((paper, full_text, pdf_path))
 
             except Exception as e:
                 logger.error(f"Error screening paper {i}: {e}")
                 continue
 
-        # Step 3: Sort by relevance score
+        # Step 3: Score relevance for all extracted papers in one batch
+        scores = self.scorer.score_batch([
+            {'title': paper['title'], 'abstract': paper.get('abstract', ''), 'full_text': full_text}
+            for paper, full_text, _ in extracted
+        ])
+
+        scored_papers = []
+        for (paper, full_text, pdf_path), (score, reasons) in zip(extracted, scores):
+            # Add scoring info to paper
+            paper['relevance_score'] = score
+            paper['relevance_reasons'] = reasons
+            paper['full_text_length'] = len(full_text)
+            paper['pdf_path'] = str(pdf_path)  # Keep path for later
+
+            scored_papers.append(paper)
+
+            logger.info(f"  Score: {score}/100 - {', '.join(reasons[:2])} ({paper['title'][:40]})")
+
+        # Step 4: Sort by relevance score
         scored_papers.sort(key=lambda x: x['relevance_score'], reverse=True)
 
         # Return top N
@@ -13,11 +13,11 @@ Categories of interest:
 """
 
 import logging
+import re
 import sys
-import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 import arxiv
 
 # Add parent directory to path for imports
@@ -27,9 +27,12 @@ from paper_utils import (
     rate_limit_request,
     get_cached_results,
     cache_results,
+    get_cached_value,
+    cache_value,
     sort_by_impact,
     log_api_request,
-    validate_paper_data
+    validate_paper_data,
+    MIRROR_DIR
 )
 
 # Configure logging
@@ -55,28 +58,58 @@ RELEVANT_CATEGORIES = [
 MAX_RESULTS = 50
 DEFAULT_LIMIT = 10
 
+# Paginated retrieval (iter_search)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 2000  # arXiv API limit per request
+PAGE_RETRIES = 3
+CURSOR_NAMESPACE = "arxiv_cursor"
+CURSOR_TTL = 30 * 24 * 3600  # Keep resume points for 30 days
+
 
 class ArxivSearch:
     """
     Search for papers on arXiv preprint server.
     """
 
-    def __init__(self):
-        """Initialize the arXiv search client."""
+    def __init__(self, mirror_path: Optional[Path] = None):
+        """
+        Initialize the arXiv search client.
+
+        Args:
+            mirror_path: Local OAI-PMH mirror store (defaults to mirrors/arxiv.sqlite)
+        """
         self.api_name = "arxiv"
+        self.mirror_path = mirror_path
+        self._mirror = None
+
+    @property
+    def mirror(self):
+        """Local metadata mirror (None until arxiv_mirror.py has harvested one)."""
+        if self._mirror is None:
+            from arxiv_mirror import ArxivMirror, STORE_NAME
+            path = Path(self.mirror_path or STORE_NAME)
+            if not path.is_absolute():
+                path = MIRROR_DIR / path
+            if path.exists():
+                self._mirror = ArxivMirror(path)
+        return self._mirror
 
     def search(self, query: str, limit: int = DEFAULT_LIMIT,
               use_cache: bool = True, filter_categories: bool = True,
-              neuro_only: bool = False) -> List[Dict]:
+              neuro_only: bool = False, use_mirror: bool = True) -> List[Dict]:
         """
         Search for papers on arXiv.
 
+        Category-restricted queries are answered from the local mirror
+        (see arxiv_mirror.py) while it is fresh; otherwise the live API is used.
+
         Args:
             query: Search query
             limit: Maximum number of results (max 50)
             use_cache: Whether to use cached results
             filter_categories: Filter to relevant categories only
             neuro_only: If True, restrict to q-bio.NC (neuroscience) only
+            use_mirror: Allow answering from the local mirror
 
         Returns:
             List of paper dictionaries with standardized format
@@ -87,6 +120,11 @@ class ArxivSearch:
             logger.error("Query failed sanitization")
             return []
 
+        if use_mirror:
+            local = self._search_mirror(clean_query, limit, filter_categories, neuro_only)
+            if local is not None:
+                return local
+
         # Check cache first
         cache_key = f"{clean_query}_filtered" if filter_categories else clean_query
         if use_cache:
@@ -106,6 +144,41 @@ class ArxivSearch:
         sorted_papers = self._sort_arxiv_papers(papers)
         return sorted_papers[:limit]
 
+    def _search_mirror(self, query: str, limit: int, filter_categories: bool,
+                       neuro_only: bool) -> Optional[List[Dict]]:
+        """
+        Answer a query from the local mirror, if it can be.
+
+        Args:
+            query: Sanitized search query
+            limit: Maximum number of results
+            filter_categories: Filter to relevant categories only
+            neuro_only: Restrict to neuroscience (q-bio.NC) only
+
+        Returns:
+            Sorted list of papers, or None if the live API must be used
+            (no fresh mirror, or the query is not limited to mirrored categories)
+        """
+        mirror = self.mirror
+        if mirror is None or not mirror.is_fresh():
+            return None
+
+        if neuro_only:
+            categories = ['q-bio.NC']
+        elif filter_categories:
+            categories = list(mirror.categories)
+        else:
+            # Unfiltered queries are only local if they name mirrored categories
+            categories = re.findall(r'\bcat:([\w.\-]+)', query)
+            if not categories or not set(categories) <= set(mirror.categories):
+                return None
+
+        papers = mirror.search(query, limit=min(limit * 2, MAX_RESULTS), categories=categories)
+        logger.info(f"Found {len(papers)} papers in local arXiv mirror")
+
+        sorted_papers = self._sort_arxiv_papers(papers)
+        return sorted_papers[:limit]
+
     def _search_papers(self, query: str, limit: int, filter_categories: bool, neuro_only: bool = False) -> List[Dict]:
         """
         Internal method to search papers via arXiv API.
@@ -119,39 +192,14 @@ class ArxivSearch:
         Returns:
             List of paper dictionaries
         """
-        # Rate limit the request
-        rate_limit_request(self.api_name)
-
         try:
-            # Create search object
             logger.info(f"Searching arXiv for: {query[:50]}...")
+            full_query = self._build_query(query, filter_categories, neuro_only)
 
-            # Build arXiv query
-            if neuro_only:
-                # Restrict to neuroscience only
-                full_query = f'({query}) AND cat:q-bio.NC'
-                logger.info("Filtering to neuroscience (q-bio.NC) only")
-            elif filter_categories:
-                # Add category filtering to query
-                cat_query = ' OR '.join([f'cat:{cat}' for cat in RELEVANT_CATEGORIES])
-                full_query = f'({query}) AND ({cat_query})'
-            else:
-                full_query = query
-
-            # Perform search
-            search = arxiv.Search(
-                query=full_query,
-                max_results=limit,
-                sort_by=arxiv.SortCriterion.Relevance,
-                sort_order=arxiv.SortOrder.Descending
-            )
-
-            # Execute search and collect results
-            papers = []
-            for result in search.results():
-                std_paper = self._standardize_paper(result)
-                if validate_paper_data(std_paper):
-                    papers.append(std_paper)
+            # Perform search (a single page, rate limited in _fetch_page)
+            results = self._fetch_page(full_query, 0, limit, arxiv.SortCriterion.Relevance,
+                                       arxiv.SortOrder.Descending)
+            papers = self._standardize_results(results)
 
             logger.info(f"Found {len(papers)} papers on arXiv")
             log_api_request(self.api_name, query, 200)
@@ -163,6 +211,177 @@ class ArxivSearch:
             log_api_request(self.api_name, query, error=str(e))
             return []
 
+    def iter_search(self, query: str, page_size: int = DEFAULT_PAGE_SIZE,
+                    max_results: Optional[int] = None, filter_categories: bool = True,
+                    neuro_only: bool = False, resume: bool = True,
+                    sort_by: arxiv.SortCriterion = arxiv.SortCriterion.SubmittedDate,
+                    sort_order: arxiv.SortOrder = arxiv.SortOrder.Ascending) -> Iterator[List[Dict]]:
+        """
+        Retrieve every match for a query, one page at a time.
+
+        The position reached is saved in the cache after each page the caller
+        has consumed, so an interrupted harvest picks up where it stopped
+        (the page in flight is delivered again). Oldest-first submission
+        order keeps offsets stable while new papers are added, and
+        re-running a finished harvest yields only papers submitted since.
+
+        Args:
+            query: Search query
+            page_size: Papers per API request (max 2000)
+            max_results: Stop after this many papers (None for all)
+            filter_categories: Filter to relevant categories only
+            neuro_only: If True, restrict to q-bio.NC (neuroscience) only
+            resume: Continue from the saved cursor (False starts from the beginning)
+            sort_by: arXiv sort criterion
+            sort_order: arXiv sort order
+
+        Yields:
+            Lists of standardized paper dictionaries, one per page
+        """
+        clean_query = sanitize_query(query)
+        if not clean_query:
+            logger.error("Query failed sanitization")
+            return
+
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        full_query = self._build_query(clean_query, filter_categories, neuro_only)
+        cursor_key = self._cursor_key(full_query, sort_by, sort_order)
+
+        cursor = get_cached_value(cursor_key, CURSOR_NAMESPACE) if resume else None
+        offset = cursor['offset'] if cursor else 0
+        if offset:
+            logger.info(f"Resuming arXiv harvest at offset {offset}")
+
+        yielded = 0
+        while max_results is None or yielded < max_results:
+            try:
+                results = self._fetch_page(full_query, offset, page_size, sort_by, sort_order)
+            except Exception as e:
+                logger.error(f"arXiv page at offset {offset} failed, harvest can be resumed: {e}")
+                log_api_request(self.api_name, clean_query, error=str(e))
+                return
+
+            # When max_results cuts the page short, only the results up to the
+            # last paper delivered count as consumed
+            papers, consumed = [], len(results)
+            for position, result in enumerate(results):
+                if max_results is not None and yielded + len(papers) >= max_results:
+                    consumed = position
+                    break
+                std_paper = self._standardize_paper(result)
+                if validate_paper_data(std_paper):
+                    papers.append(std_paper)
+
+            if papers:
+                log_api_request(self.api_name, f"{clean_query} [offset {offset}]", 200)
+                yield papers
+                yielded += len(papers)
+
+            # Page consumed: advance and persist the cursor
+            offset += consumed
+            cache_value(cursor_key, {'offset': offset}, CURSOR_NAMESPACE, CURSOR_TTL)
+
+            if consumed < len(results):
+                return
+            if len(results) < page_size:
+                logger.info(f"arXiv harvest complete at offset {offset}")
+                return
+
+    def reset_cursor(self, query: str, filter_categories: bool = True, neuro_only: bool = False,
+                     sort_by: arxiv.SortCriterion = arxiv.SortCriterion.SubmittedDate,
+                     sort_order: arxiv.SortOrder = arxiv.SortOrder.Ascending) -> None:
+        """
+        Forget the saved iter_search position for a query.
+
+        Args:
+            query: Search query
+            filter_categories: Same value passed to iter_search
+            neuro_only: Same value passed to iter_search
+            sort_by: Same value passed to iter_search
+            sort_order: Same value passed to iter_search
+        """
+        clean_query = sanitize_query(query)
+        if clean_query:
+            full_query = self._build_query(clean_query, filter_categories, neuro_only)
+            cache_value(self._cursor_key(full_query, sort_by, sort_order), {'offset': 0},
+                        CURSOR_NAMESPACE, CURSOR_TTL)
+
+    def _cursor_key(self, full_query: str, sort_by: arxiv.SortCriterion,
+                    sort_order: arxiv.SortOrder) -> str:
+        """Cache key for an iter_search cursor (offsets depend on the sort)."""
+        return f"{full_query}|{sort_by.value}|{sort_order.value}"
+
+    def _build_query(self, query: str, filter_categories: bool, neuro_only: bool) -> str:
+        """
+        Add category restrictions to a sanitized query.
+
+        Args:
+            query: Sanitized search query
+            filter_categories: Whether to filter by relevant categories
+            neuro_only: Restrict to neuroscience (q-bio.NC) only
+
+        Returns:
+            arXiv API query string
+        """
+        if neuro_only:
+            # Restrict to neuroscience only
+            logger.info("Filtering to neuroscience (q-bio.NC) only")
+            return f'({query}) AND cat:q-bio.NC'
+        elif filter_categories:
+            # Add category filtering to query
+            cat_query = ' OR '.join([f'cat:{cat}' for cat in RELEVANT_CATEGORIES])
+            return f'({query}) AND ({cat_query})'
+        return query
+
+    def _fetch_page(self, full_query: str, offset: int, page_size: int,
+                    sort_by: arxiv.SortCriterion, sort_order: arxiv.SortOrder) -> List[arxiv.Result]:
+        """
+        Fetch one page of raw results with a single API request.
+
+        Politeness delays (including retries) go through the shared rate
+        limiter; the arxiv client's own sleeping and retrying are disabled.
+
+        Args:
+            full_query: arXiv API query string
+            offset: Index of the first result
+            page_size: Number of results to request
+            sort_by: arXiv sort criterion
+            sort_order: arXiv sort order
+
+        Returns:
+            List of arxiv.Result objects (shorter than page_size on the last page)
+
+        Raises:
+            Exception: The last error if every attempt fails
+        """
+        client = arxiv.Client(page_size=page_size, delay_seconds=0, num_retries=0)
+        search = arxiv.Search(
+            query=full_query,
+            max_results=offset + page_size,
+            sort_by=sort_by,
+            sort_order=sort_order
+        )
+
+        for attempt in range(1, PAGE_RETRIES + 1):
+            rate_limit_request(self.api_name)
+            try:
+                return list(client.results(search, offset=offset))
+            except Exception as e:
+                # Includes the spurious empty pages arXiv sometimes returns
+                error = e
+                logger.warning(f"arXiv request failed (attempt {attempt}/{PAGE_RETRIES}): {e}")
+
+        raise error
+
+    def _standardize_results(self, results: List[arxiv.Result]) -> List[Dict]:
+        """Standardize raw results, dropping papers that fail validation."""
+        papers = []
+        for result in results:
+            std_paper = self._standardize_paper(result)
+            if validate_paper_data(std_paper):
+                papers.append(std_paper)
+        return papers
+
     def _standardize_paper(self, result: arxiv.Result) -> Dict:
         """
         Convert arXiv result to standardized format.
@@ -326,9 +545,6 @@ def test_arxiv():
         else:
             print("   No results found")
 
-        # Wait between queries to respect rate limit
-        time.sleep(2)
-
     # Test author search
     print("\n" + "=" * 60)
     print("Testing author search...")
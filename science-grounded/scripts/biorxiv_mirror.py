@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+biorxiv_mirror.py - Rolling-window local mirror of bioRxiv and medRxiv
+Lets BiorxivSearch filter preprints locally instead of re-downloading them.
+
+The bioRxiv API has no keyword search, so every live query downloads the
+180-day /details listing and filters it client-side. This mirror keeps
+that window in the shared local store instead:
+- The first sync downloads the whole window for each server
+- Later syncs only request the days since the last sync (daily deltas)
+- Preprints older than the window are pruned after each sync
+- Newer versions of a preprint replace older ones (one record per DOI)
+
+Usage:
+    mirror = BiorxivMirror()
+    mirror.sync()                         # run daily (e.g. from cron)
+    papers = mirror.search("seizure onset zone", server="medrxiv")
+"""
+
+import logging
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+from paper_utils import log_api_request, validate_paper_data
+from local_store import LocalStore
+from biorxiv_search import BiorxivSearch, WINDOW_DAYS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Default store file (inside MIRROR_DIR)
+STORE_NAME = "biorxiv.sqlite"
+
+SERVERS = ("biorxiv", "medrxiv")
+
+# Mirror is used instead of the live API while its last sync is this recent
+MAX_AGE_DAYS = 2  # Tolerates one missed daily sync
+
+# Store layout for preprint records
+FACET_FIELDS = {'server': 'server', 'category': 'category'}
+EXTRA_FIELDS = ['authors', 'category']
+
+
+def open_store(path: Optional[Union[str, Path]] = None) -> LocalStore:
+    """
+    Open the bioRxiv/medRxiv local store.
+
+    Args:
+        path: Store file (defaults to MIRROR_DIR/biorxiv.sqlite)
+
+    Returns:
+        LocalStore configured for preprint records
+    """
+    return LocalStore(path or STORE_NAME, id_field='doi', facet_fields=FACET_FIELDS,
+                      extra_fields=EXTRA_FIELDS, date_field='published_date')
+
+
+class BiorxivMirror:
+    """
+    Local mirror of the last WINDOW_DAYS of bioRxiv and medRxiv preprints.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None,
+                 window_days: int = WINDOW_DAYS):
+        """
+        Open the mirror.
+
+        Args:
+            path: Store file (defaults to MIRROR_DIR/biorxiv.sqlite)
+            window_days: Days of preprints to keep
+        """
+        self.window_days = window_days
+        self.store = open_store(path)
+        self.client = BiorxivSearch()
+
+    def is_available(self) -> bool:
+        """Check whether any preprints have been synced."""
+        return self.store.count() > 0
+
+    def last_sync(self) -> Optional[datetime]:
+        """Return when the last complete sync finished (None if never)."""
+        value = self.store.get_meta('last_sync')
+        return datetime.fromisoformat(value) if value else None
+
+    def is_fresh(self, max_age_days: float = MAX_AGE_DAYS) -> bool:
+        """
+        Check whether the mirror is recent enough to answer queries.
+
+        Args:
+            max_age_days: Maximum age of the last complete sync
+
+        Returns:
+            True if the mirror has records and was synced recently
+        """
+        last = self.last_sync()
+        return (last is not None and self.is_available()
+                and datetime.now() - last <= timedelta(days=max_age_days))
+
+    def sync(self, servers: Tuple[str, ...] = SERVERS) -> Dict:
+        """
+        Bring each server up to date and prune preprints outside the window.
+
+        Each server is fetched from the day of its last sync (inclusive, to
+        catch preprints posted later that day), or for the whole window on
+        the first run. A server whose listing had failed pages keeps its
+        previous sync date, so the gap is fetched again next time.
+
+        Args:
+            servers: Servers to sync
+
+        Returns:
+            Summary dict with per-server written counts and pruned count
+        """
+        start = time.time()
+        today = datetime.now().strftime("%Y-%m-%d")
+        window_start = (datetime.now() - timedelta(days=self.window_days)).strftime("%Y-%m-%d")
+        summary = {'written': {}, 'pruned': 0}
+        complete = True
+
+        for server in servers:
+            since = self.store.get_meta(f'synced_through:{server}')
+            from_date = max(since, window_start) if since else window_start
+            written, failed_pages = self._sync_interval(server, from_date, today)
+            summary['written'][server] = written
+
+            if failed_pages:
+                complete = False
+                logger.warning(f"{server}: {failed_pages} pages failed; "
+                               f"interval will be fetched again on the next sync")
+                log_api_request(self.client.api_name, f"sync {server}",
+                                error=f"{failed_pages} pages failed")
+            else:
+                self.store.set_meta(f'synced_through:{server}', today)
+                log_api_request(self.client.api_name, f"sync {server}", 200)
+
+        summary['pruned'] = self.store.delete_before(window_start)
+        if complete:
+            self.store.set_meta('last_sync', datetime.now().isoformat())
+
+        logger.info(f"bioRxiv/medRxiv sync finished in {time.time() - start:.1f}s: {summary}")
+        return summary
+
+    def _sync_interval(self, server: str, from_date: str, to_date: str) -> Tuple[int, int]:
+        """
+        Download one server's listing for a date interval into the store.
+
+        Args:
+            server: "biorxiv" or "medrxiv"
+            from_date: Interval start (YYYY-MM-DD)
+            to_date: Interval end (YYYY-MM-DD)
+
+        Returns:
+            (records written, failed pages) tuple
+        """
+        logger.info(f"Syncing {server} {from_date} to {to_date}")
+        written = 0
+        failed_pages = 0
+
+        # Oldest first, so a later version of a preprint overwrites an earlier one
+        for cursor, records in self.client.iter_window_pages(server, from_date, to_date,
+                                                             newest_first=False):
+            if records is None:
+                failed_pages += 1
+                continue
+            papers = [self.client._standardize_paper(r, server) for r in records]
+            written += self.store.add_records(p for p in papers
+                                              if p.get('doi') and validate_paper_data(p))
+
+        return written, failed_pages
+
+    def search(self, query: str, server: str = "both", limit: int = 10,
+               category: Optional[str] = None) -> List[Dict]:
+        """
+        Search the mirrored window.
+
+        Like the live filter, a preprint matches if any query word appears
+        in its title or abstract; better matches rank first.
+
+        Args:
+            query: Search query
+            server: Which server to search ("biorxiv", "medrxiv", or "both")
+            limit: Maximum number of results
+            category: Restrict to one subject category (e.g. "neuroscience")
+
+        Returns:
+            List of paper dictionaries, best matches first
+        """
+        facets = {}
+        if server in SERVERS:
+            facets['server'] = server
+        if category:
+            facets['category'] = category
+
+        return self.store.search(query, limit=limit, facets=facets, match_all=False)
+
+
+if __name__ == "__main__":
+    # Handle command line usage:
+    #   python biorxiv_mirror.py sync
+    #   python biorxiv_mirror.py search seizure onset zone
+    if len(sys.argv) > 1 and sys.argv[1] == "sync":
+        mirror = BiorxivMirror()
+        print(mirror.sync())
+    elif len(sys.argv) > 2 and sys.argv[1] == "search":
+        query = ' '.join(sys.argv[2:])
+        mirror = BiorxivMirror()
+        start = time.time()
+        papers = mirror.search(query, limit=10)
+        elapsed_ms = (time.time() - start) * 1000
+
+        print(f"Query: {query}")
+        print(f"Found {len(papers)} papers in {elapsed_ms:.1f} ms\n")
+        for i, paper in enumerate(papers, 1):
+            print(f"{i}. {paper['title']}")
+            print(f"   Date: {paper['published_date']}  Server: {paper['server']}  "
+                  f"Category: {paper['category']}")
+            print(f"   URL: {paper['url']}")
+            print()
+    else:
+        print("Usage:")
+        print("  python biorxiv_mirror.py sync")
+        print("  python biorxiv_mirror.py search <query>")
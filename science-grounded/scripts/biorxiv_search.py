@@ -12,10 +12,11 @@ API Documentation: https://api.biorxiv.org/
 import json
 import logging
 import sys
-import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 import requests
 from urllib.parse import quote
 
@@ -30,8 +31,11 @@ from paper_utils import (
     log_api_request,
     timeout_handler,
     validate_paper_data,
-    REQUEST_TIMEOUT
+    REQUEST_TIMEOUT,
+    MIRROR_DIR
 )
+from inverted_index import InvertedIndex, iter_bits, tokenize
+from paper_merger import merge_papers
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -59,31 +63,63 @@ RELEVANT_CATEGORIES = [
 MAX_RESULTS = 100
 DEFAULT_LIMIT = 10
 
+# Date-range retrieval via /details
+WINDOW_DAYS = 180  # Search the last 6 months
+PAGE_SIZE = 100  # Records per /details page (fixed by the API)
+PAGE_WORKERS = 4  # Concurrent page requests per server
+
 
 class BiorxivSearch:
     """
     Search for papers on bioRxiv and medRxiv preprint servers.
     """
 
-    def __init__(self):
-        """Initialize the bioRxiv/medRxiv search client."""
+    def __init__(self, mirror_path: Optional[Path] = None):
+        """
+        Initialize the bioRxiv/medRxiv search client.
+
+        Args:
+            mirror_path: Local rolling-window mirror (defaults to mirrors/biorxiv.sqlite)
+        """
         self.api_name = "biorxiv"
+        self.mirror_path = mirror_path
+        self._mirror = None
+        # Per server: (start_date, end_date, index over the window's records,
+        # cursor -> indices of that page's records in the index)
+        self._windows: Dict[str, Tuple[str, str, InvertedIndex, Dict[int, range]]] = {}
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Science-Grounded-Skill/1.0 (Educational/Research Tool)',
             'Accept': 'application/json'
         })
 
+    @property
+    def mirror(self):
+        """Local rolling-window mirror (None until biorxiv_mirror.py has synced one)."""
+        if self._mirror is None:
+            from biorxiv_mirror import BiorxivMirror, STORE_NAME
+            path = Path(self.mirror_path or STORE_NAME)
+            if not path.is_absolute():
+                path = MIRROR_DIR / path
+            if path.exists():
+                self._mirror = BiorxivMirror(path)
+        return self._mirror
+
     def search(self, query: str, server: str = "both", limit: int = DEFAULT_LIMIT,
-              use_cache: bool = True) -> List[Dict]:
+              use_cache: bool = True, use_mirror: bool = True) -> List[Dict]:
         """
         Search for papers on bioRxiv/medRxiv.
 
+        Queries are filtered locally against the rolling-window mirror
+        (see biorxiv_mirror.py) while it is fresh; otherwise the live
+        date-range listing is downloaded and filtered.
+
         Args:
             query: Search query
             server: Which server to search ("biorxiv", "medrxiv", or "both")
             limit: Maximum number of results
             use_cache: Whether to use cached results
+            use_mirror: Allow answering from the local mirror
 
         Returns:
             List of paper dictionaries with standardized format
@@ -94,6 +130,13 @@ class BiorxivSearch:
             logger.error("Query failed sanitization")
             return []
 
+        mirror = self.mirror if use_mirror else None
+        if mirror is not None and mirror.is_fresh():
+            # Already ranked by full-text relevance: keep the store's order
+            papers = mirror.search(clean_query, server=server, limit=min(limit, MAX_RESULTS))
+            logger.info(f"Found {len(papers)} papers in local bioRxiv/medRxiv mirror")
+            return papers
+
         # Check cache first
         cache_key = f"{clean_query}_{server}"
         if use_cache:
@@ -126,9 +169,6 @@ class BiorxivSearch:
         Returns:
             List of paper dictionaries
         """
-        # Rate limit the request
-        rate_limit_request(self.api_name)
-
         papers = []
 
         # Determine which servers to search
@@ -138,49 +178,178 @@ class BiorxivSearch:
         if server in ["medrxiv", "both"]:
             servers_to_search.append("medrxiv")
 
-        for srv in servers_to_search:
-            try:
-                # Use content detail API for date-based retrieval
-                # We'll get recent papers and filter by query
-                papers_from_server = self._get_recent_papers(srv, query, limit)
-                papers.extend(papers_from_server)
+        # Servers are walked concurrently (pages are rate limited individually)
+        with ThreadPoolExecutor(max_workers=len(servers_to_search) or 1) as executor:
+            futures = [(srv, executor.submit(self._get_recent_papers, srv, query, limit))
+                       for srv in servers_to_search]
 
-            except Exception as e:
-                logger.error(f"Error searching {srv}: {e}")
-                log_api_request(self.api_name, query, error=str(e))
+            for srv, future in futures:
+                try:
+                    # Use content detail API for date-based retrieval
+                    # We'll get recent papers and filter by query
+                    papers.extend(future.result())
 
-        # Remove duplicates based on title
-        unique_papers = {}
-        for paper in papers:
-            title_key = paper['title'].lower().strip()
-            if title_key not in unique_papers:
-                unique_papers[title_key] = paper
+                except Exception as e:
+                    logger.error(f"Error searching {srv}: {e}")
+                    log_api_request(self.api_name, query, error=str(e))
 
-        return list(unique_papers.values())
+        # Remove duplicates (same DOI, or same normalized title)
+        return merge_papers(papers)
 
     def _get_recent_papers(self, server: str, query: str, limit: int) -> List[Dict]:
         """
         Get recent papers from a specific server and filter by query.
 
+        Walks the pages of the date window newest first and stops once
+        enough papers matching a query term have been found; papers kept only
+        for their category are added from the pages walked. Each page is indexed once into the
+        server's window index (see _window_index), so later queries over the
+        same window reuse it instead of fetching and tokenizing the page again.
+
         Args:
             server: "biorxiv" or "medrxiv"
             query: Search terms to filter by
             limit: Maximum number of results
 
         Returns:
-            List of paper dictionaries
+            List of paper dictionaries, newest first
         """
         # Get date range (last 6 months)
         end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=180)).strftime("%Y-%m-%d")
+        start_date = (datetime.now() - timedelta(days=WINDOW_DAYS)).strftime("%Y-%m-%d")
+        query_terms = tokenize(query)
+        index, pages = self._window_index(server, start_date, end_date)
+
+        logger.info(f"Fetching recent papers from {server}: {query[:50]}...")
+        walked = 0  # Bitmap of the indexed records in the pages walked so far
+        pages_read = 0
+
+        for cursor, records in self.iter_window_pages(server, start_date, end_date, skip=set(pages)):
+            if cursor not in pages:
+                if records is None:
+                    continue
+                pages[cursor] = index.add_many(records)
+                pages_read += 1
+            doc_ids = pages[cursor]
+            walked |= (1 << doc_ids.stop) - (1 << doc_ids.start)
+            # Only term matches count: category-only papers would stop the walk
+            # on the first pages, before term matches deeper in the window
+            if len(self._match_scores(index, walked, query_terms, categories=False)) >= limit:
+                break
+
+        filtered_papers = self._standardize_matches(index, walked, server, query_terms)
+        logger.info(f"Found {len(filtered_papers)} relevant papers on {server} "
+                    f"({pages_read} pages read, {len(pages) - pages_read} from the window index)")
+        log_api_request(self.api_name, query, 200)
+
+        filtered_papers.sort(key=lambda p: p.get('published_date') or '', reverse=True)
+        return filtered_papers
+
+    def _window_index(self, server: str, start_date: str,
+                      end_date: str) -> Tuple[InvertedIndex, Dict[int, range]]:
+        """
+        Index of the records of a server's date window fetched so far.
+
+        Kept per server for the current window; a new window (the next day)
+        starts a new index.
+
+        Args:
+            server: "biorxiv" or "medrxiv"
+            start_date: Window start (YYYY-MM-DD)
+            end_date: Window end (YYYY-MM-DD)
+
+        Returns:
+            (index, cursor -> indices of that page's records) tuple, updated in place
+        """
+        window = self._windows.get(server)
+        if window is None or window[:2] != (start_date, end_date):
+            window = (start_date, end_date, InvertedIndex([]), {})
+            self._windows[server] = window
+        return window[2], window[3]
+
+    def iter_window_pages(self, server: str, start_date: str, end_date: str,
+                          newest_first: bool = True,
+                          skip: Optional[Set[int]] = None) -> Iterator[Tuple[int, Optional[List[Dict]]]]:
+        """
+        Walk every /details page of a date window.
+
+        The first page reports the window size; the remaining pages are
+        fetched with up to PAGE_WORKERS requests in flight. Stopping the
+        iteration early cancels pages that have not started yet.
+
+        Args:
+            server: "biorxiv" or "medrxiv"
+            start_date: Window start (YYYY-MM-DD)
+            end_date: Window end (YYYY-MM-DD)
+            newest_first: Walk from the newest end (the API lists oldest first)
+            skip: Cursors the caller already holds: yielded in order with an
+                  empty record list, without a request (the first page is
+                  always fetched, as it reports the window size)
+
+        Yields:
+            (cursor, raw records) tuples; records is None if that page failed
+        """
+        skip = skip or set()
+        records, total = self._fetch_details_page(server, start_date, end_date, 0)
+        if total is None:
+            yield 0, None
+            return
+        yield 0, records
+
+        cursors = range(PAGE_SIZE, total, PAGE_SIZE)
+        cursors = iter(cursors[::-1] if newest_first else cursors)
+
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+            pending = deque()
+
+            def submit_next():
+                cursor = next(cursors, None)
+                if cursor in skip:
+                    pending.append((cursor, None))
+                elif cursor is not None:
+                    pending.append((cursor, executor.submit(
+                        self._fetch_details_page, server, start_date, end_date, cursor)))
+
+            for _ in range(PAGE_WORKERS):
+                submit_next()
+
+            try:
+                while pending:
+                    cursor, future = pending.popleft()
+                    if future is None:
+                        submit_next()
+                        yield cursor, []
+                        continue
+                    records, page_total = future.result()
+                    submit_next()
+                    yield cursor, (records if page_total is not None else None)
+            finally:
+                # Iteration stopped early: drop pages that have not started yet
+                for _, future in pending:
+                    if future is not None:
+                        future.cancel()
+
+    def _fetch_details_page(self, server: str, start_date: str, end_date: str,
+                            cursor: int) -> Tuple[List[Dict], Optional[int]]:
+        """
+        Fetch one page of the /details date-range listing.
+
+        Args:
+            server: "biorxiv" or "medrxiv"
+            start_date: Window start (YYYY-MM-DD)
+            end_date: Window end (YYYY-MM-DD)
+            cursor: Offset of the first record
 
-        # Build API URL for content details
+        Returns:
+            (raw records, total records in the window) tuple;
+            total is None if the request failed
+        """
         # Format: /details/{server}/{interval}/{cursor}/{format}
         # We'll use interval format: YYYY-MM-DD/YYYY-MM-DD
-        url = f"{CONTENT_DETAIL_URL}/{server}/{start_date}/{end_date}/0/json"
+        url = f"{CONTENT_DETAIL_URL}/{server}/{start_date}/{end_date}/{cursor}/json"
 
         try:
-            logger.info(f"Fetching recent papers from {server}: {query[:50]}...")
+            rate_limit_request(self.api_name)
             response = self.session.get(url, timeout=REQUEST_TIMEOUT)
 
             if response.status_code == 200:
@@ -188,45 +357,91 @@ class BiorxivSearch:
                 messages = data.get('messages', [])
 
                 if messages and messages[0].get('status') == 'ok':
-                    papers_data = data.get('collection', [])
+                    total = int(messages[0].get('total', 0) or 0)
+                    return data.get('collection', []), total
 
-                    # Filter papers by query terms
-                    filtered_papers = []
-                    query_terms = query.lower().split()
+                # Past the end of the window the API reports "no posts found"
+                return [], 0
 
-                    for paper_data in papers_data:
-                        # Check if any query term appears in title or abstract
-                        title = paper_data.get('title', '').lower()
-                        abstract = paper_data.get('abstract', '').lower()
-                        category = paper_data.get('category', '').lower()
+            logger.error(f"API error for {server} (cursor {cursor}): {response.status_code}")
+            return [], None
 
-                        # Check relevance
-                        is_relevant = any(term in title or term in abstract
-                                        for term in query_terms)
+        except requests.exceptions.Timeout:
+            logger.error(f"Request timed out for {server} (cursor {cursor})")
+            return [], None
 
-                        # Also check if it's in a relevant category
-                        is_relevant_category = any(cat in category
-                                                  for cat in RELEVANT_CATEGORIES)
+        except Exception as e:
+            logger.error(f"Error fetching from {server} (cursor {cursor}): {e}")
+            return [], None
 
-                        if is_relevant or (is_relevant_category and len(query_terms) <= 2):
-                            std_paper = self._standardize_paper(paper_data, server)
-                            if validate_paper_data(std_paper):
-                                filtered_papers.append(std_paper)
+    def _filter_papers(self, papers_data: List[Dict], server: str,
+                       query_terms: List[str]) -> List[Dict]:
+        """
+        Keep raw records that match the query, standardized.
 
-                    logger.info(f"Found {len(filtered_papers)} relevant papers on {server}")
-                    log_api_request(self.api_name, query, 200)
-                    return filtered_papers
+        Args:
+            papers_data: Raw records from the API
+            server: Source server name
+            query_terms: Query tokens (see inverted_index.tokenize)
 
-            logger.error(f"API error for {server}: {response.status_code}")
-            return []
+        Returns:
+            List of standardized matching papers, best matches first,
+            each with a match_score between 0 and 1
+        """
+        index = InvertedIndex(papers_data)
+        return self._standardize_matches(index, (1 << len(index)) - 1, server, query_terms)
 
-        except requests.exceptions.Timeout:
-            logger.error(f"Request timed out for {server}")
-            return []
+    def _match_scores(self, index: InvertedIndex, candidates: int, query_terms: List[str],
+                      categories: bool = True) -> Dict[int, float]:
+        """
+        Score the candidate records that match the query.
 
-        except Exception as e:
-            logger.error(f"Error fetching from {server}: {e}")
-            return []
+        Args:
+            index: Index holding the records
+            candidates: Bitmap of the record indices to consider
+            query_terms: Query tokens
+            categories: Keep papers from relevant categories for short queries
+
+        Returns:
+            Mapping of record index -> tf-idf score (0.0 for papers kept by category only)
+        """
+        # Papers where any query term appears in the title or abstract
+        scores = {doc_id: score for doc_id, score in index.search(query_terms, mode='any')
+                  if candidates >> doc_id & 1}
+
+        # Short queries also keep papers from relevant categories
+        if categories and len(query_terms) <= 2:
+            for doc_id in iter_bits(index.category_mask(RELEVANT_CATEGORIES) & candidates):
+                scores.setdefault(doc_id, 0.0)
+        return scores
+
+    def _standardize_matches(self, index: InvertedIndex, candidates: int, server: str,
+                             query_terms: List[str]) -> List[Dict]:
+        """
+        Standardize the candidate records that match the query.
+
+        Args:
+            index: Index holding the records
+            candidates: Bitmap of the record indices to consider
+            server: Source server name
+            query_terms: Query tokens
+
+        Returns:
+            List of standardized matching papers, best matches first, each
+            with a match_score between 0 and 1 (relative to the best match
+            among all candidates)
+        """
+        scores = self._match_scores(index, candidates, query_terms)
+        top_score = max(scores.values(), default=0.0) or 1.0
+
+        filtered_papers = []
+        for doc_id, score in sorted(scores.items(), key=lambda item: (-item[1], item[0])):
+            std_paper = self._standardize_paper(index.docs[doc_id], server)
+            if validate_paper_data(std_paper):
+                std_paper['match_score'] = round(score / top_score, 3)
+                filtered_papers.append(std_paper)
+
+        return filtered_papers
 
     def _standardize_paper(self, paper_data: Dict, server: str) -> Dict:
         """
@@ -260,6 +475,8 @@ class BiorxivSearch:
             except:
                 pass
 
+        published = paper_data.get('published')
+
         # Build standardized paper
         std_paper = {
             'title': paper_data.get('title', 'Unknown Title'),
@@ -275,7 +492,9 @@ class BiorxivSearch:
             'category': paper_data.get('category', ''),
             'version': paper_data.get('version', 1),
             'published_date': paper_data.get('date', ''),
-            'server': server
+            'server': server,
+            # DOI of the journal version once the preprint is published ('NA' until then)
+            'published_doi': published if published and published != 'NA' else None
         }
 
         return std_paper
@@ -316,6 +535,9 @@ class BiorxivSearch:
             if paper.get('server') == 'medrxiv':
                 score *= 1.2
 
+            # Boost by how well the paper matched the query (0-1, from _filter_papers)
+            score *= 1.0 + paper.get('match_score', 0.0)
+
             paper['impact_score'] = score
 
         # Sort by impact score
@@ -393,9 +615,6 @@ def test_biorxiv():
         else:
             print("   No results found")
 
-        # Wait between queries to respect rate limit
-        time.sleep(2)
-
     # Test neuroscience-specific search
     print("\n" + "=" * 60)
     print("Testing neuroscience-specific search...")
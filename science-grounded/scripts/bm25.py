@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+bm25.py - BM25 text-relevance ranking with precomputed document statistics
+Scores the local knowledge base and ad-hoc (merged) remote result sets with
+the same engine, so every result list can be ordered by text relevance.
+
+BM25F, i.e. Okapi BM25 over weighted fields (a title hit counts like
+several body hits):
+- Documents are tokenized once with inverted_index.tokenize (whole tokens,
+  stopwords dropped, plurals folded)
+- Term frequencies are length-normalized per field, against that field's
+  average length, so a long body does not dilute title hits:
+  tf = sum over fields of weight * tf_field / (1 - b + b * len_field / avg_len_field)
+- IDF and each posting's saturated weight tf * (k1 + 1) / (tf + k1) are
+  computed when the index is built
+- Postings are NumPy arrays grouped by term, so a query is one np.bincount
+  over the postings of its terms: no per-document Python loop
+
+Unlike a raw keyword count, long documents do not win just by being long,
+and a term repeated many times saturates instead of growing without bound.
+
+Usage:
+    index = BM25Index(papers, fields={'title': 2.0, 'abstract': 1.0})
+    index.search("seizure onset zone", k=10)     # [(doc index, score), ...]
+    relevance = bm25_scores(merged, "seizure onset zone")
+    ranked = rank_papers(merged, k=15, relevance=relevance)
+"""
+
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+from inverted_index import DEFAULT_FIELDS, normalize_token, tokenize
+from ranking import top_k_indices
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Term frequency saturation and document length normalization
+DEFAULT_K1 = 1.5
+DEFAULT_B = 0.75
+
+
+def _field_text(doc: Dict, field: str) -> str:
+    # Author lists and other list fields are indexed as one string
+    value = doc.get(field)
+    if isinstance(value, (list, tuple)):
+        return ' '.join(str(v) for v in value if v)
+    return str(value) if value else ''
+
+
+class BM25Index:
+    """BM25 index over a fixed collection of documents."""
+
+    def __init__(self, docs: Sequence[Dict], fields: Optional[Dict[str, float]] = None,
+                 k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        """
+        Index a collection.
+
+        Args:
+            docs: Documents (dicts or records.Paper); results refer to them by list position
+            fields: Mapping of text field -> weight (defaults to title 2.0, abstract 1.0)
+            k1: Term frequency saturation (0 = presence only)
+            b: Document length normalization (0 = none, 1 = full)
+        """
+        self.fields = fields or DEFAULT_FIELDS
+        self.k1 = k1
+        self.b = b
+        self.n_docs = n_docs = len(docs)
+        self.vocabulary: Dict[str, int] = {}
+
+        term_ids: List[int] = []
+        doc_ids: List[int] = []
+        field_ids: List[int] = []
+        frequencies: List[int] = []
+        self.field_lengths = np.zeros((n_docs, len(self.fields)))
+        for doc_id, doc in enumerate(docs):
+            for field_id, field in enumerate(self.fields):
+                tokens = tokenize(_field_text(doc, field))
+                self.field_lengths[doc_id, field_id] = len(tokens)
+                counts: Dict[int, int] = {}
+                for token in tokens:
+                    term = self.vocabulary.setdefault(token, len(self.vocabulary))
+                    counts[term] = counts.get(term, 0) + 1
+                term_ids.extend(counts)
+                doc_ids.extend([doc_id] * len(counts))
+                field_ids.extend([field_id] * len(counts))
+                frequencies.extend(counts.values())
+        self._tokens = list(self.vocabulary)
+
+        # Each field is length-normalized against its own average, then weighted
+        average = self.field_lengths.mean(axis=0) if n_docs else np.zeros(len(self.fields))
+        ratio = np.divide(self.field_lengths, average, out=np.ones_like(self.field_lengths),
+                          where=average > 0)
+        norm = 1 - b + b * ratio
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        field_ids = np.asarray(field_ids, dtype=np.intp)
+        field_weights = np.fromiter(self.fields.values(), dtype=float, count=len(self.fields))
+        tf = field_weights[field_ids] * np.asarray(frequencies, dtype=float) / norm[doc_ids, field_ids]
+
+        # One posting per (term, document), grouped by term with documents in order
+        keys, inverse = np.unique(np.asarray(term_ids, dtype=np.int64) * max(n_docs, 1) + doc_ids,
+                                  return_inverse=True)
+        tf = np.bincount(inverse.ravel(), weights=tf, minlength=len(keys))
+        posting_terms = keys // max(n_docs, 1)
+        self._doc_ids = (keys % max(n_docs, 1)).astype(np.intp)
+
+        df = np.bincount(posting_terms, minlength=len(self.vocabulary))
+        self._offsets = np.concatenate(([0], np.cumsum(df)))
+        self.idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+        self._weights = tf * (k1 + 1) / (tf + k1)
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    def _terms(self, query: Union[str, List[str]]) -> List[int]:
+        """Distinct indexed term ids of a query (unknown terms dropped)."""
+        tokens = tokenize(query) if isinstance(query, str) else [normalize_token(t.lower()) for t in query]
+        terms = (self.vocabulary.get(token) for token in dict.fromkeys(tokens))
+        return [term for term in terms if term is not None]
+
+    def scores(self, query: Union[str, List[str]]) -> np.ndarray:
+        """
+        Score every document against a query.
+
+        Args:
+            query: Query text or pre-tokenized terms
+
+        Returns:
+            Score array aligned with the indexed documents (0 where no term occurs)
+        """
+        terms = self._terms(query)
+        if not terms:
+            return np.zeros(self.n_docs)
+
+        spans = [(self._offsets[term], self._offsets[term + 1]) for term in terms]
+        doc_ids = np.concatenate([self._doc_ids[start:end] for start, end in spans])
+        weights = np.concatenate([self._weights[start:end] * self.idf[term]
+                                  for term, (start, end) in zip(terms, spans)])
+        return np.bincount(doc_ids, weights=weights, minlength=self.n_docs)
+
+    def search(self, query: Union[str, List[str]],
+               k: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Find and rank documents matching a query.
+
+        Args:
+            query: Query text or pre-tokenized terms
+            k: Maximum number of results (None for all)
+
+        Returns:
+            List of (document index, score) tuples for documents containing
+            any query term, best first (ties keep document order)
+        """
+        scores = self.scores(query)
+        matching = np.flatnonzero(scores > 0)
+        top = matching[top_k_indices(scores[matching], k)]
+        return [(int(doc_id), float(scores[doc_id])) for doc_id in top]
+
+    def matched_terms(self, doc_id: int, query: Union[str, List[str]]) -> List[str]:
+        """
+        Query terms that occur in a document.
+
+        Args:
+            doc_id: Document index
+            query: Query text or pre-tokenized terms
+
+        Returns:
+            Normalized terms, in query order
+        """
+        matched = []
+        for term in self._terms(query):
+            start, end = self._offsets[term], self._offsets[term + 1]
+            position = start + np.searchsorted(self._doc_ids[start:end], doc_id)
+            if position < end and self._doc_ids[position] == doc_id:
+                matched.append(self._tokens[term])
+        return matched
+
+
+def bm25_scores(papers: Sequence[Dict], query: Union[str, List[str]],
+                fields: Optional[Dict[str, float]] = None,
+                k1: float = DEFAULT_K1, b: float = DEFAULT_B) -> np.ndarray:
+    """
+    BM25 relevance of an ad-hoc result set (e.g. merged API results) to a query.
+
+    IDF comes from the result set itself, so terms every result shares
+    (usually the search terms the APIs matched on) weigh less than the
+    distinguishing ones.
+
+    Args:
+        papers: Paper dictionaries (or records.Paper objects)
+        query: Query text or pre-tokenized terms
+        fields: Mapping of text field -> weight (defaults to title 2.0, abstract 1.0)
+        k1: Term frequency saturation
+        b: Document length normalization
+
+    Returns:
+        Score array aligned with papers (pass as rank_papers(..., relevance=...))
+    """
+    return BM25Index(papers, fields=fields, k1=k1, b=b).scores(query)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Rank paper records from JSON files by BM25 relevance")
+    parser.add_argument("query", help="Query text")
+    parser.add_argument("files", nargs='+', help="JSON files holding lists of paper records")
+    parser.add_argument("-k", type=int, default=10, help="Number of papers to show")
+    args = parser.parse_args()
+
+    records = []
+    for name in args.files:
+        with open(name) as f:
+            records.extend(json.load(f))
+
+    index = BM25Index(records)
+    for n, (doc_id, score) in enumerate(index.search(args.query, k=args.k), 1):
+        paper = records[doc_id]
+        print(f"{n:2d}. [{score:.2f}] {(paper.get('title') or '')[:70]} "
+              f"({', '.join(index.matched_terms(doc_id, args.query))})")
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+citation_graph.py - Citation-graph expansion on top of Semantic Scholar
+Builds the neighbourhood of seed papers ("papers citing X", "key references of X").
+
+Expansion is a bounded breadth-first search:
+- Seeds (S2 IDs, DOI:, PMID:, ARXIV:, ...) are resolved with one batch lookup
+- Each hop fetches the citations and/or references of the current frontier
+  through the paginated /citations and /references endpoints, a few
+  papers at a time within the Semantic Scholar rate budget
+- Papers are deduplicated across hops; edges of each paper are cached,
+  so re-expanding an overlapping neighbourhood costs no requests
+- Pruning rules (citation count, year, relevance score) decide which
+  newly found papers are kept and expanded further
+
+Usage:
+    graph = CitationGraph(prune=[min_citations(10), year_range(min_year=2015)])
+    result = graph.expand(["DOI:10.1093/brain/awz035"], hops=2, direction="citations")
+"""
+
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+from paper_utils import (
+    rate_limit_request,
+    get_cached_value,
+    cache_value,
+    log_api_request,
+    REQUEST_TIMEOUT
+)
+from semantic_scholar_search import SemanticScholarSearch, PAPER_DETAILS_URL, SEARCH_FIELDS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Edge endpoints (GET /paper/{id}/citations, /paper/{id}/references)
+DIRECTIONS = {
+    'citations': 'citingPaper',   # Papers that cite the paper
+    'references': 'citedPaper',   # Papers the paper cites
+}
+
+EDGE_PAGE_SIZE = 1000  # API maximum per page
+MAX_EDGES_PER_PAPER = 2000  # Stop paginating highly cited papers here
+GRAPH_WORKERS = 2  # Papers expanded concurrently (matches the limiter burst)
+EDGE_CACHE_NAMESPACE = "s2_edges"
+EDGE_CACHE_TTL = 7 * 24 * 3600  # Citation lists change slowly: 7 days
+
+DEFAULT_MAX_NODES = 300
+
+# A pruning rule receives a standardized paper and returns True to keep it
+PruneRule = Callable[[Dict], bool]
+
+
+def min_citations(count: int) -> PruneRule:
+    """
+    Keep papers cited at least `count` times.
+
+    Args:
+        count: Minimum citation count
+
+    Returns:
+        Pruning rule
+    """
+    def rule(paper: Dict) -> bool:
+        return (paper.get('citation_count') or 0) >= count
+    return rule
+
+
+def year_range(min_year: Optional[int] = None, max_year: Optional[int] = None) -> PruneRule:
+    """
+    Keep papers published within a year range (papers without a year are dropped).
+
+    Args:
+        min_year: Earliest publication year (inclusive)
+        max_year: Latest publication year (inclusive)
+
+    Returns:
+        Pruning rule
+    """
+    def rule(paper: Dict) -> bool:
+        year = paper.get('year')
+        if not year:
+            return False
+        return (min_year is None or year >= min_year) and (max_year is None or year <= max_year)
+    return rule
+
+
+def min_relevance(threshold: int, scorer=None) -> PruneRule:
+    """
+    Keep papers whose RelevanceScorer score reaches a threshold.
+
+    Args:
+        threshold: Minimum relevance score (0-100)
+        scorer: RelevanceScorer instance (defaults to the standard keyword weights)
+
+    Returns:
+        Pruning rule
+    """
+    if scorer is None:
+        from relevance_scorer import RelevanceScorer
+        scorer = RelevanceScorer()
+
+    def rule(paper: Dict) -> bool:
+        score, _ = scorer.score_paper(paper.get('title') or '', paper.get('abstract') or '')
+        return score >= threshold
+    return rule
+
+
+class CitationGraph:
+    """
+    Bounded breadth-first expansion of the citation graph around seed papers.
+    """
+
+    def __init__(self, searcher: Optional[SemanticScholarSearch] = None,
+                 prune: Optional[List[PruneRule]] = None,
+                 max_nodes: int = DEFAULT_MAX_NODES,
+                 max_edges_per_paper: int = MAX_EDGES_PER_PAPER):
+        """
+        Initialize the graph builder.
+
+        Args:
+            searcher: Semantic Scholar client (shares its session and standardization)
+            prune: Pruning rules; a paper is kept only if every rule accepts it
+            max_nodes: Maximum papers in the graph, seeds included
+            max_edges_per_paper: Maximum citations/references fetched per paper
+        """
+        self.searcher = searcher or SemanticScholarSearch()
+        self.api_name = self.searcher.api_name
+        self.prune = prune or []
+        self.max_nodes = max_nodes
+        self.max_edges_per_paper = max_edges_per_paper
+
+    def expand(self, seeds: List[str], hops: int = 2, direction: str = "both") -> Dict:
+        """
+        Build the citation neighbourhood of seed papers.
+
+        Each hop expands every paper added in the previous hop. When a hop
+        finds more new papers than max_nodes allows, the most cited are kept.
+        Seeds are never pruned. Once max_nodes papers are held, expansion
+        stops: the last frontier's edge lists are not fetched, so edges among
+        the papers already held that only those lists carry are not returned.
+
+        Args:
+            seeds: Seed paper identifiers (S2 IDs or prefixed external IDs)
+            hops: Number of hops to expand
+            direction: "citations", "references" or "both"
+
+        Returns:
+            Dict with 'nodes' (paper_id -> paper with its 'hop'),
+            'edges' (list of (citing paper_id, cited paper_id)) and 'seeds'
+        """
+        directions = list(DIRECTIONS) if direction == "both" else [direction]
+        if any(d not in DIRECTIONS for d in directions):
+            raise ValueError(f"Unknown direction: {direction}")
+
+        start = time.time()
+        nodes: Dict[str, Dict] = {}
+        for paper in self.searcher.get_papers_batch(seeds).values():
+            if paper.get('paper_id') and paper['paper_id'] not in nodes:
+                nodes[paper['paper_id']] = dict(paper, hop=0)
+        seed_ids = list(nodes)
+        if len(seed_ids) < len(seeds):
+            logger.warning(f"Resolved {len(seed_ids)} of {len(seeds)} seed papers")
+
+        edges = set()
+        rejected = set()
+        frontier = seed_ids
+
+        for hop in range(1, hops + 1):
+            if not frontier:
+                break
+            if len(nodes) >= self.max_nodes:
+                # No room for new papers: fetching the frontier's edges would only discard them
+                logger.info(f"Hop {hop}: node budget of {self.max_nodes} reached, not expanded")
+                break
+
+            tasks = [(paper_id, d) for paper_id in frontier for d in directions]
+            candidates: Dict[str, Dict] = {}
+            with ThreadPoolExecutor(max_workers=min(len(tasks), GRAPH_WORKERS)) as executor:
+                edge_lists = executor.map(self.get_edges, *zip(*tasks))
+                for (paper_id, d), neighbors in zip(tasks, edge_lists):
+                    for neighbor in neighbors:
+                        neighbor_id = neighbor['paper_id']
+                        if neighbor_id in rejected:
+                            continue
+                        if neighbor_id not in nodes and neighbor_id not in candidates:
+                            if not self._keep(neighbor):
+                                rejected.add(neighbor_id)
+                                continue
+                            candidates[neighbor_id] = neighbor
+                        edges.add((neighbor_id, paper_id) if d == 'citations' else (paper_id, neighbor_id))
+
+            # Keep the most cited new papers that fit in the node budget
+            room = max(self.max_nodes - len(nodes), 0)
+            ranked = sorted(candidates.values(), key=lambda p: -(p.get('citation_count') or 0))
+            frontier = []
+            for paper in ranked[:room]:
+                nodes[paper['paper_id']] = dict(paper, hop=hop)
+                frontier.append(paper['paper_id'])
+
+            logger.info(f"Hop {hop}: expanded {len(tasks)} edge lists, added {len(frontier)} papers "
+                        f"({len(candidates) - len(frontier)} over budget, {len(rejected)} pruned so far)")
+
+        # Drop edges to papers that did not fit in the budget
+        kept_edges = sorted((a, b) for a, b in edges if a in nodes and b in nodes)
+        logger.info(f"Citation graph: {len(nodes)} papers, {len(kept_edges)} edges "
+                    f"in {time.time() - start:.1f}s")
+        return {'nodes': nodes, 'edges': kept_edges, 'seeds': seed_ids}
+
+    def _keep(self, paper: Dict) -> bool:
+        """Apply the pruning rules to a newly found paper."""
+        return all(rule(paper) for rule in self.prune)
+
+    def get_edges(self, paper_id: str, direction: str) -> List[Dict]:
+        """
+        Get the papers citing (or cited by) one paper, using the edge cache.
+
+        Lists are cached per max_edges_per_paper, as they are cut off there.
+
+        Args:
+            paper_id: Semantic Scholar paper ID
+            direction: "citations" or "references"
+
+        Returns:
+            List of standardized neighbour papers (empty if the lookup failed)
+        """
+        cache_key = f"{paper_id}:{direction}:{self.max_edges_per_paper}"
+        cached = get_cached_value(cache_key, EDGE_CACHE_NAMESPACE)
+        if cached is not None:
+            return cached
+
+        neighbors, complete = self._fetch_edges(paper_id, direction)
+        if complete:
+            cache_value(cache_key, neighbors, EDGE_CACHE_NAMESPACE, EDGE_CACHE_TTL)
+        return neighbors
+
+    def _fetch_edges(self, paper_id: str, direction: str) -> Tuple[List[Dict], bool]:
+        """
+        Walk the pages of one paper's citations or references.
+
+        Args:
+            paper_id: Semantic Scholar paper ID
+            direction: "citations" or "references"
+
+        Returns:
+            (neighbour papers, complete) tuple; complete is False if a page failed
+        """
+        url = f"{PAPER_DETAILS_URL}/{paper_id}/{direction}"
+        nested = DIRECTIONS[direction]
+        neighbors = []
+        offset = 0
+
+        while offset is not None and offset < self.max_edges_per_paper:
+            params = {
+                'fields': ','.join(SEARCH_FIELDS),
+                'offset': offset,
+                'limit': min(EDGE_PAGE_SIZE, self.max_edges_per_paper - offset),
+            }
+
+            try:
+                rate_limit_request(self.api_name)
+                response = self.searcher.session.get(url, params=params, timeout=REQUEST_TIMEOUT * 2)
+                log_api_request(self.api_name, f"{direction} of {paper_id}", response.status_code)
+
+                if response.status_code != 200:
+                    logger.error(f"Semantic Scholar {direction} error for {paper_id}: "
+                                 f"{response.status_code}")
+                    return neighbors, False
+
+                data = response.json()
+
+            except Exception as e:
+                logger.error(f"Error fetching {direction} of {paper_id}: {e}")
+                log_api_request(self.api_name, f"{direction} of {paper_id}", error=str(e))
+                return neighbors, False
+
+            for item in data.get('data') or []:
+                paper = item.get(nested)
+                # Unresolved references come back without a paperId
+                if paper and paper.get('paperId'):
+                    neighbors.append(self.searcher._standardize_paper(paper))
+
+            offset = data.get('next')
+
+        return neighbors, True
+
+
+if __name__ == "__main__":
+    # Handle command line usage:
+    #   python citation_graph.py DOI:10.1093/brain/awz035 [more seeds...]
+    if len(sys.argv) > 1:
+        graph = CitationGraph(max_nodes=100)
+        result = graph.expand(sys.argv[1:], hops=2)
+
+        print(f"Seeds: {', '.join(result['seeds'])}")
+        print(f"Found {len(result['nodes'])} papers and {len(result['edges'])} edges\n")
+
+        papers = sorted(result['nodes'].values(), key=lambda p: (p['hop'], -(p['citation_count'] or 0)))
+        for paper in papers[:20]:
+            print(f"[hop {paper['hop']}] {paper['title']}")
+            print(f"   Year: {paper['year']}  Citations: {paper['citation_count']}")
+    else:
+        print("Usage: python citation_graph.py <paper id> [<paper id> ...]")
+        print("  IDs may be S2 paper IDs or DOI:, PMID:, ARXIV:, CorpusId: identifiers")
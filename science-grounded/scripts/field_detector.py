@@ -5,18 +5,24 @@ Routes queries to appropriate databases based on detected field.
 
 Uses keyword matching with configurable weights to determine
 the most relevant research areas and databases.
+
+The field keyword config is loaded and compiled once per process into a
+FieldMatcher: every keyword of every field goes into one KeywordAutomaton,
+so a query is scanned once however many fields are configured. Results are
+memoized per detector, so repeated queries cost one dictionary lookup.
 """
 
 import json
 import logging
-import re
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 from collections import defaultdict
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent))
+from keyword_automaton import KeywordAutomaton
 from paper_utils import sanitize_query
 
 # Set up paths
@@ -26,6 +32,71 @@ CONFIG_DIR = BASE_DIR / "config"
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Distinct queries memoized per detector
+DETECTION_CACHE_SIZE = 4096
+
+
+class FieldMatcher:
+    """
+    Field keyword config compiled into one matcher.
+    """
+
+    def __init__(self, fields: Dict):
+        """
+        Compile the keywords of every field.
+
+        Args:
+            fields: The 'fields' section of field_keywords.json
+        """
+        self.fields = fields
+        self._field_order = {name: order for order, name in enumerate(fields)}
+        # Lowercased keyword -> (field, position in that field's keyword list)
+        self._fields_by_pattern: Dict[str, List[Tuple[str, int]]] = {}
+        for name, config in fields.items():
+            for position, keyword in enumerate(config.get('keywords', [])):
+                if keyword:
+                    self._fields_by_pattern.setdefault(keyword.lower(), []).append((name, position))
+        self._automaton = KeywordAutomaton(self._fields_by_pattern)
+
+    def match(self, query: str) -> Tuple[Dict[str, float], Dict[str, List[str]]]:
+        """
+        Score every field against a query.
+
+        A keyword matches when it occurs anywhere in the query
+        (case-insensitive substring, so multi-word phrases match too).
+
+        Args:
+            query: Sanitized query
+
+        Returns:
+            (field -> score, field -> matched keywords), both in config
+            order, for the fields with at least one match
+        """
+        found = {pattern for _, _, pattern in self._automaton.finditer(query)}
+
+        positions = defaultdict(list)
+        for pattern in found:
+            for name, position in self._fields_by_pattern[pattern]:
+                positions[name].append(position)
+
+        field_scores = {}
+        keywords_matched = {}
+        for name in sorted(positions, key=self._field_order.get):
+            matched = sorted(positions[name])
+            config = self.fields[name]
+            keywords = config['keywords']
+            # Score based on matches and weight
+            field_scores[name] = (len(matched) / len(keywords)) * config.get('weight', 1.0)
+            keywords_matched[name] = [keywords[position] for position in matched]
+        return field_scores, keywords_matched
+
+
+@lru_cache(maxsize=None)
+def _load_field_matcher(config_path: str) -> Tuple[Dict, FieldMatcher]:
+    """Load and compile a field config once per process (shared by every FieldDetector)."""
+    config = FieldDetector._load_config(Path(config_path))
+    return config, FieldMatcher(config.get('fields', {}))
+
 
 class FieldDetector:
     """
@@ -42,12 +113,14 @@ class FieldDetector:
         if config_path is None:
             config_path = CONFIG_DIR / "field_keywords.json"
 
-        self.config = self._load_config(config_path)
+        self.config, self._matcher = _load_field_matcher(str(config_path))
         self.fields = self.config.get('fields', {})
         self.default_databases = self.config.get('default_databases', ['semantic_scholar'])
         self.confidence_threshold = self.config.get('confidence_threshold', 0.3)
+        self._detect = lru_cache(maxsize=DETECTION_CACHE_SIZE)(self._detect_uncached)
 
-    def _load_config(self, config_path: Path) -> Dict:
+    @staticmethod
+    def _load_config(config_path: Path) -> Dict:
         """
         Load field keywords configuration from JSON file.
 
@@ -91,44 +164,40 @@ class FieldDetector:
                 - recommended_sources: List of recommended databases
                 - keywords_matched: Dict of field -> matched keywords
         """
+        result = self._detect(query)
+        # Copy the memoized result so callers can modify theirs
+        return {
+            'detected_fields': list(result['detected_fields']),
+            'confidence_scores': dict(result['confidence_scores']),
+            'recommended_sources': list(result['recommended_sources']),
+            'keywords_matched': {field: list(keywords)
+                                 for field, keywords in result['keywords_matched'].items()}
+        }
+
+    def detect_fields_batch(self, queries: Iterable[str]) -> List[Dict]:
+        """
+        Detect research fields for many queries.
+
+        Repeated queries are detected once.
+
+        Args:
+            queries: User queries
+
+        Returns:
+            List of detect_fields() results, aligned with queries
+        """
+        return [self.detect_fields(query) for query in queries]
+
+    def _detect_uncached(self, query: str) -> Dict:
+        """detect_fields() without the memo; results are shared, do not modify."""
         # Sanitize query first
         clean_query = sanitize_query(query)
         if not clean_query:
             logger.warning("Query failed sanitization")
             return self._default_result()
 
-        # Convert query to lowercase for matching
-        query_lower = clean_query.lower()
-        query_words = set(query_lower.split())
-
         # Score each field based on keyword matches
-        field_scores = {}
-        keywords_matched = defaultdict(list)
-
-        for field_name, field_config in self.fields.items():
-            keywords = field_config.get('keywords', [])
-            weight = field_config.get('weight', 1.0)
-
-            # Count keyword matches
-            matches = 0
-            matched_keywords = []
-
-            for keyword in keywords:
-                keyword_lower = keyword.lower()
-                # Check for exact match or substring match
-                if keyword_lower in query_lower:
-                    matches += 1
-                    matched_keywords.append(keyword)
-                # Also check word-level matches for short keywords
-                elif len(keyword_lower.split()) == 1 and keyword_lower in query_words:
-                    matches += 0.8  # Slightly lower weight for word-only match
-                    matched_keywords.append(keyword)
-
-            if matches > 0:
-                # Calculate score based on matches and weight
-                score = (matches / len(keywords)) * weight
-                field_scores[field_name] = score
-                keywords_matched[field_name] = matched_keywords
+        field_scores, keywords_matched = self._matcher.match(clean_query)
 
         # Normalize scores to get confidence values
         if field_scores:
@@ -162,7 +231,7 @@ class FieldDetector:
             'detected_fields': detected_fields,
             'confidence_scores': confidence_scores,
             'recommended_sources': recommended_sources,
-            'keywords_matched': dict(keywords_matched)
+            'keywords_matched': keywords_matched
         }
 
     def _get_recommended_sources(self, detected_fields: List[str]) -> List[str]:
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+grant_analytics.py - Columnar funding analytics over NIH and NSF grant results
+Turns grant lists into a pandas DataFrame for vectorized scoring and aggregation.
+
+Accepts the standardized records returned by NIHReporterSearch and
+NSFAwardsSearch (live or from the offline grant store) and provides:
+- Impact scores identical to _sort_projects / _sort_awards, computed as arrays
+- Group-by aggregates (by institute, activity code, PI, institution, year, ...)
+- Funding time series by fiscal year, optionally split by a group
+- A JSON-friendly portfolio summary
+
+Usage:
+    projects = NIHReporterSearch().get_portfolio("epilepsy", agencies=["NINDS"])
+    analytics = GrantAnalytics(projects)
+    analytics.summarize("institution").head(10)
+    analytics.timeseries(by="activity_code", top=5)
+"""
+
+import logging
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+from nih_reporter_search import (
+    MAJOR_ACTIVITY_CODES,
+    MAJOR_ACTIVITY_BOOST,
+    PRIMARY_INSTITUTE,
+    PRIMARY_INSTITUTE_BOOST,
+    SECONDARY_INSTITUTES,
+    SECONDARY_INSTITUTE_BOOST
+)
+from nsf_awards_search import KEY_PROGRAMS, KEY_PROGRAM_BOOST
+from paper_utils import (
+    GRANT_FUNDING_SCALE,
+    VERY_RECENT_YEARS,
+    VERY_RECENT_BOOST,
+    RECENT_YEARS,
+    RECENT_BOOST
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Groupings understood by summarize() and timeseries()
+GROUP_FIELDS = ['agency', 'activity_code', 'pi_name', 'institution', 'fiscal_year',
+                'source', 'program']
+
+
+def grants_to_frame(grants: List[Dict]) -> pd.DataFrame:
+    """
+    Load standardized grant records into a DataFrame (one row per record).
+
+    NIH records keep one row per fiscal year; 'grant' holds the core project
+    number (or NSF award number) so multi-year awards can be counted once.
+
+    Args:
+        grants: NIH project and/or NSF award dictionaries
+
+    Returns:
+        DataFrame with columns grant, source, title, pi_name, institution,
+        year, fiscal_year, award_amount, activity_code, agencies, program
+    """
+    columns = {name: [] for name in ('grant', 'source', 'title', 'pi_name', 'institution',
+                                     'year', 'fiscal_year', 'award_amount', 'activity_code',
+                                     'agencies', 'program')}
+
+    # One pass over the records, appending to per-column lists
+    for grant in grants:
+        source = grant.get('source', '')
+        year = grant.get('year')
+        columns['grant'].append(grant.get('core_project_num') or grant.get('project_number')
+                                or grant.get('award_number') or '')
+        columns['source'].append(source)
+        columns['title'].append(grant.get('title', ''))
+        columns['pi_name'].append(grant.get('pi_name', ''))
+        columns['institution'].append(grant.get('institution', ''))
+        columns['year'].append(year)
+        columns['fiscal_year'].append(grant.get('fiscal_year') or year)
+        columns['award_amount'].append(grant.get('award_amount') or 0)
+        columns['activity_code'].append(grant.get('activity_code', ''))
+        # NSF awards carry no institute list; the agency is NSF itself
+        columns['agencies'].append(list(grant.get('agencies') or ([] if source != 'nsf' else ['NSF'])))
+        columns['program'].append(grant.get('program', ''))
+
+    frame = pd.DataFrame(columns)
+    frame['year'] = pd.to_numeric(frame['year'], errors='coerce').astype('Int64')
+    frame['fiscal_year'] = pd.to_numeric(frame['fiscal_year'], errors='coerce').astype('Int64')
+    frame['award_amount'] = pd.to_numeric(frame['award_amount'], errors='coerce').fillna(0).astype(np.int64)
+    for name in ('source', 'activity_code', 'program'):
+        frame[name] = frame[name].astype('category')
+    return frame
+
+
+def score_frame(frame: pd.DataFrame, current_year: Optional[int] = None) -> np.ndarray:
+    """
+    Compute impact scores for every row at once.
+
+    Gives the same values as NIHReporterSearch._sort_projects (NIH rows) and
+    NSFAwardsSearch._sort_awards (NSF rows).
+
+    Args:
+        frame: DataFrame from grants_to_frame
+        current_year: Reference year for recency (defaults to this year)
+
+    Returns:
+        Array of impact scores, aligned with the frame's rows
+    """
+    current_year = current_year or datetime.now().year
+
+    amount = frame['award_amount'].to_numpy(dtype=np.float64)
+    score = np.where(amount > 0, amount / GRANT_FUNDING_SCALE, 0.0)
+
+    year = frame['year'].to_numpy(dtype=np.float64, na_value=np.nan)
+    with np.errstate(invalid='ignore'):
+        recency = np.select(
+            [year >= current_year - VERY_RECENT_YEARS, year >= current_year - RECENT_YEARS],
+            [VERY_RECENT_BOOST, RECENT_BOOST], default=1.0)
+    score = score * recency
+
+    is_nsf = (frame['source'] == 'nsf').to_numpy()
+
+    # NIH: major research grants and neuroscience institutes
+    major = frame['activity_code'].isin(MAJOR_ACTIVITY_CODES).to_numpy() & ~is_nsf
+    score = np.where(major, score * MAJOR_ACTIVITY_BOOST, score)
+
+    # One row per (grant, institute); reduce back to one flag per grant
+    agencies = frame['agencies'].explode()
+    primary = (agencies == PRIMARY_INSTITUTE).groupby(level=0).any().to_numpy() & ~is_nsf
+    secondary = agencies.isin(SECONDARY_INSTITUTES).groupby(level=0).any().to_numpy()
+    score = np.select([primary, secondary & ~is_nsf],
+                      [score * PRIMARY_INSTITUTE_BOOST, score * SECONDARY_INSTITUTE_BOOST],
+                      default=score)
+
+    # NSF: key programs (case-insensitive substring, as in _sort_awards)
+    key_pattern = '|'.join(re.escape(p.lower()) for p in KEY_PROGRAMS)
+    key_program = frame['program'].astype(str).str.lower().str.contains(key_pattern, regex=True).to_numpy()
+    score = np.where(key_program & is_nsf, score * KEY_PROGRAM_BOOST, score)
+
+    return score
+
+
+class GrantAnalytics:
+    """
+    Vectorized scoring and aggregation over a set of grants.
+    """
+
+    def __init__(self, grants: List[Dict], current_year: Optional[int] = None):
+        """
+        Load grants into columnar form and score them.
+
+        Args:
+            grants: NIH project and/or NSF award dictionaries
+            current_year: Reference year for recency scoring (defaults to this year)
+        """
+        self.grants = grants
+        self.frame = grants_to_frame(grants)
+        self.frame['impact_score'] = score_frame(self.frame, current_year)
+        logger.info(f"Loaded {len(self.frame)} grant records for analysis")
+
+    def ranked(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Return the grants sorted by impact score, highest first.
+
+        Args:
+            limit: Maximum number of grants (all when None)
+
+        Returns:
+            Grant dictionaries, each with 'impact_score' set
+        """
+        scores = self.frame['impact_score'].to_numpy()
+        # Stable sort keeps input order among equal scores, like sorted()
+        order = np.argsort(-scores, kind='stable')
+        if limit is not None:
+            order = order[:limit]
+        ranked = []
+        for i in order:
+            grant = self.grants[i]
+            grant['impact_score'] = float(scores[i])
+            ranked.append(grant)
+        return ranked
+
+    def _grouped_frame(self, by: str) -> pd.DataFrame:
+        """Frame to group by a field (one row per agency when grouping by agency)."""
+        if by not in GROUP_FIELDS:
+            raise ValueError(f"Unknown grouping '{by}' (expected one of {GROUP_FIELDS})")
+        if by == 'agency':
+            frame = self.frame.explode('agencies', ignore_index=True)
+            frame = frame.rename(columns={'agencies': 'agency'})
+            return frame[frame['agency'].notna()]
+        return self.frame
+
+    def summarize(self, by: str) -> pd.DataFrame:
+        """
+        Aggregate funding per group.
+
+        A grant funded by several institutes counts fully towards each of them.
+
+        Args:
+            by: One of GROUP_FIELDS ('agency', 'activity_code', 'pi_name',
+                'institution', 'fiscal_year', 'source', 'program')
+
+        Returns:
+            DataFrame indexed by group with grants (distinct), records,
+            total_funding, mean_funding, median_funding, first_year,
+            last_year and share (of total funding), largest total first
+        """
+        frame = self._grouped_frame(by)
+        grouped = frame.groupby(by, observed=True, sort=False)
+        summary = grouped.agg(
+            grants=('grant', 'nunique'),
+            records=('grant', 'size'),
+            total_funding=('award_amount', 'sum'),
+            mean_funding=('award_amount', 'mean'),
+            median_funding=('award_amount', 'median'),
+            first_year=('fiscal_year', 'min'),
+            last_year=('fiscal_year', 'max'),
+        )
+        total = summary['total_funding'].sum()
+        summary['share'] = summary['total_funding'] / total if total else 0.0
+        return summary.sort_values('total_funding', ascending=False)
+
+    def timeseries(self, by: Optional[str] = None, top: Optional[int] = None,
+                   value: str = 'award_amount') -> pd.DataFrame:
+        """
+        Funding (or record counts) per fiscal year.
+
+        Args:
+            by: Optional grouping (one of GROUP_FIELDS); one column per group
+            top: Keep only the top groups by total, folding the rest into 'Other'
+            value: 'award_amount' for funding totals or 'count' for record counts
+
+        Returns:
+            DataFrame indexed by fiscal year (no gaps), one column per group
+            (a single 'total' column when by is None)
+        """
+        frame = self._grouped_frame(by) if by else self.frame
+        frame = frame[frame['fiscal_year'].notna()]
+        if frame.empty:
+            return pd.DataFrame()
+
+        if by:
+            groups = frame[by].astype(object)
+            if top is not None:
+                totals = frame.groupby(groups)['award_amount'].sum().nlargest(top)
+                groups = groups.where(groups.isin(totals.index), 'Other')
+            columns = groups
+        else:
+            columns = pd.Series('total', index=frame.index)
+
+        if value == 'count':
+            table = pd.crosstab(frame['fiscal_year'], columns)
+        else:
+            table = pd.crosstab(frame['fiscal_year'], columns, values=frame['award_amount'],
+                                aggfunc='sum').fillna(0).astype(np.int64)
+
+        years = range(int(table.index.min()), int(table.index.max()) + 1)
+        table = table.reindex(years, fill_value=0)
+        table.index.name = 'fiscal_year'
+        table.columns.name = by
+        return table
+
+    def portfolio_summary(self, top: int = 5) -> Dict:
+        """
+        Summarize the portfolio as plain Python values (JSON-friendly).
+
+        Args:
+            top: Number of leading groups listed per dimension
+
+        Returns:
+            Dict with totals, top institutes, activity codes, institutions
+            and PIs (name, grants, total funding), and funding per fiscal year
+        """
+        frame = self.frame
+
+        def leaders(by):
+            summary = self.summarize(by).head(top)
+            return [{'name': str(name), 'grants': int(row.grants),
+                     'total_funding': int(row.total_funding)}
+                    for name, row in summary.iterrows()]
+
+        yearly = self.timeseries()
+        return {
+            'grants': int(frame['grant'].nunique()),
+            'records': int(len(frame)),
+            'total_funding': int(frame['award_amount'].sum()),
+            'median_award': float(frame['award_amount'].median()) if len(frame) else 0.0,
+            'institutes': leaders('agency'),
+            'activity_codes': leaders('activity_code'),
+            'institutions': leaders('institution'),
+            'pis': leaders('pi_name'),
+            'funding_by_year': {int(year): int(total) for year, total
+                                in yearly['total'].items()} if not yearly.empty else {},
+        }
+
+
+if __name__ == "__main__":
+    # Handle command line usage: python grant_analytics.py <query>
+    # Summarizes the matching grants in the offline grant store
+    if len(sys.argv) > 1:
+        import json
+        from grant_store import GrantStore
+
+        query = ' '.join(sys.argv[1:])
+        grants = GrantStore().search(query, limit=10000)
+        if not grants:
+            print("No grants found (run grant_store.py ingest-nih / ingest-nsf first)")
+            sys.exit(0)
+
+        analytics = GrantAnalytics(grants)
+        print(f"Query: {query}")
+        print(json.dumps(analytics.portfolio_summary(), indent=2))
+    else:
+        print("Usage: python grant_analytics.py <query>")
@@ -0,0 +1,584 @@
+#!/usr/bin/env python3
+"""
+grant_store.py - Offline grant store built from NIH ExPORTER and NSF award dumps
+Serves funding-landscape queries locally, without RePORTER/NSF API round trips.
+
+Ingests bulk files downloaded to a local directory:
+- NIH ExPORTER project files (https://reporter.nih.gov/exporter/projects),
+  e.g. RePORTER_PRJ_C_FY2023.csv or the .zip it is distributed in
+- NSF yearly award archives (https://www.nsf.gov/awardsearch/download.jsp),
+  e.g. 2023.zip holding one XML (or JSON) file per award
+
+Rows are converted to the shape the live APIs return and passed through
+NIHReporterSearch._parse_project / NSFAwardsSearch._parse_award, so stored
+grants are the same dictionaries the searchers produce. Each file is
+streamed in its own worker process into a temporary store; temporary
+stores are merged into one indexed LocalStore.
+
+Usage:
+    grants = GrantStore()
+    grants.ingest_nih("/data/exporter")
+    grants.ingest_nsf("/data/nsf")
+    results = grants.search("epilepsy", pi="Sydney Cash")
+"""
+
+import csv
+import gzip
+import io
+import json
+import logging
+import re
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+from local_store import LocalStore, QUERY_OPERATORS
+from nih_reporter_search import NIHReporterSearch, MAJOR_INSTITUTES
+from nsf_awards_search import NSFAwardsSearch
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Default store file (inside MIRROR_DIR)
+STORE_NAME = "grants.sqlite"
+
+# File name patterns of the bulk downloads
+NIH_PATTERNS = ("*.csv", "*.csv.gz", "*.zip")
+NSF_PATTERNS = ("*.zip", "*.xml", "*.json")
+
+# Parallel parsing
+DEFAULT_WORKERS = 4
+
+# Store layout for grant records. NIH and NSF records have different
+# number fields but both carry a unique URL, which serves as the key.
+ID_FIELD = 'url'
+FACET_FIELDS = {
+    'source': 'source',
+    'agency': 'agencies',
+    'activity': 'activity_code'
+}
+EXTRA_FIELDS = ['pi_name', 'co_pis', 'institution', 'program', 'study_section']
+
+# Candidates fetched per result when PI, institution, funding or end date
+# filters apply; grown by this factor again until enough grants pass
+CANDIDATE_FACTOR = 20
+
+# ExPORTER IC names -> institute abbreviations used by RePORTER
+IC_ABBREVIATIONS = {name.upper(): code for code, name in MAJOR_INSTITUTES.items()}
+
+# ExPORTER ADMINISTERING_IC two-letter codes -> abbreviations used by RePORTER
+IC_CODES = {
+    'AA': 'NIAAA', 'AG': 'NIA', 'AI': 'NIAID', 'AR': 'NIAMS', 'AT': 'NCCIH',
+    'CA': 'NCI', 'DA': 'NIDA', 'DC': 'NIDCD', 'DE': 'NIDCR', 'DK': 'NIDDK',
+    'EB': 'NIBIB', 'ES': 'NIEHS', 'EY': 'NEI', 'GM': 'NIGMS', 'HD': 'NICHD',
+    'HG': 'NHGRI', 'HL': 'NHLBI', 'LM': 'NLM', 'MD': 'NIMHD', 'MH': 'NIMH',
+    'NR': 'NINR', 'NS': 'NINDS', 'OD': 'OD', 'RM': 'OD', 'RR': 'NCRR',
+    'TR': 'NCATS', 'TW': 'FIC', 'CL': 'CLC',
+    'HS': 'AHRQ', 'FD': 'FDA', 'OH': 'NIOSH',
+}
+
+
+def open_store(path: Optional[Union[str, Path]] = None) -> LocalStore:
+    """
+    Open the grant local store.
+
+    Args:
+        path: Store file (defaults to MIRROR_DIR/grants.sqlite)
+
+    Returns:
+        LocalStore configured for grant records
+    """
+    return LocalStore(path or STORE_NAME, id_field=ID_FIELD,
+                      facet_fields=FACET_FIELDS, extra_fields=EXTRA_FIELDS)
+
+
+def _to_int(value) -> int:
+    """Parse an amount that may be empty or formatted as a float."""
+    try:
+        return int(float(value))
+    except (ValueError, TypeError):
+        return 0
+
+
+def _us_to_iso(date: str) -> str:
+    """Convert MM/DD/YYYY (ExPORTER) to YYYY-MM-DD (RePORTER API)."""
+    try:
+        return datetime.strptime(date.strip(), '%m/%d/%Y').strftime('%Y-%m-%d')
+    except (ValueError, AttributeError):
+        return ''
+
+
+def _iso_to_us(date: str) -> str:
+    """Convert YYYY-MM-DD (NSF JSON) to MM/DD/YYYY (NSF API)."""
+    try:
+        return datetime.strptime(date.strip()[:10], '%Y-%m-%d').strftime('%m/%d/%Y')
+    except (ValueError, AttributeError):
+        return ''
+
+
+def exporter_row_to_api(row: Dict[str, str]) -> Optional[Dict]:
+    """
+    Convert one ExPORTER project row to a RePORTER API project.
+
+    Args:
+        row: CSV row keyed by ExPORTER column names
+
+    Returns:
+        Project dictionary as returned by projects/search, or None if the
+        row has no project number
+    """
+    project_num = (row.get('FULL_PROJECT_NUM') or '').strip()
+    if not project_num:
+        return None
+
+    # PI_NAMEs: "CASH, SYDNEY (contact); SMITH, JOHN;"
+    pis = [p.strip() for p in (row.get('PI_NAMEs') or '').split(';') if p.strip()]
+    contact = next((p for p in pis if '(contact)' in p), pis[0] if pis else '')
+    contact = contact.replace('(contact)', '').strip()
+
+    ic_name = (row.get('IC_NAME') or '').strip().upper()
+    administering_ic = (row.get('ADMINISTERING_IC') or '').strip().upper()
+    ic_code = IC_ABBREVIATIONS.get(ic_name) or IC_CODES.get(administering_ic, administering_ic)
+
+    amount = _to_int(row.get('TOTAL_COST'))
+    if not amount:
+        amount = _to_int(row.get('DIRECT_COST_AMT')) + _to_int(row.get('INDIRECT_COST_AMT'))
+
+    return {
+        'project_num': project_num,
+        'core_project_num': (row.get('CORE_PROJECT_NUM') or '').strip(),
+        'project_title': (row.get('PROJECT_TITLE') or '').strip() or 'Untitled Project',
+        'contact_pi_name': contact or 'Unknown PI',
+        'org_name': (row.get('ORG_NAME') or '').strip() or 'Unknown Institution',
+        'org_city': (row.get('ORG_CITY') or '').strip(),
+        'org_state': (row.get('ORG_STATE') or '').strip(),
+        'org_country': (row.get('ORG_COUNTRY') or '').strip() or 'USA',
+        'project_start_date': _us_to_iso(row.get('PROJECT_START') or ''),
+        'project_end_date': _us_to_iso(row.get('PROJECT_END') or ''),
+        'award_amount': amount,
+        'fiscal_year': _to_int(row.get('FY')) or None,
+        'agency_ic_fundings': [{'code': ic_code}] if ic_code else [],
+        'phr_text': (row.get('PHR') or '').strip(),
+        'full_study_section': {'name': (row.get('STUDY_SECTION_NAME') or '').strip()},
+        'project_num_split': {'activity_code': (row.get('ACTIVITY') or '').strip()},
+    }
+
+
+def iter_exporter_file(path: Path) -> Iterator[Dict]:
+    """
+    Stream standardized projects from one ExPORTER project file.
+
+    Args:
+        path: .csv, .csv.gz or .zip (holding .csv members) file
+
+    Yields:
+        Project dictionaries in the NIHReporterSearch record shape
+    """
+    parser = NIHReporterSearch()
+
+    def projects(binary):
+        # Older ExPORTER years are not UTF-8 clean
+        reader = csv.DictReader(io.TextIOWrapper(binary, encoding='utf-8',
+                                                 errors='replace', newline=''))
+        if 'FULL_PROJECT_NUM' not in (reader.fieldnames or []):
+            logger.warning(f"{path.name} is not an ExPORTER project file, skipping")
+            return
+        for row in reader:
+            raw = exporter_row_to_api(row)
+            project = parser._parse_project(raw) if raw else None
+            if project:
+                yield project
+
+    if path.suffix == '.zip':
+        with zipfile.ZipFile(path) as archive:
+            for name in archive.namelist():
+                if name.lower().endswith('.csv'):
+                    with archive.open(name) as member:
+                        yield from projects(member)
+        return
+
+    opener = gzip.open if path.suffix == '.gz' else open
+    with opener(path, 'rb') as f:
+        yield from projects(f)
+
+
+def nsf_xml_to_api(xml_bytes: bytes) -> Optional[Dict]:
+    """
+    Convert one NSF award XML document to an NSF Awards API award.
+
+    Args:
+        xml_bytes: Contents of a per-award XML file (<rootTag><Award>...)
+
+    Returns:
+        Award dictionary as returned by awards.json, or None if unparseable
+    """
+    try:
+        root = ET.fromstring(xml_bytes)
+    except ET.ParseError:
+        return None
+    award = root if root.tag == 'Award' else root.find('Award')
+    if award is None or not award.findtext('AwardID'):
+        return None
+
+    pi, co_pis = None, []
+    for investigator in award.findall('Investigator'):
+        name = ' '.join(filter(None, [investigator.findtext('FirstName', '').strip(),
+                                      investigator.findtext('LastName', '').strip()]))
+        role = investigator.findtext('RoleCode', '')
+        if pi is None and role.strip().lower() == 'principal investigator':
+            pi = investigator
+        elif name:
+            co_pis.append(name)
+
+    institution = award.find('Institution')
+    country = institution.findtext('CountryName', '') if institution is not None else ''
+
+    return {
+        'id': award.findtext('AwardID', '').strip(),
+        'title': award.findtext('AwardTitle', '').strip(),
+        'piFirstName': pi.findtext('FirstName', '').strip() if pi is not None else '',
+        'piLastName': pi.findtext('LastName', '').strip() if pi is not None else '',
+        'piEmail': pi.findtext('EmailAddress', '').strip() if pi is not None else '',
+        'coPDPI': co_pis,
+        'awardeeName': institution.findtext('Name', '').strip() if institution is not None else '',
+        'awardeeCity': institution.findtext('CityName', '').strip() if institution is not None else '',
+        'awardeeStateCode': institution.findtext('StateCode', '').strip() if institution is not None else '',
+        'awardeeCountryCode': 'USA' if country.strip() in ('', 'United States') else country.strip(),
+        'date': award.findtext('MinAmdLetterDate', '').strip(),
+        'startDate': award.findtext('AwardEffectiveDate', '').strip(),
+        'expDate': award.findtext('AwardExpirationDate', '').strip(),
+        'estimatedTotalAmt': award.findtext('AwardTotalIntnAmount', '').strip(),
+        'fundsObligatedAmt': award.findtext('AwardAmount', '').strip(),
+        'abstractText': award.findtext('AbstractNarration', '').strip(),
+        'fundProgramName': award.findtext('ProgramElement/Text', '').strip(),
+    }
+
+
+def nsf_json_to_api(data: Dict) -> Optional[Dict]:
+    """
+    Convert one NSF award JSON document to an NSF Awards API award.
+
+    Args:
+        data: Parsed per-award JSON file (awd_id, awd_titl_txt, pi, inst, ...)
+
+    Returns:
+        Award dictionary as returned by awards.json, or None if it has no ID
+    """
+    if not isinstance(data, dict) or not data.get('awd_id'):
+        return None
+
+    investigators = data.get('pi') or []
+    pi = next((p for p in investigators
+               if (p.get('pi_role') or '').lower() == 'principal investigator'), None)
+    co_pis = [' '.join(filter(None, [p.get('pi_first_name'), p.get('pi_last_name')]))
+              for p in investigators if p is not pi]
+
+    institution = data.get('inst') or {}
+    country = (institution.get('inst_country_name') or '').strip()
+    programs = data.get('pgm_ele') or []
+
+    return {
+        'id': str(data['awd_id']),
+        'title': data.get('awd_titl_txt') or '',
+        'piFirstName': (pi or {}).get('pi_first_name') or '',
+        'piLastName': (pi or {}).get('pi_last_name') or '',
+        'piEmail': (pi or {}).get('pi_email_addr') or '',
+        'coPDPI': [name for name in co_pis if name],
+        'awardeeName': institution.get('inst_name') or '',
+        'awardeeCity': institution.get('inst_city_name') or '',
+        'awardeeStateCode': institution.get('inst_state_code') or '',
+        'awardeeCountryCode': 'USA' if country in ('', 'United States') else country,
+        'date': _iso_to_us(data.get('awd_min_amd_letter_date') or ''),
+        'startDate': _iso_to_us(data.get('awd_eff_date') or ''),
+        'expDate': _iso_to_us(data.get('awd_exp_date') or ''),
+        'estimatedTotalAmt': data.get('tot_intn_awd_amt') or '',
+        'fundsObligatedAmt': data.get('awd_amount') or '',
+        'abstractText': data.get('awd_abstract_narration') or '',
+        'fundProgramName': programs[0].get('pgm_ele_name', '') if programs else '',
+    }
+
+
+def iter_nsf_file(path: Path) -> Iterator[Dict]:
+    """
+    Stream standardized awards from one NSF archive or award file.
+
+    Args:
+        path: Yearly .zip archive, or a single award .xml/.json file
+
+    Yields:
+        Award dictionaries in the NSFAwardsSearch record shape
+    """
+    parser = NSFAwardsSearch()
+
+    def convert(name: str, content: bytes) -> Optional[Dict]:
+        if name.lower().endswith('.xml'):
+            return nsf_xml_to_api(content)
+        if name.lower().endswith('.json'):
+            try:
+                return nsf_json_to_api(json.loads(content))
+            except ValueError:
+                return None
+        return None
+
+    if path.suffix == '.zip':
+        with zipfile.ZipFile(path) as archive:
+            for name in archive.namelist():
+                raw = convert(name, archive.read(name))
+                award = parser._parse_award(raw) if raw else None
+                if award:
+                    yield award
+        return
+
+    raw = convert(path.name, path.read_bytes())
+    award = parser._parse_award(raw) if raw else None
+    if award:
+        yield award
+
+
+def _ingest_file(path: Path, kind: str, temp_path: Path) -> Tuple[str, int]:
+    """
+    Worker: parse one bulk file into its own temporary store.
+
+    Args:
+        path: ExPORTER or NSF file to parse
+        kind: 'nih' or 'nsf'
+        temp_path: Temporary store to create
+
+    Returns:
+        (file name, grants written)
+    """
+    records = iter_exporter_file(path) if kind == 'nih' else iter_nsf_file(path)
+    store = open_store(temp_path)
+    try:
+        written = store.add_records(records)
+    finally:
+        store.close()
+    return path.name, written
+
+
+class GrantStore:
+    """
+    Local, indexed store of NIH and NSF grants.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Open the grant store.
+
+        Args:
+            path: Store file (defaults to MIRROR_DIR/grants.sqlite)
+        """
+        self.store = open_store(path)
+
+    def is_available(self) -> bool:
+        """Check whether any grants have been ingested."""
+        return self.store.count() > 0
+
+    def ingested_files(self, kind: str) -> List[str]:
+        """
+        Return names of bulk files already ingested.
+
+        Args:
+            kind: 'nih' or 'nsf'
+        """
+        return json.loads(self.store.get_meta(f'ingested_{kind}', '[]'))
+
+    def ingest_nih(self, directory: Union[str, Path], workers: int = DEFAULT_WORKERS,
+                   force: bool = False) -> Dict:
+        """
+        Ingest NIH ExPORTER project files found in a directory.
+
+        Args:
+            directory: Directory with RePORTER_PRJ_C_FY*.csv (or .zip) files
+            workers: Number of parallel parser processes
+            force: Re-ingest files that were ingested before
+
+        Returns:
+            Summary dict with files and grants counts
+        """
+        return self._ingest(Path(directory), 'nih', NIH_PATTERNS, workers, force)
+
+    def ingest_nsf(self, directory: Union[str, Path], workers: int = DEFAULT_WORKERS,
+                   force: bool = False) -> Dict:
+        """
+        Ingest NSF yearly award archives found in a directory.
+
+        Args:
+            directory: Directory with yearly .zip archives (or award .xml/.json files)
+            workers: Number of parallel parser processes
+            force: Re-ingest files that were ingested before
+
+        Returns:
+            Summary dict with files and grants counts
+        """
+        return self._ingest(Path(directory), 'nsf', NSF_PATTERNS, workers, force)
+
+    def _ingest(self, directory: Path, kind: str, patterns: Tuple[str, ...],
+                workers: int, force: bool) -> Dict:
+        """Parse files in parallel worker processes and merge them in name order."""
+        files = sorted({p for pattern in patterns for p in directory.glob(pattern)},
+                       key=lambda p: p.name)
+        done = set() if force else set(self.ingested_files(kind))
+        files = [p for p in files if p.name not in done]
+
+        summary = {'files': 0, 'grants': 0}
+        if not files:
+            logger.info(f"No new {kind.upper()} files to ingest in {directory}")
+            return summary
+
+        start = time.time()
+        logger.info(f"Ingesting {len(files)} {kind.upper()} files with {workers} workers")
+
+        with tempfile.TemporaryDirectory(prefix="grant_ingest_") as temp_dir:
+            temp_dir = Path(temp_dir)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Keep a bounded window of files in flight; merge in file order
+                pending = []
+                next_index = 0
+                while next_index < len(files) or pending:
+                    while next_index < len(files) and len(pending) < workers * 2:
+                        path = files[next_index]
+                        temp_path = temp_dir / f"{next_index:06d}.sqlite"
+                        pending.append((temp_path, executor.submit(_ingest_file, path, kind, temp_path)))
+                        next_index += 1
+
+                    temp_path, future = pending.pop(0)
+                    name, written = future.result()
+                    self.store.merge_from(temp_path)
+                    for suffix in ('', '-wal', '-shm'):
+                        Path(f"{temp_path}{suffix}").unlink(missing_ok=True)
+                    done.add(name)
+                    self.store.set_meta(f'ingested_{kind}', json.dumps(sorted(done)))
+
+                    summary['files'] += 1
+                    summary['grants'] += written
+                    logger.info(f"Ingested {name}: {written} grants")
+
+        self.store.set_meta('last_ingest', datetime.now().isoformat())
+        logger.info(f"{kind.upper()} ingest finished in {time.time() - start:.1f}s: {summary}")
+        return summary
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Get one grant by its URL.
+
+        Args:
+            url: RePORTER project-details or NSF showAward URL
+
+        Returns:
+            Grant dictionary or None if not stored
+        """
+        return self.store.get(url)
+
+    def search(self, text: Optional[str] = None, limit: int = 10,
+               source: Optional[str] = None, pi: Optional[str] = None,
+               institution: Optional[str] = None, agency: Optional[str] = None,
+               min_year: Optional[int] = None, max_year: Optional[int] = None,
+               min_funding: Optional[int] = None,
+               active_on: Optional[str] = None) -> List[Dict]:
+        """
+        Search stored grants.
+
+        The full-text index holds neither funding nor end dates, and mixes
+        PIs with institutions, so those filters run on ranked candidates.
+        The candidate pool grows until `limit` grants pass or every
+        candidate has been checked.
+
+        Args:
+            text: Free-text query (title, abstract, PIs, institution, program)
+            limit: Maximum number of results
+            source: 'nih_reporter' or 'nsf' (both when None)
+            pi: Principal investigator name (all name words must match)
+            institution: Institution name (all words must match)
+            agency: NIH institute abbreviation (e.g. 'NINDS')
+            min_year: Earliest start year
+            max_year: Latest start year
+            min_funding: Minimum award amount (in dollars)
+            active_on: Only grants ending on or after this date (YYYY-MM-DD)
+
+        Returns:
+            List of grant dictionaries, best matches first
+        """
+        def words(value: Optional[str]) -> List[str]:
+            return [w for w in re.findall(r'[a-z0-9]+', (value or '').lower())
+                    if w not in QUERY_OPERATORS]
+
+        pi_words, institution_words = words(pi), words(institution)
+        terms = [f'"{w}"' for w in words(text)]
+        terms += [f'extra : "{w}"' for w in pi_words + institution_words]
+        if text and not words(text):
+            return []
+
+        facets = {}
+        if source:
+            facets['source'] = source
+        if agency:
+            facets['agency'] = agency
+
+        def passes(grant: Dict) -> bool:
+            # The FTS 'extra' column mixes PIs and institutions; check each field
+            if pi_words:
+                names = set(words(' '.join([grant.get('pi_name') or ''] + (grant.get('co_pis') or []))))
+                if not set(pi_words) <= names:
+                    return False
+            if institution_words and not set(institution_words) <= set(words(grant.get('institution'))):
+                return False
+            if min_funding and (grant.get('award_amount') or 0) < min_funding:
+                return False
+            if active_on and (grant.get('end_date') or '')[:10] < active_on:
+                return False
+            return True
+
+        post_filter = bool(pi_words or institution_words or min_funding or active_on)
+        pool = limit * CANDIDATE_FACTOR if post_filter else limit
+        while True:
+            candidates = self.store.search(
+                limit=pool, facets=facets, min_year=min_year, max_year=max_year,
+                fts_query=' '.join(terms) if terms else None
+            )
+            results = [grant for grant in candidates if passes(grant)][:limit]
+            if len(results) >= limit or len(candidates) < pool:
+                return results
+            pool *= CANDIDATE_FACTOR
+
+
+if __name__ == "__main__":
+    # Handle command line usage:
+    #   python grant_store.py ingest-nih /path/to/exporter [workers]
+    #   python grant_store.py ingest-nsf /path/to/nsf [workers]
+    #   python grant_store.py search deep brain stimulation
+    if len(sys.argv) > 2 and sys.argv[1] in ("ingest-nih", "ingest-nsf"):
+        workers = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_WORKERS
+        grants = GrantStore()
+        if sys.argv[1] == "ingest-nih":
+            print(grants.ingest_nih(sys.argv[2], workers=workers))
+        else:
+            print(grants.ingest_nsf(sys.argv[2], workers=workers))
+    elif len(sys.argv) > 2 and sys.argv[1] == "search":
+        query = ' '.join(sys.argv[2:])
+        grants = GrantStore()
+        start = time.time()
+        results = grants.search(query, limit=10)
+        elapsed_ms = (time.time() - start) * 1000
+
+        print(f"Query: {query}")
+        print(f"Found {len(results)} grants in {elapsed_ms:.1f} ms\n")
+        for i, grant in enumerate(results, 1):
+            print(f"{i}. {grant['title']}")
+            print(f"   PI: {grant['pi_name']}  Institution: {grant['institution']}")
+            print(f"   Funding: ${grant['award_amount']:,}  Source: {grant['source']}")
+            print(f"   {grant['url']}")
+            print()
+    else:
+        print("Usage:")
+        print("  python grant_store.py ingest-nih <directory> [workers]")
+        print("  python grant_store.py ingest-nsf <directory> [workers]")
+        print("  python grant_store.py search <query>")
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+inverted_index.py - In-memory inverted index for client-side paper filtering
+Replaces per-paper substring scans with token posting lists.
+
+Used where an API returns a collection that has to be filtered locally
+(e.g. the bioRxiv/medRxiv date-range listing):
+- Titles and abstracts are tokenized once into token -> {doc: weight} postings
+- Queries are evaluated as posting-list unions ("any") or intersections ("all")
+  and ranked by tf-idf, with title hits weighted above abstract hits
+- Category membership is kept as integer bitmaps, one per distinct category
+
+Matching is on whole tokens, so "ion" no longer matches "connection";
+simple plurals are folded so "seizures" still matches "seizure".
+"""
+
+import heapq
+import logging
+import math
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Words too common to carry meaning in a query
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'by', 'for', 'from', 'in', 'is',
+    'of', 'on', 'or', 'not', 'the', 'to', 'with'
+}
+
+# Default field weights (title hits count double)
+DEFAULT_FIELDS = {'title': 2.0, 'abstract': 1.0}
+
+
+def normalize_token(token: str) -> str:
+    """
+    Fold simple English plurals onto their singular form.
+
+    Args:
+        token: Lower-cased token
+
+    Returns:
+        Normalized token
+    """
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str, drop_stopwords: bool = True) -> List[str]:
+    """
+    Split text into normalized lower-case tokens.
+
+    Args:
+        text: Text to tokenize
+        drop_stopwords: Remove STOPWORDS
+
+    Returns:
+        List of tokens in order of appearance
+    """
+    tokens = TOKEN_PATTERN.findall((text or '').lower())
+    return [normalize_token(t) for t in tokens if not (drop_stopwords and t in STOPWORDS)]
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """
+    Yield the positions of the set bits of a bitmap, lowest first.
+
+    Args:
+        mask: Integer bitmap
+
+    Yields:
+        Document indices
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class InvertedIndex:
+    """
+    Token and category index over a fixed collection of documents.
+    """
+
+    def __init__(self, docs: List[Dict], fields: Optional[Dict[str, float]] = None,
+                 category_field: Optional[str] = 'category'):
+        """
+        Index a collection.
+
+        Args:
+            docs: Documents (dicts); results refer to them by list position
+            fields: Mapping of text field -> weight (defaults to title 2.0, abstract 1.0)
+            category_field: Field holding the document's category (None to skip)
+        """
+        self.docs: List[Dict] = []
+        self.fields = fields or DEFAULT_FIELDS
+        self.category_field = category_field
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.category_bits: Dict[str, int] = {}
+        self.add_many(docs)
+
+    def add_many(self, docs: Iterable[Dict]) -> range:
+        """
+        Add documents to the index.
+
+        Args:
+            docs: Documents (dicts), numbered after those already indexed
+
+        Returns:
+            Range of the indices given to the new documents
+        """
+        first = len(self.docs)
+        for doc_id, doc in enumerate(docs, first):
+            self.docs.append(doc)
+            for field, weight in self.fields.items():
+                for token in tokenize(doc.get(field) or ''):
+                    posting = self.postings.setdefault(token, {})
+                    posting[doc_id] = posting.get(doc_id, 0.0) + weight
+
+            if self.category_field:
+                category = (doc.get(self.category_field) or '').lower().strip()
+                if category:
+                    self.category_bits[category] = self.category_bits.get(category, 0) | (1 << doc_id)
+        return range(first, len(self.docs))
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def idf(self, token: str) -> float:
+        """Inverse document frequency of a token (0 if unseen)."""
+        df = len(self.postings.get(token, ()))
+        return math.log(1 + len(self.docs) / df) if df else 0.0
+
+    def category_mask(self, categories: Iterable[str], substring: bool = True) -> int:
+        """
+        Bitmap of documents whose category matches any of the given ones.
+
+        Args:
+            categories: Category names
+            substring: Also match categories that contain a name
+                       (e.g. "neuroscience" matches "systems neuroscience")
+
+        Returns:
+            Integer bitmap over document indices
+        """
+        wanted = [c.lower().strip() for c in categories if c]
+        mask = 0
+        for category, bits in self.category_bits.items():
+            if any(w == category or (substring and w in category) for w in wanted):
+                mask |= bits
+        return mask
+
+    def search(self, query: Union[str, List[str]], mode: str = 'any',
+               limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Find and rank documents matching a query.
+
+        Args:
+            query: Query text or pre-tokenized terms
+            mode: 'any' (union of posting lists) or 'all' (intersection)
+            limit: Maximum number of results (None for all)
+
+        Returns:
+            List of (document index, score) tuples, best first
+        """
+        terms = tokenize(query) if isinstance(query, str) else [normalize_token(t) for t in query]
+        terms = list(dict.fromkeys(terms))
+        if not terms:
+            return []
+
+        postings = [(self.idf(term), self.postings.get(term, {})) for term in terms]
+
+        scores: Dict[int, float] = {}
+        if mode == 'all':
+            # Intersect starting from the shortest posting list, then score
+            # only the surviving documents
+            ordered = sorted(postings, key=lambda item: len(item[1]))
+            candidates = set(ordered[0][1])
+            for _, posting in ordered[1:]:
+                candidates.intersection_update(posting)
+                if not candidates:
+                    return []
+            for doc_id in candidates:
+                scores[doc_id] = sum(idf * posting[doc_id] for idf, posting in postings)
+        else:
+            for idf, posting in postings:
+                for doc_id, weight in posting.items():
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * weight
+
+        def rank_key(item):
+            return (-item[1], item[0])
+
+        if limit is not None:
+            return heapq.nsmallest(limit, scores.items(), key=rank_key)
+        return sorted(scores.items(), key=rank_key)
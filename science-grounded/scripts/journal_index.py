@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+journal_index.py - Journal normalization index built from config/journals.json
+Maps canonical journal names, ISO abbreviations and aliases to their tier,
+tier multiplier and impact factor. config/journals.json is the single source
+of truth for journal tiers (paper_utils.JOURNAL_TIERS is built from it).
+
+Lookup order for a journal string from any searcher:
+1. Exact match of the normalized name ("J. Neurosci." -> "j neurosci")
+2. The name before a PubMed subtitle (" : ...") or a trailing place
+   qualifier (" (...)"), so "Brain : a journal of neurology" -> Brain and
+   "Neuron (Cambridge, Mass.)" -> Neuron, but "Neurology. Genetics" and
+   "Neurology(R) neuroimmunology & neuroinflammation" are not Neurology
+3. Leftmost-longest whole-word match of a multi-word name inside it, so
+   "The Journal of neuroscience : the official journal..." -> Journal of
+   Neuroscience and "Journal of Neuroscience Methods" -> itself. One-word
+   names are not matched inside longer names ("Cell Reports" is not Cell,
+   "Frontiers in Neurology" is not Neurology)
+Results are memoized, so repeated journals cost one dictionary lookup.
+
+Config sections with a "journals" list become tiers; the preprint_servers
+section lists sources rather than journals and is not indexed (see
+SOURCE_PRIORS in ranking.py).
+
+Usage:
+    index = get_journal_index()
+    index.tier("The Journal of neuroscience")     # 'tier2'
+    index.lookup("Proc Natl Acad Sci U S A")      # {'name': 'PNAS', ...}
+"""
+
+import json
+import logging
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+from keyword_automaton import KeywordAutomaton
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+JOURNALS_FILE = Path(__file__).parent.parent / "config" / "journals.json"
+
+DEFAULT_TIER = 'default'
+DEFAULT_MULTIPLIER = 1.0
+
+# Distinct journal strings memoized per index
+LOOKUP_CACHE_SIZE = 4096
+
+# A journal title followed by its subtitle ("Brain : a journal of neurology")
+# or a place qualifier ("Neuron (Cambridge, Mass.)")
+SUBTITLED_TITLE = re.compile(r'^(.+?)(?:\s+:\s+\S.*|\s+\([^()]*\))$')
+
+
+def normalize_journal(name: str) -> str:
+    """
+    Normalize a journal name for matching.
+
+    Lowercases, strips accents, spells out '&' and reduces punctuation
+    to single spaces ("Epilepsy & Behavior" -> "epilepsy and behavior").
+
+    Args:
+        name: Journal name or abbreviation
+
+    Returns:
+        Normalized name ('' for empty input)
+    """
+    if not name:
+        return ''
+    text = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    text = text.lower().replace('&', ' and ')
+    return ' '.join(re.findall(r'[a-z0-9]+', text))
+
+
+class JournalIndex:
+    """Journal name -> tier/impact factor index."""
+
+    def __init__(self, config: Dict):
+        """
+        Build the index.
+
+        Args:
+            config: Parsed config/journals.json
+        """
+        # JOURNAL_TIERS-compatible view: {tier: {'journals': [...], 'multiplier': ...}}
+        self.tiers: Dict[str, Dict] = {}
+        self.entries: List[Dict] = []
+        self._by_name: Dict[str, Dict] = {}
+
+        for tier, section in config.items():
+            if 'journals' not in section:
+                continue
+            multiplier = section.get('multiplier', DEFAULT_MULTIPLIER)
+            self.tiers[tier] = {
+                'journals': [journal['name'] for journal in section['journals']],
+                'multiplier': multiplier,
+                'impact_range': section.get('impact_range'),
+            }
+            for journal in section['journals']:
+                entry = {
+                    'name': journal['name'],
+                    'iso_abbreviation': journal.get('iso_abbreviation'),
+                    'tier': tier,
+                    'multiplier': multiplier,
+                    'impact_factor': journal.get('impact_factor'),
+                    'focus': journal.get('focus'),
+                }
+                self.entries.append(entry)
+                for variant in [journal['name'], journal.get('iso_abbreviation')] + journal.get('aliases', []):
+                    key = normalize_journal(variant)
+                    if key and self._by_name.setdefault(key, entry) is not entry:
+                        logger.debug(f"Journal name '{variant}' already maps to "
+                                     f"{self._by_name[key]['name']}")
+        self.tiers[DEFAULT_TIER] = {'multiplier': DEFAULT_MULTIPLIER}
+
+        # Only multi-word names are matched inside longer journal strings
+        self._automaton = KeywordAutomaton([key for key in self._by_name if ' ' in key],
+                                           word_boundaries=True)
+        self.lookup = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._lookup)
+
+    @classmethod
+    def from_file(cls, path: Path = JOURNALS_FILE) -> 'JournalIndex':
+        """
+        Build the index from a journals.json file.
+
+        Args:
+            path: Path to journals.json
+
+        Returns:
+            JournalIndex (empty, so every journal is 'default', if the file is unreadable)
+        """
+        try:
+            with open(path) as f:
+                config = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Could not load journal config {path}: {e}")
+            config = {}
+        return cls(config)
+
+    def _lookup(self, journal_name: Optional[str]) -> Optional[Dict]:
+        """
+        Find the configured journal behind a journal string.
+
+        Args:
+            journal_name: Journal name or abbreviation as returned by a searcher
+
+        Returns:
+            Entry dict (name, iso_abbreviation, tier, multiplier, impact_factor,
+            focus) or None for unlisted journals. Entries are shared; do not modify.
+        """
+        key = normalize_journal(journal_name)
+        if not key:
+            return None
+        entry = self._by_name.get(key)
+        if entry is None:
+            title = SUBTITLED_TITLE.match(journal_name.strip())
+            if title:
+                entry = self._by_name.get(normalize_journal(title.group(1)))
+        if entry is None:
+            match = self._automaton.longest_match(key)
+            if match:
+                entry = self._by_name[match[2]]
+        return entry
+
+    def tier(self, journal_name: Optional[str]) -> str:
+        """Tier name for a journal ('default' if unlisted)."""
+        entry = self.lookup(journal_name)
+        return entry['tier'] if entry else DEFAULT_TIER
+
+    def multiplier(self, journal_name: Optional[str]) -> float:
+        """Tier multiplier for a journal (1.0 if unlisted)."""
+        entry = self.lookup(journal_name)
+        return entry['multiplier'] if entry else DEFAULT_MULTIPLIER
+
+    def impact_factor(self, journal_name: Optional[str]) -> Optional[float]:
+        """Impact factor for a journal (None if unlisted)."""
+        entry = self.lookup(journal_name)
+        return entry['impact_factor'] if entry else None
+
+
+@lru_cache(maxsize=None)
+def get_journal_index() -> JournalIndex:
+    """Shared index built from config/journals.json on first use."""
+    return JournalIndex.from_file()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Look up journal tiers in config/journals.json")
+    parser.add_argument("journals", nargs='+', help="Journal names or abbreviations")
+    args = parser.parse_args()
+
+    index = get_journal_index()
+    for name in args.journals:
+        entry = index.lookup(name)
+        if entry:
+            print(f"{name!r}: {entry['name']} ({entry['tier']}, x{entry['multiplier']}, "
+                  f"IF {entry['impact_factor']})")
+        else:
+            print(f"{name!r}: not listed ({DEFAULT_TIER})")
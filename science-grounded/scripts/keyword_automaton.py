@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+keyword_automaton.py - Compiled multi-keyword matcher
+Finds every occurrence of every keyword in one pass over the text, the
+output of an Aho-Corasick automaton.
+
+The keywords are merged into a trie, and the trie is compiled into one
+regular expression, so the scan runs in the C regex engine rather than a
+Python loop per character. Each search returns the longest keyword at the
+next position where any keyword starts; the shorter keywords starting
+there are exactly the keywords that are prefixes of it, and those are
+precomputed. Resuming the search one character later gives all
+(overlapping) matches.
+
+- Optional word boundaries (keywords must not start or end inside a word)
+- Case-insensitive by default
+- counts() reproduces str.count() per keyword (non-overlapping occurrences)
+- longest_match() returns the leftmost-longest keyword (e.g. journal names)
+
+Usage:
+    automaton = KeywordAutomaton(['seizure', 'seizure forecasting', 'EEG'])
+    automaton.counts(text)          # {'seizure': 3, 'EEG': 1, ...}
+    automaton.longest_match(text)   # (start, end, 'seizure forecasting')
+"""
+
+import logging
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_WORD_CHAR = re.compile(r'\w')
+
+
+def _trie_pattern(patterns: Iterable[str]) -> str:
+    """Compile patterns into a trie-shaped regular expression (longest match first)."""
+    trie: Dict = {}
+    for pattern in patterns:
+        node = trie
+        for ch in pattern:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A keyword ends here: the continuation is optional (greedy, so longer wins)
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordAutomaton:
+    """Matches a fixed keyword set against many texts."""
+
+    def __init__(self, keywords: Iterable[str], word_boundaries: bool = False,
+                 ignore_case: bool = True):
+        """
+        Compile the keyword set.
+
+        Args:
+            keywords: Keywords to match (empty strings are ignored)
+            word_boundaries: Only match whole words (no match inside 'patients'
+                for 'patient')
+            ignore_case: Match case-insensitively (text and keywords lowercased)
+        """
+        self.keywords = [k for k in keywords if k]
+        self.word_boundaries = word_boundaries
+        self.ignore_case = ignore_case
+
+        # Keywords differing only in case share one pattern
+        self._keywords_by_pattern: Dict[str, List[str]] = {}
+        for keyword in self.keywords:
+            self._keywords_by_pattern.setdefault(self._prepare(keyword), []).append(keyword)
+        # Distinct (lowercased) patterns, in first-seen order
+        self.patterns = patterns = list(self._keywords_by_pattern)
+
+        # For each pattern, the patterns that are prefixes of it (itself first)
+        pattern_set = set(patterns)
+        self._prefixes: Dict[str, Tuple[str, ...]] = {
+            p: tuple(p[:n] for n in range(len(p), 0, -1) if p[:n] in pattern_set)
+            for p in patterns
+        }
+
+        self._search = re.compile(f'({_trie_pattern(patterns)})') if patterns else None
+
+    def _prepare(self, text: str) -> str:
+        return text.lower() if self.ignore_case else text
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """
+        Yield every keyword occurrence, overlapping ones included.
+
+        Args:
+            text: Text to scan
+
+        Yields:
+            (start, end, pattern) by start position, longest first; positions
+            index the lowercased text when ignore_case is set
+        """
+        if not self._search or not text:
+            return
+        text = self._prepare(text)
+        search = self._search.search
+        bounded = self.word_boundaries
+        match = search(text)
+        while match:
+            start = match.start()
+            if not (bounded and start and _WORD_CHAR.match(text, start - 1)):
+                for pattern in self._prefixes[match.group()]:
+                    end = start + len(pattern)
+                    if not bounded or end == len(text) or not _WORD_CHAR.match(text, end):
+                        yield start, end, pattern
+            match = search(text, start + 1)
+
+    def occurrences(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        Yield the occurrences counted by counts().
+
+        Occurrences of one keyword do not overlap (leftmost first, as
+        str.count() finds them); different keywords may overlap.
+
+        Args:
+            text: Text to scan
+
+        Yields:
+            (start, pattern) by start position
+        """
+        last_end: Dict[str, int] = {}
+        if not self.word_boundaries:
+            if not self._search or not text:
+                return
+            # Same walk as finditer() without boundary checks: the hot path for full texts
+            text = self._prepare(text)
+            search = self._search.search
+            prefixes = self._prefixes
+            match = search(text)
+            while match:
+                start = match.start()
+                for pattern in prefixes[match.group()]:
+                    if start >= last_end.get(pattern, 0):
+                        last_end[pattern] = start + len(pattern)
+                        yield start, pattern
+                match = search(text, start + 1)
+        else:
+            for start, end, pattern in self.finditer(text):
+                if start >= last_end.get(pattern, 0):
+                    last_end[pattern] = end
+                    yield start, pattern
+
+    def counts(self, text: str, limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Count occurrences of each keyword.
+
+        Occurrences of one keyword do not overlap, matching text.count(keyword).
+
+        Args:
+            text: Text to scan
+            limit: Optional cap per keyword
+
+        Returns:
+            Dictionary of keyword -> count for the keywords that occur
+        """
+        pattern_counts: Dict[str, int] = {}
+        for _, pattern in self.occurrences(text):
+            pattern_counts[pattern] = pattern_counts.get(pattern, 0) + 1
+
+        counts = {}
+        for pattern, count in pattern_counts.items():
+            if limit is not None:
+                count = min(count, limit)
+            for keyword in self._keywords_by_pattern[pattern]:
+                counts[keyword] = count
+        return counts
+
+    def longest_match(self, text: str) -> Optional[Tuple[int, int, str]]:
+        """
+        Find the leftmost keyword, preferring the longest one at that position.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            (start, end, pattern) or None
+        """
+        return next(self.finditer(text), None)
+
+    def keywords_for(self, pattern: str) -> List[str]:
+        """Original keywords behind a matched pattern."""
+        return self._keywords_by_pattern.get(pattern, [])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Count keyword occurrences in a text file")
+    parser.add_argument("file", help="Text file to scan")
+    parser.add_argument("keywords", nargs='+', help="Keywords to count")
+    parser.add_argument("--words", action='store_true', help="Match whole words only")
+    args = parser.parse_args()
+
+    with open(args.file) as f:
+        content = f.read()
+
+    automaton = KeywordAutomaton(args.keywords, word_boundaries=args.words)
+    for keyword, count in sorted(automaton.counts(content).items(), key=lambda kv: -kv[1]):
+        print(f"{count:6d}  {keyword}")
@@ -10,7 +10,12 @@ import json
 import logging
 import sys
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent))
+from bm25 import BM25Index
+from near_duplicates import DEFAULT_THRESHOLD, NearDuplicateIndex
+from paper_merger import normalize_doi
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -44,6 +49,9 @@ KB_BASE = _load_kb_path()
 PAPERS_DIR = KB_BASE / "raw" / "papers" if KB_BASE else None
 INDEX_FILE = KB_BASE / "indexes" / "master_index.json" if KB_BASE else None
 
+# BM25 field weights for local search: metadata hits count above body text hits
+LOCAL_KB_FIELDS = {'name': 3.0, 'title': 3.0, 'authors': 2.0, 'text': 1.0}
+
 
 class LocalKBSearch:
     """Search local knowledge base for papers."""
@@ -74,6 +82,9 @@ class LocalKBSearch:
 
         # Load index if exists
         self.index = self._load_index()
+        self._catalog = None
+        self._title_index = None
+        self._search_index = None
 
     def is_available(self) -> bool:
         """Check if local knowledge base is available."""
@@ -96,6 +107,10 @@ class LocalKBSearch:
         """
         Search local knowledge base for papers matching query.
 
+        Papers are ranked by BM25 over folder name, title, authors and clean
+        text (see LOCAL_KB_FIELDS), so long papers do not win on raw keyword
+        counts. The index is built on the first search and reused.
+
         Args:
             query: Search query (keywords)
             limit: Maximum results to return
@@ -107,13 +122,25 @@ class LocalKBSearch:
         if not self.available:
             return []
 
-        query_lower = query.lower()
-        keywords = query_lower.split()
+        papers, index = self._load_search_index()
 
         results = []
+        for doc_id, score in index.search(query, k=limit):
+            paper_info = dict(papers[doc_id], score=round(score, 3),
+                              matched_keywords=index.matched_terms(doc_id, query))
+            results.append(paper_info)
+
+        logger.info(f"Local KB search found {len(results)} papers for query: {query}")
+
+        return results
 
-        # Search through papers directory
-        for paper_dir in self.papers_dir.iterdir():
+    def _load_search_index(self) -> Tuple[List[Dict], BM25Index]:
+        """Load every KB paper (metadata and clean text) and build the BM25 index (cached)."""
+        if self._search_index is not None:
+            return self._search_index
+
+        papers, docs = [], []
+        for paper_dir in sorted(self.papers_dir.iterdir()):
             if not paper_dir.is_dir():
                 continue
 
@@ -139,69 +166,111 @@ class LocalKBSearch:
             if clean_text_file.exists():
                 try:
                     with open(clean_text_file, 'r') as f:
-                        text_content = f.read().lower()
+                        text_content = f.read()
                 except:
                     pass
 
-            # Score this paper based on keyword matches
-            score = 0
-            matched_keywords = []
-
-            for keyword in keywords:
-                if len(keyword) < 3:  # Skip very short keywords
-                    continue
-
-                # Check in folder name
-                if keyword in paper_dir.name.lower():
-                    score += 5
-                    matched_keywords.append(keyword)
-
-                # Check in text content
-                if keyword in text_content:
-                    score += text_content.count(keyword)
-                    if keyword not in matched_keywords:
-                        matched_keywords.append(keyword)
-
-                # Check in metadata if available
-                if metadata:
-                    title = metadata.get('title', '').lower()
-                    authors = ' '.join(metadata.get('authors', [])).lower()
-                    if keyword in title:
-                        score += 10
-                    if keyword in authors:
-                        score += 8
-
-            # If any keywords matched, add to results
-            if score > 0:
-                paper_info = {
-                    'paper_id': paper_dir.name,
-                    'local_path': str(paper_dir),
-                    'score': score,
-                    'matched_keywords': matched_keywords,
-                    'source': 'local_kb'
-                }
-
-                # Add metadata if available
-                if metadata:
-                    paper_info.update({
-                        'title': metadata.get('title', ''),
-                        'authors': metadata.get('authors', []),
-                        'year': metadata.get('year', ''),
-                        'journal': metadata.get('journal', ''),
-                        'doi': metadata.get('doi', '')
-                    })
-                else:
-                    # Extract from clean_text if no extraction.json
-                    paper_info['title'] = paper_dir.name.replace('_', ' ').title()
-
-                results.append(paper_info)
-
-        # Sort by score (highest first)
-        results.sort(key=lambda x: x['score'], reverse=True)
+            paper_info = {
+                'paper_id': paper_dir.name,
+                'local_path': str(paper_dir),
+                'source': 'local_kb'
+            }
+
+            # Add metadata if available
+            if metadata:
+                paper_info.update({
+                    'title': metadata.get('title', ''),
+                    'authors': metadata.get('authors', []),
+                    'year': metadata.get('year', ''),
+                    'journal': metadata.get('journal', ''),
+                    'doi': metadata.get('doi', '')
+                })
+            else:
+                # Extract from clean_text if no extraction.json
+                paper_info['title'] = paper_dir.name.replace('_', ' ').title()
+
+            papers.append(paper_info)
+            docs.append({
+                'name': paper_dir.name,
+                'title': paper_info['title'],
+                'authors': paper_info.get('authors', []),
+                'text': text_content
+            })
+
+        self._search_index = (papers, BM25Index(docs, fields=LOCAL_KB_FIELDS))
+        return self._search_index
+
+    def _load_catalog(self) -> List[Dict]:
+        """Load title/author/DOI metadata of every KB paper (cached)."""
+        if self._catalog is not None:
+            return self._catalog
+
+        self._catalog = []
+        if not self.available:
+            return self._catalog
 
-        logger.info(f"Local KB search found {len(results)} papers for query: {query}")
+        for paper_dir in sorted(self.papers_dir.iterdir()):
+            extraction_file = paper_dir / "extraction.json"
+            if not extraction_file.exists():
+                continue
+            try:
+                with open(extraction_file, 'r') as f:
+                    metadata = json.load(f).get('metadata', {})
+            except Exception:
+                continue
+
+            self._catalog.append({
+                'paper_id': paper_dir.name,
+                'local_path': str(paper_dir),
+                'title': metadata.get('title', ''),
+                'authors': metadata.get('authors', []),
+                'year': metadata.get('year', ''),
+                'journal': metadata.get('journal', ''),
+                'doi': metadata.get('doi', ''),
+                'source': 'local_kb'
+            })
+
+        return self._catalog
+
+    def find_local_copies(self, papers: List[Dict],
+                          threshold: float = DEFAULT_THRESHOLD) -> Dict[int, Dict]:
+        """
+        Find which papers (e.g. API results) are already in the local KB.
+
+        Matches on DOI first, then on near-duplicate title and first author
+        (MinHash/LSH, so the KB is not compared against every paper).
+
+        Args:
+            papers: Paper dictionaries from any source
+            threshold: Minimum title/author Jaccard similarity
+
+        Returns:
+            Mapping of index in papers to the matching KB paper (with a
+            'similarity' field; 1.0 for DOI matches)
+        """
+        catalog = self._load_catalog()
+        if not catalog:
+            return {}
+
+        if self._title_index is None or self._title_index.threshold != threshold:
+            self._title_index = NearDuplicateIndex(threshold=threshold)
+            self._title_index.add_many(catalog)
+        by_doi = {normalize_doi(p['doi']): n for n, p in enumerate(catalog) if normalize_doi(p['doi'])}
+
+        matches = {}
+        for i, paper in enumerate(papers):
+            dois = [normalize_doi(paper.get('doi')), normalize_doi(paper.get('published_doi'))]
+            doi = next((d for d in dois if d in by_doi), None)
+            if doi:
+                matches[i] = dict(catalog[by_doi[doi]], similarity=1.0)
+                continue
+            found = self._title_index.query(paper)
+            if found:
+                n, similarity = found[0]
+                matches[i] = dict(catalog[n], similarity=round(similarity, 3))
 
-        return results[:limit]
+        logger.info(f"{len(matches)} of {len(papers)} papers already in the local KB")
+        return matches
 
     def get_paper_content(self, paper_id: str) -> Optional[str]:
         """
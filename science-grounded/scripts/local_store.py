@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+local_store.py - Indexed local record store for offline mirrors
+Backs the offline modes of the search scripts with a single SQLite file.
+
+Each store holds standardized records (the same dictionaries the searchers
+return) together with:
+- A full-text index (SQLite FTS5) over title, abstract and extra text
+- Facet tables (journal, MeSH term, category, ...) for exact filtering
+- A small key/value table for sync state (datestamps, cursors, etc.)
+
+Stores are written from one process at a time. Parallel ingestion writes
+into per-worker temporary stores that are merged with merge_from().
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+from paper_utils import MIRROR_DIR
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Records are written in batches of this size (one transaction per batch)
+WRITE_BATCH_SIZE = 1000
+
+# Words that carry query syntax rather than content
+QUERY_OPERATORS = {'and', 'or', 'not'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT UNIQUE NOT NULL,
+    title TEXT,
+    abstract TEXT,
+    extra TEXT,
+    year INTEGER,
+    date TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_year ON records(year);
+CREATE INDEX IF NOT EXISTS records_date ON records(date);
+
+CREATE TABLE IF NOT EXISTS facets (
+    record_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS facets_lookup ON facets(kind, value);
+CREATE INDEX IF NOT EXISTS facets_record ON facets(record_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5(
+    title, abstract, extra,
+    content='records', content_rowid='rowid',
+    tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS records_ai AFTER INSERT ON records BEGIN
+    INSERT INTO records_fts(rowid, title, abstract, extra)
+    VALUES (new.rowid, new.title, new.abstract, new.extra);
+END;
+CREATE TRIGGER IF NOT EXISTS records_ad AFTER DELETE ON records BEGIN
+    INSERT INTO records_fts(records_fts, rowid, title, abstract, extra)
+    VALUES ('delete', old.rowid, old.title, old.abstract, old.extra);
+END;
+CREATE TRIGGER IF NOT EXISTS records_au AFTER UPDATE ON records BEGIN
+    INSERT INTO records_fts(records_fts, rowid, title, abstract, extra)
+    VALUES ('delete', old.rowid, old.title, old.abstract, old.extra);
+    INSERT INTO records_fts(rowid, title, abstract, extra)
+    VALUES (new.rowid, new.title, new.abstract, new.extra);
+END;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def build_fts_query(text: str, match_all: bool = True) -> Optional[str]:
+    """
+    Convert a free-text query into a safe FTS5 MATCH expression.
+
+    Every word is quoted, so user input can never inject FTS syntax.
+
+    Args:
+        text: Free-text query
+        match_all: Require all words (AND) instead of any word (OR)
+
+    Returns:
+        FTS5 expression or None if the query has no searchable words
+    """
+    words = [w for w in re.findall(r'[A-Za-z0-9]+', text or '')
+             if w.lower() not in QUERY_OPERATORS]
+    if not words:
+        return None
+    joiner = ' ' if match_all else ' OR '
+    return joiner.join(f'"{w}"' for w in words)
+
+
+class LocalStore:
+    """
+    SQLite-backed store of standardized records with full-text search.
+    """
+
+    def __init__(self, path: Union[str, Path], id_field: str,
+                 facet_fields: Optional[Dict[str, Union[str, List[str]]]] = None,
+                 extra_fields: Optional[List[str]] = None,
+                 date_field: Optional[str] = None):
+        """
+        Open (or create) a local store.
+
+        Args:
+            path: SQLite file path (relative paths are placed in MIRROR_DIR)
+            id_field: Record field holding the unique identifier
+            facet_fields: Mapping of facet name -> record field(s) (str or list values)
+            extra_fields: Record fields indexed as extra searchable text
+            date_field: Record field holding an ISO date (YYYY-MM-DD...)
+        """
+        path = Path(path)
+        if not path.is_absolute():
+            path = MIRROR_DIR / path
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self.id_field = id_field
+        self.facet_fields = facet_fields or {}
+        self.extra_fields = extra_fields or []
+        self.date_field = date_field
+
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.conn.close()
+
+    def _text_of(self, value) -> str:
+        """Flatten a record value (str, list or None) into searchable text."""
+        if not value:
+            return ''
+        if isinstance(value, (list, tuple)):
+            return ' '.join(str(v) for v in value if v)
+        return str(value)
+
+    def _facets_of(self, record: Dict) -> List[tuple]:
+        """Collect (kind, value) facet pairs for a record."""
+        pairs = []
+        for kind, fields in self.facet_fields.items():
+            if isinstance(fields, str):
+                fields = [fields]
+            seen = set()
+            for field in fields:
+                values = record.get(field)
+                if not values:
+                    continue
+                if not isinstance(values, (list, tuple)):
+                    values = [values]
+                for value in values:
+                    value = str(value).lower().strip() if value else ''
+                    if value and value not in seen:
+                        seen.add(value)
+                        pairs.append((kind, value))
+        return pairs
+
+    def add_records(self, records: Iterable[Dict]) -> int:
+        """
+        Insert or update records (streamed in batches).
+
+        Args:
+            records: Iterable of standardized record dictionaries
+
+        Returns:
+            Number of records written
+        """
+        written = 0
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= WRITE_BATCH_SIZE:
+                written += self._write_batch(batch)
+                batch = []
+        if batch:
+            written += self._write_batch(batch)
+        return written
+
+    def _write_batch(self, records: List[Dict]) -> int:
+        """Write one batch of records inside a single transaction."""
+        rows = []
+        facet_rows = []
+        ids = []
+        for record in records:
+            record_id = record.get(self.id_field)
+            if not record_id:
+                continue
+            record_id = str(record_id)
+            ids.append((record_id,))
+            extra = ' '.join(self._text_of(record.get(f)) for f in self.extra_fields)
+            date = record.get(self.date_field) if self.date_field else None
+            rows.append((
+                record_id,
+                record.get('title') or '',
+                record.get('abstract') or '',
+                extra,
+                record.get('year'),
+                date or None,
+                json.dumps(record, default=str)
+            ))
+            facet_rows.extend((record_id, kind, value) for kind, value in self._facets_of(record))
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO records (id, title, abstract, extra, year, date, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET title=excluded.title, "
+                "abstract=excluded.abstract, extra=excluded.extra, year=excluded.year, "
+                "date=excluded.date, data=excluded.data",
+                rows
+            )
+            self.conn.executemany("DELETE FROM facets WHERE record_id = ?", ids)
+            self.conn.executemany(
+                "INSERT INTO facets (record_id, kind, value) VALUES (?, ?, ?)", facet_rows
+            )
+        return len(rows)
+
+    def delete_records(self, record_ids: Iterable[str]) -> int:
+        """
+        Delete records by identifier.
+
+        Args:
+            record_ids: Identifiers to remove
+
+        Returns:
+            Number of records deleted
+        """
+        ids = [(str(i),) for i in record_ids]
+        if not ids:
+            return 0
+        with self.conn:
+            before = self.count()
+            self.conn.executemany("DELETE FROM records WHERE id = ?", ids)
+            self.conn.executemany("DELETE FROM facets WHERE record_id = ?", ids)
+        return before - self.count()
+
+    def delete_before(self, date: str) -> int:
+        """
+        Delete records whose date is earlier than the given ISO date.
+
+        Records without a date are deleted too, as they cannot be placed
+        inside any window.
+
+        Args:
+            date: Cut-off date (YYYY-MM-DD)
+
+        Returns:
+            Number of records deleted
+        """
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM records WHERE date < ? OR date IS NULL", (date,))
+            self.conn.execute(
+                "DELETE FROM facets WHERE record_id NOT IN (SELECT id FROM records)"
+            )
+        return cursor.rowcount
+
+    def merge_from(self, other_path: Union[str, Path]) -> int:
+        """
+        Merge all records from another store file into this one.
+
+        Args:
+            other_path: Path of the store to merge (e.g. a worker's temp store)
+
+        Returns:
+            Number of records merged
+        """
+        self.conn.execute("ATTACH DATABASE ? AS other", (str(other_path),))
+        try:
+            with self.conn:
+                cursor = self.conn.execute(
+                    "INSERT INTO records (id, title, abstract, extra, year, date, data) "
+                    "SELECT id, title, abstract, extra, year, date, data FROM other.records "
+                    "WHERE true ON CONFLICT(id) DO UPDATE SET title=excluded.title, "
+                    "abstract=excluded.abstract, extra=excluded.extra, year=excluded.year, "
+                    "date=excluded.date, data=excluded.data"
+                )
+                merged = cursor.rowcount
+                self.conn.execute(
+                    "DELETE FROM facets WHERE record_id IN (SELECT id FROM other.records)"
+                )
+                self.conn.execute(
+                    "INSERT INTO facets (record_id, kind, value) "
+                    "SELECT record_id, kind, value FROM other.facets"
+                )
+        finally:
+            self.conn.execute("DETACH DATABASE other")
+        return merged
+
+    def get(self, record_id: str) -> Optional[Dict]:
+        """
+        Get a single record by identifier.
+
+        Args:
+            record_id: Record identifier
+
+        Returns:
+            Record dictionary or None if not stored
+        """
+        row = self.conn.execute(
+            "SELECT data FROM records WHERE id = ?", (str(record_id),)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, record_ids: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Get several records by identifier.
+
+        Args:
+            record_ids: Record identifiers
+
+        Returns:
+            Dict mapping identifier -> record (missing ids are omitted)
+        """
+        ids = [str(i) for i in record_ids]
+        found = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for record_id, data in self.conn.execute(
+                f"SELECT id, data FROM records WHERE id IN ({placeholders})", chunk
+            ):
+                found[record_id] = json.loads(data)
+        return found
+
+    def search(self, text: Optional[str] = None, limit: int = 10,
+               facets: Optional[Dict[str, Union[str, List[str]]]] = None,
+               min_year: Optional[int] = None, max_year: Optional[int] = None,
+               since: Optional[str] = None, match_all: bool = True,
+               fts_query: Optional[str] = None) -> List[Dict]:
+        """
+        Search stored records.
+
+        Args:
+            text: Free-text query (matched against title, abstract and extra text)
+            limit: Maximum number of results
+            facets: Facet filters, e.g. {'journal': 'epilepsia', 'mesh': ['epilepsy']};
+                    a list matches any of its values, a list of lists
+                    needs every inner list to match (any of its values)
+            min_year: Earliest publication year
+            max_year: Latest publication year
+            since: Earliest record date (YYYY-MM-DD)
+            match_all: Require all query words (otherwise any word)
+            fts_query: Pre-built FTS5 expression (overrides text)
+
+        Returns:
+            List of records, best full-text matches first
+            (newest first when there is no text query)
+        """
+        match = fts_query or (build_fts_query(text, match_all) if text else None)
+        if text and not match and not fts_query:
+            return []
+
+        clauses = []
+        params = []
+
+        for kind, values in (facets or {}).items():
+            if not isinstance(values, (list, tuple)):
+                values = [values]
+            groups = values if values and all(isinstance(v, (list, tuple)) for v in values) else [values]
+            for group in groups:
+                group = [str(v).lower().strip() for v in group if v]
+                if not group:
+                    continue
+                placeholders = ','.join('?' * len(group))
+                clauses.append(
+                    f"r.id IN (SELECT record_id FROM facets WHERE kind = ? AND value IN ({placeholders}))"
+                )
+                params.extend([kind] + group)
+
+        if min_year is not None:
+            clauses.append("r.year >= ?")
+            params.append(min_year)
+        if max_year is not None:
+            clauses.append("r.year <= ?")
+            params.append(max_year)
+        if since:
+            clauses.append("r.date >= ?")
+            params.append(since)
+
+        if match:
+            sql = ("SELECT r.data FROM records_fts JOIN records r ON r.rowid = records_fts.rowid "
+                   "WHERE records_fts MATCH ?")
+            params.insert(0, match)
+            if clauses:
+                sql += " AND " + " AND ".join(clauses)
+            # Title matches weigh more than abstract, abstract more than extra text
+            sql += " ORDER BY bm25(records_fts, 10.0, 5.0, 1.0) LIMIT ?"
+        else:
+            sql = "SELECT r.data FROM records r"
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+            sql += " ORDER BY r.date DESC, r.year DESC LIMIT ?"
+        params.append(limit)
+
+        try:
+            rows = self.conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            logger.error(f"Local store query failed: {e}")
+            return []
+
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self) -> int:
+        """Return the number of stored records."""
+        return self.conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Read a sync-state value.
+
+        Args:
+            key: Metadata key
+            default: Value returned when the key is not set
+
+        Returns:
+            Stored value or default
+        """
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: str) -> None:
+        """
+        Write a sync-state value.
+
+        Args:
+            key: Metadata key
+            value: Value to store
+        """
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                (key, str(value))
+            )
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+near_duplicates.py - MinHash/LSH matching of near-duplicate papers
+Finds records of the same paper whose titles differ slightly (punctuation,
+changed subtitles, British vs American spelling) without comparing every
+pair of papers.
+
+Each paper becomes a set of shingles: character n-grams of its
+spelling-normalized title plus the first author's surname. MinHash
+signatures of those sets are split into LSH bands, so only papers sharing
+a band bucket are compared, and each candidate pair is then confirmed with
+the exact Jaccard similarity of the shingle sets.
+
+Usage:
+    index = NearDuplicateIndex(threshold=0.6)
+    index.add_many(kb_papers)
+    matches = index.query(paper)                 # [(key, similarity), ...]
+    pairs = find_near_duplicates(papers)         # [(i, j, similarity), ...]
+"""
+
+import logging
+import re
+import sys
+import zlib
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+from paper_merger import normalize_title
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 0.6    # Minimum Jaccard similarity of two papers' shingle sets
+DEFAULT_NUM_PERM = 128     # MinHash permutations (signature length)
+DEFAULT_SHINGLE_SIZE = 4   # Characters per title shingle
+DEFAULT_RECALL = 0.95      # LSH probability of catching a pair at the threshold
+BATCH_SIZE = 256           # Papers hashed per numpy batch
+
+
+# British spellings folded to American ones (applied to both sides, so
+# over-eager rewrites of unrelated words do no harm)
+SPELLING_RULES = [
+    (re.compile(r'isation'), 'ization'),
+    (re.compile(r'is(e|ed|es|ing)\b'), r'iz\1'),
+    (re.compile(r'yse\b'), 'yze'),
+    (re.compile(r'our\b'), 'or'),
+    (re.compile(r'll(ed|ing)\b'), r'l\1'),
+    (re.compile(r'tre\b'), 'ter'),
+    (re.compile(r'\b(h|an)ae'), r'\1e'),
+    (re.compile(r'\boe'), 'e'),
+]
+
+
+def spelling_normalized_title(title: Optional[str]) -> str:
+    """
+    Normalize a title and fold common British spellings to American ones.
+
+    Args:
+        title: Paper title
+
+    Returns:
+        Normalized title ('' if empty)
+    """
+    title = normalize_title(title)
+    for pattern, replacement in SPELLING_RULES:
+        title = pattern.sub(replacement, title)
+    return title
+
+
+def first_author_surname(paper: Dict) -> str:
+    """
+    Get the normalized surname of a paper's first author.
+
+    Handles 'Last, First' (bioRxiv), 'Last FM' (PubMed) and 'First M. Last'
+    (Semantic Scholar, arXiv) name formats.
+
+    Args:
+        paper: Paper dictionary with an 'authors' list
+
+    Returns:
+        Lowercase surname ('' if there are no authors)
+    """
+    authors = paper.get('authors') or []
+    if not authors or not authors[0]:
+        return ''
+    name = str(authors[0])
+    if ',' in name:
+        return normalize_title(name.split(',')[0]).replace(' ', '')
+
+    parts = name.split()
+    if len(parts) > 1 and len(parts[-1]) <= 3 and parts[-1].isupper():
+        surname = ' '.join(parts[:-1])
+    else:
+        surname = parts[-1]
+    return normalize_title(surname).replace(' ', '')
+
+
+def paper_shingles(paper: Dict, shingle_size: int = DEFAULT_SHINGLE_SIZE) -> Set[str]:
+    """
+    Get the shingle set of a paper: title character n-grams plus the first
+    author's surname.
+
+    Args:
+        paper: Paper dictionary
+        shingle_size: Characters per title shingle
+
+    Returns:
+        Set of shingles (empty if the paper has no title)
+    """
+    title = spelling_normalized_title(paper.get('title'))
+    if not title or title == 'unknown title':
+        return set()
+
+    title = f' {title} '
+    shingles = {title[i:i + shingle_size] for i in range(max(1, len(title) - shingle_size + 1))}
+    surname = first_author_surname(paper)
+    if surname:
+        shingles.add(f'author:{surname}')
+    return shingles
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """Exact Jaccard similarity of two shingle sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def lsh_params(threshold: float, num_perm: int = DEFAULT_NUM_PERM,
+               recall: float = DEFAULT_RECALL) -> Tuple[int, int]:
+    """
+    Choose LSH bands and rows for a similarity threshold.
+
+    Picks the most selective banding (most rows per band) that still makes
+    a pair at the threshold a candidate with probability >= recall.
+
+    Args:
+        threshold: Jaccard similarity threshold
+        num_perm: Signature length
+        recall: Required candidate probability at the threshold
+
+    Returns:
+        (bands, rows) with bands * rows <= num_perm
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= recall:
+            best = (bands, rows)
+    return best
+
+
+class NearDuplicateIndex:
+    """LSH index of paper shingle sets for sub-quadratic near-duplicate lookup."""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM,
+                 shingle_size: int = DEFAULT_SHINGLE_SIZE, recall: float = DEFAULT_RECALL,
+                 seed: int = 1):
+        """
+        Initialize an empty index.
+
+        Args:
+            threshold: Minimum Jaccard similarity for two papers to match
+            num_perm: MinHash permutations (more = more accurate, slower)
+            shingle_size: Characters per title shingle
+            recall: LSH probability of catching a pair at the threshold
+            seed: Seed for the MinHash permutations
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = lsh_params(threshold, num_perm, recall)
+
+        # Multiply-shift hash functions: odd 64-bit multipliers and offsets
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(0, 1 << 63, size=(num_perm, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.randint(0, 1 << 63, size=(num_perm, 1), dtype=np.uint64)
+        # Folds each band of a signature into one integer bucket key
+        self._band_mix = rng.randint(0, 1 << 63, size=self.rows, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+        self._keys: List[Hashable] = []
+        self._shingles: List[Set[str]] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def signatures(self, shingle_sets: List[Set[str]]) -> np.ndarray:
+        """
+        Compute MinHash signatures.
+
+        Args:
+            shingle_sets: One shingle set per paper (all non-empty)
+
+        Returns:
+            Array of shape (len(shingle_sets), num_perm)
+        """
+        signatures = np.empty((len(shingle_sets), self.num_perm), dtype=np.uint64)
+
+        for start in range(0, len(shingle_sets), BATCH_SIZE):
+            batch = shingle_sets[start:start + BATCH_SIZE]
+            hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for shingles in batch for s in shingles),
+                                 dtype=np.uint64)
+            offsets = np.cumsum([0] + [len(shingles) for shingles in batch[:-1]])
+
+            # (a * x + b) mod 2^64, top 32 bits, for every permutation and
+            # shingle at once (uint64 arithmetic wraps, so no modulo needed)
+            permuted = (self._a * hashes + self._b) >> np.uint64(32)
+            signatures[start:start + len(batch)] = np.minimum.reduceat(permuted, offsets, axis=1).T
+
+        return signatures
+
+    def _band_keys(self, signatures: np.ndarray) -> List[List[int]]:
+        bands = signatures[:, :self.bands * self.rows].reshape(len(signatures), self.bands, self.rows)
+        return (bands * self._band_mix).sum(axis=2).tolist()
+
+    def add_many(self, papers: Iterable[Dict], keys: Optional[Iterable[Hashable]] = None) -> int:
+        """
+        Add papers to the index.
+
+        Args:
+            papers: Paper dictionaries
+            keys: Key to return for each paper (defaults to its position in
+                the index)
+
+        Returns:
+            Number of papers indexed (papers without a title are skipped)
+        """
+        papers = list(papers)
+        keys = list(keys) if keys is not None else list(range(len(self), len(self) + len(papers)))
+
+        entries = [(key, shingles) for key, shingles in
+                   zip(keys, (paper_shingles(p, self.shingle_size) for p in papers)) if shingles]
+        if not entries:
+            return 0
+
+        band_keys = self._band_keys(self.signatures([shingles for _, shingles in entries]))
+        for (key, shingles), paper_bands in zip(entries, band_keys):
+            position = len(self._keys)
+            self._keys.append(key)
+            self._shingles.append(shingles)
+            for buckets, band_key in zip(self._buckets, paper_bands):
+                buckets.setdefault(band_key, []).append(position)
+
+        return len(entries)
+
+    def add(self, paper: Dict, key: Optional[Hashable] = None) -> bool:
+        """Add one paper; returns False if it has no title to index."""
+        return self.add_many([paper], None if key is None else [key]) == 1
+
+    def _candidates(self, shingles: Set[str]) -> Set[int]:
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(self.signatures([shingles]))[0]):
+            candidates.update(buckets.get(band_key, ()))
+        return candidates
+
+    def query(self, paper: Dict, threshold: Optional[float] = None) -> List[Tuple[Hashable, float]]:
+        """
+        Find indexed papers similar to a paper.
+
+        Args:
+            paper: Paper dictionary
+            threshold: Override the index threshold (only values above the
+                index threshold keep the LSH recall guarantee)
+
+        Returns:
+            (key, similarity) pairs, most similar first
+        """
+        threshold = self.threshold if threshold is None else threshold
+        shingles = paper_shingles(paper, self.shingle_size)
+        if not shingles or not self._keys:
+            return []
+
+        matches = []
+        for position in self._candidates(shingles):
+            similarity = jaccard(shingles, self._shingles[position])
+            if similarity >= threshold:
+                matches.append((self._keys[position], similarity))
+
+        matches.sort(key=lambda m: m[1], reverse=True)
+        return matches
+
+    def pairs(self) -> List[Tuple[Hashable, Hashable, float]]:
+        """
+        Find every near-duplicate pair among the indexed papers.
+
+        Returns:
+            (key_a, key_b, similarity) triples, with key_a added before key_b,
+            most similar first
+        """
+        seen = set()
+        found = []
+        for buckets in self._buckets:
+            for positions in buckets.values():
+                for n, j in enumerate(positions[1:], 1):
+                    for i in positions[:n]:
+                        if (i, j) in seen:
+                            continue
+                        seen.add((i, j))
+                        similarity = jaccard(self._shingles[i], self._shingles[j])
+                        if similarity >= self.threshold:
+                            found.append((self._keys[i], self._keys[j], similarity))
+
+        found.sort(key=lambda p: p[2], reverse=True)
+        return found
+
+
+def find_near_duplicates(papers: List[Dict], threshold: float = DEFAULT_THRESHOLD,
+                         **index_options) -> List[Tuple[int, int, float]]:
+    """
+    Find near-duplicate pairs in a list of papers.
+
+    Args:
+        papers: Paper dictionaries from any mix of sources
+        threshold: Minimum Jaccard similarity of the shingle sets
+        **index_options: num_perm, shingle_size, recall or seed for
+            NearDuplicateIndex
+
+    Returns:
+        (i, j, similarity) triples of indices into papers, i < j
+    """
+    index = NearDuplicateIndex(threshold=threshold, **index_options)
+    index.add_many(papers)
+    found = index.pairs()
+    logger.info(f"Found {len(found)} near-duplicate pairs among {len(papers)} papers")
+    return found
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Find near-duplicate papers in JSON result files")
+    parser.add_argument("files", nargs='+', help="JSON files holding lists of paper records")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    records = []
+    for name in args.files:
+        with open(name) as f:
+            records.extend(json.load(f))
+
+    for i, j, similarity in find_near_duplicates(records, threshold=args.threshold):
+        print(f"{similarity:.2f}  {records[i].get('title', '')[:60]}")
+        print(f"      {records[j].get('title', '')[:60]}\n")
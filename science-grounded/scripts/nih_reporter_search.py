@@ -9,11 +9,14 @@ API Documentation: https://api.reporter.nih.gov/
 
 import json
 import logging
+import re
 import sys
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 import requests
 
 # Add parent directory to path for imports
@@ -23,9 +26,16 @@ from paper_utils import (
     rate_limit_request,
     get_cached_results,
     cache_results,
+    get_cached_value,
+    cache_value,
     log_api_request,
     timeout_handler,
-    REQUEST_TIMEOUT
+    REQUEST_TIMEOUT,
+    GRANT_FUNDING_SCALE,
+    VERY_RECENT_YEARS,
+    VERY_RECENT_BOOST,
+    RECENT_YEARS,
+    RECENT_BOOST
 )
 
 # Configure logging
@@ -41,6 +51,40 @@ DEFAULT_LIMIT = 10
 MAX_LIMIT = 500
 MAX_RESULTS = 10000  # API limitation
 
+# Deep pagination (iter_projects)
+PAGE_WORKERS = 3  # Pages in flight (matches the limiter burst)
+CURSOR_NAMESPACE = "nih_cursor"
+CURSOR_TTL = 30 * 24 * 3600  # Keep resume points for 30 days
+
+# Grant -> publication linkage (publications/search)
+PUBLICATION_CHUNK_SIZE = 50  # Core project numbers per request
+PUBLICATIONS_CACHE_NAMESPACE = "nih_publications"
+PUBLICATIONS_CACHE_TTL = 7 * 24 * 3600  # Publication links change slowly: 7 days
+
+# Core project number inside a full project number, e.g. 5R01NS100000-02 -> R01NS100000
+CORE_PROJECT_PATTERN = re.compile(r'^\d?([A-Z][A-Z0-9]{2}[A-Z]{2}\d{6})')
+
+# Fields requested for every project
+INCLUDE_FIELDS = [
+    'ProjectNum',
+    'CoreProjectNum',
+    'ProjectTitle',
+    'ContactPiName',
+    'OrgName',
+    'OrgCity',
+    'OrgState',
+    'OrgCountry',
+    'ProjectStartDate',
+    'ProjectEndDate',
+    'AbstractText',
+    'AwardAmount',
+    'FiscalYear',
+    'AgencyIcFundings',
+    'ProjectNumSplit',
+    'FullStudySection',
+    'PhrText'
+]
+
 # Major NIH institutes and centers
 MAJOR_INSTITUTES = {
     'NINDS': 'National Institute of Neurological Disorders and Stroke',
@@ -55,27 +99,62 @@ MAJOR_INSTITUTES = {
     'NIGMS': 'National Institute of General Medical Sciences'
 }
 
+# Impact score boosts for major research grants and neuroscience institutes
+MAJOR_ACTIVITY_CODES = ['R01', 'R37', 'P01', 'P50']
+MAJOR_ACTIVITY_BOOST = 1.3
+PRIMARY_INSTITUTE, PRIMARY_INSTITUTE_BOOST = 'NINDS', 1.4
+SECONDARY_INSTITUTES, SECONDARY_INSTITUTE_BOOST = ['NIMH', 'NCI', 'NHLBI'], 1.2
+
+
+def core_project_number(project_number: str) -> str:
+    """
+    Reduce a full NIH project number to its core project number.
+
+    Args:
+        project_number: e.g. "5R01NS100000-02" or "1U01NS123456-01A1"
+
+    Returns:
+        Core project number (e.g. "R01NS100000"), or the cleaned input
+        if it does not look like an NIH project number
+    """
+    cleaned = project_number.replace(' ', '').upper()
+    match = CORE_PROJECT_PATTERN.match(cleaned)
+    return match.group(1) if match else cleaned
+
 
 class NIHReporterSearch:
     """
     Search for NIH grants and funded projects using NIH RePORTER API v2.
     """
 
-    def __init__(self):
+    def __init__(self, grant_store_path: Optional[Path] = None):
         """
         Initialize NIH RePORTER search client.
         No authentication required for public API.
+
+        Args:
+            grant_store_path: Offline grant store (defaults to mirrors/grants.sqlite)
         """
         self.api_name = "nih_reporter"
+        self.grant_store_path = grant_store_path
+        self._grant_store = None
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Science-Grounded-Skill/1.0 (Educational/Research Tool)',
             'Content-Type': 'application/json'
         })
 
+    @property
+    def grant_store(self):
+        """Offline ExPORTER/NSF grant store (opened on first use)."""
+        if self._grant_store is None:
+            from grant_store import GrantStore
+            self._grant_store = GrantStore(self.grant_store_path)
+        return self._grant_store
+
     def search_projects(self, query: str, limit: int = DEFAULT_LIMIT,
                        use_cache: bool = True, recent_only: bool = False,
-                       include_active: bool = False) -> List[Dict]:
+                       include_active: bool = False, offline: bool = False) -> List[Dict]:
         """
         Search for NIH-funded projects/grants.
 
@@ -85,6 +164,8 @@ class NIHReporterSearch:
             use_cache: Whether to use cached results
             recent_only: Only return projects from last 5 years
             include_active: Only include currently active projects
+            offline: Serve the query from the local grant store
+                     (see grant_store.py) instead of RePORTER
 
         Returns:
             List of project/grant dictionaries with standardized format
@@ -95,6 +176,9 @@ class NIHReporterSearch:
             logger.error("Query failed sanitization")
             return []
 
+        if offline:
+            return self._search_offline(clean_query, limit, recent_only, include_active)
+
         # Determine fiscal years to search
         fiscal_years = None
         if recent_only:
@@ -121,6 +205,38 @@ class NIHReporterSearch:
         sorted_projects = self._sort_projects(projects)
         return sorted_projects[:limit]
 
+    def _search_offline(self, query: Optional[str], limit: int, recent_only: bool = False,
+                        include_active: bool = False, pi: Optional[str] = None,
+                        institution: Optional[str] = None,
+                        min_funding: Optional[int] = None) -> List[Dict]:
+        """
+        Search NIH projects in the local grant store.
+
+        Args:
+            query: Sanitized search query (None to filter by PI/institution only)
+            limit: Maximum number of results
+            recent_only: Only return projects started in the last 5 years
+            include_active: Only include projects that have not ended
+            pi: Principal investigator name
+            institution: Institution name
+            min_funding: Minimum funding amount (in dollars)
+
+        Returns:
+            List of project dictionaries
+        """
+        if not self.grant_store.is_available():
+            logger.warning("Grant store is empty; run grant_store.py ingest-nih first")
+            return []
+
+        min_year = datetime.now().year - 4 if recent_only else None
+        active_on = datetime.now().strftime('%Y-%m-%d') if include_active else None
+        projects = self.grant_store.search(query, limit=limit * 2, source='nih_reporter',
+                                           pi=pi, institution=institution, min_year=min_year,
+                                           min_funding=min_funding, active_on=active_on)
+        logger.info(f"Found {len(projects)} projects in local grant store")
+
+        return self._sort_projects(projects)[:limit]
+
     @timeout_handler
     def _search_projects(self, query: str, limit: int,
                         fiscal_years: Optional[List[int]] = None,
@@ -137,77 +253,394 @@ class NIHReporterSearch:
         Returns:
             List of project dictionaries
         """
-        # Rate limit the request
-        rate_limit_request(self.api_name)
+        payload = self._build_payload(query, 0, min(limit, MAX_LIMIT), fiscal_years,
+                                      include_active)
 
-        try:
-            # Build search criteria
-            criteria = {
-                'advanced_text_search': {
-                    'search_field': 'terms',
-                    'search_text': query
-                }
-            }
+        logger.info(f"Searching NIH RePORTER for: {query[:50]}...")
+        results, total = self._fetch_projects_page(payload)
+        if total is None:
+            return []
 
-            # Add fiscal year filter if specified
-            if fiscal_years:
-                criteria['fiscal_years'] = fiscal_years
+        logger.info(f"Found {total} total results, returning {len(results)} projects")
 
-            # Add active projects filter if specified
-            if include_active:
-                criteria['include_active_projects'] = True
+        # Parse projects into standardized format
+        projects = [self._parse_project(proj) for proj in results]
+        return [p for p in projects if p is not None]
 
-            # Build request payload
-            payload = {
-                'criteria': criteria,
-                'offset': 0,
-                'limit': min(limit, MAX_LIMIT),
-                'sort_field': 'project_start_date',
-                'sort_order': 'desc',
-                'include_fields': [
-                    'ProjectNum',
-                    'ProjectTitle',
-                    'ContactPiName',
-                    'OrgName',
-                    'OrgCity',
-                    'OrgState',
-                    'OrgCountry',
-                    'ProjectStartDate',
-                    'ProjectEndDate',
-                    'AbstractText',
-                    'AwardAmount',
-                    'FiscalYear',
-                    'AgencyIcFundings',
-                    'ProjectNumSplit',
-                    'FullStudySection',
-                    'PhrText'
-                ]
+    def _build_payload(self, query: str, offset: int, limit: int,
+                       fiscal_years: Optional[List[int]] = None,
+                       include_active: bool = False,
+                       agencies: Optional[List[str]] = None,
+                       sort_field: str = 'project_start_date',
+                       sort_order: str = 'desc') -> Dict:
+        """
+        Build a projects/search request payload.
+
+        Args:
+            query: Sanitized search query
+            offset: Offset of the first project
+            limit: Projects per page (max 500)
+            fiscal_years: List of fiscal years to search
+            include_active: Only include active projects
+            agencies: Restrict to administering institutes (e.g. ['NINDS'])
+            sort_field: Field to sort by
+            sort_order: 'asc' or 'desc'
+
+        Returns:
+            Request payload dictionary
+        """
+        # Build search criteria
+        criteria = {
+            'advanced_text_search': {
+                'search_field': 'terms',
+                'search_text': query
             }
+        }
 
-            logger.info(f"Searching NIH RePORTER for: {query[:50]}...")
+        # Add fiscal year filter if specified
+        if fiscal_years:
+            criteria['fiscal_years'] = fiscal_years
+
+        # Add active projects filter if specified
+        if include_active:
+            criteria['include_active_projects'] = True
+
+        if agencies:
+            criteria['agencies'] = agencies
+
+        return {
+            'criteria': criteria,
+            'offset': offset,
+            'limit': limit,
+            'sort_field': sort_field,
+            'sort_order': sort_order,
+            'include_fields': INCLUDE_FIELDS
+        }
+
+    def _fetch_projects_page(self, payload: Dict) -> Tuple[List[Dict], Optional[int]]:
+        """
+        Fetch one page of projects/search results.
+
+        Args:
+            payload: Request payload (see _build_payload)
+
+        Returns:
+            (raw projects, total matches) tuple; total is None if the request failed
+        """
+        query = payload['criteria']['advanced_text_search']['search_text']
+
+        try:
+            rate_limit_request(self.api_name)
             response = self.session.post(PROJECTS_URL, json=payload, timeout=REQUEST_TIMEOUT)
 
             if response.status_code == 200:
                 data = response.json()
-                results = data.get('results', [])
-                total = data.get('meta', {}).get('total', 0)
-
-                logger.info(f"Found {total} total results, returning {len(results)} projects")
-                log_api_request(self.api_name, query, 200)
-
-                # Parse projects into standardized format
-                projects = [self._parse_project(proj) for proj in results]
-                return [p for p in projects if p is not None]
+                log_api_request(self.api_name, f"{query} [offset {payload['offset']}]", 200)
+                return data.get('results', []), data.get('meta', {}).get('total', 0)
 
             else:
                 logger.error(f"NIH RePORTER error: {response.status_code}")
                 log_api_request(self.api_name, query, response.status_code)
-                return []
+                return [], None
 
         except Exception as e:
             logger.error(f"Error searching NIH RePORTER: {e}")
             log_api_request(self.api_name, query, error=str(e))
-            return []
+            return [], None
+
+    def iter_projects(self, query: str, fiscal_years: Optional[List[int]] = None,
+                      include_active: bool = False, agencies: Optional[List[str]] = None,
+                      max_results: int = MAX_RESULTS, dedupe: bool = True,
+                      resume: bool = True) -> Iterator[Dict]:
+        """
+        Stream every project matching a query, walking all result pages.
+
+        The first page reports the total; the remaining offsets are fetched
+        with up to PAGE_WORKERS requests in flight under the rate limiter
+        and yielded in order. Results are sorted by application ID so page
+        boundaries stay stable, and the offset reached (with the core projects
+        already yielded, when deduping) is saved in the cache after each
+        consumed page, so an interrupted walk resumes where it stopped without
+        repeating projects. A failed page ends the walk at that point.
+
+        Args:
+            query: Search query
+            fiscal_years: List of fiscal years to search
+            include_active: Only include active projects
+            agencies: Restrict to administering institutes (e.g. ['NINDS'])
+            max_results: Read at most this many records in this walk (the API
+                         allows offsets up to 10000); fewer are yielded when
+                         dedupe drops repeated core projects
+            dedupe: Yield only the first record of each core project
+                    (multi-year awards have one record per fiscal year)
+            resume: Continue from the saved offset (False starts from the beginning)
+
+        Yields:
+            Standardized project dictionaries
+        """
+        clean_query = sanitize_query(query)
+        if not clean_query:
+            logger.error("Query failed sanitization")
+            return
+
+        def payload_at(offset, limit=MAX_LIMIT):
+            return self._build_payload(clean_query, offset, limit, fiscal_years,
+                                       include_active, agencies, sort_field='appl_id',
+                                       sort_order='asc')
+
+        def save_cursor(offset):
+            # Core projects already yielded travel with the offset, so a
+            # resumed walk does not yield them again
+            state = {'offset': offset}
+            if dedupe and offset:
+                state['seen'] = sorted(seen)
+            cache_value(cursor_key, state, CURSOR_NAMESPACE, CURSOR_TTL)
+
+        cursor_key = json.dumps(payload_at(0)['criteria'], sort_keys=True)
+        cursor = get_cached_value(cursor_key, CURSOR_NAMESPACE) if resume else None
+        offset = cursor['offset'] if cursor else 0
+        seen = set(cursor.get('seen', [])) if cursor and dedupe else set()
+        if offset:
+            logger.info(f"Resuming NIH RePORTER walk at offset {offset}")
+
+        if max_results <= 0:
+            return
+        results, total = self._fetch_projects_page(payload_at(offset, min(MAX_LIMIT, max_results)))
+        if total is None:
+            return
+        stop = min(MAX_RESULTS, offset + max_results)
+        end = min(total, stop)
+        logger.info(f"NIH RePORTER walk: records {offset}-{end} of {total}")
+
+        # The last page only asks for the records still within max_results
+        pages = ((page, min(MAX_LIMIT, stop - page)) for page in range(offset + MAX_LIMIT, end, MAX_LIMIT))
+
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+            pending = deque()
+
+            def submit_next():
+                next_page = next(pages, None)
+                if next_page is not None:
+                    pending.append((next_page[0], executor.submit(
+                        self._fetch_projects_page, payload_at(*next_page))))
+
+            for _ in range(PAGE_WORKERS):
+                submit_next()
+
+            try:
+                while True:
+                    for raw in results[:end - offset]:
+                        project = self._parse_project(raw)
+                        if project is None:
+                            continue
+                        key = project.get('core_project_num') or project['project_number']
+                        if dedupe and key in seen:
+                            continue
+                        seen.add(key)
+                        yield project
+
+                    # Page consumed: advance and persist the cursor
+                    offset += min(len(results), end - offset)
+                    if not pending:
+                        if offset < total and offset < MAX_RESULTS:
+                            # Stopped at max_results: the next walk continues from here
+                            save_cursor(offset)
+                            logger.info(f"NIH RePORTER walk stopped at offset {offset} (max_results)")
+                        else:
+                            logger.info(f"NIH RePORTER walk complete at offset {offset}")
+                            save_cursor(0)
+                        return
+                    save_cursor(offset)
+
+                    page_offset, future = pending.popleft()
+                    results, page_total = future.result()
+                    if page_total is None:
+                        logger.error(f"NIH RePORTER page at offset {page_offset} failed, "
+                                     f"walk can be resumed")
+                        return
+                    submit_next()
+            finally:
+                # Iteration stopped early: drop pages that have not started yet
+                for _, future in pending:
+                    future.cancel()
+
+    def get_portfolio(self, query: str, agencies: Optional[List[str]] = None,
+                      fiscal_years: Optional[List[int]] = None,
+                      include_active: bool = False) -> List[Dict]:
+        """
+        Retrieve a whole topic portfolio, one record per core project.
+
+        All fiscal-year records of a core project are merged: the latest
+        record is kept, with 'fiscal_years' listing every year found and
+        'total_award_amount' summing their awards.
+
+        Args:
+            query: Search query (e.g. "epilepsy")
+            agencies: Restrict to administering institutes (e.g. ['NINDS'])
+            fiscal_years: List of fiscal years to search
+            include_active: Only include active projects
+
+        Returns:
+            List of merged project dictionaries, sorted by impact
+        """
+        portfolio = {}
+        for project in self.iter_projects(query, fiscal_years=fiscal_years,
+                                          include_active=include_active, agencies=agencies,
+                                          dedupe=False, resume=False):
+            key = project.get('core_project_num') or project['project_number']
+            merged = portfolio.get(key)
+            award = project.get('award_amount') or 0
+            years = [project['fiscal_year']] if project.get('fiscal_year') else []
+
+            if merged is None:
+                portfolio[key] = dict(project, fiscal_years=years, total_award_amount=award)
+                continue
+
+            years = sorted(set(merged['fiscal_years'] + years))
+            total = merged['total_award_amount'] + award
+            if (project.get('fiscal_year') or 0) > (merged.get('fiscal_year') or 0):
+                merged = dict(project)
+            merged['fiscal_years'] = years
+            merged['total_award_amount'] = total
+            portfolio[key] = merged
+
+        logger.info(f"Portfolio for {query[:50]}: {len(portfolio)} core projects")
+        return self._sort_projects(list(portfolio.values()))
+
+    def get_publication_pmids(self, project_numbers: List[str],
+                              use_cache: bool = True) -> Dict[str, List[str]]:
+        """
+        Find the PMIDs of publications citing each grant.
+
+        Project numbers are reduced to core project numbers and looked up
+        in chunks of PUBLICATION_CHUNK_SIZE with the publications search
+        endpoint, up to PAGE_WORKERS chunks at a time. The PMID list of
+        each core project is cached.
+
+        Args:
+            project_numbers: Full or core project numbers
+                             (e.g. "5R01NS100000-02" or "R01NS100000")
+            use_cache: Whether to use cached links
+
+        Returns:
+            Dict mapping core project number to its PMIDs (projects whose
+            lookup failed are omitted)
+        """
+        cores = list(dict.fromkeys(core_project_number(n) for n in project_numbers if n))
+
+        links = {}
+        missing = []
+        for core in cores:
+            cached = get_cached_value(core, PUBLICATIONS_CACHE_NAMESPACE) if use_cache else None
+            if cached is not None:
+                links[core] = cached
+            else:
+                missing.append(core)
+
+        if not missing:
+            return links
+
+        cached_count = len(links)
+        chunks = [missing[i:i + PUBLICATION_CHUNK_SIZE]
+                  for i in range(0, len(missing), PUBLICATION_CHUNK_SIZE)]
+
+        with ThreadPoolExecutor(max_workers=min(len(chunks), PAGE_WORKERS)) as executor:
+            for chunk, chunk_links in zip(chunks, executor.map(self._fetch_publication_links, chunks)):
+                if chunk_links is None:
+                    continue
+                for core in chunk:
+                    pmids = chunk_links.get(core, [])
+                    cache_value(core, pmids, PUBLICATIONS_CACHE_NAMESPACE, PUBLICATIONS_CACHE_TTL)
+                    links[core] = pmids
+
+        logger.info(f"Publication links: {cached_count} projects cached, "
+                    f"{len(links) - cached_count} fetched")
+        return links
+
+    def _fetch_publication_links(self, cores: List[str]) -> Optional[Dict[str, List[str]]]:
+        """
+        Fetch all publication links for one chunk of core project numbers.
+
+        Args:
+            cores: Core project numbers
+
+        Returns:
+            Dict mapping core project number to PMIDs, or None if a page failed
+        """
+        links: Dict[str, List[str]] = {}
+        offset = 0
+
+        while True:
+            payload = {
+                'criteria': {'core_project_nums': cores},
+                'offset': offset,
+                'limit': MAX_LIMIT
+            }
+
+            try:
+                rate_limit_request(self.api_name)
+                response = self.session.post(PUBLICATIONS_URL, json=payload,
+                                             timeout=REQUEST_TIMEOUT)
+                log_api_request(self.api_name, f"publications of {len(cores)} projects",
+                                response.status_code)
+
+                if response.status_code != 200:
+                    logger.error(f"NIH RePORTER publications error: {response.status_code}")
+                    return None
+
+                data = response.json()
+
+            except Exception as e:
+                logger.error(f"Error fetching NIH publications: {e}")
+                log_api_request(self.api_name, f"publications of {len(cores)} projects",
+                                error=str(e))
+                return None
+
+            results = data.get('results', [])
+            for link in results:
+                core, pmid = link.get('coreproject'), link.get('pmid')
+                if core and pmid:
+                    pmids = links.setdefault(core, [])
+                    if str(pmid) not in pmids:
+                        pmids.append(str(pmid))
+
+            offset += len(results)
+            if not results or offset >= data.get('meta', {}).get('total', 0):
+                return links
+
+    def link_publications(self, project_numbers: List[str], use_cache: bool = True,
+                          offline: bool = False) -> Dict[str, List[Dict]]:
+        """
+        Map grants to the papers that came out of them, in bulk.
+
+        PMIDs come from get_publication_pmids; all of them are resolved to
+        paper records in one bulk PubMed lookup. Each paper is annotated
+        with the core project numbers ('grant_numbers') it is linked to.
+
+        Args:
+            project_numbers: Full or core project numbers
+            use_cache: Whether to use cached links and records
+            offline: Resolve PMIDs from the local PubMed mirror
+
+        Returns:
+            Dict mapping core project number to its papers (newest first)
+        """
+        from pubmed_search import PubMedSearch
+
+        links = self.get_publication_pmids(project_numbers, use_cache=use_cache)
+        all_pmids = list(dict.fromkeys(p for pmids in links.values() for p in pmids))
+        papers = PubMedSearch().fetch_by_pmids(all_pmids, use_cache=use_cache, offline=offline)
+
+        for core, pmids in links.items():
+            for pmid in pmids:
+                if pmid in papers:
+                    papers[pmid].setdefault('grant_numbers', []).append(core)
+
+        return {
+            core: sorted((papers[p] for p in pmids if p in papers),
+                         key=lambda p: p.get('year') or 0, reverse=True)
+            for core, pmids in links.items()
+        }
 
     def _parse_project(self, project_data: Dict) -> Optional[Dict]:
         """
@@ -222,6 +655,7 @@ class NIHReporterSearch:
         try:
             # Extract basic info
             project_num = project_data.get('project_num', 'Unknown')
+            core_project_num = project_data.get('core_project_num', '')
             title = project_data.get('project_title', 'Untitled Project')
             pi_name = project_data.get('contact_pi_name', 'Unknown PI')
             org_name = project_data.get('org_name', 'Unknown Institution')
@@ -277,6 +711,7 @@ class NIHReporterSearch:
             # Build standardized project dictionary
             std_project = {
                 'project_number': project_num,
+                'core_project_num': core_project_num,
                 'title': title,
                 'pi_name': pi_name,
                 'institution': org_name,
@@ -374,50 +809,59 @@ class NIHReporterSearch:
             award_amount = project.get('award_amount', 0)
             if award_amount > 0:
                 # Normalize to reasonable scale (e.g., $1M = 1.0 point)
-                score += award_amount / 1_000_000
+                score += award_amount / GRANT_FUNDING_SCALE
 
             # Boost for recent projects
             year = project.get('year')
             current_year = datetime.now().year
             if year:
-                if year >= current_year - 2:
-                    score *= 1.5  # Very recent
-                elif year >= current_year - 5:
-                    score *= 1.2  # Recent
+                if year >= current_year - VERY_RECENT_YEARS:
+                    score *= VERY_RECENT_BOOST
+                elif year >= current_year - RECENT_YEARS:
+                    score *= RECENT_BOOST
 
             # Boost for major research grants
             activity_code = project.get('activity_code', '')
-            if activity_code in ['R01', 'R37', 'P01', 'P50']:
-                score *= 1.3
+            if activity_code in MAJOR_ACTIVITY_CODES:
+                score *= MAJOR_ACTIVITY_BOOST
 
             # Boost for major neuroscience institutes
             agencies = project.get('agencies', [])
-            if 'NINDS' in agencies:
-                score *= 1.4
-            elif any(inst in agencies for inst in ['NIMH', 'NCI', 'NHLBI']):
-                score *= 1.2
+            if PRIMARY_INSTITUTE in agencies:
+                score *= PRIMARY_INSTITUTE_BOOST
+            elif any(inst in agencies for inst in SECONDARY_INSTITUTES):
+                score *= SECONDARY_INSTITUTE_BOOST
 
             project['impact_score'] = score
 
         # Sort by impact score
         return sorted(projects, key=lambda p: p.get('impact_score', 0), reverse=True)
 
-    def search_by_pi(self, pi_name: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+    def search_by_pi(self, pi_name: str, limit: int = DEFAULT_LIMIT,
+                     offline: bool = False) -> List[Dict]:
         """
         Search for projects by principal investigator name.
 
         Args:
             pi_name: Name of principal investigator
             limit: Maximum number of results
+            offline: Search the local grant store (matches the PI field only)
 
         Returns:
             List of project dictionaries
         """
+        if offline:
+            clean_pi = sanitize_query(pi_name)
+            if not clean_pi:
+                logger.error("Query failed sanitization")
+                return []
+            return self._search_offline(None, limit, pi=clean_pi)
+
         # Use advanced search for PI name
         return self.search_projects(pi_name, limit=limit)
 
     def search_by_institution(self, institution: str, limit: int = DEFAULT_LIMIT,
-                             recent_only: bool = True) -> List[Dict]:
+                             recent_only: bool = True, offline: bool = False) -> List[Dict]:
         """
         Search for projects by institution/organization.
 
@@ -425,14 +869,22 @@ class NIHReporterSearch:
             institution: Institution or organization name
             limit: Maximum number of results
             recent_only: Only return recent projects
+            offline: Search the local grant store (matches the institution field only)
 
         Returns:
             List of project dictionaries
         """
+        if offline:
+            clean_institution = sanitize_query(institution)
+            if not clean_institution:
+                logger.error("Query failed sanitization")
+                return []
+            return self._search_offline(None, limit, recent_only, institution=clean_institution)
+
         return self.search_projects(institution, limit=limit, recent_only=recent_only)
 
     def search_by_topic(self, topic: str, limit: int = DEFAULT_LIMIT,
-                       min_funding: Optional[int] = None) -> List[Dict]:
+                       min_funding: Optional[int] = None, offline: bool = False) -> List[Dict]:
         """
         Search for projects by research topic with optional funding filter.
 
@@ -440,10 +892,19 @@ class NIHReporterSearch:
             topic: Research topic keywords
             limit: Maximum number of results
             min_funding: Minimum funding amount (in dollars)
+            offline: Search the local grant store
 
         Returns:
             List of project dictionaries filtered by minimum funding
         """
+        if offline:
+            clean_topic = sanitize_query(topic)
+            if not clean_topic:
+                logger.error("Query failed sanitization")
+                return []
+            return self._search_offline(clean_topic, limit, recent_only=True,
+                                        min_funding=min_funding)
+
         projects = self.search_projects(topic, limit=limit * 2, recent_only=True)
 
         # Filter by minimum funding if specified
@@ -11,9 +11,11 @@ import json
 import logging
 import sys
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 import requests
 
 # Add parent directory to path for imports
@@ -25,7 +27,12 @@ from paper_utils import (
     cache_results,
     log_api_request,
     timeout_handler,
-    REQUEST_TIMEOUT
+    REQUEST_TIMEOUT,
+    GRANT_FUNDING_SCALE,
+    VERY_RECENT_YEARS,
+    VERY_RECENT_BOOST,
+    RECENT_YEARS,
+    RECENT_BOOST
 )
 
 # Configure logging
@@ -39,6 +46,14 @@ AWARDS_URL = f"{BASE_URL}/awards.json"
 DEFAULT_LIMIT = 10
 MAX_LIMIT = 25  # NSF API limit per request
 MAX_RESULTS = 3000  # NSF API total result limit
+PAGE_WORKERS = 3  # Pages in flight (matches the limiter burst)
+
+# Fields requested for every award
+PRINT_FIELDS = ('id,agency,title,pdPIName,piEmail,piFirstName,piLastName,'
+                'coPDPI,awardeeName,awardeeCity,awardeeStateCode,'
+                'awardeeCountryCode,date,startDate,expDate,'
+                'estimatedTotalAmt,fundsObligatedAmt,abstractText,'
+                'fundProgramName,publicationResearch')
 
 # Major NSF directorates and divisions
 NSF_DIRECTORATES = {
@@ -65,6 +80,7 @@ KEY_PROGRAMS = [
     'Robust Intelligence',
     'Cyberinfrastructure'
 ]
+KEY_PROGRAM_BOOST = 1.3
 
 
 class NSFAwardsSearch:
@@ -72,20 +88,33 @@ class NSFAwardsSearch:
     Search for NSF awards and grants using NSF Awards API v1.
     """
 
-    def __init__(self):
+    def __init__(self, grant_store_path: Optional[Path] = None):
         """
         Initialize NSF Awards search client.
         No authentication required for public API.
+
+        Args:
+            grant_store_path: Offline grant store (defaults to mirrors/grants.sqlite)
         """
         self.api_name = "nsf_awards"
+        self.grant_store_path = grant_store_path
+        self._grant_store = None
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Science-Grounded-Skill/1.0 (Educational/Research Tool)'
         })
 
+    @property
+    def grant_store(self):
+        """Offline ExPORTER/NSF grant store (opened on first use)."""
+        if self._grant_store is None:
+            from grant_store import GrantStore
+            self._grant_store = GrantStore(self.grant_store_path)
+        return self._grant_store
+
     def search_awards(self, query: str, limit: int = DEFAULT_LIMIT,
                      use_cache: bool = True, recent_only: bool = False,
-                     min_funding: Optional[int] = None) -> List[Dict]:
+                     min_funding: Optional[int] = None, offline: bool = False) -> List[Dict]:
         """
         Search for NSF awards/grants.
 
@@ -95,6 +124,8 @@ class NSFAwardsSearch:
             use_cache: Whether to use cached results
             recent_only: Only return awards from last 5 years
             min_funding: Minimum funding amount (in dollars)
+            offline: Serve the query from the local grant store
+                     (see grant_store.py) instead of the NSF API
 
         Returns:
             List of award dictionaries with standardized format
@@ -105,6 +136,10 @@ class NSFAwardsSearch:
             logger.error("Query failed sanitization")
             return []
 
+        if offline:
+            return self._search_offline(clean_query, limit, recent_only,
+                                        min_funding=min_funding)
+
         # Determine date range if recent_only
         start_date = None
         if recent_only:
@@ -134,6 +169,35 @@ class NSFAwardsSearch:
         sorted_awards = self._sort_awards(awards)
         return sorted_awards[:limit]
 
+    def _search_offline(self, query: Optional[str], limit: int, recent_only: bool = False,
+                        pi: Optional[str] = None, institution: Optional[str] = None,
+                        min_funding: Optional[int] = None) -> List[Dict]:
+        """
+        Search NSF awards in the local grant store.
+
+        Args:
+            query: Sanitized search query (None to filter by PI/institution only)
+            limit: Maximum number of results
+            recent_only: Only return awards started in the last 5 years
+            pi: Principal investigator name
+            institution: Institution name
+            min_funding: Minimum funding amount (in dollars)
+
+        Returns:
+            List of award dictionaries
+        """
+        if not self.grant_store.is_available():
+            logger.warning("Grant store is empty; run grant_store.py ingest-nsf first")
+            return []
+
+        min_year = datetime.now().year - 4 if recent_only else None
+        awards = self.grant_store.search(query, limit=limit * 2, source='nsf', pi=pi,
+                                         institution=institution, min_year=min_year,
+                                         min_funding=min_funding)
+        logger.info(f"Found {len(awards)} awards in local grant store")
+
+        return self._sort_awards(awards)[:limit]
+
     @timeout_handler
     def _search_awards(self, query: str, limit: int,
                       start_date: Optional[str] = None) -> List[Dict]:
@@ -148,75 +212,143 @@ class NSFAwardsSearch:
         Returns:
             List of award dictionaries
         """
-        # NSF API uses pagination with max 25 results per request
-        awards = []
-        offset = 1  # NSF uses 1-based indexing
+        awards = list(self._iter_awards(query, limit, start_date))
 
-        while len(awards) < limit and offset <= MAX_RESULTS:
-            # Rate limit the request
-            rate_limit_request(self.api_name)
+        if awards:
+            log_api_request(self.api_name, query, 200)
+
+        return awards
+
+    def iter_awards(self, query: str, start_date: Optional[str] = None,
+                    max_results: int = MAX_RESULTS) -> Iterator[Dict]:
+        """
+        Stream every award matching a query, walking all result pages.
+
+        Args:
+            query: Search query
+            start_date: Start date filter (MM/DD/YYYY format)
+            max_results: Stop after this many awards (API allows 3000)
+
+        Yields:
+            Standardized award dictionaries
+        """
+        clean_query = sanitize_query(query)
+        if not clean_query:
+            logger.error("Query failed sanitization")
+            return
+
+        yield from self._iter_awards(clean_query, max_results, start_date)
+
+    def _iter_awards(self, query: str, max_results: int,
+                     start_date: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Pipelined page walk behind search_awards and iter_awards.
+
+        The API reports no total, so the next offsets are prefetched
+        speculatively: up to PAGE_WORKERS pages are in flight under the
+        rate limiter while the current page is parsed and yielded. Pages
+        are consumed in order; a short or failed page ends the walk and
+        cancels the pages queued behind it.
+
+        Args:
+            query: Sanitized search query
+            max_results: Maximum number of awards
+            start_date: Start date filter (MM/DD/YYYY format)
+
+        Yields:
+            Standardized award dictionaries
+        """
+        max_results = min(max_results, MAX_RESULTS)
+        # NSF uses 1-based offsets
+        offsets = iter(range(1, max_results + 1, MAX_LIMIT))
+        remaining = max_results
+
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+            pending = deque()
+
+            def submit_next():
+                offset = next(offsets, None)
+                if offset is not None:
+                    rpp = min(MAX_LIMIT, max_results - offset + 1)
+                    pending.append((offset, rpp, executor.submit(
+                        self._fetch_awards_page, query, offset, rpp, start_date)))
+
+            for _ in range(PAGE_WORKERS):
+                submit_next()
 
             try:
-                # Build query parameters
-                params = {
-                    'keyword': query,
-                    'rpp': min(MAX_LIMIT, limit - len(awards)),
-                    'offset': offset,
-                    'printFields': 'id,agency,title,pdPIName,piEmail,piFirstName,piLastName,'
-                                  'coPDPI,awardeeName,awardeeCity,awardeeStateCode,'
-                                  'awardeeCountryCode,date,startDate,expDate,'
-                                  'estimatedTotalAmt,fundsObligatedAmt,abstractText,'
-                                  'fundProgramName,publicationResearch'
-                }
-
-                # Add date filter if specified
-                if start_date:
-                    params['startDateStart'] = start_date
-
-                logger.info(f"Searching NSF Awards for: {query[:50]}... (offset={offset})")
-                response = self.session.get(AWARDS_URL, params=params, timeout=REQUEST_TIMEOUT)
-
-                if response.status_code == 200:
-                    data = response.json()
-                    response_data = data.get('response', {})
-                    award_list = response_data.get('award', [])
-
-                    # NSF API returns single award as dict, not list
-                    if isinstance(award_list, dict):
-                        award_list = [award_list]
-
-                    if not award_list:
-                        logger.info("No more awards found")
-                        break
-
-                    # Parse awards into standardized format
+                while pending:
+                    offset, rpp, future = pending.popleft()
+                    award_list = future.result()
+                    if award_list is None:
+                        return
+                    submit_next()
+
                     for award_data in award_list:
                         award = self._parse_award(award_data)
                         if award:
-                            awards.append(award)
+                            yield award
+                            remaining -= 1
+                            if remaining <= 0:
+                                return
+
+                    # Fewer results than requested: end of results
+                    if len(award_list) < rpp:
+                        logger.info(f"No more awards after offset {offset}")
+                        return
+            finally:
+                # Walk ended early: drop pages that have not started yet
+                for _, _, future in pending:
+                    future.cancel()
+
+    def _fetch_awards_page(self, query: str, offset: int, rpp: int,
+                           start_date: Optional[str] = None) -> Optional[List[Dict]]:
+        """
+        Fetch one page of raw awards.
+
+        Args:
+            query: Sanitized search query
+            offset: 1-based offset of the first award
+            rpp: Results per page (max 25)
+            start_date: Start date filter (MM/DD/YYYY format)
 
-                    logger.info(f"Retrieved {len(award_list)} awards (total: {len(awards)})")
+        Returns:
+            List of raw award dictionaries, or None if the request failed
+        """
+        params = {
+            'keyword': query,
+            'rpp': rpp,
+            'offset': offset,
+            'printFields': PRINT_FIELDS
+        }
 
-                    # Check if we got fewer results than requested (end of results)
-                    if len(award_list) < MAX_LIMIT:
-                        break
+        # Add date filter if specified
+        if start_date:
+            params['startDateStart'] = start_date
 
-                    offset += MAX_LIMIT
+        try:
+            rate_limit_request(self.api_name)
+            logger.info(f"Searching NSF Awards for: {query[:50]}... (offset={offset})")
+            response = self.session.get(AWARDS_URL, params=params, timeout=REQUEST_TIMEOUT)
 
-                else:
-                    logger.error(f"NSF Awards API error: {response.status_code}")
-                    log_api_request(self.api_name, query, response.status_code)
-                    break
+            if response.status_code != 200:
+                logger.error(f"NSF Awards API error: {response.status_code}")
+                log_api_request(self.api_name, query, response.status_code)
+                return None
 
-            except Exception as e:
-                logger.error(f"Error searching NSF Awards: {e}")
-                log_api_request(self.api_name, query, error=str(e))
-                break
+            award_list = response.json().get('response', {}).get('award', [])
 
-        if awards:
-            log_api_request(self.api_name, query, 200)
+            # NSF API returns single award as dict, not list
+            if isinstance(award_list, dict):
+                award_list = [award_list]
 
-        return awards
+            logger.info(f"Retrieved {len(award_list)} awards at offset {offset}")
+            return award_list
+
+        except Exception as e:
+            logger.error(f"Error searching NSF Awards: {e}")
+            log_api_request(self.api_name, query, error=str(e))
+            return None
 
     def _parse_award(self, award_data: Dict) -> Optional[Dict]:
         """
@@ -340,22 +472,22 @@ class NSFAwardsSearch:
             award_amount = award.get('award_amount', 0)
             if award_amount > 0:
                 # Normalize to reasonable scale (e.g., $1M = 1.0 point)
-                score += award_amount / 1_000_000
+                score += award_amount / GRANT_FUNDING_SCALE
 
             # Boost for recent awards
             year = award.get('year')
             current_year = datetime.now().year
             if year:
-                if year >= current_year - 2:
-                    score *= 1.5  # Very recent
-                elif year >= current_year - 5:
-                    score *= 1.2  # Recent
+                if year >= current_year - VERY_RECENT_YEARS:
+                    score *= VERY_RECENT_BOOST
+                elif year >= current_year - RECENT_YEARS:
+                    score *= RECENT_BOOST
 
             # Boost for key programs
             program = award.get('program', '')
             for key_program in KEY_PROGRAMS:
                 if key_program.lower() in program.lower():
-                    score *= 1.3
+                    score *= KEY_PROGRAM_BOOST
                     break
 
             award['impact_score'] = score
@@ -363,21 +495,30 @@ class NSFAwardsSearch:
         # Sort by impact score
         return sorted(awards, key=lambda a: a.get('impact_score', 0), reverse=True)
 
-    def search_by_pi(self, pi_name: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+    def search_by_pi(self, pi_name: str, limit: int = DEFAULT_LIMIT,
+                     offline: bool = False) -> List[Dict]:
         """
         Search for awards by principal investigator name.
 
         Args:
             pi_name: Name of principal investigator
             limit: Maximum number of results
+            offline: Search the local grant store (matches PI and co-PI fields only)
 
         Returns:
             List of award dictionaries
         """
+        if offline:
+            clean_pi = sanitize_query(pi_name)
+            if not clean_pi:
+                logger.error("Query failed sanitization")
+                return []
+            return self._search_offline(None, limit, pi=clean_pi)
+
         return self.search_awards(pi_name, limit=limit)
 
     def search_by_institution(self, institution: str, limit: int = DEFAULT_LIMIT,
-                             recent_only: bool = True) -> List[Dict]:
+                             recent_only: bool = True, offline: bool = False) -> List[Dict]:
         """
         Search for awards by institution/organization.
 
@@ -385,14 +526,22 @@ class NSFAwardsSearch:
             institution: Institution or organization name
             limit: Maximum number of results
             recent_only: Only return recent awards
+            offline: Search the local grant store (matches the institution field only)
 
         Returns:
             List of award dictionaries
         """
+        if offline:
+            clean_institution = sanitize_query(institution)
+            if not clean_institution:
+                logger.error("Query failed sanitization")
+                return []
+            return self._search_offline(None, limit, recent_only, institution=clean_institution)
+
         return self.search_awards(institution, limit=limit, recent_only=recent_only)
 
     def search_by_topic(self, topic: str, limit: int = DEFAULT_LIMIT,
-                       min_funding: Optional[int] = None) -> List[Dict]:
+                       min_funding: Optional[int] = None, offline: bool = False) -> List[Dict]:
         """
         Search for awards by research topic with optional funding filter.
 
@@ -400,12 +549,13 @@ class NSFAwardsSearch:
             topic: Research topic keywords
             limit: Maximum number of results
             min_funding: Minimum funding amount (in dollars)
+            offline: Search the local grant store
 
         Returns:
             List of award dictionaries filtered by minimum funding
         """
         return self.search_awards(topic, limit=limit, recent_only=True,
-                                 min_funding=min_funding)
+                                 min_funding=min_funding, offline=offline)
 
 
 def test_nsf_awards():
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+paper_merger.py - Cross-source deduplication and merging of paper records
+Collapses the same paper returned by PubMed, Semantic Scholar, arXiv and
+bioRxiv/medRxiv into one record carrying the best fields of each source.
+
+Records are grouped by identifier (DOI, PMID, PMCID, arXiv ID, the
+Semantic Scholar paper/corpus IDs including S2 externalIds, and the
+journal DOI that bioRxiv records for published preprints), with a
+normalized-title fallback for records that share no identifier (e.g. a
+preprint and its journal version). Every key goes through a hash index and
+groups are joined with union-find, so merging is near-linear in the number
+of records. Titles that differ slightly can also be joined with MinHash/LSH
+(fuzzy_threshold, see near_duplicates.py).
+
+Usage:
+    papers = pubmed.search(query) + s2.search(query) + arxiv.search(query)
+    ranked = rank_papers(merge_papers(papers), k=10)
+"""
+
+import logging
+import re
+import sys
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Which record provides the base metadata (title, journal, year, url) when a
+# paper was returned by several sources: peer-reviewed indexes first
+SOURCE_PRIORITY = ['pubmed', 'semantic_scholar', 'arxiv', 'biorxiv', 'medrxiv']
+
+# S2 externalIds entries and the key namespace each maps to
+EXTERNAL_ID_KEYS = {
+    'DOI': 'doi',
+    'PubMed': 'pmid',
+    'PubMedCentral': 'pmc',
+    'ArXiv': 'arxiv',
+    'CorpusId': 'corpus',
+}
+
+# Identifier fields copied onto the merged record from whichever source has them
+ID_FIELDS = ['doi', 'pmid', 'pmc_id', 'arxiv_id', 'paper_id', 'corpus_id']
+
+# List fields unioned across sources
+LIST_FIELDS = ['mesh_terms', 'publication_types', 'fields_of_study', 'categories']
+
+# Titles shorter than this many words ("Editorial", "Reply") are too generic
+# to merge on without an identifier
+MIN_TITLE_WORDS = 5
+
+# Preprint and journal versions of a paper are often a year apart
+MAX_TITLE_YEAR_GAP = 1
+
+PREPRINT_JOURNALS = {'arxiv', 'biorxiv', 'medrxiv', 'arxiv preprint', 'preprint'}
+
+DOI_PREFIX = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+ARXIV_PREFIX = re.compile(r'^(?:https?://arxiv\.org/(?:abs|pdf)/|arxiv:)', re.IGNORECASE)
+ARXIV_VERSION = re.compile(r'v\d+$')
+ARXIV_DOI = re.compile(r'^10\.48550/arxiv\.(.+)$')
+NON_ALNUM = re.compile(r'[^0-9a-z]+')
+TITLE_NUMBER = re.compile(r'\b(?:\d+|i{1,3}|iv|v|vi{1,3}|ix|x)\b')
+YEAR = re.compile(r'\b\d{4}\b')
+
+
+def normalize_doi(doi: Optional[str]) -> Optional[str]:
+    """
+    Normalize a DOI to its lowercase bare form.
+
+    Args:
+        doi: DOI, doi.org URL or 'doi:' string
+
+    Returns:
+        Normalized DOI, or None if empty
+    """
+    if not doi:
+        return None
+    doi = DOI_PREFIX.sub('', str(doi).strip()).lower().rstrip('.')
+    return doi or None
+
+
+def normalize_arxiv_id(arxiv_id: Optional[str]) -> Optional[str]:
+    """
+    Normalize an arXiv ID, dropping URL prefixes and the version suffix.
+
+    Args:
+        arxiv_id: arXiv ID such as '2301.00001v2' or 'arXiv:2301.00001'
+
+    Returns:
+        Normalized ID (e.g. '2301.00001'), or None if empty
+    """
+    if not arxiv_id:
+        return None
+    arxiv_id = ARXIV_PREFIX.sub('', str(arxiv_id).strip()).lower()
+    arxiv_id = ARXIV_VERSION.sub('', arxiv_id.replace('.pdf', ''))
+    return arxiv_id or None
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """
+    Normalize a title for fuzzy-free matching: accents folded, lowercase,
+    punctuation removed and whitespace collapsed.
+
+    Args:
+        title: Paper title
+
+    Returns:
+        Normalized title ('' if empty)
+    """
+    if not title:
+        return ''
+    title = unicodedata.normalize('NFKD', title)
+    title = ''.join(c for c in title if not unicodedata.combining(c))
+    return NON_ALNUM.sub(' ', title.lower()).strip()
+
+
+def _add_key(keys: List[str], namespace: str, value) -> None:
+    if value is None or value == '':
+        return
+    value = str(value).strip()
+    if namespace == 'doi':
+        value = normalize_doi(value)
+        # arXiv-minted DOIs identify the same paper as the arXiv ID
+        arxiv = ARXIV_DOI.match(value or '')
+        if arxiv:
+            _add_key(keys, 'arxiv', arxiv.group(1))
+    elif namespace == 'arxiv':
+        value = normalize_arxiv_id(value)
+    elif namespace == 'pmc':
+        value = value.upper()
+        value = value if value.startswith('PMC') else f'PMC{value}'
+    if value:
+        keys.append(f'{namespace}:{value}')
+
+
+def paper_keys(paper: Dict) -> List[str]:
+    """
+    Get the identifier keys of a paper record.
+
+    Args:
+        paper: Standardized paper dictionary from any source
+
+    Returns:
+        Keys such as 'doi:10.1038/...', 'pmid:123', 'arxiv:2301.00001'
+    """
+    keys = []
+    _add_key(keys, 'doi', paper.get('doi'))
+    # bioRxiv/medRxiv preprints link the DOI of their journal version
+    _add_key(keys, 'doi', paper.get('published_doi'))
+    _add_key(keys, 'pmid', paper.get('pmid'))
+    _add_key(keys, 'pmc', paper.get('pmc_id'))
+    _add_key(keys, 'arxiv', paper.get('arxiv_id'))
+    _add_key(keys, 'corpus', paper.get('corpus_id'))
+    _add_key(keys, 's2', paper.get('paper_id'))
+
+    for name, namespace in EXTERNAL_ID_KEYS.items():
+        _add_key(keys, namespace, (paper.get('external_ids') or {}).get(name))
+
+    return list(dict.fromkeys(keys))
+
+
+def _title_key(paper: Dict) -> Optional[str]:
+    title = normalize_title(paper.get('title'))
+    if len(title.split()) < MIN_TITLE_WORDS or title == 'unknown title':
+        return None
+    return title
+
+
+def _title_numbers(paper: Dict) -> List[str]:
+    return TITLE_NUMBER.findall(normalize_title(paper.get('title')))
+
+
+class _UnionFind:
+    """Disjoint sets over record indices (path halving, union by size)."""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> int:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return a
+
+
+def _year(paper: Dict) -> Optional[int]:
+    # Local KB metadata years are free-form ("2021", "2021-03", "in press")
+    match = YEAR.search(str(paper.get('year') or ''))
+    return int(match.group()) if match else None
+
+
+def group_papers(papers: List[Dict], use_titles: bool = True,
+                 fuzzy_threshold: Optional[float] = None) -> List[List[int]]:
+    """
+    Group the records that describe the same paper.
+
+    Args:
+        papers: Paper dictionaries from any mix of sources
+        use_titles: Also join records with the same normalized title
+        fuzzy_threshold: Also join near-duplicate titles (MinHash/LSH, see
+            near_duplicates.py) at this Jaccard similarity; None disables
+
+    Returns:
+        Groups of indices into papers, in order of first appearance
+    """
+    sets = _UnionFind(len(papers))
+    first_seen: Dict[str, int] = {}
+
+    for i, paper in enumerate(papers):
+        for key in paper_keys(paper):
+            j = first_seen.setdefault(key, i)
+            if j != i:
+                sets.union(i, j)
+
+    if not use_titles and fuzzy_threshold is None:
+        return _collect_groups(sets, len(papers))
+
+    # Title matches are checked against each group's years rather than
+    # trusted blindly, so identical generic titles from different years
+    # stay apart
+    years: Dict[int, set] = {}
+    for i, paper in enumerate(papers):
+        year = _year(paper)
+        if year:
+            years.setdefault(sets.find(i), set()).add(year)
+
+    def join(i: int, j: int) -> bool:
+        a, b = sets.find(i), sets.find(j)
+        if a == b:
+            return True
+        ya, yb = years.get(a, set()), years.get(b, set())
+        if ya and yb and min(abs(x - y) for x in ya for y in yb) > MAX_TITLE_YEAR_GAP:
+            return False
+        years[sets.union(a, b)] = ya | yb
+        return True
+
+    if use_titles:
+        by_title: Dict[str, List[int]] = {}
+        for i, paper in enumerate(papers):
+            title = _title_key(paper)
+            if title:
+                by_title.setdefault(title, []).append(i)
+
+        for indices in by_title.values():
+            for n, i in enumerate(indices[1:], 1):
+                for j in indices[:n]:
+                    if join(i, j):
+                        break
+
+    if fuzzy_threshold is not None:
+        from near_duplicates import find_near_duplicates
+
+        eligible = [i for i, paper in enumerate(papers) if _title_key(paper)]
+        for a, b, _ in find_near_duplicates([papers[i] for i in eligible], threshold=fuzzy_threshold):
+            i, j = eligible[a], eligible[b]
+            # "Part 1" and "Part 2" look alike but are different papers
+            if _title_numbers(papers[i]) == _title_numbers(papers[j]):
+                join(i, j)
+
+    return _collect_groups(sets, len(papers))
+
+
+def _collect_groups(sets: _UnionFind, size: int) -> List[List[int]]:
+    groups: Dict[int, List[int]] = {}
+    for i in range(size):
+        groups.setdefault(sets.find(i), []).append(i)
+    return list(groups.values())
+
+
+def _source_rank(paper: Dict) -> int:
+    source = paper.get('source')
+    return SOURCE_PRIORITY.index(source) if source in SOURCE_PRIORITY else len(SOURCE_PRIORITY)
+
+
+def _is_preprint_journal(journal: Optional[str]) -> bool:
+    return not journal or journal.strip().lower() in PREPRINT_JOURNALS
+
+
+def _unique(values: Iterable) -> List:
+    return list(dict.fromkeys(v for v in values if v))
+
+
+def merge_records(records: List[Dict]) -> Dict:
+    """
+    Merge records of the same paper into one.
+
+    Base metadata comes from the highest-priority source (see
+    SOURCE_PRIORITY); the other fields take the best value from any source:
+    the highest citation count, open access if any source says so, the
+    longest abstract, the first journal that is not a preprint server and
+    the first PDF URL. Identifiers from every source are kept.
+
+    Args:
+        records: Paper dictionaries describing one paper
+
+    Returns:
+        Merged paper dictionary with 'sources' listing every source and
+        'urls' mapping each source to its landing page
+    """
+    if len(records) == 1:
+        merged = dict(records[0])
+        merged['sources'] = _unique([merged.get('source')])
+        merged['urls'] = ({merged['source']: merged['url']}
+                          if merged.get('source') and merged.get('url') else {})
+        return merged
+
+    ordered = sorted(records, key=_source_rank)
+    merged = dict(ordered[0])
+
+    # Fill anything the base record lacks from the next-best sources
+    for record in ordered[1:]:
+        for field, value in record.items():
+            if merged.get(field) in (None, '', [], {}) and value not in (None, '', [], {}):
+                merged[field] = value
+
+    for field in ID_FIELDS:
+        merged[field] = next((r[field] for r in ordered if r.get(field)), merged.get(field))
+
+    merged['citation_count'] = max((r.get('citation_count') or 0) for r in records)
+    merged['is_open_access'] = any(r.get('is_open_access') for r in records)
+    merged['abstract'] = max((r.get('abstract') or '' for r in ordered), key=len)
+
+    if _is_preprint_journal(merged.get('journal')):
+        merged['journal'] = next((r['journal'] for r in ordered
+                                  if not _is_preprint_journal(r.get('journal'))),
+                                 merged.get('journal'))
+
+    if not merged.get('authors'):
+        merged['authors'] = max((r.get('authors') or [] for r in ordered), key=len)
+
+    for field in LIST_FIELDS:
+        values = _unique(v for r in ordered for v in r.get(field) or [])
+        if values:
+            merged[field] = values
+
+    external_ids = {}
+    for record in reversed(ordered):
+        external_ids.update(record.get('external_ids') or {})
+    if external_ids:
+        merged['external_ids'] = external_ids
+
+    merged['sources'] = _unique(r.get('source') for r in ordered)
+    merged['urls'] = {r['source']: r['url'] for r in reversed(ordered)
+                      if r.get('source') and r.get('url')}
+    return merged
+
+
+def merge_papers(papers: List[Dict], use_titles: bool = True,
+                 fuzzy_threshold: Optional[float] = None) -> List[Dict]:
+    """
+    Deduplicate papers across sources, merging the best fields of each.
+
+    Args:
+        papers: Paper dictionaries from any mix of PubMed, Semantic Scholar,
+            arXiv and bioRxiv/medRxiv searches
+        use_titles: Also merge records with the same normalized title and
+            years at most MAX_TITLE_YEAR_GAP apart
+        fuzzy_threshold: Also merge near-duplicate titles (same year rule,
+            and any numbers in the titles must agree) whose shingle sets
+            reach this Jaccard similarity; None disables
+
+    Returns:
+        One merged record per unique paper, in order of first appearance
+    """
+    groups = group_papers(papers, use_titles=use_titles, fuzzy_threshold=fuzzy_threshold)
+    merged = [merge_records([papers[i] for i in group]) for group in groups]
+
+    if len(merged) < len(papers):
+        logger.info(f"Merged {len(papers)} records into {len(merged)} unique papers")
+    return merged
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Merge paper records from several sources")
+    parser.add_argument("files", nargs='+', help="JSON files holding lists of paper records")
+    parser.add_argument("--no-titles", action='store_true', help="Merge on identifiers only")
+    args = parser.parse_args()
+
+    records = []
+    for name in args.files:
+        with open(name) as f:
+            records.extend(json.load(f))
+
+    unique = merge_papers(records, use_titles=not args.no_titles)
+    print(f"{len(records)} records -> {len(unique)} unique papers\n")
+    for paper in unique:
+        if len(paper['sources']) > 1:
+            print(f"- {paper['title'][:80]}")
+            print(f"  Sources: {', '.join(paper['sources'])}; citations: {paper['citation_count']}")
@@ -4,7 +4,9 @@ paper_utils.py - Core utilities for science-grounded literature search skill
 Provides safety features, caching, rate limiting, and paper ranking utilities.
 
 Safety Features:
-- Rate limiting: 2+ seconds between API calls
+- Rate limiting: per-API (interval, burst) budgets in API_RATE_LIMITS, from
+  0.5 s (bioRxiv, NSF) to 3 s (arXiv, Semantic Scholar) between calls, with
+  short bursts allowed; other APIs wait RATE_LIMIT_SECONDS (thread-safe)
 - Input sanitization: Max 200 chars, alphanumeric only
 - Request logging: All API calls logged
 - Timeout handling: 10 seconds max per request
@@ -16,6 +18,7 @@ import json
 import logging
 import os
 import re
+import threading
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -23,11 +26,15 @@ from typing import Dict, List, Optional, Any
 import diskcache
 from functools import wraps
 
+from journal_index import get_journal_index
+from records import is_packed, pack_records, unpack_records
+
 # Set up paths
 BASE_DIR = Path(__file__).parent.parent
 CACHE_DIR = BASE_DIR / "cache"
 LOG_DIR = BASE_DIR / "logs"
 CONFIG_DIR = BASE_DIR / "config"
+MIRROR_DIR = BASE_DIR / "mirrors"  # Local offline mirrors (created on first use)
 
 # Create directories if they don't exist
 CACHE_DIR.mkdir(exist_ok=True)
@@ -58,45 +65,46 @@ DEFAULT_CACHE_TTL = 24 * 3600  # 24 hours in seconds
 
 # Rate limiting tracking
 _last_api_call = {}
-RATE_LIMIT_SECONDS = 2.0  # Minimum seconds between API calls
+_next_api_slot = {}  # Earliest time the next call to each API may start
+_rate_limit_lock = threading.Lock()
+RATE_LIMIT_SECONDS = 2.0  # Seconds between calls to APIs without their own budget
 REQUEST_TIMEOUT = 10.0  # Maximum seconds per request
 
-# Journal tier configuration
-JOURNAL_TIERS = {
-    # Tier 1: Impact > 10
-    'tier1': {
-        'journals': [
-            'Nature', 'Science', 'Nature Neuroscience', 'Nature Communications',
-            'Nature Computational Science', 'Cell', 'Neuron', 'PNAS',
-            'Nature Methods', 'Nature Medicine', 'Nature Biotechnology'
-        ],
-        'multiplier': 3.0
-    },
-    # Tier 2: Impact 5-10
-    'tier2': {
-        'journals': [
-            'Brain', 'Epilepsia', 'NeuroImage', 'Journal of Neuroscience',
-            'PLOS Computational Biology', 'eLife', 'Current Biology',
-            'Annals of Neurology', 'Neurology', 'Brain Stimulation'
-        ],
-        'multiplier': 2.0
-    },
-    # Tier 3: Impact 3-5
-    'tier3': {
-        'journals': [
-            'Clinical Neurophysiology', 'IEEE Transactions on Biomedical Engineering',
-            'Journal of Neural Engineering', 'Epilepsy Research',
-            'Epilepsy & Behavior', 'Scientific Reports', 'PLOS ONE',
-            'Frontiers in Neuroscience', 'Journal of Neuroscience Methods'
-        ],
-        'multiplier': 1.5
-    },
-    # Default: All others
-    'default': {
-        'multiplier': 1.0
-    }
+# Per-API request budgets: (average seconds per request, burst size).
+# A burst of N lets N calls start back-to-back (e.g. concurrent fetches)
+# while the long-run rate stays at one call per interval.
+API_RATE_LIMITS = {
+    'pubmed': (RATE_LIMIT_SECONDS, 3),  # NCBI allows 3 requests/second
+    'arxiv': (3.0, 1),  # arXiv API terms: one request every 3 seconds
+    'biorxiv': (0.5, 4),  # Date-range dumps span hundreds of 100-record pages
+    'semantic_scholar': (3.0, 2),  # 100 requests per 5 minutes
+    'nih_reporter': (1.0, 3),  # RePORTER asks for no more than 1 request/second
+    'nsf_awards': (0.5, 3),  # 25-record pages; sweeps run to 3000 awards
 }
 
+# Query sanitization patterns (compiled once; sanitize_query runs on every search)
+# Letters, numbers, spaces, hyphens, commas, periods, question marks, quotes,
+# parentheses and square brackets (PubMed field tags like [Author], [Title])
+SAFE_QUERY_PATTERN = re.compile(r'^[a-zA-Z0-9\s\-,.\'\"():?!\[\]]+$')
+DANGEROUS_QUERY_PATTERN = re.compile('|'.join([
+    r';\s*(DROP|DELETE|INSERT|UPDATE|SELECT)',  # SQL injection
+    r'&&|\|\|',  # Command chaining
+    r'<script',  # XSS attempts
+    r'javascript:',  # JS injection
+    r'\$\(',  # Command substitution
+    r'`',  # Backticks
+]), re.IGNORECASE)
+
+# Journal tier configuration, built from config/journals.json:
+# {tier: {'journals': [...], 'multiplier': ...}} plus a 'default' tier
+JOURNAL_TIERS = get_journal_index().tiers
+
+# Grant impact scoring shared by NIHReporterSearch._sort_projects,
+# NSFAwardsSearch._sort_awards and grant_analytics.score_frame
+GRANT_FUNDING_SCALE = 1_000_000  # $1M = 1.0 point
+VERY_RECENT_YEARS, VERY_RECENT_BOOST = 2, 1.5
+RECENT_YEARS, RECENT_BOOST = 5, 1.2
+
 
 def sanitize_query(query: str) -> Optional[str]:
     """
@@ -124,27 +132,15 @@ def sanitize_query(query: str) -> Optional[str]:
         return None
 
     # Allow only safe characters: alphanumeric, spaces, and basic punctuation
-    # This pattern allows letters, numbers, spaces, hyphens, commas, periods, question marks
-    # ADDED: Square brackets [] for PubMed field tags like [Author], [Title], [Journal]
-    safe_pattern = r'^[a-zA-Z0-9\s\-,.\'\"():?!\[\]]+$'
-    if not re.match(safe_pattern, query):
+    # (see SAFE_QUERY_PATTERN)
+    if not SAFE_QUERY_PATTERN.match(query):
         logger.warning(f"Unsafe characters detected in query: {query}")
         return None
 
     # Additional check for SQL/command injection patterns
-    dangerous_patterns = [
-        r';\s*(DROP|DELETE|INSERT|UPDATE|SELECT)',  # SQL injection
-        r'&&|\|\|',  # Command chaining
-        r'<script',  # XSS attempts
-        r'javascript:',  # JS injection
-        r'\$\(',  # Command substitution
-        r'`',  # Backticks
-    ]
-
-    for pattern in dangerous_patterns:
-        if re.search(pattern, query, re.IGNORECASE):
-            logger.error(f"Potential injection attempt detected: {query}")
-            return None
+    if DANGEROUS_QUERY_PATTERN.search(query):
+        logger.error(f"Potential injection attempt detected: {query}")
+        return None
 
     logger.info(f"Query sanitized successfully: {query[:50]}...")
     return query
@@ -157,21 +153,25 @@ def rate_limit_request(api_name: str) -> None:
     Args:
         api_name: Name of the API being called
 
-    Ensures minimum 2 seconds between calls to the same API.
-    Implements exponential backoff on repeated calls.
+    Spaces calls to the same API by the (interval, burst) budget in
+    API_RATE_LIMITS (RATE_LIMIT_SECONDS, no burst, for other APIs). Safe to call from several
+    threads: each caller reserves the next free slot under a lock and
+    sleeps outside it, so concurrent requests are spaced, not serialized.
     """
-    global _last_api_call
+    interval, burst = API_RATE_LIMITS.get(api_name, (RATE_LIMIT_SECONDS, 1))
 
-    current_time = time.time()
+    with _rate_limit_lock:
+        current_time = time.time()
+        next_slot = max(_next_api_slot.get(api_name, current_time), current_time)
+        # Up to (burst - 1) calls may run ahead of the steady schedule
+        sleep_time = max(0.0, next_slot - interval * (burst - 1) - current_time)
+        _next_api_slot[api_name] = next_slot + interval
+        _last_api_call[api_name] = current_time + sleep_time
 
-    if api_name in _last_api_call:
-        elapsed = current_time - _last_api_call[api_name]
-        if elapsed < RATE_LIMIT_SECONDS:
-            sleep_time = RATE_LIMIT_SECONDS - elapsed
-            logger.info(f"Rate limiting {api_name}: sleeping for {sleep_time:.2f}s")
-            time.sleep(sleep_time)
+    if sleep_time > 0:
+        logger.info(f"Rate limiting {api_name}: sleeping for {sleep_time:.2f}s")
+        time.sleep(sleep_time)
 
-    _last_api_call[api_name] = time.time()
     logger.debug(f"API call to {api_name} at {datetime.now()}")
 
 
@@ -231,8 +231,9 @@ def cache_results(query: str, results: List[Dict], source: str, topic: str = Non
         except Exception as e:
             logger.debug(f"Could not auto-classify topic: {e}")
 
+    # Results are stored as compact Paper/Grant rows (see records.py)
     cache_entry = {
-        'results': results,
+        'results': pack_records(results),
         'timestamp': datetime.now().isoformat(),
         'source': source,
         'query_hash': cache_key,
@@ -264,7 +265,9 @@ def get_cached_results(query: str, source: str) -> Optional[List[Dict]]:
             age = datetime.now() - timestamp
             if age < timedelta(hours=24):
                 logger.info(f"Cache hit for {source} (age: {age})")
-                return cache_entry['results']
+                results = cache_entry['results']
+                # Entries written before records.py hold plain dictionaries
+                return unpack_records(results) if is_packed(results) else results
             else:
                 logger.info(f"Cache expired for {source} (age: {age})")
                 cache.delete(cache_key)
@@ -274,29 +277,51 @@ def get_cached_results(query: str, source: str) -> Optional[List[Dict]]:
     return None
 
 
-def get_journal_tier(journal_name: str) -> str:
+def cache_value(key: str, value: Any, namespace: str, ttl_seconds: int = DEFAULT_CACHE_TTL) -> None:
     """
-    Determine journal tier from name.
+    Cache a single value (e.g. one paper's citation count) under an identifier.
 
     Args:
-        journal_name: Name of the journal
+        key: Identifier (PMID, DOI, paper ID, ...)
+        value: Value to cache
+        namespace: Cache namespace (e.g. 'pubmed_citedin')
+        ttl_seconds: Time to live in seconds
+    """
+    cache.set(get_cache_key(key, namespace), value, expire=ttl_seconds)
+
+
+def get_cached_value(key: str, namespace: str) -> Optional[Any]:
+    """
+    Retrieve a single cached value stored with cache_value().
+
+    Args:
+        key: Identifier
+        namespace: Cache namespace
 
     Returns:
-        Tier string ('tier1', 'tier2', 'tier3', or 'default')
+        Cached value or None if not found/expired
+    """
+    try:
+        return cache.get(get_cache_key(key, namespace))
+    except Exception as e:
+        logger.error(f"Cache retrieval error: {e}")
+        return None
+
+
+def get_journal_tier(journal_name: str) -> str:
     """
-    if not journal_name:
-        return 'default'
+    Determine journal tier from name.
 
-    journal_lower = journal_name.lower()
+    Matches canonical names, ISO abbreviations and aliases from
+    config/journals.json (see journal_index.py); results are memoized.
 
-    for tier, config in JOURNAL_TIERS.items():
-        if tier == 'default':
-            continue
-        for journal in config['journals']:
-            if journal.lower() in journal_lower:
-                return tier
+    Args:
+        journal_name: Name of the journal
 
-    return 'default'
+    Returns:
+        Tier string ('tier1', 'tier2', 'tier3', 'specialized', or 'default')
+    """
+    return get_journal_index().tier(journal_name)
 
 
 def calculate_impact_score(paper: Dict) -> float:
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+pubmed_mirror.py - Offline PubMed mirror built from NLM baseline/update files
+Serves PubMed queries locally, without E-utilities latency or quotas.
+
+Ingests the annual baseline and daily update files distributed by NLM
+(https://ftp.ncbi.nlm.nih.gov/pubmed/baseline/ and .../updatefiles/),
+e.g. pubmed25n0001.xml.gz, from a local directory:
+- Each file is parsed as a stream (iterparse), so memory stays flat
+- Files are parsed in parallel worker processes into temporary stores
+- Temporary stores are merged in file order, so later update files
+  replace earlier versions and DeleteCitation entries are honoured
+
+Usage:
+    mirror = PubMedMirror()
+    mirror.ingest("/data/pubmed/baseline")
+    mirror.ingest("/data/pubmed/updatefiles")
+    papers = mirror.search("seizure prediction", mesh="Epilepsy", min_year=2020)
+"""
+
+import gzip
+import json
+import logging
+import re
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+from paper_utils import validate_paper_data
+from local_store import LocalStore, QUERY_OPERATORS
+from pubmed_search import parse_pubmed_article
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Default store file (inside MIRROR_DIR)
+STORE_NAME = "pubmed.sqlite"
+
+# File name patterns of NLM baseline/update files
+BASELINE_PATTERNS = ("*.xml.gz", "*.xml")
+
+# Parallel parsing
+DEFAULT_WORKERS = 4
+
+# Store layout for PubMed records
+FACET_FIELDS = {
+    'journal': ['journal', 'journal_abbreviation'],
+    'mesh': 'mesh_terms',
+    'pt': 'publication_types'
+}
+EXTRA_FIELDS = ['authors', 'journal', 'journal_abbreviation', 'mesh_terms']
+
+# PubMed field tags understood in offline queries
+FIELD_TAG_PATTERN = re.compile(r'("[^"]+"|[A-Za-z0-9\-\s]+?)\s*\[([A-Za-z ]+)\]')
+TAG_ALIASES = {
+    'mesh': 'mesh', 'mh': 'mesh', 'majr': 'mesh', 'mesh terms': 'mesh',
+    'journal': 'journal', 'ta': 'journal', 'jour': 'journal',
+    'pt': 'pt', 'publication type': 'pt',
+    'author': 'author', 'au': 'author', '1au': 'author',
+    'title': 'title', 'ti': 'title',
+    'pdat': 'pdat', 'dp': 'pdat'
+}
+
+
+def open_store(path: Optional[Union[str, Path]] = None) -> LocalStore:
+    """
+    Open the PubMed local store.
+
+    Args:
+        path: Store file (defaults to MIRROR_DIR/pubmed.sqlite)
+
+    Returns:
+        LocalStore configured for PubMed records
+    """
+    return LocalStore(path or STORE_NAME, id_field='pmid',
+                      facet_fields=FACET_FIELDS, extra_fields=EXTRA_FIELDS)
+
+
+def iter_baseline_file(xml_path: Path) -> Iterator[Tuple[str, Union[Dict, str]]]:
+    """
+    Stream articles and deletions from one baseline/update file.
+
+    Args:
+        xml_path: Path to a .xml or .xml.gz file
+
+    Yields:
+        ('article', paper_dict) or ('delete', pmid) tuples in file order
+    """
+    opener = gzip.open if xml_path.suffix == '.gz' else open
+    with opener(xml_path, 'rb') as f:
+        root = None
+        for event, elem in ET.iterparse(f, events=('start', 'end')):
+            if root is None:
+                root = elem
+                continue
+            if event != 'end':
+                continue
+
+            if elem.tag == 'PubmedArticle':
+                paper = parse_pubmed_article(elem)
+                if paper and paper.get('pmid') and validate_paper_data(paper):
+                    yield 'article', paper
+                root.clear()
+
+            elif elem.tag == 'DeleteCitation':
+                for pmid_elem in elem.findall('PMID'):
+                    if pmid_elem.text:
+                        yield 'delete', pmid_elem.text
+                root.clear()
+
+
+def _ingest_file(xml_path: Path, temp_path: Path) -> Tuple[str, int, int]:
+    """
+    Worker: parse one file into its own temporary store.
+
+    Deleted PMIDs are kept in the temporary store's metadata and applied
+    by the parent process when the store is merged.
+
+    Args:
+        xml_path: Baseline/update file to parse
+        temp_path: Temporary store to create
+
+    Returns:
+        (file name, articles written, deletions found)
+    """
+    store = open_store(temp_path)
+    deleted = []
+
+    def articles():
+        for kind, item in iter_baseline_file(xml_path):
+            if kind == 'article':
+                yield item
+            else:
+                deleted.append(item)
+
+    try:
+        written = store.add_records(articles())
+        store.set_meta('deleted', json.dumps(deleted))
+    finally:
+        store.close()
+
+    return xml_path.name, written, len(deleted)
+
+
+class PubMedMirror:
+    """
+    Local, indexed PubMed mirror.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Open the mirror.
+
+        Args:
+            path: Store file (defaults to MIRROR_DIR/pubmed.sqlite)
+        """
+        self.store = open_store(path)
+
+    def is_available(self) -> bool:
+        """Check whether any records have been ingested."""
+        return self.store.count() > 0
+
+    def ingested_files(self) -> List[str]:
+        """Return names of baseline/update files already ingested."""
+        return json.loads(self.store.get_meta('ingested_files', '[]'))
+
+    def ingest(self, directory: Union[str, Path], workers: int = DEFAULT_WORKERS,
+               force: bool = False) -> Dict:
+        """
+        Ingest all baseline/update files found in a directory.
+
+        Files are applied in name order (NLM names sort chronologically);
+        files that were already ingested are skipped unless force=True.
+
+        Args:
+            directory: Directory containing pubmedYYnNNNN.xml(.gz) files
+            workers: Number of parallel parser processes
+            force: Re-ingest files that were ingested before
+
+        Returns:
+            Summary dict with files, articles and deletions counts
+        """
+        directory = Path(directory)
+        files = sorted({p for pattern in BASELINE_PATTERNS for p in directory.glob(pattern)},
+                       key=lambda p: p.name)
+        done = set() if force else set(self.ingested_files())
+        files = [p for p in files if p.name not in done]
+
+        summary = {'files': 0, 'articles': 0, 'deleted': 0}
+        if not files:
+            logger.info(f"No new PubMed files to ingest in {directory}")
+            return summary
+
+        start = time.time()
+        logger.info(f"Ingesting {len(files)} PubMed files with {workers} workers")
+
+        with tempfile.TemporaryDirectory(prefix="pubmed_ingest_") as temp_dir:
+            temp_dir = Path(temp_dir)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Keep a bounded window of files in flight; merge in file order
+                pending = []
+                next_index = 0
+                while next_index < len(files) or pending:
+                    while next_index < len(files) and len(pending) < workers * 2:
+                        xml_path = files[next_index]
+                        temp_path = temp_dir / f"{next_index:06d}.sqlite"
+                        pending.append((temp_path, executor.submit(_ingest_file, xml_path, temp_path)))
+                        next_index += 1
+
+                    temp_path, future = pending.pop(0)
+                    name, written, n_deleted = future.result()
+                    self._merge_temp_store(temp_path)
+                    done.add(name)
+                    self.store.set_meta('ingested_files', json.dumps(sorted(done)))
+
+                    summary['files'] += 1
+                    summary['articles'] += written
+                    summary['deleted'] += n_deleted
+                    logger.info(f"Ingested {name}: {written} articles, {n_deleted} deletions")
+
+        self.store.set_meta('last_ingest', datetime.now().isoformat())
+        logger.info(f"PubMed ingest finished in {time.time() - start:.1f}s: {summary}")
+        return summary
+
+    def _merge_temp_store(self, temp_path: Path) -> None:
+        """Merge a worker's temporary store and apply its deletions."""
+        temp_store = open_store(temp_path)
+        deleted = json.loads(temp_store.get_meta('deleted', '[]'))
+        temp_store.close()
+
+        self.store.merge_from(temp_path)
+        if deleted:
+            self.store.delete_records(deleted)
+        for suffix in ('', '-wal', '-shm'):
+            Path(f"{temp_path}{suffix}").unlink(missing_ok=True)
+
+    def get(self, pmid: str) -> Optional[Dict]:
+        """
+        Get one paper by PMID.
+
+        Args:
+            pmid: PubMed ID
+
+        Returns:
+            Paper dictionary or None if not mirrored
+        """
+        return self.store.get(pmid)
+
+    def get_many(self, pmids: List[str]) -> Dict[str, Dict]:
+        """
+        Get several papers by PMID.
+
+        Args:
+            pmids: PubMed IDs
+
+        Returns:
+            Dict mapping PMID -> paper (missing PMIDs are omitted)
+        """
+        return self.store.get_many(pmids)
+
+    def search(self, query: str, limit: int = 10, journal: Optional[str] = None,
+               mesh: Optional[Union[str, List[str]]] = None,
+               min_year: Optional[int] = None, max_year: Optional[int] = None) -> List[Dict]:
+        """
+        Search the mirror.
+
+        Supports free text plus the common PubMed field tags
+        [MeSH], [Journal], [PT], [Author], [Title] and "last N years"[PDat].
+        Tagged terms must all match, as with PubMed's default AND; only
+        [MeSH], [Journal] and [PT] values joined by OR match any of them
+        (other OR and NOT operators are read as AND, so such queries are
+        stricter offline than on PubMed).
+
+        Args:
+            query: Search query (PubMed syntax subset)
+            limit: Maximum number of results
+            journal: Restrict to a journal (full title or ISO abbreviation)
+            mesh: Restrict to one or more MeSH descriptors (any of)
+            min_year: Earliest publication year
+            max_year: Latest publication year
+
+        Returns:
+            List of paper dictionaries, best matches first
+        """
+        fts_query, facets, query_min_year = self._parse_query(query)
+
+        if journal:
+            facets.setdefault('journal', []).append([journal])
+        if mesh:
+            facets.setdefault('mesh', []).append([mesh] if isinstance(mesh, str) else list(mesh))
+        if query_min_year and (min_year is None or query_min_year > min_year):
+            min_year = query_min_year
+
+        return self.store.search(limit=limit, facets=facets, min_year=min_year,
+                                 max_year=max_year, fts_query=fts_query)
+
+    def _parse_query(self, query: str) -> Tuple[Optional[str], Dict[str, List[List[str]]], Optional[int]]:
+        """
+        Split a PubMed-style query into an FTS expression, facet filters and a year bound.
+
+        Args:
+            query: Search query
+
+        Returns:
+            (fts_query or None, facets, min_year or None) tuple; each facet
+            holds groups of values that must all match (any value in a group)
+        """
+        facets: Dict[str, List[List[str]]] = {}
+        terms: List[str] = []
+        min_year = None
+
+        def word_terms(text: str, column: Optional[str] = None) -> List[str]:
+            words = [w for w in re.findall(r'[A-Za-z0-9]+', text)
+                     if w.lower() not in QUERY_OPERATORS]
+            prefix = f"{column} : " if column else ""
+            return [f'{prefix}"{w}"' for w in words]
+
+        def handle_tag(match: re.Match) -> str:
+            nonlocal min_year
+            # The term pattern can swallow free text before a boolean operator
+            # ("seizure AND epilepsy[MeSH]"); only the last operand is tagged
+            parts = re.split(r'\s+(AND|OR|NOT)\s+|^(AND|OR|NOT)\s+', match.group(1).strip())
+            operator = (parts[-2] or parts[-3]) if len(parts) > 1 else None
+            head = ' '.join(part for part in parts[:-1:3] if part)
+            value = parts[-1].strip().strip('"')
+            tag = TAG_ALIASES.get(match.group(2).strip().lower())
+
+            if tag in ('mesh', 'journal', 'pt'):
+                groups = facets.setdefault(tag, [])
+                # "A[MeSH] OR B[MeSH]" matches either; otherwise both are required
+                if operator == 'OR' and groups:
+                    groups[-1].append(value)
+                else:
+                    groups.append([value])
+            elif tag == 'author':
+                words = value.split()
+                if words:
+                    terms.extend(word_terms(words[0], 'extra'))
+                    # Initials only constrain the first letter of the forename
+                    if len(words) > 1 and words[1][:1].isalpha():
+                        terms.append(f'extra : {words[1][0].lower()}*')
+            elif tag == 'title':
+                terms.extend(word_terms(value, 'title'))
+            elif tag == 'pdat':
+                years = re.search(r'last (\d+) years?', value, re.IGNORECASE)
+                if years:
+                    min_year = datetime.now().year - int(years.group(1))
+            else:
+                terms.extend(word_terms(value))
+            return f' {head} '
+
+        remainder = FIELD_TAG_PATTERN.sub(handle_tag, query or '')
+        terms.extend(word_terms(remainder))
+
+        fts_query = ' '.join(terms) if terms else None
+        return fts_query, facets, min_year
+
+
+if __name__ == "__main__":
+    # Handle command line usage:
+    #   python pubmed_mirror.py ingest /path/to/baseline [workers]
+    #   python pubmed_mirror.py search epilepsy[MeSH] seizure prediction
+    if len(sys.argv) > 2 and sys.argv[1] == "ingest":
+        workers = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_WORKERS
+        mirror = PubMedMirror()
+        print(mirror.ingest(sys.argv[2], workers=workers))
+    elif len(sys.argv) > 2 and sys.argv[1] == "search":
+        query = ' '.join(sys.argv[2:])
+        mirror = PubMedMirror()
+        start = time.time()
+        papers = mirror.search(query, limit=10)
+        elapsed_ms = (time.time() - start) * 1000
+
+        print(f"Query: {query}")
+        print(f"Found {len(papers)} papers in {elapsed_ms:.1f} ms\n")
+        for i, paper in enumerate(papers, 1):
+            print(f"{i}. {paper['title']}")
+            print(f"   Year: {paper['year']}  Journal: {paper['journal']}")
+            print(f"   PubMed: {paper['url']}")
+            print()
+    else:
+        print("Usage:")
+        print("  python pubmed_mirror.py ingest <directory> [workers]")
+        print("  python pubmed_mirror.py search <query>")
@@ -9,9 +9,11 @@ API Documentation: https://www.ncbi.nlm.nih.gov/books/NBK25501/
 
 import json
 import logging
+import math
 import sys
 import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -25,6 +27,8 @@ from paper_utils import (
     rate_limit_request,
     get_cached_results,
     cache_results,
+    get_cached_value,
+    cache_value,
     sort_by_impact,
     log_api_request,
     timeout_handler,
@@ -40,12 +44,24 @@ BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 SEARCH_URL = f"{BASE_URL}/esearch.fcgi"
 FETCH_URL = f"{BASE_URL}/efetch.fcgi"
 SUMMARY_URL = f"{BASE_URL}/esummary.fcgi"
+ELINK_URL = f"{BASE_URL}/elink.fcgi"
 
 # API parameters
 DB_NAME = "pubmed"
 RETMAX = 100  # Maximum results per request
 DEFAULT_LIMIT = 10
 
+# Citation enrichment (ELink pubmed_pubmed_citedin)
+ELINK_BATCH_SIZE = 100  # PMIDs per ELink request (sent via POST)
+CITATION_WORKERS = 3  # Concurrent ELink batches (NCBI allows 3 requests/second)
+CITATION_CACHE_NAMESPACE = "pubmed_citedin"
+CITATION_CACHE_TTL = 7 * 24 * 3600  # Citation counts change slowly: 7 days
+
+# Bulk record lookup by PMID (EFetch via POST)
+EFETCH_BATCH_SIZE = 200  # PMIDs per EFetch request
+PAPER_CACHE_NAMESPACE = "pubmed_paper"
+PAPER_CACHE_TTL = 7 * 24 * 3600
+
 # Important journals for epilepsy and neuroscience
 PRIORITY_JOURNALS = [
     'Epilepsia',
@@ -63,27 +79,165 @@ PRIORITY_JOURNALS = [
 ]
 
 
+def parse_pubmed_article(article: ET.Element) -> Optional[Dict]:
+    """
+    Parse a single PubmedArticle element into the standardized paper format.
+
+    Shared by the E-utilities client and the offline baseline mirror
+    (pubmed_mirror.py), which parse the same XML schema.
+
+    Args:
+        article: XML element containing article data
+
+    Returns:
+        Standardized paper dictionary or None if parsing fails
+    """
+    try:
+        # Get basic article info
+        medline = article.find('.//MedlineCitation')
+        article_data = medline.find('.//Article')
+
+        # Extract title
+        title_elem = article_data.find('.//ArticleTitle')
+        title = title_elem.text if title_elem is not None else "Unknown Title"
+
+        # Extract authors
+        authors = []
+        author_list = article_data.find('.//AuthorList')
+        if author_list is not None:
+            for author in author_list.findall('.//Author'):
+                last_name = author.find('.//LastName')
+                first_name = author.find('.//ForeName')
+                if last_name is not None:
+                    name = last_name.text
+                    if first_name is not None:
+                        name = f"{last_name.text}, {first_name.text}"
+                    authors.append(name)
+
+        # Extract abstract
+        abstract = ""
+        abstract_elem = article_data.find('.//Abstract')
+        if abstract_elem is not None:
+            abstract_texts = abstract_elem.findall('.//AbstractText')
+            abstract_parts = []
+            for text_elem in abstract_texts:
+                if text_elem.text:
+                    abstract_parts.append(text_elem.text)
+            abstract = ' '.join(abstract_parts)
+
+        # Extract journal
+        journal_elem = article_data.find('.//Journal/Title')
+        journal = journal_elem.text if journal_elem is not None else None
+        iso_elem = article_data.find('.//Journal/ISOAbbreviation')
+        journal_abbreviation = iso_elem.text if iso_elem is not None else None
+
+        # Extract MeSH descriptors
+        mesh_terms = [
+            descriptor.text
+            for descriptor in medline.findall('.//MeshHeadingList/MeshHeading/DescriptorName')
+            if descriptor.text
+        ]
+
+        # Extract publication types (Review, Clinical Trial, ...)
+        publication_types = [
+            pub_type.text
+            for pub_type in article_data.findall('.//PublicationTypeList/PublicationType')
+            if pub_type.text
+        ]
+
+        # Extract year
+        year = None
+        pub_date = article_data.find('.//Journal/JournalIssue/PubDate')
+        if pub_date is not None:
+            year_elem = pub_date.find('.//Year')
+            if year_elem is not None:
+                year = int(year_elem.text)
+            else:
+                # Try MedlineDate
+                medline_date = pub_date.find('.//MedlineDate')
+                if medline_date is not None and medline_date.text:
+                    # Extract year from strings like "2023 Jan-Feb"
+                    year_str = medline_date.text[:4]
+                    if year_str.isdigit():
+                        year = int(year_str)
+
+        # Extract PMID
+        pmid_elem = medline.find('.//PMID')
+        pmid = pmid_elem.text if pmid_elem is not None else None
+
+        # Extract DOI if available
+        doi = None
+        article_ids = article.findall('.//PubmedData/ArticleIdList/ArticleId')
+        for article_id in article_ids:
+            if article_id.get('IdType') == 'doi':
+                doi = article_id.text
+                break
+
+        # Build standardized paper
+        std_paper = {
+            'title': title,
+            'authors': authors,
+            'year': year,
+            'doi': doi,
+            'abstract': abstract,
+            'citation_count': 0,  # Filled in by PubMedSearch.fetch_citation_counts
+            'journal': journal,
+            'journal_abbreviation': journal_abbreviation,
+            'mesh_terms': mesh_terms,
+            'publication_types': publication_types,
+            'is_open_access': False,  # Check PMC for open access
+            'url': f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+            'source': 'pubmed',
+            'pmid': pmid
+        }
+
+        # Check if available in PMC (open access)
+        pmc_elem = article.find('.//PubmedData/ArticleIdList/ArticleId[@IdType="pmc"]')
+        if pmc_elem is not None:
+            std_paper['is_open_access'] = True
+            std_paper['pmc_id'] = pmc_elem.text
+
+        return std_paper
+
+    except Exception as e:
+        logger.error(f"Error parsing article: {e}")
+        return None
+
+
 class PubMedSearch:
     """
     Search for papers in PubMed database.
     """
 
-    def __init__(self, email: str = "science-grounded@example.com"):
+    def __init__(self, email: str = "science-grounded@example.com",
+                 mirror_path: Optional[Path] = None):
         """
         Initialize PubMed search client.
 
         Args:
             email: Email address for NCBI (required for API usage)
+            mirror_path: Offline mirror store (defaults to mirrors/pubmed.sqlite)
         """
         self.api_name = "pubmed"
         self.email = email
+        self.mirror_path = mirror_path
+        self._mirror = None
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Science-Grounded-Skill/1.0 (Educational/Research Tool)'
         })
 
+    @property
+    def mirror(self):
+        """Offline baseline mirror (opened on first use)."""
+        if self._mirror is None:
+            from pubmed_mirror import PubMedMirror
+            self._mirror = PubMedMirror(self.mirror_path)
+        return self._mirror
+
     def search(self, query: str, limit: int = DEFAULT_LIMIT,
-              use_cache: bool = True, recent_only: bool = False) -> List[Dict]:
+              use_cache: bool = True, recent_only: bool = False,
+              offline: bool = False) -> List[Dict]:
         """
         Search for papers in PubMed.
 
@@ -92,6 +246,8 @@ class PubMedSearch:
             limit: Maximum number of results
             use_cache: Whether to use cached results
             recent_only: Only return papers from last 5 years
+            offline: Serve the query from the local baseline mirror
+                     (see pubmed_mirror.py) instead of E-utilities
 
         Returns:
             List of paper dictionaries with standardized format
@@ -102,6 +258,9 @@ class PubMedSearch:
             logger.error("Query failed sanitization")
             return []
 
+        if offline:
+            return self._search_offline(clean_query, limit, recent_only)
+
         # Add date filter if requested
         if recent_only:
             clean_query = f"{clean_query} AND (\"last 5 years\"[PDat])"
@@ -125,6 +284,33 @@ class PubMedSearch:
         sorted_papers = self._sort_pubmed_papers(papers)
         return sorted_papers[:limit]
 
+    def _search_offline(self, query: str, limit: int, recent_only: bool) -> List[Dict]:
+        """
+        Search the local baseline mirror.
+
+        Args:
+            query: Sanitized search query
+            limit: Maximum number of results
+            recent_only: Only return papers from last 5 years
+
+        Returns:
+            List of paper dictionaries
+        """
+        if not self.mirror.is_available():
+            logger.warning("PubMed mirror is empty; run pubmed_mirror.py ingest first")
+            return []
+
+        min_year = datetime.now().year - 5 if recent_only else None
+        papers = self.mirror.search(query, limit=min(limit * 2, RETMAX), min_year=min_year)
+        logger.info(f"Found {len(papers)} papers in local PubMed mirror")
+
+        # Reuse citation counts cached by earlier online searches (no network)
+        counts = self.fetch_citation_counts([p['pmid'] for p in papers], cached_only=True)
+        self._apply_citation_counts(papers, counts)
+
+        sorted_papers = self._sort_pubmed_papers(papers)
+        return sorted_papers[:limit]
+
     @timeout_handler
     def _search_papers(self, query: str, limit: int) -> List[Dict]:
         """
@@ -148,8 +334,14 @@ class PubMedSearch:
                 logger.info("No PMIDs found for query")
                 return []
 
-            # Step 2: Fetch paper details for PMIDs
-            papers = self._fetch_paper_details(pmids)
+            # Step 2: Fetch paper details and citation counts concurrently
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                details = executor.submit(self._fetch_paper_details, pmids)
+                citations = executor.submit(self.fetch_citation_counts, pmids)
+                papers = details.result()
+                counts = citations.result()
+
+            self._apply_citation_counts(papers, counts)
 
             logger.info(f"Found {len(papers)} papers in PubMed")
             log_api_request(self.api_name, query, 200)
@@ -251,6 +443,180 @@ class PubMedSearch:
             logger.error(f"Error fetching paper details: {e}")
             return []
 
+    def fetch_by_pmids(self, pmids: List[str], use_cache: bool = True,
+                       offline: bool = False) -> Dict[str, Dict]:
+        """
+        Get paper records for many PMIDs, in bulk.
+
+        Uncached PMIDs are fetched with EFetch in POST batches of
+        EFETCH_BATCH_SIZE, up to CITATION_WORKERS batches at a time, and
+        each record is cached per PMID.
+
+        Args:
+            pmids: List of PubMed IDs
+            use_cache: Whether to use cached records
+            offline: Read the records from the local baseline mirror instead
+
+        Returns:
+            Dict mapping PMID to paper (PMIDs not found are omitted)
+        """
+        pmids = list(dict.fromkeys(str(p) for p in pmids if p))
+        if offline:
+            return self.mirror.get_many(pmids)
+
+        papers = {}
+        missing = []
+        for pmid in pmids:
+            cached = get_cached_value(pmid, PAPER_CACHE_NAMESPACE) if use_cache else None
+            if cached is not None:
+                papers[pmid] = cached
+            else:
+                missing.append(pmid)
+
+        if not missing:
+            return papers
+
+        cached_count = len(papers)
+        batches = [missing[i:i + EFETCH_BATCH_SIZE]
+                   for i in range(0, len(missing), EFETCH_BATCH_SIZE)]
+
+        with ThreadPoolExecutor(max_workers=min(len(batches), CITATION_WORKERS)) as executor:
+            for batch_papers in executor.map(self._fetch_paper_batch, batches):
+                for paper in batch_papers:
+                    cache_value(paper['pmid'], paper, PAPER_CACHE_NAMESPACE, PAPER_CACHE_TTL)
+                    papers[paper['pmid']] = paper
+
+        logger.info(f"PMID lookup: {cached_count} cached, {len(papers) - cached_count} fetched, "
+                    f"{len(pmids) - len(papers)} not found")
+        return papers
+
+    def _fetch_paper_batch(self, pmids: List[str]) -> List[Dict]:
+        """
+        Fetch one batch of records with a single EFetch POST.
+
+        Args:
+            pmids: Batch of PubMed IDs
+
+        Returns:
+            List of paper dictionaries
+        """
+        data = {
+            'db': DB_NAME,
+            'id': ','.join(pmids),
+            'retmode': 'xml',
+            'email': self.email
+        }
+
+        try:
+            rate_limit_request(self.api_name)
+            response = self.session.post(FETCH_URL, data=data, timeout=REQUEST_TIMEOUT * 3)
+
+            if response.status_code != 200:
+                logger.error(f"PubMed fetch error: {response.status_code}")
+                return []
+
+            root = ET.fromstring(response.content)
+            papers = []
+            for article in root.findall('.//PubmedArticle'):
+                paper = self._parse_article(article)
+                if paper and paper.get('pmid') and validate_paper_data(paper):
+                    papers.append(paper)
+            return papers
+
+        except Exception as e:
+            logger.error(f"Error fetching PMID batch: {e}")
+            return []
+
+    def fetch_citation_counts(self, pmids: List[str], cached_only: bool = False) -> Dict[str, int]:
+        """
+        Look up how often each PMID is cited, in bulk.
+
+        Counts come from ELink's pubmed_pubmed_citedin links (citations from
+        PMC full text), requested in batches and cached per PMID.
+
+        Args:
+            pmids: List of PubMed IDs
+            cached_only: Only return counts already in the cache (no network)
+
+        Returns:
+            Dict mapping PMID to citation count (PMIDs whose lookup failed are omitted)
+        """
+        counts = {}
+        missing = []
+
+        for pmid in pmids:
+            cached = get_cached_value(pmid, CITATION_CACHE_NAMESPACE)
+            if cached is not None:
+                counts[pmid] = cached
+            else:
+                missing.append(pmid)
+
+        if cached_only or not missing:
+            return counts
+
+        cached_count = len(counts)
+        batches = [missing[i:i + ELINK_BATCH_SIZE]
+                   for i in range(0, len(missing), ELINK_BATCH_SIZE)]
+
+        with ThreadPoolExecutor(max_workers=min(len(batches), CITATION_WORKERS)) as executor:
+            for batch_counts in executor.map(self._fetch_citedin_batch, batches):
+                for pmid, count in batch_counts.items():
+                    cache_value(pmid, count, CITATION_CACHE_NAMESPACE, CITATION_CACHE_TTL)
+                counts.update(batch_counts)
+
+        logger.info(f"Citation counts: {cached_count} cached, {len(counts) - cached_count} fetched")
+        return counts
+
+    def _fetch_citedin_batch(self, pmids: List[str]) -> Dict[str, int]:
+        """
+        Fetch citation counts for one batch of PMIDs with a single ELink call.
+
+        Each PMID is sent as its own id parameter so ELink returns one
+        linkset per PMID instead of merging their links.
+
+        Args:
+            pmids: Batch of PubMed IDs
+
+        Returns:
+            Dict mapping PMID to citation count
+        """
+        params = [
+            ('dbfrom', DB_NAME),
+            ('db', DB_NAME),
+            ('linkname', 'pubmed_pubmed_citedin'),
+            ('retmode', 'json'),
+            ('email', self.email),
+        ] + [('id', pmid) for pmid in pmids]
+
+        try:
+            rate_limit_request(self.api_name)
+            response = self.session.post(ELINK_URL, data=params, timeout=REQUEST_TIMEOUT * 2)
+
+            if response.status_code != 200:
+                logger.error(f"PubMed ELink error: {response.status_code}")
+                return {}
+
+            counts = {}
+            for linkset in response.json().get('linksets', []):
+                links = []
+                for linksetdb in linkset.get('linksetdbs', []):
+                    if linksetdb.get('linkname') == 'pubmed_pubmed_citedin':
+                        links = linksetdb.get('links', [])
+                for pmid in linkset.get('ids', []):
+                    counts[str(pmid)] = len(links)
+
+            return counts
+
+        except Exception as e:
+            logger.error(f"Error fetching citation counts: {e}")
+            return {}
+
+    def _apply_citation_counts(self, papers: List[Dict], counts: Dict[str, int]) -> None:
+        """Set citation_count on papers that have a looked-up count."""
+        for paper in papers:
+            if paper.get('pmid') in counts:
+                paper['citation_count'] = counts[paper['pmid']]
+
     def _parse_article(self, article: ET.Element) -> Optional[Dict]:
         """
         Parse a single PubMed article from XML.
@@ -261,101 +627,14 @@ class PubMedSearch:
         Returns:
             Standardized paper dictionary or None if parsing fails
         """
-        try:
-            # Get basic article info
-            medline = article.find('.//MedlineCitation')
-            article_data = medline.find('.//Article')
-
-            # Extract title
-            title_elem = article_data.find('.//ArticleTitle')
-            title = title_elem.text if title_elem is not None else "Unknown Title"
-
-            # Extract authors
-            authors = []
-            author_list = article_data.find('.//AuthorList')
-            if author_list is not None:
-                for author in author_list.findall('.//Author'):
-                    last_name = author.find('.//LastName')
-                    first_name = author.find('.//ForeName')
-                    if last_name is not None:
-                        name = last_name.text
-                        if first_name is not None:
-                            name = f"{last_name.text}, {first_name.text}"
-                        authors.append(name)
-
-            # Extract abstract
-            abstract = ""
-            abstract_elem = article_data.find('.//Abstract')
-            if abstract_elem is not None:
-                abstract_texts = abstract_elem.findall('.//AbstractText')
-                abstract_parts = []
-                for text_elem in abstract_texts:
-                    if text_elem.text:
-                        abstract_parts.append(text_elem.text)
-                abstract = ' '.join(abstract_parts)
-
-            # Extract journal
-            journal_elem = article_data.find('.//Journal/Title')
-            journal = journal_elem.text if journal_elem is not None else None
-
-            # Extract year
-            year = None
-            pub_date = article_data.find('.//Journal/JournalIssue/PubDate')
-            if pub_date is not None:
-                year_elem = pub_date.find('.//Year')
-                if year_elem is not None:
-                    year = int(year_elem.text)
-                else:
-                    # Try MedlineDate
-                    medline_date = pub_date.find('.//MedlineDate')
-                    if medline_date is not None and medline_date.text:
-                        # Extract year from strings like "2023 Jan-Feb"
-                        year_str = medline_date.text[:4]
-                        if year_str.isdigit():
-                            year = int(year_str)
-
-            # Extract PMID
-            pmid_elem = medline.find('.//PMID')
-            pmid = pmid_elem.text if pmid_elem is not None else None
-
-            # Extract DOI if available
-            doi = None
-            article_ids = article.findall('.//PubmedData/ArticleIdList/ArticleId')
-            for article_id in article_ids:
-                if article_id.get('IdType') == 'doi':
-                    doi = article_id.text
-                    break
-
-            # Build standardized paper
-            std_paper = {
-                'title': title,
-                'authors': authors,
-                'year': year,
-                'doi': doi,
-                'abstract': abstract,
-                'citation_count': 0,  # PubMed doesn't provide citation counts
-                'journal': journal,
-                'is_open_access': False,  # Check PMC for open access
-                'url': f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
-                'source': 'pubmed',
-                'pmid': pmid
-            }
-
-            # Check if available in PMC (open access)
-            pmc_elem = article.find('.//PubmedData/ArticleIdList/ArticleId[@IdType="pmc"]')
-            if pmc_elem is not None:
-                std_paper['is_open_access'] = True
-                std_paper['pmc_id'] = pmc_elem.text
-
-            return std_paper
-
-        except Exception as e:
-            logger.error(f"Error parsing article: {e}")
-            return None
+        return parse_pubmed_article(article)
 
     def _sort_pubmed_papers(self, papers: List[Dict]) -> List[Dict]:
         """
-        Sort PubMed papers by journal priority and recency.
+        Sort PubMed papers by citations, journal priority and recency.
+
+        Citations are log-scaled so a highly cited paper outranks a new
+        one without drowning out the journal and recency boosts.
 
         Args:
             papers: List of paper dictionaries
@@ -364,7 +643,7 @@ class PubMedSearch:
             Sorted list of papers
         """
         for paper in papers:
-            score = 1.0
+            score = 1.0 + math.log1p(paper.get('citation_count') or 0)
 
             # Boost for priority journals
             journal = paper.get('journal', '')
@@ -392,47 +671,53 @@ class PubMedSearch:
         # Sort by impact score
         return sorted(papers, key=lambda p: p.get('impact_score', 0), reverse=True)
 
-    def search_clinical_trials(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+    def search_clinical_trials(self, query: str, limit: int = DEFAULT_LIMIT,
+                               offline: bool = False) -> List[Dict]:
         """
         Search specifically for clinical trials.
 
         Args:
             query: Search query
             limit: Maximum number of results
+            offline: Serve the query from the local baseline mirror
 
         Returns:
             List of paper dictionaries
         """
         clinical_query = f"{query} AND (Clinical Trial[PT] OR Randomized Controlled Trial[PT])"
-        return self.search(clinical_query, limit=limit)
+        return self.search(clinical_query, limit=limit, offline=offline)
 
-    def search_reviews(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+    def search_reviews(self, query: str, limit: int = DEFAULT_LIMIT,
+                       offline: bool = False) -> List[Dict]:
         """
         Search specifically for review articles.
 
         Args:
             query: Search query
             limit: Maximum number of results
+            offline: Serve the query from the local baseline mirror
 
         Returns:
             List of paper dictionaries
         """
         review_query = f"{query} AND (Review[PT] OR Systematic Review[PT])"
-        return self.search(review_query, limit=limit)
+        return self.search(review_query, limit=limit, offline=offline)
 
-    def search_epilepsy(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+    def search_epilepsy(self, query: str, limit: int = DEFAULT_LIMIT,
+                        offline: bool = False) -> List[Dict]:
         """
         Search with epilepsy-specific filters.
 
         Args:
             query: Search query
             limit: Maximum number of results
+            offline: Serve the query from the local baseline mirror
 
         Returns:
             List of paper dictionaries
         """
         epilepsy_query = f"{query} AND (epilepsy[MeSH] OR seizure[MeSH] OR anticonvulsants[MeSH])"
-        return self.search(epilepsy_query, limit=limit, recent_only=True)
+        return self.search(epilepsy_query, limit=limit, recent_only=True, offline=offline)
 
     def search_by_author(self, author_name: str, keywords: str = "",
                          limit: int = DEFAULT_LIMIT, recent_only: bool = True) -> List[Dict]:
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+ranking.py - Unified cross-source paper ranking with vectorized scoring
+Ranks papers from any mix of PubMed, Semantic Scholar, arXiv, bioRxiv/medRxiv
+and the local KB on one scale (e.g. the output of merge_papers()).
+
+Each feature is the log of a multiplicative boost, computed as a NumPy
+array over the whole candidate set:
+- citations:   log(1 + citation_count)
+- journal:     log of the journal tier multiplier (config/journals.json)
+- recency:     log of the recency boost (RECENCY_BOOSTS)
+- relevance:   log(1 + relevance), relevance scaled to 0-1 across the set
+- open_access: log of OPEN_ACCESS_BOOST for open-access papers
+- source:      log of the source prior (SOURCE_PRIORS; best source of a merged paper)
+
+The score is exp(sum of weight * feature): with every weight at 1.0 it is
+the product (1 + citations) * tier * recency * (1 + relevance) * OA * prior,
+and a weight of 0 switches a feature off. The top k are selected with a
+partial sort (np.argpartition), so only the winners are fully ordered.
+
+Usage:
+    ranked = rank_papers(merge_papers(all_papers), k=10)
+    ranker = Ranker(weights={'citations': 0.5, 'recency': 2.0})
+    ranked = ranker.rank(papers, k=20)
+"""
+
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+from journal_index import get_journal_index
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+FEATURES = ['citations', 'journal', 'recency', 'relevance', 'open_access', 'source']
+
+DEFAULT_WEIGHTS = {name: 1.0 for name in FEATURES}
+
+# (maximum age in years, boost), checked in order
+RECENCY_BOOSTS = [(2, 1.5), (5, 1.2)]
+
+OPEN_ACCESS_BOOST = 1.1
+
+# Prior for each source; preprints have no peer review and few citations yet
+SOURCE_PRIORS = {
+    'pubmed': 1.0,
+    'semantic_scholar': 1.0,
+    'local_kb': 1.0,
+    'arxiv': 0.8,
+    'biorxiv': 0.8,
+    'medrxiv': 0.8,
+}
+DEFAULT_SOURCE_PRIOR = 1.0
+
+# Fields holding a per-paper relevance score, checked in order
+RELEVANCE_FIELDS = ['relevance_score', 'match_score']
+
+
+def _number(value) -> float:
+    # Local KB metadata may hold years as strings (or '')
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def top_k_indices(scores: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first (ties keep input order).
+
+    Uses a partial sort, so only the k winners are fully sorted.
+
+    Args:
+        scores: Score array
+        k: Number of indices to return (None = all)
+
+    Returns:
+        Index array of length min(k, len(scores))
+    """
+    n = len(scores)
+    if k is None or k >= n:
+        return np.argsort(-scores, kind='stable')
+    if k <= 0:
+        return np.array([], dtype=np.intp)
+
+    # The partition splits ties at the k-th score arbitrarily, so keep every
+    # score tied with it and let the input position decide among them
+    kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+    candidates = np.flatnonzero(scores >= kth)
+    # Order the winners by score, then by input position
+    return candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+
+
+class Ranker:
+    """Scores and ranks papers from any source on one scale."""
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None,
+                 source_priors: Optional[Dict[str, float]] = None,
+                 current_year: Optional[int] = None):
+        """
+        Initialize the ranker.
+
+        Args:
+            weights: Feature weights overriding DEFAULT_WEIGHTS (0 disables a feature)
+            source_priors: Source priors overriding SOURCE_PRIORS
+            current_year: Reference year for recency (defaults to this year)
+        """
+        unknown = set(weights or {}) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown ranking features: {sorted(unknown)} (expected {FEATURES})")
+
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.source_priors = dict(SOURCE_PRIORS, **(source_priors or {}))
+        self.current_year = current_year or datetime.now().year
+        self._weight_vector = np.array([self.weights[name] for name in FEATURES])
+        self._journals = get_journal_index()
+
+    def _source_prior(self, paper: Dict) -> float:
+        sources = paper.get('sources') or [paper.get('source')]
+        return max(self.source_priors.get(s, DEFAULT_SOURCE_PRIOR) for s in sources)
+
+    def features(self, papers: Sequence[Dict],
+                 relevance: Optional[Sequence[float]] = None) -> np.ndarray:
+        """
+        Compute the feature matrix.
+
+        Args:
+            papers: Paper dictionaries (or records.Paper objects)
+            relevance: Relevance per paper (e.g. BM25 or RelevanceScorer
+                scores); defaults to each paper's RELEVANCE_FIELDS value
+
+        Returns:
+            Array of shape (len(papers), len(FEATURES)), columns in FEATURES order
+        """
+        n = len(papers)
+        matrix = np.zeros((n, len(FEATURES)))
+        if n == 0:
+            return matrix
+
+        citations = np.fromiter((_number(p.get('citation_count')) for p in papers), dtype=float, count=n)
+        matrix[:, 0] = np.log1p(np.maximum(citations, 0))
+
+        # Journal lookups are memoized by the index; result sets repeat journals a lot
+        matrix[:, 1] = np.log(np.fromiter(
+            (self._journals.multiplier(p.get('journal')) for p in papers), dtype=float, count=n))
+
+        years = np.fromiter((_number(p.get('year')) for p in papers), dtype=float, count=n)
+        age = np.where(years > 0, self.current_year - years, np.inf)
+        recency = np.ones(n)
+        for max_age, boost in reversed(RECENCY_BOOSTS):
+            recency[age <= max_age] = boost
+        matrix[:, 2] = np.log(recency)
+
+        if relevance is None:
+            relevance = [next((p[f] for f in RELEVANCE_FIELDS if p.get(f) is not None), 0.0)
+                         for p in papers]
+        relevance = np.maximum(np.asarray(relevance, dtype=float), 0)
+        # Scale to 0-1 so scores from different scorers are comparable
+        if relevance.max() > 1:
+            relevance = relevance / relevance.max()
+        matrix[:, 3] = np.log1p(relevance)
+
+        open_access = np.fromiter((bool(p.get('is_open_access')) for p in papers), dtype=bool, count=n)
+        matrix[:, 4] = open_access * np.log(OPEN_ACCESS_BOOST)
+
+        matrix[:, 5] = np.log(np.fromiter((self._source_prior(p) for p in papers), dtype=float, count=n))
+        return matrix
+
+    def scores(self, papers: Sequence[Dict], relevance: Optional[Sequence[float]] = None) -> np.ndarray:
+        """
+        Compute ranking scores.
+
+        Args:
+            papers: Paper dictionaries
+            relevance: Optional relevance per paper (see features())
+
+        Returns:
+            Score array aligned with papers
+        """
+        return np.exp(self.features(papers, relevance) @ self._weight_vector)
+
+    def rank(self, papers: Sequence[Dict], k: Optional[int] = None,
+             relevance: Optional[Sequence[float]] = None) -> List[Dict]:
+        """
+        Rank papers and return the top k with 'impact_score' set.
+
+        Args:
+            papers: Paper dictionaries from any mix of sources
+            k: Number of papers to return (None = all)
+            relevance: Optional relevance per paper (see features())
+
+        Returns:
+            Top papers, best first
+        """
+        scores = self.scores(papers, relevance)
+        top = top_k_indices(scores, k)
+        ranked = []
+        for i in top:
+            paper = papers[i]
+            paper['impact_score'] = float(scores[i])
+            ranked.append(paper)
+        return ranked
+
+
+def rank_papers(papers: Sequence[Dict], k: Optional[int] = None,
+                weights: Optional[Dict[str, float]] = None,
+                relevance: Optional[Sequence[float]] = None) -> List[Dict]:
+    """
+    Rank papers from any mix of sources on one scale.
+
+    Args:
+        papers: Paper dictionaries (ideally merged with merge_papers())
+        k: Number of papers to return (None = all)
+        weights: Feature weights overriding DEFAULT_WEIGHTS
+        relevance: Optional relevance per paper
+
+    Returns:
+        Top papers, best first, with 'impact_score' set
+    """
+    return Ranker(weights=weights).rank(papers, k=k, relevance=relevance)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Rank paper records from JSON result files")
+    parser.add_argument("files", nargs='+', help="JSON files holding lists of paper records")
+    parser.add_argument("-k", type=int, default=10, help="Number of papers to show")
+    parser.add_argument("--weight", action='append', default=[], metavar="FEATURE=W",
+                        help=f"Override a feature weight ({', '.join(FEATURES)})")
+    args = parser.parse_args()
+
+    records = []
+    for name in args.files:
+        with open(name) as f:
+            records.extend(json.load(f))
+
+    weights = {name: float(value) for name, value in (w.split('=', 1) for w in args.weight)}
+    for n, paper in enumerate(rank_papers(records, k=args.k, weights=weights), 1):
+        print(f"{n:2d}. [{paper['impact_score']:.2f}] {paper.get('title', '')[:70]} "
+              f"({paper.get('source')}, {paper.get('year')})")
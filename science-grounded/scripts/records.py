@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+records.py - Compact slotted record types for papers and grants
+Shared Paper/Grant classes that replace the per-source result dictionaries
+in memory-heavy places (large result sets, caches).
+
+- __slots__ instead of a per-record dict, lists stored as tuples
+- Categorical strings (source, journal, MeSH terms, agencies, ...) interned,
+  so repeated values share one object
+- Lazy abstracts: an abstract can be a loader called on first access
+- Row packing: records pickle as one positional tuple, and pack_records()
+  stores a whole result list as rows without repeating field names
+
+The dictionary shape used throughout the scripts is kept: from_dict() /
+to_dict() round-trip exactly, and get(), [] and `in` work as on a dict.
+
+Usage:
+    paper = Paper.from_dict(pubmed.search("epilepsy")[0])
+    paper.title, paper.get('pmid'), paper.to_dict()
+    packed = pack_records(results)          # cache-friendly
+    results = unpack_records(packed)        # back to dicts
+"""
+
+import logging
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Format version of pack_records() payloads
+PACK_VERSION = 1
+
+# Result sources that hold grants rather than papers
+GRANT_SOURCES = {'nih_reporter', 'nsf'}
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+def _slot_names(fields: Tuple[str, ...], lazy_fields: frozenset) -> Tuple[str, ...]:
+    # Lazy fields live in a private slot behind a property of the field's name
+    return tuple(f'_{name}' if name in lazy_fields else name for name in fields)
+
+
+class Record:
+    """
+    Base class for slotted records.
+
+    Subclasses list their known dictionary keys in FIELDS; keys outside
+    FIELDS are kept in `extra`. A bitmask records which fields were present,
+    so to_dict() returns exactly the keys that went in.
+    """
+
+    __slots__ = ('_present', 'extra')
+
+    FIELDS: Tuple[str, ...] = ()
+    LIST_FIELDS: frozenset = frozenset()   # Lists, stored as tuples
+    INTERNED: frozenset = frozenset()      # Strings (or list items) to intern
+    LAZY_FIELDS: frozenset = frozenset()   # May hold a zero-argument loader
+
+    def __init__(self, **fields):
+        self._assign(self.row_from_dict(fields))
+
+    @classmethod
+    def row_from_dict(cls, data: Dict, loaders: Optional[Dict[str, Callable[[], Any]]] = None) -> Tuple:
+        """
+        Convert a result dictionary straight to a row (see to_row()).
+
+        Args:
+            data: Result dictionary from any searcher
+            loaders: Zero-argument loaders for lazy fields missing from data
+
+        Returns:
+            Row tuple; lazy fields may hold their loader
+        """
+        present = 0
+        values = []
+        interned, list_fields = cls.INTERNED, cls.LIST_FIELDS
+        for bit, name in enumerate(cls.FIELDS):
+            if name in data:
+                value = data[name]
+                present |= 1 << bit
+                if name in list_fields and type(value) is list:
+                    value = tuple(map(_intern, value)) if name in interned else tuple(value)
+                elif name in interned:
+                    value = _intern(value)
+            elif loaders and name in loaders:
+                value = loaders[name]
+                present |= 1 << bit
+            else:
+                value = None
+            values.append(value)
+
+        extra = {k: v for k, v in data.items() if k not in cls._field_bits} or None
+        return (present, *values, extra)
+
+    @classmethod
+    def from_dict(cls, data: Dict, loaders: Optional[Dict[str, Callable[[], Any]]] = None):
+        """
+        Build a record from a standardized result dictionary.
+
+        Args:
+            data: Result dictionary from any searcher
+            loaders: Zero-argument loaders for lazy fields missing from data
+                (e.g. {'abstract': lambda: fetch_abstract(pmid)})
+
+        Returns:
+            Record instance
+        """
+        return cls.from_row(cls.row_from_dict(data, loaders))
+
+    def _assign(self, row: Tuple) -> None:
+        self._present = row[0]
+        for slot, value in zip(self._slots, row[1:]):
+            setattr(self, slot, value)
+        self.extra = row[-1]
+
+    def _value(self, name: str) -> Any:
+        slot = self._slots[self._field_bits[name]]
+        value = getattr(self, slot)
+        if name in self.LAZY_FIELDS and callable(value):
+            value = value()
+            setattr(self, slot, value)
+        return value
+
+    def to_dict(self) -> Dict:
+        """
+        Convert back to the standardized result dictionary.
+
+        Returns:
+            Dictionary with the same keys that went in
+        """
+        data = {}
+        present, list_fields = self._present, self.LIST_FIELDS
+        for bit, name in enumerate(self.FIELDS):
+            if present >> bit & 1:
+                value = self._value(name)
+                data[name] = list(value) if name in list_fields and isinstance(value, tuple) else value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def to_row(self) -> Tuple:
+        """
+        Pack into a positional tuple (presence mask, field values..., extra).
+
+        Lazy fields are loaded first, so rows hold plain data.
+        """
+        return ((self._present,) + tuple(self._value(name) for name in self.FIELDS)
+                + (self.extra,))
+
+    @classmethod
+    def dict_from_row(cls, row: Tuple) -> Dict:
+        """Turn to_row() output straight into a result dictionary."""
+        mask = row[0]
+        data = {name: value for bit, (name, value) in enumerate(zip(cls.FIELDS, row[1:-1]))
+                if mask >> bit & 1}
+        for name in cls.LIST_FIELDS:
+            if type(data.get(name)) is tuple:
+                data[name] = list(data[name])
+        if row[-1]:
+            data.update(row[-1])
+        return data
+
+    @classmethod
+    def from_row(cls, row: Tuple):
+        """Rebuild a record from to_row() output."""
+        record = cls.__new__(cls)
+        record._assign(row)
+        return record
+
+    def __reduce__(self):
+        return (self.__class__.from_row, (self.to_row(),))
+
+    # Dictionary compatibility shims
+
+    def __contains__(self, key: str) -> bool:
+        bit = self._field_bits.get(key)
+        if bit is not None:
+            return bool(self._present >> bit & 1)
+        return bool(self.extra) and key in self.extra
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """dict.get() equivalent (list fields come back as tuples)."""
+        bit = self._field_bits.get(key)
+        if bit is not None:
+            return self._value(key) if self._present >> bit & 1 else default
+        return self.extra.get(key, default) if self.extra else default
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        bit = self._field_bits.get(key)
+        if bit is None:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+            return
+        if key in self.LIST_FIELDS and isinstance(value, list):
+            value = tuple(value)
+        setattr(self, self._slots[bit], _intern(value) if key in self.INTERNED else value)
+        self._present |= 1 << bit
+
+    def keys(self) -> Iterator[str]:
+        for bit, name in enumerate(self.FIELDS):
+            if self._present >> bit & 1:
+                yield name
+        if self.extra:
+            yield from self.extra
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        title = (self.get('title') or '')[:50]
+        return f"{type(self).__name__}(source={self.get('source')!r}, title={title!r})"
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_bits = {name: bit for bit, name in enumerate(cls.FIELDS)}
+        cls._slots = _slot_names(cls.FIELDS, cls.LAZY_FIELDS)
+
+
+class Paper(Record):
+    """Paper from PubMed, Semantic Scholar, arXiv, bioRxiv/medRxiv or a mirror."""
+
+    FIELDS = (
+        'title', 'authors', 'year', 'doi', 'abstract', 'citation_count', 'journal',
+        'journal_abbreviation', 'mesh_terms', 'publication_types', 'is_open_access', 'url',
+        'source', 'pmid', 'pmc_id', 'paper_id', 'corpus_id', 'arxiv_id', 'pdf_url',
+        'fields_of_study', 'categories', 'is_relevant_category', 'external_ids',
+        'published_date', 'updated_date', 'published_doi', 'category', 'version', 'server',
+    )
+    LIST_FIELDS = frozenset({'authors', 'mesh_terms', 'publication_types', 'fields_of_study',
+                             'categories'})
+    INTERNED = frozenset({'journal', 'journal_abbreviation', 'source', 'server', 'category',
+                          'mesh_terms', 'publication_types', 'fields_of_study', 'categories'})
+    LAZY_FIELDS = frozenset({'abstract'})
+
+    __slots__ = _slot_names(FIELDS, LAZY_FIELDS)
+
+    @property
+    def abstract(self) -> Optional[str]:
+        """Abstract text (loaded on first access if a loader was given)."""
+        return self._value('abstract')
+
+
+class Grant(Record):
+    """Grant from NIH RePORTER, NSF Awards or the offline grant store."""
+
+    FIELDS = (
+        'project_number', 'core_project_num', 'award_number', 'title', 'pi_name', 'pi_email',
+        'co_pis', 'institution', 'location', 'year', 'award_date', 'start_date', 'end_date',
+        'expiration_date', 'fiscal_year', 'award_amount', 'agencies', 'abstract',
+        'study_section', 'project_type', 'activity_code', 'program', 'source', 'url',
+    )
+    LIST_FIELDS = frozenset({'co_pis', 'agencies'})
+    INTERNED = frozenset({'institution', 'location', 'agencies', 'study_section', 'project_type',
+                          'activity_code', 'program', 'source'})
+    LAZY_FIELDS = frozenset({'abstract'})
+
+    __slots__ = _slot_names(FIELDS, LAZY_FIELDS)
+
+    @property
+    def abstract(self) -> Optional[str]:
+        """Abstract text (loaded on first access if a loader was given)."""
+        return self._value('abstract')
+
+
+def record_type(data: Union[Dict, Record]) -> type:
+    """Pick Paper or Grant for a result dictionary by its source."""
+    if isinstance(data, Record):
+        return type(data)
+    return Grant if data.get('source') in GRANT_SOURCES else Paper
+
+
+def to_records(results: Iterable[Union[Dict, Record]]) -> List[Record]:
+    """
+    Convert result dictionaries to Paper/Grant records.
+
+    Args:
+        results: Result dictionaries (records are passed through)
+
+    Returns:
+        List of records
+    """
+    return [r if isinstance(r, Record) else record_type(r).from_dict(r) for r in results]
+
+
+def to_dicts(records: Iterable[Union[Dict, Record]]) -> List[Dict]:
+    """Convert records back to result dictionaries (dicts are passed through)."""
+    return [r.to_dict() if isinstance(r, Record) else r for r in records]
+
+
+def pack_records(results: Iterable[Union[Dict, Record]]) -> Dict:
+    """
+    Pack results into a compact payload for caching.
+
+    Each result becomes one positional row, so field names are not stored
+    per record and pickling handles plain tuples.
+
+    Args:
+        results: Result dictionaries or records
+
+    Returns:
+        Payload for unpack_records()
+    """
+    packed = {'version': PACK_VERSION, 'papers': [], 'grants': [], 'order': []}
+    for result in results:
+        cls = record_type(result)
+        row = result.to_row() if isinstance(result, Record) else cls.row_from_dict(result)
+        packed['grants' if cls is Grant else 'papers'].append(row)
+        packed['order'].append(cls is Grant)
+    return packed
+
+
+def is_packed(payload: Any) -> bool:
+    """Check whether a cached value is a pack_records() payload."""
+    return isinstance(payload, dict) and payload.get('version') == PACK_VERSION and 'order' in payload
+
+
+def unpack_records(packed: Dict, as_dicts: bool = True) -> List[Union[Dict, Record]]:
+    """
+    Unpack a pack_records() payload.
+
+    Args:
+        packed: Payload from pack_records()
+        as_dicts: Return result dictionaries (default) rather than records
+
+    Returns:
+        Results in their original order
+    """
+    rows = {False: iter(packed['papers']), True: iter(packed['grants'])}
+    if as_dicts:
+        build = {False: Paper.dict_from_row, True: Grant.dict_from_row}
+    else:
+        build = {False: Paper.from_row, True: Grant.from_row}
+    return [build[is_grant](next(rows[is_grant])) for is_grant in packed['order']]
@@ -7,8 +7,16 @@ Keyword-based scoring with weighted categories matching user's research interest
 
 import json
 import logging
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+from keyword_automaton import KeywordAutomaton
 
 logger = logging.getLogger(__name__)
 
@@ -93,17 +101,51 @@ KEYWORD_WEIGHTS = {
 }
 
 
+# Full-text matches counted per keyword (avoids overwhelming the score)
+FULL_TEXT_MATCH_CAP = 10
+
+# Paper sections scored by score_batch(): (field, match multiplier, per-keyword cap)
+SECTIONS = [('title', 3, None), ('abstract', 2, None), ('full_text', 1, FULL_TEXT_MATCH_CAP)]
+
+# Joins a batch of texts for one scan; no keyword contains it
+BATCH_SEPARATOR = '\x00'
+
+
+@lru_cache(maxsize=32)
+def _compile_keywords(keywords: Tuple[str, ...], word_boundaries: bool) -> KeywordAutomaton:
+    """Automaton for one weight profile, shared by every scorer using it."""
+    return KeywordAutomaton(keywords, word_boundaries=word_boundaries)
+
+
 class RelevanceScorer:
     """Score paper relevance based on epilepsy/iEEG research keywords."""
 
-    def __init__(self, custom_weights: Optional[Dict] = None):
+    def __init__(self, custom_weights: Optional[Dict] = None, word_boundaries: bool = False):
         """
         Initialize scorer with keyword weights.
 
         Args:
             custom_weights: Custom keyword categories (overrides defaults)
+            word_boundaries: Match whole words only (e.g. 'RNS' no longer
+                matches inside 'patterns'). Off by default, which keeps the
+                substring scores.
         """
         self.weights = custom_weights or KEYWORD_WEIGHTS
+        self.word_boundaries = word_boundaries
+
+        keywords = tuple(dict.fromkeys(
+            keyword for category in self.weights.values() for keyword in category['keywords']))
+        self._automaton = _compile_keywords(keywords, word_boundaries)
+
+        # Pattern -> category membership counts (a keyword listed twice counts twice)
+        self._pattern_ids = {pattern: i for i, pattern in enumerate(self._automaton.patterns)}
+        self._membership = np.zeros((len(self._pattern_ids), len(self.weights)))
+        for column, category_data in enumerate(self.weights.values()):
+            for keyword in category_data['keywords']:
+                if keyword:
+                    self._membership[self._pattern_ids[keyword.lower()], column] += 1
+        self._category_weights = np.array(
+            [category_data['weight'] for category_data in self.weights.values()], dtype=float)
 
     def score_paper(self, title: str, abstract: str, full_text: str = "") -> Tuple[int, List[str]]:
         """
@@ -119,9 +161,11 @@ class RelevanceScorer:
         """
         # Combine text with different weights
         # Title matches count 3x, abstract 2x, full_text 1x
-        title_lower = title.lower()
-        abstract_lower = abstract.lower()
-        full_text_lower = full_text.lower() if full_text else ""
+        # One pass per section finds every keyword
+        title_counts = self._automaton.counts(title)
+        abstract_counts = self._automaton.counts(abstract)
+        # Limit full text matches to avoid overwhelming score
+        full_text_counts = self._automaton.counts(full_text, limit=FULL_TEXT_MATCH_CAP) if full_text else {}
 
         total_score = 0
         matched_categories = []
@@ -134,19 +178,9 @@ class RelevanceScorer:
             category_matches = 0
 
             for keyword in keywords:
-                keyword_lower = keyword.lower()
-
-                # Count matches in each section
-                title_matches = title_lower.count(keyword_lower) * 3
-                abstract_matches = abstract_lower.count(keyword_lower) * 2
-
-                if full_text:
-                    # Limit full text matches to avoid overwhelming score
-                    full_text_matches = min(full_text_lower.count(keyword_lower), 10)
-                else:
-                    full_text_matches = 0
-
-                total_matches = title_matches + abstract_matches + full_text_matches
+                total_matches = (title_counts.get(keyword, 0) * 3
+                                 + abstract_counts.get(keyword, 0) * 2
+                                 + full_text_counts.get(keyword, 0))
 
                 if total_matches > 0:
                     category_matches += total_matches
@@ -167,6 +201,94 @@ class RelevanceScorer:
 
         return normalized_score, reasons
 
+    def score_batch(self, papers: Sequence[Dict]) -> List[Tuple[int, List[str]]]:
+        """
+        Score many papers at once (same scores as score_paper()).
+
+        Each section of the whole batch is scanned in one pass. The matches
+        become sparse (paper, keyword, count) triplets, and the section
+        multipliers, full-text cap and per-category caps are applied as
+        array operations.
+
+        Args:
+            papers: Paper dictionaries with 'title', 'abstract' and optionally
+                'full_text'
+
+        Returns:
+            (score, reasons) tuple per paper, in input order
+        """
+        n = len(papers)
+        if n == 0:
+            return []
+
+        rows, columns, counts = [], [], []
+        for field, multiplier, limit in SECTIONS:
+            section_rows, section_columns, section_counts = self._section_matches(
+                [paper.get(field) or '' for paper in papers], limit)
+            rows.append(section_rows)
+            columns.append(section_columns)
+            counts.append(section_counts * multiplier)
+        rows, columns, counts = np.concatenate(rows), np.concatenate(columns), np.concatenate(counts)
+
+        # Matches per category: keyword counts summed through the membership matrix
+        category_matches = np.column_stack([
+            np.bincount(rows, weights=counts * self._membership[columns, c], minlength=n)
+            for c in range(len(self._category_weights))
+        ])
+        weights = self._category_weights
+        category_scores = np.minimum(category_matches * weights, weights * 5)  # Cap per category
+        total_scores = np.zeros(n)
+        for c in range(len(weights)):
+            total_scores += category_scores[:, c]
+        normalized_scores = np.minimum((total_scores / 400 * 100).astype(int), 100)
+
+        # Matched keywords per paper, for the reasons
+        matched_keywords: List[set] = [set() for _ in range(n)]
+        n_patterns = len(self._pattern_ids)
+        for key in np.unique(rows * n_patterns + columns):
+            row, column = divmod(int(key), n_patterns)
+            matched_keywords[row].update(self._automaton.keywords_for(self._automaton.patterns[column]))
+
+        category_names = list(self.weights)
+        results = []
+        for i in range(n):
+            matched_categories = [category_names[c] for c in np.flatnonzero(category_matches[i])]
+            results.append((int(normalized_scores[i]),
+                            self._generate_reasons(matched_categories, matched_keywords[i])))
+        return results
+
+    def _section_matches(self, texts: List[str],
+                         limit: Optional[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Sparse (paper, pattern, count) triplets for one section of every paper.
+
+        Args:
+            texts: Section text per paper
+            limit: Optional cap per keyword and paper
+
+        Returns:
+            (rows, pattern columns, counts) arrays
+        """
+        lowered = [text.lower() for text in texts]
+        offsets = np.cumsum([0] + [len(text) + 1 for text in lowered[:-1]])
+
+        starts, columns = [], []
+        pattern_ids = self._pattern_ids
+        # Keywords cannot span the separator, so one scan counts every paper
+        for start, pattern in self._automaton.occurrences(BATCH_SEPARATOR.join(lowered)):
+            starts.append(start)
+            columns.append(pattern_ids[pattern])
+        if not starts:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty
+
+        n_patterns = len(pattern_ids)
+        rows = np.searchsorted(offsets, starts, side='right') - 1
+        keys, counts = np.unique(rows * n_patterns + np.asarray(columns), return_counts=True)
+        if limit is not None:
+            counts = np.minimum(counts, limit)
+        return keys // n_patterns, keys % n_patterns, counts
+
     def _generate_reasons(self, categories: List[str], keywords: set) -> List[str]:
         """
         Generate human-readable reasons for score.
@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+"""
+s2_dataset.py - Offline Semantic Scholar store built from S2 Datasets shards
+Serves Semantic Scholar search, details and citation counts without network or quota.
+
+Ingests the JSONL(.gz) shards of the S2 Datasets releases
+(https://api.semanticscholar.org/api-docs/datasets) from local directories:
+- papers: one record per corpus ID, kept only if one of its fields of
+  study is in FIELDS_OF_STUDY
+- abstracts: joined onto papers already in the store
+- citations: (citing, cited) corpus-ID edges touching papers in the store
+
+Ingest papers first; abstracts and citations are filtered against them.
+Each shard is streamed line by line in a worker process into a temporary
+SQLite file, which the parent merges, so memory stays flat however large
+the release is.
+
+Usage:
+    dataset = S2Dataset()
+    dataset.ingest("/data/s2/papers", "papers")
+    dataset.ingest("/data/s2/abstracts", "abstracts")
+    dataset.ingest("/data/s2/citations", "citations")
+    papers = dataset.search("thalamic stimulation seizures", min_year=2015)
+"""
+
+import gzip
+import json
+import logging
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent))
+from paper_utils import validate_paper_data
+from local_store import LocalStore, WRITE_BATCH_SIZE
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Default store file (inside MIRROR_DIR)
+STORE_NAME = "s2_dataset.sqlite"
+
+DATASETS = ("papers", "abstracts", "citations")
+
+# Shard file names (releases ship gzipped JSONL, sometimes without .jsonl)
+SHARD_PATTERNS = ("*.jsonl.gz", "*.jsonl", "*.gz")
+
+# Parallel parsing
+DEFAULT_WORKERS = 4
+
+# S2 fields of study kept by default: neuroscience is spread over Medicine,
+# Biology and Psychology; methods papers over the quantitative fields
+FIELDS_OF_STUDY = (
+    'Medicine', 'Biology', 'Psychology', 'Computer Science', 'Mathematics', 'Physics'
+)
+
+# Store layout for paper records
+FACET_FIELDS = {
+    'field': 'fields_of_study',
+    'doi': 'doi',
+    'pmid': 'pmid',
+    'arxiv': 'arxiv_id',
+    'paper_id': 'paper_id',
+}
+EXTRA_FIELDS = ['authors', 'journal']
+
+# Citation edges live next to the records, in the same file
+CITATIONS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS citations (
+    citing TEXT NOT NULL,
+    cited TEXT NOT NULL,
+    PRIMARY KEY (citing, cited)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS citations_cited ON citations(cited);
+"""
+
+# Temporary per-shard tables for abstracts and citations
+TEMP_SCHEMAS = {
+    'abstracts': "CREATE TABLE abstracts (corpus_id TEXT PRIMARY KEY, abstract TEXT)",
+    'citations': "CREATE TABLE citations (citing TEXT NOT NULL, cited TEXT NOT NULL)",
+}
+
+# External ID prefixes (as normalized by semantic_scholar_search) -> store facet
+ID_FACETS = {'DOI': 'doi', 'PMID': 'pmid', 'ARXIV': 'arxiv'}
+
+
+def open_store(path: Optional[Union[str, Path]] = None) -> LocalStore:
+    """
+    Open the Semantic Scholar dataset store.
+
+    Args:
+        path: Store file (defaults to MIRROR_DIR/s2_dataset.sqlite)
+
+    Returns:
+        LocalStore configured for S2 paper records
+    """
+    store = LocalStore(path or STORE_NAME, id_field='corpus_id', facet_fields=FACET_FIELDS,
+                       extra_fields=EXTRA_FIELDS, date_field='published_date')
+    store.conn.executescript(CITATIONS_SCHEMA)
+    return store
+
+
+def iter_shard(shard_path: Path) -> Iterator[Dict]:
+    """
+    Stream the JSON records of one shard.
+
+    Args:
+        shard_path: Path to a .jsonl or gzipped JSONL shard
+
+    Yields:
+        One dict per line (malformed lines are skipped)
+    """
+    with open(shard_path, 'rb') as f:
+        gzipped = f.read(2) == b'\x1f\x8b'
+    opener = gzip.open if gzipped else open
+
+    with opener(shard_path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed line in {shard_path.name}")
+
+
+def fields_of(record: Dict) -> List[str]:
+    """Collect a dataset paper's fields of study (s2fieldsofstudy and legacy fieldsofstudy)."""
+    fields = [f.get('category') for f in record.get('s2fieldsofstudy') or [] if f]
+    fields += record.get('fieldsofstudy') or []
+    return list(dict.fromkeys(f for f in fields if f))
+
+
+def standardize_dataset_paper(record: Dict) -> Dict:
+    """
+    Convert a papers-dataset record to the standardized paper format.
+
+    Uses the same keys as SemanticScholarSearch results, plus corpus_id,
+    pmid, arxiv_id and published_date.
+
+    Args:
+        record: One line of a papers shard
+
+    Returns:
+        Standardized paper dictionary
+    """
+    external_ids = record.get('externalids') or {}
+    url = record.get('url') or ''
+    journal = record.get('journal') or {}
+
+    return {
+        'title': record.get('title') or 'Unknown Title',
+        'authors': [a['name'] for a in record.get('authors') or [] if a and a.get('name')],
+        'year': record.get('year'),
+        'doi': external_ids.get('DOI'),
+        'abstract': '',
+        'citation_count': record.get('citationcount') or 0,
+        'journal': journal.get('name') or record.get('venue') or None,
+        'is_open_access': bool(record.get('isopenaccess')),
+        'url': url,
+        'source': 'semantic_scholar',
+        # The S2 paper ID is the last segment of the paper URL
+        'paper_id': url.rstrip('/').rsplit('/', 1)[-1] if '/paper/' in url else None,
+        'fields_of_study': fields_of(record),
+        'publication_types': record.get('publicationtypes') or [],
+        'corpus_id': str(record.get('corpusid')),
+        'pmid': external_ids.get('PubMed'),
+        'arxiv_id': external_ids.get('ArXiv'),
+        'external_ids': external_ids,
+        'published_date': record.get('publicationdate'),
+    }
+
+
+def _ingest_papers_shard(shard_path: Path, temp_path: Path,
+                         fields_of_study: Tuple[str, ...]) -> Tuple[str, int, int]:
+    """
+    Worker: parse one papers shard into its own temporary store.
+
+    Args:
+        shard_path: Shard to parse
+        temp_path: Temporary store to create
+        fields_of_study: Fields of study to keep
+
+    Returns:
+        (shard name, papers written, papers skipped)
+    """
+    wanted = set(fields_of_study)
+    store = open_store(temp_path)
+    skipped = 0
+
+    def papers():
+        nonlocal skipped
+        for record in iter_shard(shard_path):
+            if record.get('corpusid') is None or not wanted.intersection(fields_of(record)):
+                skipped += 1
+                continue
+            paper = standardize_dataset_paper(record)
+            if validate_paper_data(paper):
+                yield paper
+            else:
+                skipped += 1
+
+    try:
+        written = store.add_records(papers())
+    finally:
+        store.close()
+
+    return shard_path.name, written, skipped
+
+
+def _ingest_table_shard(shard_path: Path, temp_path: Path, dataset: str) -> Tuple[str, int, int]:
+    """
+    Worker: parse one abstracts or citations shard into a temporary table.
+
+    Args:
+        shard_path: Shard to parse
+        temp_path: Temporary SQLite file to create
+        dataset: "abstracts" or "citations"
+
+    Returns:
+        (shard name, rows written, rows skipped)
+    """
+    if dataset == 'abstracts':
+        sql = "INSERT OR REPLACE INTO abstracts (corpus_id, abstract) VALUES (?, ?)"
+
+        def row_of(record):
+            if record.get('corpusid') is not None and record.get('abstract'):
+                return str(record['corpusid']), record['abstract']
+            return None
+    else:
+        sql = "INSERT INTO citations (citing, cited) VALUES (?, ?)"
+
+        def row_of(record):
+            citing, cited = record.get('citingcorpusid'), record.get('citedcorpusid')
+            if citing is not None and cited is not None:
+                return str(citing), str(cited)
+            return None
+
+    conn = sqlite3.connect(str(temp_path))
+    conn.execute(TEMP_SCHEMAS[dataset])
+    written = skipped = 0
+    batch = []
+
+    try:
+        for record in iter_shard(shard_path):
+            row = row_of(record)
+            if row is None:
+                skipped += 1
+                continue
+            batch.append(row)
+            if len(batch) >= WRITE_BATCH_SIZE:
+                with conn:
+                    conn.executemany(sql, batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            with conn:
+                conn.executemany(sql, batch)
+            written += len(batch)
+    finally:
+        conn.close()
+
+    return shard_path.name, written, skipped
+
+
+class S2Dataset:
+    """
+    Local, indexed Semantic Scholar store built from dataset shards.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None,
+                 fields_of_study: Tuple[str, ...] = FIELDS_OF_STUDY):
+        """
+        Open the store.
+
+        Args:
+            path: Store file (defaults to MIRROR_DIR/s2_dataset.sqlite)
+            fields_of_study: Fields of study kept when ingesting papers
+        """
+        self.store = open_store(path)
+        self.fields_of_study = tuple(fields_of_study)
+
+    def is_available(self) -> bool:
+        """Check whether any papers have been ingested."""
+        return self.store.count() > 0
+
+    def ingested_shards(self, dataset: str) -> List[str]:
+        """Return names of shards of a dataset already ingested."""
+        return json.loads(self.store.get_meta(f'ingested:{dataset}', '[]'))
+
+    def ingest(self, directory: Union[str, Path], dataset: str,
+               workers: int = DEFAULT_WORKERS, force: bool = False) -> Dict:
+        """
+        Ingest all shards of one dataset found in a directory.
+
+        Shards that were already ingested are skipped unless force=True.
+
+        Args:
+            directory: Directory containing the dataset's shards
+            dataset: "papers", "abstracts" or "citations"
+            workers: Number of parallel parser processes
+            force: Re-ingest shards that were ingested before
+
+        Returns:
+            Summary dict with shards, parsed, skipped and stored counts
+        """
+        if dataset not in DATASETS:
+            raise ValueError(f"Unknown dataset: {dataset} (expected one of {DATASETS})")
+        if dataset != 'papers' and not self.is_available():
+            logger.warning(f"No papers ingested yet; {dataset} are filtered against papers, "
+                           f"so ingest the papers dataset first")
+
+        directory = Path(directory)
+        shards = sorted({p for pattern in SHARD_PATTERNS for p in directory.glob(pattern)},
+                        key=lambda p: p.name)
+        done = set() if force else set(self.ingested_shards(dataset))
+        shards = [p for p in shards if p.name not in done]
+
+        summary = {'shards': 0, 'parsed': 0, 'skipped': 0, 'stored': 0}
+        if not shards:
+            logger.info(f"No new {dataset} shards to ingest in {directory}")
+            return summary
+
+        start = time.time()
+        logger.info(f"Ingesting {len(shards)} {dataset} shards with {workers} workers")
+
+        with tempfile.TemporaryDirectory(prefix="s2_ingest_") as temp_dir:
+            temp_dir = Path(temp_dir)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Keep a bounded window of shards in flight; merge in shard order
+                pending = []
+                next_index = 0
+                while next_index < len(shards) or pending:
+                    while next_index < len(shards) and len(pending) < workers * 2:
+                        shard_path = shards[next_index]
+                        temp_path = temp_dir / f"{next_index:06d}.sqlite"
+                        if dataset == 'papers':
+                            future = executor.submit(_ingest_papers_shard, shard_path, temp_path,
+                                                     self.fields_of_study)
+                        else:
+                            future = executor.submit(_ingest_table_shard, shard_path, temp_path,
+                                                     dataset)
+                        pending.append((temp_path, future))
+                        next_index += 1
+
+                    temp_path, future = pending.pop(0)
+                    name, parsed, skipped = future.result()
+                    stored = self._merge_temp(temp_path, dataset)
+                    done.add(name)
+                    self.store.set_meta(f'ingested:{dataset}', json.dumps(sorted(done)))
+
+                    summary['shards'] += 1
+                    summary['parsed'] += parsed
+                    summary['skipped'] += skipped
+                    summary['stored'] += stored
+                    logger.info(f"Ingested {dataset} shard {name}: {stored} stored, "
+                                f"{skipped} skipped")
+
+        self.store.set_meta('last_ingest', datetime.now().isoformat())
+        logger.info(f"S2 {dataset} ingest finished in {time.time() - start:.1f}s: {summary}")
+        return summary
+
+    def _merge_temp(self, temp_path: Path, dataset: str) -> int:
+        """
+        Merge a worker's temporary file into the store.
+
+        Papers are merged as records; abstracts update papers already
+        stored; citation edges are kept if either end is a stored paper.
+
+        Args:
+            temp_path: Worker output
+            dataset: Dataset the worker parsed
+
+        Returns:
+            Number of records updated or edges added
+        """
+        try:
+            if dataset == 'papers':
+                return self.store.merge_from(temp_path)
+
+            conn = self.store.conn
+            conn.execute("ATTACH DATABASE ? AS other", (str(temp_path),))
+            try:
+                with conn:
+                    if dataset == 'abstracts':
+                        cursor = conn.execute(
+                            "UPDATE records SET abstract = a.abstract, "
+                            "data = json_set(data, '$.abstract', a.abstract) "
+                            "FROM other.abstracts a WHERE records.id = a.corpus_id"
+                        )
+                    else:
+                        cursor = conn.execute(
+                            "INSERT OR IGNORE INTO citations (citing, cited) "
+                            "SELECT citing, cited FROM other.citations "
+                            "WHERE citing IN (SELECT id FROM records) "
+                            "OR cited IN (SELECT id FROM records)"
+                        )
+                    return cursor.rowcount
+            finally:
+                conn.execute("DETACH DATABASE other")
+        finally:
+            for suffix in ('', '-wal', '-shm'):
+                Path(f"{temp_path}{suffix}").unlink(missing_ok=True)
+
+    def resolve(self, paper_id: str) -> Optional[Dict]:
+        """
+        Get one paper by any supported identifier.
+
+        Args:
+            paper_id: Normalized identifier (CorpusId:, DOI:, PMID:, ARXIV:)
+                      or S2 paper ID
+
+        Returns:
+            Paper dictionary or None if not stored
+        """
+        prefix, sep, value = paper_id.partition(':')
+        if not sep:
+            found = self.store.search(limit=1, facets={'paper_id': paper_id})
+            return found[0] if found else None
+        if prefix == 'CorpusId':
+            return self.store.get(value)
+        if prefix in ID_FACETS:
+            found = self.store.search(limit=1, facets={ID_FACETS[prefix]: value})
+            return found[0] if found else None
+        return None
+
+    def get_many(self, paper_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get several papers by identifier.
+
+        Args:
+            paper_ids: Normalized identifiers (see resolve)
+
+        Returns:
+            Dict mapping identifier -> paper (missing papers are omitted)
+        """
+        corpus_ids = {p: p.split(':', 1)[1] for p in paper_ids if p.startswith('CorpusId:')}
+        by_corpus_id = self.store.get_many(corpus_ids.values())
+        found = {p: by_corpus_id[c] for p, c in corpus_ids.items() if c in by_corpus_id}
+
+        for paper_id in paper_ids:
+            if paper_id not in corpus_ids:
+                paper = self.resolve(paper_id)
+                if paper:
+                    found[paper_id] = paper
+        return found
+
+    def citation_count(self, corpus_id: str) -> int:
+        """
+        Citation count of a stored paper.
+
+        Uses the count shipped in the papers dataset (which covers the
+        whole corpus), falling back to the ingested citation edges.
+
+        Args:
+            corpus_id: S2 corpus ID
+
+        Returns:
+            Citation count (0 if unknown)
+        """
+        paper = self.store.get(corpus_id)
+        if paper and paper.get('citation_count'):
+            return paper['citation_count']
+        return self.store.conn.execute(
+            "SELECT COUNT(*) FROM citations WHERE cited = ?", (str(corpus_id),)
+        ).fetchone()[0]
+
+    def get_citing(self, corpus_id: str) -> List[str]:
+        """Corpus IDs of ingested papers citing a paper."""
+        return [row[0] for row in self.store.conn.execute(
+            "SELECT citing FROM citations WHERE cited = ?", (str(corpus_id),))]
+
+    def get_references(self, corpus_id: str) -> List[str]:
+        """Corpus IDs of papers a paper cites (from ingested edges)."""
+        return [row[0] for row in self.store.conn.execute(
+            "SELECT cited FROM citations WHERE citing = ?", (str(corpus_id),))]
+
+    def search(self, query: str, limit: int = 10, field: Optional[str] = None,
+               min_year: Optional[int] = None, max_year: Optional[int] = None) -> List[Dict]:
+        """
+        Search the store.
+
+        Args:
+            query: Free-text query (all words must match title, abstract,
+                   authors or journal)
+            limit: Maximum number of results
+            field: Restrict to one field of study (e.g. "Medicine")
+            min_year: Earliest publication year
+            max_year: Latest publication year
+
+        Returns:
+            List of paper dictionaries, best matches first
+        """
+        facets = {'field': field} if field else None
+        return self.store.search(query, limit=limit, facets=facets,
+                                 min_year=min_year, max_year=max_year)
+
+
+if __name__ == "__main__":
+    # Handle command line usage:
+    #   python s2_dataset.py ingest papers /data/s2/papers
+    #   python s2_dataset.py search thalamic stimulation seizures
+    if len(sys.argv) > 3 and sys.argv[1] == "ingest":
+        dataset = S2Dataset()
+        print(dataset.ingest(sys.argv[3], sys.argv[2]))
+    elif len(sys.argv) > 2 and sys.argv[1] == "search":
+        query = ' '.join(sys.argv[2:])
+        dataset = S2Dataset()
+        start = time.time()
+        papers = dataset.search(query, limit=10)
+        elapsed_ms = (time.time() - start) * 1000
+
+        print(f"Query: {query}")
+        print(f"Found {len(papers)} papers in {elapsed_ms:.1f} ms\n")
+        for i, paper in enumerate(papers, 1):
+            print(f"{i}. {paper['title']}")
+            print(f"   Year: {paper['year']}  Citations: {paper['citation_count']}  "
+                  f"Fields: {', '.join(paper['fields_of_study'])}")
+            print()
+    else:
+        print("Usage:")
+        print("  python s2_dataset.py ingest {papers|abstracts|citations} <directory>")
+        print("  python s2_dataset.py search <query>")
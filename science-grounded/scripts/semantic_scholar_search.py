@@ -11,9 +11,10 @@ import json
 import logging
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 import requests
 from urllib.parse import quote
 
@@ -24,6 +25,8 @@ from paper_utils import (
     rate_limit_request,
     get_cached_results,
     cache_results,
+    get_cached_value,
+    cache_value,
     sort_by_impact,
     log_api_request,
     timeout_handler,
@@ -38,6 +41,8 @@ logger = logging.getLogger(__name__)
 BASE_URL = "https://api.semanticscholar.org/graph/v1"
 PAPER_SEARCH_URL = f"{BASE_URL}/paper/search"
 PAPER_DETAILS_URL = f"{BASE_URL}/paper"
+PAPER_BATCH_URL = f"{BASE_URL}/paper/batch"
+PAPER_BULK_SEARCH_URL = f"{BASE_URL}/paper/search/bulk"
 
 # Fields to retrieve from API
 SEARCH_FIELDS = [
@@ -60,22 +65,90 @@ SEARCH_FIELDS = [
 MAX_RESULTS = 50
 DEFAULT_LIMIT = 10
 
+# Batch paper details (POST /paper/batch)
+BATCH_SIZE = 500  # API maximum IDs per request
+BATCH_WORKERS = 2  # Concurrent batches (matches the limiter burst)
+DETAILS_CACHE_NAMESPACE = "s2_paper"
+DETAILS_CACHE_TTL = 7 * 24 * 3600  # Paper metadata changes slowly: 7 days
+NOT_FOUND_CACHE_NAMESPACE = "s2_not_found"
+NOT_FOUND_CACHE_TTL = 24 * 3600  # New papers get indexed: retry unknown IDs daily
+
+# Bulk search (GET /paper/search/bulk, up to 1000 papers per page)
+BULK_RETRIES = 3  # Attempts per page before giving up (progress is kept)
+BULK_CURSOR_NAMESPACE = "s2_bulk_cursor"
+BULK_CURSOR_TTL = 30 * 24 * 3600  # Keep resume points for 30 days
+
+# External ID prefixes accepted by the Graph API, keyed by lower-case form
+ID_PREFIXES = {
+    'doi': 'DOI',
+    'pmid': 'PMID',
+    'pmcid': 'PMCID',
+    'arxiv': 'ARXIV',
+    'corpusid': 'CorpusId',
+    'mag': 'MAG',
+    'acl': 'ACL',
+    'url': 'URL',
+}
+
+
+def normalize_paper_id(paper_id: str) -> Optional[str]:
+    """
+    Normalize a paper identifier to the form the Graph API expects.
+
+    Prefixes are matched case-insensitively ("doi:", "arXiv:", "corpusid:")
+    and bare DOIs (starting with "10.") get a DOI: prefix. S2 paper IDs
+    and anything unrecognized are passed through unchanged.
+
+    Args:
+        paper_id: S2 paper ID or prefixed external ID
+
+    Returns:
+        Normalized identifier, or None if empty
+    """
+    paper_id = (paper_id or '').strip()
+    if not paper_id:
+        return None
+
+    prefix, sep, value = paper_id.partition(':')
+    if sep and prefix.lower() in ID_PREFIXES:
+        return f"{ID_PREFIXES[prefix.lower()]}:{value.strip()}"
+
+    if paper_id.startswith('10.'):
+        return f"DOI:{paper_id}"
+
+    return paper_id
+
 
 class SemanticScholarSearch:
     """
     Search for papers using Semantic Scholar API.
     """
 
-    def __init__(self):
-        """Initialize the Semantic Scholar search client."""
+    def __init__(self, dataset_path: Optional[Path] = None):
+        """
+        Initialize the Semantic Scholar search client.
+
+        Args:
+            dataset_path: Offline dataset store (defaults to mirrors/s2_dataset.sqlite)
+        """
         self.api_name = "semantic_scholar"
+        self.dataset_path = dataset_path
+        self._dataset = None
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Science-Grounded-Skill/1.0 (Educational/Research Tool)'
         })
 
+    @property
+    def dataset(self):
+        """Offline dataset store (opened on first use)."""
+        if self._dataset is None:
+            from s2_dataset import S2Dataset
+            self._dataset = S2Dataset(self.dataset_path)
+        return self._dataset
+
     def search(self, query: str, limit: int = DEFAULT_LIMIT,
-              use_cache: bool = True) -> List[Dict]:
+              use_cache: bool = True, offline: bool = False) -> List[Dict]:
         """
         Search for papers on Semantic Scholar.
 
@@ -83,6 +156,8 @@ class SemanticScholarSearch:
             query: Search query
             limit: Maximum number of results (max 50)
             use_cache: Whether to use cached results
+            offline: Serve the query from the local dataset store
+                     (see s2_dataset.py) instead of the API
 
         Returns:
             List of paper dictionaries with standardized format
@@ -93,6 +168,14 @@ class SemanticScholarSearch:
             logger.error("Query failed sanitization")
             return []
 
+        if offline:
+            if not self.dataset.is_available():
+                logger.warning("S2 dataset store is empty; run s2_dataset.py ingest first")
+                return []
+            papers = self.dataset.search(clean_query, limit=min(limit * 2, MAX_RESULTS))
+            logger.info(f"Found {len(papers)} papers in local S2 dataset")
+            return sort_by_impact(papers)[:limit]
+
         # Check cache first
         if use_cache:
             cached = get_cached_results(clean_query, self.api_name)
@@ -178,6 +261,136 @@ class SemanticScholarSearch:
             log_api_request(self.api_name, query, error=str(e))
             return []
 
+    def iter_search_bulk(self, query: str, sort: Optional[str] = None,
+                         min_year: Optional[int] = None, max_year: Optional[int] = None,
+                         max_results: Optional[int] = None,
+                         resume: bool = True) -> Iterator[Dict]:
+        """
+        Stream every match for a query from the bulk search endpoint.
+
+        Pages are requested one at a time with the continuation token the
+        API returns, so memory stays bounded by one page. The token for the
+        next page is saved in the cache once all papers of the current page
+        have been consumed, so an interrupted sweep resumes where it stopped
+        (the page in flight is delivered again). A completed sweep clears
+        its saved position.
+
+        Args:
+            query: Search query (bulk search also accepts +, | and - operators
+                   where the query sanitizer allows them)
+            sort: Server-side sort, e.g. "citationCount:desc" or "publicationDate:asc"
+                  (None for the API's default paperId order)
+            min_year: Earliest publication year (inclusive)
+            max_year: Latest publication year (inclusive)
+            max_results: Stop after this many papers (None for all)
+            resume: Continue from the saved position (False starts from the beginning)
+
+        Yields:
+            Standardized paper dictionaries
+        """
+        clean_query = sanitize_query(query)
+        if not clean_query:
+            logger.error("Query failed sanitization")
+            return
+
+        params = self._bulk_params(clean_query, sort, min_year, max_year)
+        cursor_key = self._bulk_cursor_key(params)
+        cursor = get_cached_value(cursor_key, BULK_CURSOR_NAMESPACE) if resume else None
+        token = cursor.get('token') if cursor else None
+        if token:
+            logger.info(f"Resuming Semantic Scholar bulk search after {cursor.get('seen', 0)} papers")
+
+        seen = cursor.get('seen', 0) if token else 0
+        yielded = 0
+        while max_results is None or yielded < max_results:
+            page_params = dict(params, token=token) if token else params
+            data = self._fetch_bulk_page(page_params)
+            if data is None:
+                logger.error("Bulk search page failed, sweep can be resumed")
+                return
+
+            if seen == 0:
+                logger.info(f"Bulk search for {clean_query[:50]}: {data.get('total', 0)} matches")
+
+            for paper in data.get('data') or []:
+                if max_results is not None and yielded >= max_results:
+                    return
+                std_paper = self._standardize_paper(paper)
+                if validate_paper_data(std_paper):
+                    yield std_paper
+                    yielded += 1
+
+            # Page consumed: persist the token for the next one
+            seen += len(data.get('data') or [])
+            token = data.get('token')
+            if not token:
+                logger.info(f"Bulk search complete after {seen} papers")
+                cache_value(cursor_key, {}, BULK_CURSOR_NAMESPACE, BULK_CURSOR_TTL)
+                return
+            cache_value(cursor_key, {'token': token, 'seen': seen},
+                        BULK_CURSOR_NAMESPACE, BULK_CURSOR_TTL)
+
+    def reset_bulk_cursor(self, query: str, sort: Optional[str] = None,
+                          min_year: Optional[int] = None, max_year: Optional[int] = None) -> None:
+        """
+        Forget the saved iter_search_bulk position for a query.
+
+        Args:
+            query: Search query
+            sort: Same value passed to iter_search_bulk
+            min_year: Same value passed to iter_search_bulk
+            max_year: Same value passed to iter_search_bulk
+        """
+        clean_query = sanitize_query(query)
+        if clean_query:
+            params = self._bulk_params(clean_query, sort, min_year, max_year)
+            cache_value(self._bulk_cursor_key(params), {}, BULK_CURSOR_NAMESPACE, BULK_CURSOR_TTL)
+
+    def _bulk_params(self, query: str, sort: Optional[str], min_year: Optional[int],
+                     max_year: Optional[int]) -> Dict:
+        """Build bulk search request parameters (year filter as "2015-2020", "2015-" or "-2020")."""
+        params = {'query': query, 'fields': ','.join(SEARCH_FIELDS)}
+        if sort:
+            params['sort'] = sort
+        if min_year or max_year:
+            params['year'] = f"{min_year or ''}-{max_year or ''}"
+        return params
+
+    def _bulk_cursor_key(self, params: Dict) -> str:
+        """Cache key for a bulk search cursor (tokens depend on query, sort and filters)."""
+        return f"{params['query']}|{params.get('sort', '')}|{params.get('year', '')}"
+
+    def _fetch_bulk_page(self, params: Dict) -> Optional[Dict]:
+        """
+        Fetch one bulk search page, retrying transient failures.
+
+        Args:
+            params: Request parameters (including the continuation token, if any)
+
+        Returns:
+            Response JSON, or None if every attempt failed
+        """
+        for attempt in range(1, BULK_RETRIES + 1):
+            rate_limit_request(self.api_name)
+            try:
+                response = self.session.get(PAPER_BULK_SEARCH_URL, params=params,
+                                            timeout=REQUEST_TIMEOUT * 3)
+                log_api_request(self.api_name, params['query'], response.status_code)
+
+                if response.status_code == 200:
+                    return response.json()
+                if response.status_code != 429 and response.status_code < 500:
+                    logger.error(f"Semantic Scholar bulk search error: {response.status_code}")
+                    return None
+                logger.warning(f"Bulk search page failed ({response.status_code}), "
+                               f"attempt {attempt}/{BULK_RETRIES}")
+
+            except Exception as e:
+                logger.warning(f"Bulk search page failed ({e}), attempt {attempt}/{BULK_RETRIES}")
+                log_api_request(self.api_name, params['query'], error=str(e))
+
+        return None
+
     def _standardize_paper(self, paper: Dict) -> Dict:
         """
         Convert Semantic Scholar format to standardized format.
@@ -223,21 +436,35 @@ class SemanticScholarSearch:
             'source': 'semantic_scholar',
             'paper_id': paper.get('paperId'),
             'fields_of_study': paper.get('fieldsOfStudy', []),
-            'publication_types': paper.get('publicationTypes', [])
+            'publication_types': paper.get('publicationTypes', []),
+            # DOI, PubMed, ArXiv, CorpusId, ... (used by paper_merger)
+            'external_ids': external_ids or {}
         }
 
         return std_paper
 
-    def get_paper_details(self, paper_id: str) -> Optional[Dict]:
+    def get_paper_details(self, paper_id: str, offline: bool = False) -> Optional[Dict]:
         """
         Get detailed information about a specific paper.
 
         Args:
-            paper_id: Semantic Scholar paper ID
+            paper_id: Semantic Scholar paper ID (or prefixed external ID)
+            offline: Look the paper up in the local dataset store
 
         Returns:
             Paper dictionary or None if not found
         """
+        paper_id = normalize_paper_id(paper_id)
+        if not paper_id:
+            return None
+
+        if offline:
+            return self.dataset.resolve(paper_id)
+
+        cached = get_cached_value(paper_id, DETAILS_CACHE_NAMESPACE)
+        if cached is not None:
+            return cached
+
         # Rate limit the request
         rate_limit_request(self.api_name)
 
@@ -249,8 +476,9 @@ class SemanticScholarSearch:
             response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT)
 
             if response.status_code == 200:
-                paper = response.json()
-                return self._standardize_paper(paper)
+                paper = self._standardize_paper(response.json())
+                cache_value(paper_id, paper, DETAILS_CACHE_NAMESPACE, DETAILS_CACHE_TTL)
+                return paper
             else:
                 logger.error(f"Failed to get paper details: {response.status_code}")
                 return None
@@ -259,6 +487,120 @@ class SemanticScholarSearch:
             logger.error(f"Error getting paper details: {e}")
             return None
 
+    def get_papers_batch(self, ids: List[str], use_cache: bool = True,
+                         offline: bool = False) -> Dict[str, Dict]:
+        """
+        Get details for many papers with as few requests as possible.
+
+        IDs may mix S2 paper IDs and prefixed external IDs (DOI:, PMID:,
+        ARXIV:, CorpusId:, ...). Uncached IDs are sent to /paper/batch in
+        chunks of BATCH_SIZE, up to BATCH_WORKERS chunks at a time, and
+        each paper found is cached under its normalized ID. IDs the API
+        does not know are remembered for NOT_FOUND_CACHE_TTL, so they are
+        not sent again meanwhile.
+
+        Args:
+            ids: Paper identifiers
+            use_cache: Whether to use cached paper details
+            offline: Look the papers up in the local dataset store
+
+        Returns:
+            Dict mapping each requested ID (as given) to its standardized
+            paper; IDs that were not found or whose batch failed are omitted
+        """
+        normalized = {}
+        for paper_id in ids:
+            key = normalize_paper_id(paper_id)
+            if key:
+                normalized[paper_id] = key
+
+        if offline:
+            found = self.dataset.get_many(list(dict.fromkeys(normalized.values())))
+            return {paper_id: found[key] for paper_id, key in normalized.items() if key in found}
+
+        found = {}
+        missing = []
+        for key in dict.fromkeys(normalized.values()):
+            cached = get_cached_value(key, DETAILS_CACHE_NAMESPACE) if use_cache else None
+            if cached is not None:
+                found[key] = cached
+            elif not (use_cache and get_cached_value(key, NOT_FOUND_CACHE_NAMESPACE)):
+                missing.append(key)
+
+        cached_count = len(found)
+        if missing:
+            batches = [missing[i:i + BATCH_SIZE] for i in range(0, len(missing), BATCH_SIZE)]
+            with ThreadPoolExecutor(max_workers=min(len(batches), BATCH_WORKERS)) as executor:
+                for batch, batch_papers in zip(batches, executor.map(self._fetch_batch, batches)):
+                    if batch_papers is None:
+                        continue  # Failed batch: nothing is known about these IDs
+                    for key in batch:
+                        if key in batch_papers:
+                            cache_value(key, batch_papers[key], DETAILS_CACHE_NAMESPACE, DETAILS_CACHE_TTL)
+                        else:
+                            cache_value(key, True, NOT_FOUND_CACHE_NAMESPACE, NOT_FOUND_CACHE_TTL)
+                    found.update(batch_papers)
+
+        logger.info(f"Batch details: {cached_count} cached, {len(found) - cached_count} fetched, "
+                    f"{len(normalized) - len(found)} not found")
+        return {paper_id: found[key] for paper_id, key in normalized.items() if key in found}
+
+    def get_citation_counts(self, ids: List[str], offline: bool = False) -> Dict[str, int]:
+        """
+        Look up citation counts for many papers.
+
+        Args:
+            ids: Paper identifiers (as accepted by get_papers_batch)
+            offline: Use the local dataset store instead of the API
+
+        Returns:
+            Dict mapping ID (as given) to citation count (unknown papers are omitted)
+        """
+        papers = self.get_papers_batch(ids, offline=offline)
+        if offline:
+            # Falls back to counting ingested citation edges
+            return {paper_id: self.dataset.citation_count(paper['corpus_id'])
+                    for paper_id, paper in papers.items()}
+        return {paper_id: paper.get('citation_count') or 0 for paper_id, paper in papers.items()}
+
+    def _fetch_batch(self, ids: List[str]) -> Optional[Dict[str, Dict]]:
+        """
+        Fetch one chunk of paper details with a single /paper/batch call.
+
+        Args:
+            ids: Normalized paper identifiers (at most BATCH_SIZE)
+
+        Returns:
+            Dict mapping identifier to standardized paper (unknown IDs
+            omitted), or None if the request failed
+        """
+        rate_limit_request(self.api_name)
+        params = {'fields': ','.join(SEARCH_FIELDS)}
+
+        try:
+            response = self.session.post(PAPER_BATCH_URL, params=params, json={'ids': ids},
+                                         timeout=REQUEST_TIMEOUT * 3)
+            log_api_request(self.api_name, f"batch of {len(ids)} ids", response.status_code)
+
+            if response.status_code == 429:
+                logger.error("Rate limit exceeded for Semantic Scholar")
+                return None
+            elif response.status_code != 200:
+                logger.error(f"Semantic Scholar batch error: {response.status_code}")
+                return None
+
+            # Results are aligned with the request; unknown IDs come back as null
+            papers = {}
+            for key, paper in zip(ids, response.json()):
+                if paper:
+                    papers[key] = self._standardize_paper(paper)
+            return papers
+
+        except Exception as e:
+            logger.error(f"Error fetching paper batch: {e}")
+            log_api_request(self.api_name, f"batch of {len(ids)} ids", error=str(e))
+            return None
+
 
 def test_semantic_scholar():
     """
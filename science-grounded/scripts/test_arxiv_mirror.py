@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Test suite for the local arXiv OAI-PMH mirror.
+Harvests from a local stand-in OAI-PMH server, so no network access is needed.
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append(str(Path(__file__).parent))
+import paper_utils
+from arxiv_mirror import ArxivMirror
+from arxiv_search import ArxivSearch
+
+PAGE_SIZE = 2
+
+
+class FakeOAI:
+    """In-memory OAI-PMH repository with paging, deletions and one-off failures."""
+
+    def __init__(self):
+        self.records = {}
+        self.requests = []
+        self.fail_next_token = False
+
+    def add(self, arxiv_id, set_spec, datestamp, categories, title, deleted=False):
+        self.records[arxiv_id] = dict(id=arxiv_id, set=set_spec, datestamp=datestamp,
+                                      categories=categories, title=title, deleted=deleted)
+
+    def _record_xml(self, r):
+        status = ' status="deleted"' if r['deleted'] else ''
+        header = (f'<header{status}><identifier>oai:arXiv.org:{r["id"]}</identifier>'
+                  f'<datestamp>{r["datestamp"]}</datestamp><setSpec>{r["set"]}</setSpec></header>')
+        if r['deleted']:
+            return f'<record>{header}</record>'
+        return f"""<record>{header}<metadata>
+          <arXiv xmlns="http://arxiv.org/OAI/arXiv/">
+            <id>{r['id']}</id><created>2024-01-01</created>
+            <authors><author><keyname>Brunton</keyname><forenames>Steven L.</forenames></author></authors>
+            <title>{r['title']}</title>
+            <categories>{r['categories']}</categories>
+            <abstract>  An abstract about {r['title'].lower()}.  </abstract>
+          </arXiv></metadata></record>"""
+
+    def respond(self, params):
+        self.requests.append(params)
+        if 'resumptionToken' in params:
+            if self.fail_next_token:
+                self.fail_next_token = False
+                return 500, ''
+            set_spec, from_date, offset = params['resumptionToken'].split('|')
+            offset = int(offset)
+        else:
+            set_spec, from_date, offset = params['set'], params.get('from', ''), 0
+
+        matches = sorted((r for r in self.records.values()
+                          if r['set'] == set_spec and r['datestamp'] >= from_date),
+                         key=lambda r: r['id'])
+        if not matches:
+            body = '<error code="noRecordsMatch">No matching records</error>'
+        else:
+            page = matches[offset:offset + PAGE_SIZE]
+            more = offset + PAGE_SIZE < len(matches)
+            token = f'{set_spec}|{from_date}|{offset + PAGE_SIZE}' if more else ''
+            body = (f'<ListRecords>{"".join(self._record_xml(r) for r in page)}'
+                    f'<resumptionToken cursor="{offset}">{token}</resumptionToken></ListRecords>')
+        return 200, ('<?xml version="1.0" encoding="UTF-8"?>'
+                     '<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">'
+                     f'<responseDate>2024-01-06T00:00:00Z</responseDate>{body}</OAI-PMH>')
+
+
+def _serve(repo):
+    """Start a stand-in OAI-PMH server; returns (server, base_url)."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+            status, body = repo.respond(params)
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/xml')
+            self.end_headers()
+            self.wfile.write(body.encode())
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/oai"
+
+
+def _fixture_repo():
+    repo = FakeOAI()
+    repo.add('2401.00001', 'math', '2024-01-02', 'math.DS', 'Koopman operator spectra')
+    repo.add('2401.00002', 'math', '2024-01-02', 'math.AG', 'Algebraic curves')
+    repo.add('2401.00003', 'cs', '2024-01-02', 'cs.LG stat.ML', 'Deep Koopman networks')
+    repo.add('2401.00004', 'cs', '2024-01-03', 'cs.LG', 'Seizure forecasting transformers')
+    repo.add('2401.00005', 'cs', '2024-01-03', 'cs.CR', 'Cryptographic protocols')
+    repo.add('2401.00007', 'q-bio', '2024-01-03', 'q-bio.NC', 'Koopman analysis of neural oscillations')
+    return repo
+
+
+def test_harvest():
+    """Test full, resumed and incremental harvests."""
+    print("=== TEST 1: OAI-PMH Harvest ===\n")
+    repo = _fixture_repo()
+    server, base_url = _serve(repo)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            mirror = ArxivMirror(Path(tmp) / "arxiv.sqlite", base_url=base_url)
+            sets = ['cs', 'math', 'q-bio']
+
+            # First run fails on the cs set's second page and must resume there
+            repo.fail_next_token = True
+            mirror.harvest(sets=sets)
+            interrupted = not mirror.is_fresh()
+            repo.requests.clear()
+            summary = mirror.harvest(sets=sets)
+            resumed_with_token = 'resumptionToken' in repo.requests[0]
+
+            checks = [
+                ("Interrupted harvest not marked fresh", interrupted),
+                ("Resumed from saved resumptionToken", resumed_with_token),
+                ("Only relevant categories kept", mirror.get('2401.00002') is None
+                 and mirror.get('2401.00005') is None),
+                ("Relevant records stored", all(mirror.get(i) for i in
+                                                ('2401.00001', '2401.00003', '2401.00004', '2401.00007'))),
+                ("Authors parsed", mirror.get('2401.00001')['authors'] == ['Steven L. Brunton']),
+                ("Mirror fresh after harvest", mirror.is_fresh()),
+            ]
+
+            # Next day: one new paper, one withdrawn
+            repo.add('2401.00006', 'math', '2024-01-05', 'math.DS', 'Koopman mode decomposition')
+            repo.add('2401.00001', 'math', '2024-01-05', 'math.DS', '', deleted=True)
+            repo.requests.clear()
+            update = mirror.harvest(sets=sets)
+            math_request = next(r for r in repo.requests if r.get('set') == 'math')
+
+            checks += [
+                ("Incremental harvest uses last datestamp", math_request.get('from') == '2024-01-02'),
+                ("New record added", mirror.get('2401.00006') is not None),
+                ("Deleted record removed", mirror.get('2401.00001') is None and update['deleted'] == 1),
+            ]
+    finally:
+        server.shutdown()
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_local_search():
+    """Test that ArxivSearch answers category-filtered queries from a fresh mirror."""
+    print("=== TEST 2: Local Search ===\n")
+    repo = _fixture_repo()
+    server, base_url = _serve(repo)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "arxiv.sqlite"
+            mirror = ArxivMirror(path, base_url=base_url)
+            mirror.harvest(sets=['cs', 'math', 'q-bio'])
+            searcher = ArxivSearch(mirror_path=path)
+
+            def ids(papers):
+                return {p['arxiv_id'] for p in papers}
+
+            start = time.time()
+            koopman = searcher.search("Koopman", limit=10)
+            elapsed_ms = (time.time() - start) * 1000
+
+            checks = [
+                ("Filtered query served locally", ids(koopman) == {'2401.00001', '2401.00003', '2401.00007'}),
+                ("Sub-50ms local query", elapsed_ms < 50),
+                ("neuro_only restricts to q-bio.NC", ids(searcher.search("Koopman", neuro_only=True))
+                 == {'2401.00007'}),
+                ("cat: prefix", ids(searcher.search("Koopman AND cat:stat.ML", filter_categories=False))
+                 == {'2401.00003'}),
+                ("au: prefix", len(mirror.search('au:Brunton')) == 4),
+                ("Unfiltered query goes to live API",
+                 searcher._search_mirror("Koopman", 10, False, False) is None),
+            ]
+
+            mirror.store.set_meta('last_harvest', (datetime.now() - timedelta(days=7)).isoformat())
+            checks.append(("Stale mirror goes to live API",
+                           searcher._search_mirror("Koopman", 10, True, False) is None))
+    finally:
+        server.shutdown()
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all arXiv mirror tests."""
+    print("\n" + "="*70)
+    print("ARXIV OAI-PMH MIRROR - TEST SUITE")
+    print("="*70 + "\n")
+
+    # The stand-in server is local, so skip the 3 s politeness delay
+    paper_utils.API_RATE_LIMITS['arxiv'] = (0.0, 1)
+
+    tests = [
+        test_harvest,
+        test_local_search,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
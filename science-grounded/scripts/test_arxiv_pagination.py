@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test suite for paginated, resumable arXiv retrieval (ArxivSearch.iter_search).
+The arXiv export API is mocked with `responses`, so no network access is needed.
+"""
+
+import re
+import sys
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import responses
+
+sys.path.append(str(Path(__file__).parent))
+import arxiv_search
+import paper_utils
+from arxiv_search import ArxivSearch
+
+TOTAL = 7
+QUERY = "koopman pagination test"
+
+
+def _entry(i):
+    """Build one Atom entry."""
+    return f"""
+  <entry>
+    <id>http://arxiv.org/abs/2401.0000{i}v1</id>
+    <updated>2024-01-{i + 1:02d}T00:00:00Z</updated>
+    <published>2024-01-{i + 1:02d}T00:00:00Z</published>
+    <title>Koopman operator paper {i}</title>
+    <summary>Abstract {i}</summary>
+    <author><name>Author {i}</name></author>
+    <link href="http://arxiv.org/pdf/2401.0000{i}v1" rel="related" title="pdf" type="application/pdf"/>
+    <arxiv:primary_category term="math.DS" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="math.DS" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>"""
+
+
+class FakeArxiv:
+    """Serves TOTAL entries by start/max_results, optionally failing once."""
+
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+        self.starts = []
+
+    def __call__(self, request):
+        params = parse_qs(urlparse(request.url).query)
+        start = int(params['start'][0])
+        size = int(params['max_results'][0])
+        self.starts.append(start)
+
+        if start == self.fail_at:
+            self.fail_at = None
+            return 503, {}, "Service Unavailable"
+
+        entries = ''.join(_entry(i) for i in range(start, min(start + size, TOTAL)))
+        feed = f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/"
+      xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <title>arXiv Query</title>
+  <opensearch:totalResults>{TOTAL}</opensearch:totalResults>
+  <opensearch:startIndex>{start}</opensearch:startIndex>
+  <opensearch:itemsPerPage>{size}</opensearch:itemsPerPage>{entries}
+</feed>"""
+        return 200, {}, feed
+
+
+def _harvest(searcher, fake, **kwargs):
+    with responses.RequestsMock() as mock:
+        mock.add_callback(responses.GET, re.compile(r"https://export\.arxiv\.org/api/query.*"),
+                          callback=fake)
+        return [[p['arxiv_id'] for p in page] for page in searcher.iter_search(QUERY, **kwargs)]
+
+
+def test_pagination():
+    """Test page sizing, max_results and cursor-based resumption."""
+    print("=== TEST 1: Paginated Harvest ===\n")
+    searcher = ArxivSearch()
+
+    fake = FakeArxiv()
+    pages = _harvest(searcher, fake, page_size=3, resume=False)
+    checks = [
+        ("Pages of requested size", [len(p) for p in pages] == [3, 3, 1]),
+        ("One request per page", fake.starts == [0, 3, 6]),
+    ]
+
+    searcher.reset_cursor(QUERY)
+    capped = _harvest(searcher, FakeArxiv(), page_size=3, max_results=4, resume=False)
+    rest = FakeArxiv()
+    after_cap = _harvest(searcher, rest, page_size=3)
+    checks += [
+        ("max_results honoured", sum(len(p) for p in capped) == 4),
+        ("Cursor saved after the last paper delivered", rest.starts[0] == 4),
+        ("Resume after truncation loses nothing", [i for p in capped + after_cap for i in p]
+         == [f'2401.0000{i}v1' for i in range(TOTAL)]),
+    ]
+
+    # A failure part-way through keeps the pages already consumed
+    searcher.reset_cursor(QUERY)
+    failing = FakeArxiv(fail_at=3)
+    original_retries = arxiv_search.PAGE_RETRIES
+    arxiv_search.PAGE_RETRIES = 1
+    try:
+        first_run = _harvest(searcher, failing, page_size=3)
+    finally:
+        arxiv_search.PAGE_RETRIES = original_retries
+    resumed = FakeArxiv()
+    second_run = _harvest(searcher, resumed, page_size=3)
+    checks += [
+        ("Failed run keeps first page", [len(p) for p in first_run] == [3]),
+        ("Resume starts at saved cursor", resumed.starts[0] == 3),
+        ("Resume completes harvest", sum(len(p) for p in first_run + second_run) == TOTAL),
+    ]
+    searcher.reset_cursor(QUERY)
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all arXiv pagination tests."""
+    print("\n" + "="*70)
+    print("ARXIV PAGINATION - TEST SUITE")
+    print("="*70 + "\n")
+
+    # Pages are mocked, so skip the 3 s politeness delay
+    paper_utils.API_RATE_LIMITS['arxiv'] = (0.0, 1)
+
+    tests = [
+        test_pagination,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Test suite for the rolling-window bioRxiv/medRxiv mirror.
+The /details API is mocked with `responses`, so no network access is needed.
+"""
+
+import json
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import responses
+
+sys.path.append(str(Path(__file__).parent))
+import paper_utils
+from biorxiv_mirror import BiorxivMirror
+from biorxiv_search import BiorxivSearch, PAGE_SIZE
+
+
+def _day(days_ago):
+    return (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+
+
+class FakeDetails:
+    """Date-interval aware /details listing with request logging."""
+
+    def __init__(self):
+        self.records = {'biorxiv': [], 'medrxiv': []}
+        self.intervals = []
+        self.fail_cursor = None
+
+    def add(self, server, doi, days_ago, title, version=1, category='neuroscience'):
+        self.records[server].append({
+            'doi': doi, 'title': title, 'authors': 'Cash, S.; Brown, E.',
+            'date': _day(days_ago), 'version': version, 'category': category,
+            'abstract': f'{title}. Intracranial recordings.'})
+
+    def __call__(self, request):
+        server, start, end, cursor = request.url.split('/details/')[1].split('/')[:4]
+        cursor = int(cursor)
+        self.intervals.append((server, start, end, cursor))
+        if cursor == self.fail_cursor:
+            return 500, {}, ''
+        window = sorted((r for r in self.records[server] if start <= r['date'] <= end),
+                        key=lambda r: r['date'])
+        page = window[cursor:cursor + PAGE_SIZE]
+        body = {'messages': [{'status': 'ok' if page else 'no posts found',
+                              'total': str(len(window)), 'cursor': cursor}],
+                'collection': page}
+        return 200, {}, json.dumps(body)
+
+
+def _mock(fake):
+    mock = responses.RequestsMock()
+    mock.add_callback(responses.GET, re.compile(r"https://api\.biorxiv\.org/details/.*"),
+                      callback=fake)
+    return mock
+
+
+def _fixture():
+    fake = FakeDetails()
+    for i in range(250):
+        fake.add('biorxiv', f'10.1101/b{i:04d}', 170 - i // 2, f'Protein folding dynamics {i}',
+                 category='biophysics')
+    fake.add('biorxiv', '10.1101/seiz1', 100, 'Seizure onset zone mapping')
+    fake.add('biorxiv', '10.1101/seiz1', 90, 'Seizure onset zone mapping (revised)', version=2)
+    fake.add('medrxiv', '10.1101/med1', 10, 'Seizure forecasting in clinical EEG', category='neurology')
+    fake.add('medrxiv', '10.1101/med2', 60, 'Long COVID cohort', category='epidemiology')
+    return fake
+
+
+def test_sync():
+    """Test initial sync, daily deltas, version replacement and pruning."""
+    print("=== TEST 1: Sync ===\n")
+    fake = _fixture()
+
+    with tempfile.TemporaryDirectory() as tmp, _mock(fake):
+        mirror = BiorxivMirror(Path(tmp) / "biorxiv.sqlite")
+        first = mirror.sync()
+        checks = [
+            ("Whole window synced", first['written'] == {'biorxiv': 252, 'medrxiv': 2}),
+            ("All pages of the window walked",
+             sorted(c for s, _, _, c in fake.intervals if s == 'biorxiv') == [0, 100, 200]),
+            ("Later version replaces earlier", mirror.store.get('10.1101/seiz1')['version'] == 2),
+            ("Mirror fresh after sync", mirror.is_fresh()),
+        ]
+
+        # Next day: only the days since the last sync are requested
+        fake.intervals.clear()
+        fake.add('medrxiv', '10.1101/med3', 0, 'Thalamic stimulation outcomes', category='neurology')
+        mirror.sync()
+        checks += [
+            ("Delta sync requests only today", {start for _, start, _, _ in fake.intervals} == {_day(0)}),
+            ("New preprint added", mirror.store.get('10.1101/med3') is not None),
+        ]
+
+        # Shrinking the window prunes older preprints, and undated ones
+        mirror.store.add_records([{'doi': '10.1101/nodate', 'title': 'Undated preprint', 'date': ''}])
+        pruned = BiorxivMirror(Path(tmp) / "biorxiv.sqlite", window_days=30).sync()['pruned']
+        checks.append(("Preprints outside window pruned",
+                       pruned > 0 and mirror.store.get('10.1101/med2') is None
+                       and mirror.store.get('10.1101/nodate') is None))
+
+        # A failed page keeps the previous sync point
+        mirror.store.set_meta('synced_through:biorxiv', _day(170))
+        fake.fail_cursor = 100
+        mirror.store.set_meta('last_sync', (datetime.now() - timedelta(days=5)).isoformat())
+        mirror.sync(servers=('biorxiv',))
+        checks.append(("Failed page does not advance sync point",
+                       mirror.store.get_meta('synced_through:biorxiv') == _day(170)
+                       and not mirror.is_fresh()))
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_local_search():
+    """Test that BiorxivSearch filters locally while the mirror is fresh."""
+    print("=== TEST 2: Local Search ===\n")
+    fake = _fixture()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "biorxiv.sqlite"
+        with _mock(fake):
+            BiorxivMirror(path).sync()
+
+        # No mock is active: any live request would fail
+        searcher = BiorxivSearch(mirror_path=path)
+        start = time.time()
+        both = searcher.search("seizure onset", limit=10, use_cache=False)
+        elapsed_ms = (time.time() - start) * 1000
+        med = searcher.search("seizure onset", server="medrxiv", limit=10, use_cache=False)
+
+        checks = [
+            ("Matches from both servers", {p['doi'] for p in both} == {'10.1101/seiz1', '10.1101/med1'}),
+            # The newer medRxiv preprint matches one query word, the older bioRxiv one both
+            ("Full-text relevance order kept", [p['doi'] for p in both] == ['10.1101/seiz1', '10.1101/med1']),
+            ("Server filter", [p['doi'] for p in med] == ['10.1101/med1']),
+            ("Sub-50ms local query", elapsed_ms < 50),
+        ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all bioRxiv mirror tests."""
+    print("\n" + "="*70)
+    print("BIORXIV ROLLING MIRROR - TEST SUITE")
+    print("="*70 + "\n")
+
+    # Pages are mocked, so skip the politeness delay
+    paper_utils.API_RATE_LIMITS['biorxiv'] = (0.0, 1)
+
+    tests = [
+        test_sync,
+        test_local_search,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Test suite for bioRxiv/medRxiv cursor pagination.
+The /details API is mocked with `responses`, so no network access is needed.
+"""
+
+import json
+import re
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import responses
+
+sys.path.append(str(Path(__file__).parent))
+import paper_utils
+from biorxiv_search import BiorxivSearch, PAGE_SIZE
+
+TOTALS = {'biorxiv': 1000, 'medrxiv': 350}
+
+
+def _record(server, i):
+    """Record i of a server's window (oldest first); every 50th is about seizures."""
+    topic = "seizure onset" if i % 50 == 7 else "protein folding"
+    return {
+        'doi': f'10.1101/{server}.{i:05d}',
+        'title': f'{topic.capitalize()} study {i} on {server}',
+        'authors': 'Cash, S.; Brown, E.',
+        'date': (datetime(2026, 1, 1) + timedelta(days=i * 180 // TOTALS[server])).strftime('%Y-%m-%d'),
+        'version': 1,
+        'category': 'cell biology' if server == 'biorxiv' else 'infectious diseases',
+        'abstract': f'We study {topic}.',
+    }
+
+
+class FakeDetails:
+    """Serves /details pages and records which cursors were requested."""
+
+    def __init__(self):
+        self.cursors = {server: [] for server in TOTALS}
+
+    def __call__(self, request):
+        server, _, _, cursor = request.url.split('/details/')[1].split('/')[:4]
+        cursor = int(cursor)
+        self.cursors[server].append(cursor)
+        total = TOTALS[server]
+        collection = [_record(server, i) for i in range(cursor, min(cursor + PAGE_SIZE, total))]
+        status = 'ok' if collection else 'no posts found'
+        body = {'messages': [{'status': status, 'cursor': cursor, 'count': len(collection),
+                              'total': str(total)}],
+                'collection': collection}
+        return 200, {}, json.dumps(body)
+
+
+def _search(query, server, limit):
+    fake = FakeDetails()
+    with responses.RequestsMock() as mock:
+        mock.add_callback(responses.GET, re.compile(r"https://api\.biorxiv\.org/details/.*"),
+                          callback=fake)
+        papers = BiorxivSearch().search(query, server=server, limit=limit, use_cache=False)
+    return papers, fake
+
+
+def test_pagination():
+    """Test full cursor walking, early stopping and both-server search."""
+    print("=== TEST 1: Cursor Pagination ===\n")
+
+    # 20 seizure papers on bioRxiv: asking for 50 candidates forces a full walk
+    full, full_fake = _search("seizure onset zones", "biorxiv", limit=25)
+    # Asking for 2 (4 candidates) should stop after the newest pages
+    few, few_fake = _search("seizure onset zones", "biorxiv", limit=2)
+    both, both_fake = _search("seizure onset zones", "both", limit=50)
+
+    pages = -(-TOTALS['biorxiv'] // PAGE_SIZE)
+    checks = [
+        ("Every page walked when needed", sorted(full_fake.cursors['biorxiv'])
+         == list(range(0, TOTALS['biorxiv'], PAGE_SIZE))),
+        ("Matches beyond the first page found", len(full) == 20),
+        ("Early stop fetches fewer pages", len(few_fake.cursors['biorxiv']) < pages),
+        ("Newest matches returned first", few[0]['doi'] == '10.1101/biorxiv.00957'),
+        ("Both servers searched", {p['server'] for p in both} == {'biorxiv', 'medrxiv'}),
+        ("All medRxiv pages walked", len(both_fake.cursors['medrxiv']) == 4),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_window_index():
+    """Test that a window is indexed once and matches are scored across pages."""
+    print("=== TEST 2: Window Index ===\n")
+
+    fake = FakeDetails()
+    searcher = BiorxivSearch()
+    with responses.RequestsMock() as mock:
+        mock.add_callback(responses.GET, re.compile(r"https://api\.biorxiv\.org/details/.*"),
+                          callback=fake)
+        first = searcher.search("seizure onset zones", server="biorxiv", limit=25, use_cache=False)
+        fetched = len(fake.cursors['biorxiv'])
+        # Every record matches: three pages of the window, scored together
+        mixed = searcher._get_recent_papers("biorxiv", "study 957 folding", limit=300)
+    index, pages = searcher._window_index('biorxiv', *next(iter(searcher._windows.values()))[:2])
+    best = [p['doi'] for p in mixed if p['match_score'] == 1.0]
+
+    checks = [
+        ("Every record indexed once", len(index) == TOTALS['biorxiv']
+         and len(pages) == -(-TOTALS['biorxiv'] // PAGE_SIZE)),
+        ("Second query reuses the window index", fake.cursors['biorxiv'][fetched:] == [0]),
+        ("Same results from the index", len(first) == 20),
+        ("Scores normalized across pages", len(mixed) == 300
+         and best == ['10.1101/biorxiv.00957']),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_category_only_pages():
+    """Test that category-only papers do not stop the walk before term matches."""
+    print("=== TEST 3: Category-Only Pages ===\n")
+
+    total = 300
+    fetched = []
+
+    def details(request):
+        cursor = int(request.url.split('/details/')[1].split('/')[3])
+        fetched.append(cursor)
+        collection = []
+        for i in range(cursor, min(cursor + PAGE_SIZE, total)):
+            record = _record('biorxiv', i)
+            # Every paper is in a relevant category; only the last page walked mentions the query
+            record['title'] = 'Thalamic stimulation in epilepsy' if i == 105 else f'Protein folding study {i}'
+            record['abstract'] = 'We study protein folding.'
+            record['category'] = 'neuroscience'
+            collection.append(record)
+        body = {'messages': [{'status': 'ok', 'cursor': cursor, 'count': len(collection),
+                              'total': str(total)}],
+                'collection': collection}
+        return 200, {}, json.dumps(body)
+
+    with responses.RequestsMock() as mock:
+        mock.add_callback(responses.GET, re.compile(r"https://api\.biorxiv\.org/details/.*"),
+                          callback=details)
+        papers = BiorxivSearch()._get_recent_papers("biorxiv", "thalamic", limit=20)
+    scored = [p for p in papers if p['match_score'] > 0]
+
+    checks = [
+        ("First page alone holds more category-only papers than the limit", PAGE_SIZE > 20),
+        ("Whole window walked", sorted(fetched) == [0, 100, 200]),
+        ("Term match on the last page found", [p['doi'] for p in scored] == ['10.1101/biorxiv.00105']),
+        ("Category-only papers still added", len(papers) == total),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all bioRxiv pagination tests."""
+    print("\n" + "="*70)
+    print("BIORXIV PAGINATION - TEST SUITE")
+    print("="*70 + "\n")
+
+    # Pages are mocked, so skip the politeness delay
+    paper_utils.API_RATE_LIMITS['biorxiv'] = (0.0, 1)
+
+    tests = [
+        test_pagination,
+        test_window_index,
+        test_category_only_pages,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Test suite for BM25 ranking of the local KB and merged remote results.
+Uses synthetic papers and a temporary knowledge base (no network needed).
+"""
+
+import json
+import math
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent))
+from bm25 import BM25Index, bm25_scores
+from inverted_index import tokenize
+from local_kb_search import LocalKBSearch
+from ranking import rank_papers
+
+VOCABULARY = ['seizure', 'onset', 'zone', 'thalamic', 'stimulation', 'hippocampal', 'forecasting',
+              'network', 'cortex', 'epilepsy', 'model', 'patient', 'recording', 'koopman', 'spike',
+              'interictal', 'responsive', 'neurostimulation', 'connectivity', 'imaging']
+
+
+def _reference_scores(docs, fields, query, k1=1.5, b=0.75):
+    """Textbook BM25F, one document and term at a time."""
+    tokens = [{f: tokenize(d.get(f) or '') for f in fields} for d in docs]
+    average = {f: sum(len(t[f]) for t in tokens) / len(docs) for f in fields}
+    scores = []
+    for doc_tokens in tokens:
+        score = 0.0
+        for term in dict.fromkeys(tokenize(query)):
+            tf = sum(w * doc_tokens[f].count(term) / (1 - b + b * len(doc_tokens[f]) / average[f])
+                     for f, w in fields.items() if average[f])
+            df = sum(any(term in t[f] for f in fields) for t in tokens)
+            if tf:
+                idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+                score += idf * tf * (k1 + 1) / (tf + k1)
+        scores.append(score)
+    return scores
+
+
+def _synthetic(rng, n):
+    return [{'title': ' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(4, 10))),
+             'abstract': ' '.join(rng.choice(VOCABULARY + ['the', 'with', 'results'] * 5)
+                                  for _ in range(rng.randint(20, 200)))}
+            for _ in range(n)]
+
+
+def test_scoring():
+    """Test BM25 scores against a per-document reference."""
+    print("=== TEST 1: BM25 Scoring ===\n")
+
+    rng = random.Random(4)
+    docs = _synthetic(rng, 300)
+    fields = {'title': 2.0, 'abstract': 1.0}
+    index = BM25Index(docs, fields=fields)
+    queries = ['seizure onset zone', 'thalamic stimulation', 'Koopman spikes', 'unseen words']
+    agree = all(np.allclose(index.scores(q), _reference_scores(docs, fields, q)) for q in queries)
+
+    short = {'title': 'Seizure onset zone', 'abstract': 'Seizure onset zone localization.'}
+    long = {'title': 'Review of epilepsy surgery',
+            'abstract': ' '.join(['seizure onset zone'] * 5 + ['surgery outcomes and imaging'] * 200)}
+    ranked = BM25Index([long, short]).search('seizure onset zone')
+    hits = index.search('thalamic stimulation', k=5)
+
+    checks = [
+        ("Scores equal textbook BM25F", agree),
+        ("Short focused paper beats long paper with more raw hits", [doc_id for doc_id, _ in ranked] == [1, 0]),
+        ("search(k) is the head of the score order", [doc_id for doc_id, _ in hits]
+         == list(np.argsort(-index.scores('thalamic stimulation'), kind='stable')[:5])),
+        ("Only documents with a query term returned", BM25Index([short, long]).search('koopman') == []),
+        ("Plurals and case folded", index.matched_terms(0, 'SEIZURES Onset') ==
+         [t for t in ['seizure', 'onset'] if t in tokenize(docs[0]['title'] + ' ' + docs[0]['abstract'])]),
+        ("Empty collection", len(BM25Index([]).scores('seizure')) == 0 and BM25Index([]).search('x') == []),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_local_kb():
+    """Test local KB search and relevance for merged remote results."""
+    print("=== TEST 2: Local KB and Merged Results ===\n")
+
+    padding = ' '.join(['Methods and results of the recording sessions.'] * 400)
+    with tempfile.TemporaryDirectory() as tmp:
+        papers_dir = Path(tmp) / 'raw' / 'papers'
+        for name, metadata, text in [
+            ('gregg_2025_thalamic_stimulation_network',
+             {'title': 'Thalamic stimulation network effects', 'authors': ['Gregg NM'], 'year': 2025},
+             ' '.join(['thalamic stimulation'] * 10) + ' ' + padding),
+            ('smith_2020_epilepsy_review',
+             {'title': 'Epilepsy surgery review', 'authors': ['Smith J'], 'year': 2020},
+             ' '.join(['thalamic stimulation'] * 30) + ' ' + padding * 3),
+            ('mivalt_2023_impedance_rhythms', None, 'Impedance rhythms in the hippocampus. ' + padding),
+        ]:
+            (papers_dir / name).mkdir(parents=True)
+            if metadata:
+                (papers_dir / name / 'extraction.json').write_text(json.dumps({'metadata': metadata}))
+            (papers_dir / name / 'clean_text.txt').write_text(text)
+
+        searcher = LocalKBSearch(kb_path=Path(tmp))
+        thalamic = searcher.search('thalamic stimulation', limit=5)
+        impedance = searcher.search('impedance rhythms', limit=5)
+        gregg = searcher.search('Gregg', limit=5)
+        index = searcher._search_index
+        searcher.search('epilepsy')
+
+    merged = [
+        {'title': 'Deep learning for sleep staging', 'abstract': 'Sleep EEG.', 'citation_count': 5,
+         'year': 2024, 'source': 'pubmed'},
+        {'title': 'Seizure onset zone localization', 'abstract': 'Intracranial seizure onset.',
+         'citation_count': 5, 'year': 2024, 'source': 'semantic_scholar'},
+    ]
+    relevance = bm25_scores(merged, 'seizure onset zone')
+    ranked = rank_papers(merged, k=2, relevance=relevance)
+
+    checks = [
+        ("Title match outranks a longer paper with more raw hits",
+         [r['paper_id'] for r in thalamic][:2] == ['gregg_2025_thalamic_stimulation_network',
+                                                  'smith_2020_epilepsy_review']),
+        ("Result fields kept", thalamic[0]['source'] == 'local_kb' and thalamic[0]['year'] == 2025
+         and thalamic[0]['matched_keywords'] == ['thalamic', 'stimulation']
+         and thalamic[0]['score'] >= thalamic[1]['score']),
+        ("Paper without extraction.json found by folder name and text",
+         impedance[0]['paper_id'] == 'mivalt_2023_impedance_rhythms'
+         and impedance[0]['title'] == 'Mivalt 2023 Impedance Rhythms'),
+        ("Author search", [r['paper_id'] for r in gregg] == ['gregg_2025_thalamic_stimulation_network']),
+        ("Index built once per searcher", searcher._search_index is index),
+        ("Unconfigured KB returns nothing", LocalKBSearch(kb_path=Path(tmp) / 'missing').search('x') == []),
+        ("Relevance reorders merged remote results", relevance[0] == 0
+         and ranked[0]['title'] == 'Seizure onset zone localization'),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_speed():
+    """Test index build and query time on a large result set."""
+    print("=== TEST 3: Speed ===\n")
+
+    rng = random.Random(8)
+    docs = _synthetic(rng, 10000)
+
+    start = time.time()
+    index = BM25Index(docs)
+    build_ms = (time.time() - start) * 1000
+
+    queries = [' '.join(rng.sample(VOCABULARY, 3)) for _ in range(100)]
+    start = time.time()
+    for query in queries:
+        index.search(query, k=10)
+    query_ms = (time.time() - start) * 1000 / len(queries)
+    print(f"10k papers: index built in {build_ms:.0f} ms, {query_ms:.2f} ms per top-10 query")
+
+    checks = [
+        ("10k papers indexed in under 2 s", build_ms < 2000),
+        ("Top-10 query over 10k papers in under 20 ms", query_ms < 20),
+        ("Every query term contributes", len(index.search(queries[0])) > 0),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all BM25 tests."""
+    print("\n" + "="*70)
+    print("BM25 RANKING - TEST SUITE")
+    print("="*70 + "\n")
+
+    tests = [
+        test_scoring,
+        test_local_kb,
+        test_speed,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
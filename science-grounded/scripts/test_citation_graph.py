@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Test suite for citation-graph expansion.
+Semantic Scholar endpoints are mocked with `responses`, so no network access is needed.
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import responses
+
+sys.path.append(str(Path(__file__).parent))
+import paper_utils
+from paper_utils import cache, get_cache_key
+from citation_graph import (
+    CitationGraph, min_citations, year_range, min_relevance, EDGE_CACHE_NAMESPACE, MAX_EDGES_PER_PAPER
+)
+from semantic_scholar_search import DETAILS_CACHE_NAMESPACE, PAPER_BATCH_URL
+
+FILLER = [f"F{i:04d}" for i in range(1500)]
+
+
+def _paper(paper_id, year=2020, citations=5, title=None):
+    return {'paperId': paper_id, 'title': title or f'Protein folding {paper_id}',
+            'authors': [{'name': 'Sydney Cash'}], 'year': year, 'abstract': '',
+            'citationCount': citations}
+
+
+PAPERS = {
+    'P0': _paper('P0', 2018, 100, 'Seizure onset zone mapping in epilepsy'),
+    'P1': _paper('P1', 2019, 40, 'Epilepsy seizure networks'),
+    'P2': _paper('P2', 2020, 30),
+    'P3': _paper('P3', 2021, 20, 'Seizure forecasting in epilepsy'),
+    'P4': _paper('P4', 2022, 10),
+    'OLD': _paper('OLD', 2005, 50),
+    'LOW': _paper('LOW', 2023, 0),
+    'P5': _paper('P5', 2023, 3),
+    'R1': _paper('R1', 2010, 300),
+    'R2': _paper('R2', 2012, 200),
+}
+PAPERS.update({f: _paper(f, 2024, 1) for f in FILLER})
+
+CITED_BY = {
+    'P0': ['P1', 'P2', 'P3', 'P4', 'OLD', 'LOW'],
+    'P1': ['P2', 'P5'] + FILLER,
+}
+REFERENCES = {'P0': ['R1', 'R2', None]}  # None: unresolved reference
+
+
+class FakeS2:
+    """Serves /paper/batch and paginated /citations and /references."""
+
+    def __init__(self):
+        self.pages = []
+
+    def batch(self, request):
+        ids = json.loads(request.body)['ids']
+        return 200, {}, json.dumps([PAPERS.get(i) for i in ids])
+
+    def edges(self, request):
+        url = urlparse(request.url)
+        _, paper_id, direction = url.path.rsplit('/', 2)
+        params = parse_qs(url.query)
+        offset, limit = int(params['offset'][0]), int(params['limit'][0])
+        self.pages.append((paper_id, direction, offset))
+
+        if direction == 'citations':
+            ids, nested = CITED_BY.get(paper_id, []), 'citingPaper'
+        else:
+            ids, nested = REFERENCES.get(paper_id, []), 'citedPaper'
+        page = ids[offset:offset + limit]
+        body = {'offset': offset,
+                'data': [{nested: PAPERS[i] if i else {'paperId': None, 'title': 'Unresolved'}}
+                         for i in page]}
+        if offset + limit < len(ids):
+            body['next'] = offset + limit
+        return 200, {}, json.dumps(body)
+
+
+def _mock(fake):
+    mock = responses.RequestsMock(assert_all_requests_are_fired=False)
+    mock.add_callback(responses.POST, PAPER_BATCH_URL, callback=fake.batch)
+    mock.add_callback(responses.GET, re.compile(r".*/paper/[^/]+/(citations|references).*"),
+                      callback=fake.edges)
+    return mock
+
+
+def _clear_cache():
+    for paper_id in PAPERS:
+        cache.delete(get_cache_key(paper_id, DETAILS_CACHE_NAMESPACE))
+        for direction in ('citations', 'references'):
+            for cap in (2, MAX_EDGES_PER_PAPER):
+                cache.delete(get_cache_key(f"{paper_id}:{direction}:{cap}", EDGE_CACHE_NAMESPACE))
+
+
+def test_expansion():
+    """Test multi-hop BFS, pagination, dedupe across hops and the edge cache."""
+    print("=== TEST 1: Expansion ===\n")
+    _clear_cache()
+    fake = FakeS2()
+    with _mock(fake):
+        result = CitationGraph(max_nodes=5000).expand(['P0'], hops=2, direction='citations')
+    nodes = result['nodes']
+
+    # Same neighbourhood again: every edge list comes from the cache (no mock -> no network)
+    again = CitationGraph(max_nodes=5000).expand(['P0'], hops=2, direction='citations')
+
+    # A list cut off at a lower cap is not served to a graph with a higher one
+    capped, full = FakeS2(), FakeS2()
+    with _mock(capped):
+        short = CitationGraph(max_edges_per_paper=2).get_edges('P0', 'citations')
+    _clear_cache()
+    with _mock(full):
+        CitationGraph(max_edges_per_paper=2).get_edges('P0', 'citations')
+        longer = CitationGraph().get_edges('P0', 'citations')
+
+    # Budget already full after the first hop: the next hop fetches nothing
+    _clear_cache()
+    budget = FakeS2()
+    with _mock(budget):
+        small = CitationGraph(max_nodes=4).expand(['P0'], hops=3, direction='citations')
+
+    checks = [
+        ("Two-hop neighbourhood built", len(nodes) == 1 + 6 + 1 + 1500),
+        ("Citation lists paginated", [o for p, _, o in fake.pages if p == 'P1'] == [0, 1000]),
+        ("Papers deduplicated across hops", nodes['P2']['hop'] == 1),
+        ("Edges between known papers kept", ('P2', 'P1') in result['edges']),
+        ("Citing -> cited orientation", ('P1', 'P0') in result['edges']),
+        ("Only the frontier is expanded", not any(p in FILLER for p, _, _ in fake.pages)),
+        ("Edge lists cached", again['edges'] == result['edges']),
+        ("Capped lists cached per cap", len(short) == 2 and len(longer) == 6),
+        ("No edge requests once the budget is full", len(small['nodes']) == 4
+         and [p for p, _, _ in budget.pages] == ['P0']),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_pruning():
+    """Test pruning rules, both directions and the node budget."""
+    print("=== TEST 2: Pruning ===\n")
+    _clear_cache()
+
+    with _mock(FakeS2()):
+        pruned = CitationGraph(prune=[min_citations(1), year_range(min_year=2008)]).expand(
+            ['P0'], hops=1)
+        relevant = CitationGraph(prune=[min_relevance(10)]).expand(['P0'], hops=1)
+        budget = CitationGraph(max_nodes=3).expand(['P0'], hops=1, direction='citations')
+
+    checks = [
+        ("Citations and references followed", set(pruned['nodes'])
+         == {'P0', 'P1', 'P2', 'P3', 'P4', 'R1', 'R2'}),
+        ("Reference edges point at references", ('P0', 'R1') in pruned['edges']),
+        ("Relevance threshold applied", set(relevant['nodes']) == {'P0', 'P1', 'P3'}),
+        ("Budget keeps the most cited", set(budget['nodes']) == {'P0', 'OLD', 'P1'}),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all citation graph tests."""
+    print("\n" + "="*70)
+    print("CITATION GRAPH EXPANSION - TEST SUITE")
+    print("="*70 + "\n")
+
+    # Requests are mocked, so skip the politeness delay
+    paper_utils.API_RATE_LIMITS['semantic_scholar'] = (0.0, 1)
+
+    tests = [
+        test_expansion,
+        test_pruning,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Test suite for compiled, memoized field detection.
+Compares FieldDetector against the per-keyword substring scan it replaces,
+using config/field_keywords.json and synthetic larger configs (offline).
+"""
+
+import json
+import logging
+import random
+import string
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from field_detector import CONFIG_DIR, FieldDetector
+from paper_utils import sanitize_query
+
+FILLER = ['how', 'to', 'detect', 'using', 'in', 'data', 'for', 'of', 'the', 'analysis',
+          'patients', 'methods', 'brain', 'with', 'and', 'from']
+
+
+def _reference_detect(detector, query):
+    """The per-keyword substring scan FieldDetector used before."""
+    clean_query = sanitize_query(query)
+    if not clean_query:
+        return detector._default_result()
+    query_lower = clean_query.lower()
+    field_scores, keywords_matched = {}, defaultdict(list)
+    for field_name, field_config in detector.fields.items():
+        keywords = field_config.get('keywords', [])
+        matches, matched_keywords = 0, []
+        for keyword in keywords:
+            if keyword.lower() in query_lower:
+                matches += 1
+                matched_keywords.append(keyword)
+        if matches > 0:
+            field_scores[field_name] = (matches / len(keywords)) * field_config.get('weight', 1.0)
+            keywords_matched[field_name] = matched_keywords
+    max_score = max(field_scores.values()) if field_scores else 0
+    confidence_scores = {field: score / max_score for field, score in field_scores.items()}
+    detected_fields = [f for f, c in confidence_scores.items() if c >= detector.confidence_threshold]
+    detected_fields.sort(key=lambda f: confidence_scores[f], reverse=True)
+    return {
+        'detected_fields': detected_fields,
+        'confidence_scores': confidence_scores,
+        'recommended_sources': detector._get_recommended_sources(detected_fields),
+        'keywords_matched': dict(keywords_matched)
+    }
+
+
+def _queries(rng, keywords, n):
+    queries = []
+    for _ in range(n):
+        words = rng.sample(FILLER, 4) + rng.sample(keywords, rng.randint(0, 3))
+        rng.shuffle(words)
+        queries.append(' '.join(w.upper() if rng.random() < 0.2 else w for w in words)[:200])
+    return queries
+
+
+def _grown_config(path, copies, seed=6):
+    """field_keywords.json with `copies` times as many fields (random extra keywords)."""
+    with open(CONFIG_DIR / "field_keywords.json") as f:
+        config = json.load(f)
+    rng = random.Random(seed)
+    fields = dict(config['fields'])
+    for i in range(copies - 1):
+        for name, field in config['fields'].items():
+            fields[f'{name}_{i}'] = dict(field, keywords=[
+                ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12)))
+                + rng.choice(['', ' ' + rng.choice(FILLER)]) for _ in field['keywords']])
+    config['fields'] = fields
+    path.write_text(json.dumps(config))
+    return [k for field in fields.values() for k in field['keywords']]
+
+
+def test_equivalence():
+    """Test that detection results are unchanged."""
+    print("=== TEST 1: Detection Equivalence ===\n")
+
+    detector = FieldDetector()
+    rng = random.Random(3)
+    keywords = [k for field in detector.fields.values() for k in field['keywords']]
+    queries = _queries(rng, keywords, 500) + [
+        "How to detect seizures using wavelet transform in sEEG data?",
+        "Phase locking value for seizure onset zone localization",
+        "Riemannian manifold methods for EEG classification",
+        "How do neurons communicate?",
+        "'; DROP TABLE papers; --",
+        "",
+    ]
+    mismatches = [q for q in queries if detector.detect_fields(q) != _reference_detect(detector, q)]
+    if mismatches:
+        print(f"Mismatched queries: {mismatches[:3]}")
+
+    result = detector.detect_fields("Phase locking value for seizure onset zone localization")
+
+    checks = [
+        ("506 queries detected as before", not mismatches),
+        ("Phrases matched", 'seizure onset zone' in result['keywords_matched']['epilepsy_clinical']),
+        ("Matched keywords in config order", all(
+            kws == [k for k in detector.fields[f]['keywords'] if k in kws]
+            for f, kws in result['keywords_matched'].items())),
+        ("Unsafe query falls back to defaults", detector.detect_fields("'; DROP TABLE papers; --")
+         == detector._default_result()),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_memo_and_batch():
+    """Test the shared compiled config, the query memo and batch detection."""
+    print("=== TEST 2: Memo and Batch ===\n")
+
+    first, second = FieldDetector(), FieldDetector()
+    query = "LSTM networks for seizure prediction from EEG"
+    result = first.detect_fields(query)
+    result['detected_fields'].clear()
+    result['keywords_matched'].clear()
+    again = first.detect_fields(query)
+
+    rng = random.Random(8)
+    keywords = [k for field in first.fields.values() for k in field['keywords']]
+    queries = _queries(rng, keywords, 50) * 4
+    batch = second.detect_fields_batch(queries)
+    info = second._detect.cache_info()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        custom_path = Path(tmp) / 'fields.json'
+        custom_path.write_text(json.dumps({'fields': {'koopman': {
+            'keywords': ['Koopman', 'DMD'], 'weight': 1.0, 'databases': ['arxiv']}}}))
+        custom = FieldDetector(custom_path).detect_fields("Koopman operators")
+        missing = FieldDetector(Path(tmp) / 'missing.json')
+
+    checks = [
+        ("Config loaded and compiled once per process", first._matcher is second._matcher
+         and first.config is second.config),
+        ("Callers cannot corrupt the memo", bool(again['detected_fields'] and again['keywords_matched'])),
+        ("Batch aligned with single detection", batch == [first.detect_fields(q) for q in queries]),
+        ("Repeated queries served from the memo", info.misses == len(set(queries))
+         and info.hits == len(queries) - len(set(queries))),
+        ("Custom config path", custom['detected_fields'] == ['koopman']
+         and custom['recommended_sources'] == ['arxiv']),
+        ("Missing config falls back to defaults", missing.list_all_fields() == ['general']
+         and missing.detect_fields("EEG")['recommended_sources'] == ['semantic_scholar']),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_routing_speed():
+    """Test routing time as the field list grows."""
+    print("=== TEST 3: Routing Speed ===\n")
+
+    timings = {}
+    # Time the routing itself, not the per-query INFO log lines
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp:
+        for copies in (1, 20):
+            path = Path(tmp) / f'fields_{copies}.json'
+            keywords = _grown_config(path, copies)
+            detector = FieldDetector(path)
+            queries = _queries(random.Random(copies), keywords, 2000)
+
+            start = time.time()
+            for q in queries:
+                detector.detect_fields(q)
+            uncached = (time.time() - start) / len(queries) * 1e6
+            start = time.time()
+            for q in queries:
+                detector.detect_fields(q)
+            cached = (time.time() - start) / len(queries) * 1e6
+
+            sample = queries[:100]
+            start = time.time()
+            same = all(detector.detect_fields(q) == _reference_detect(detector, q) for q in sample)
+            reference = (time.time() - start) / len(sample) * 1e6
+            timings[copies] = (uncached, cached, same)
+            print(f"{len(detector.fields)} fields, {len(keywords)} keywords: {uncached:.0f} us per new query, "
+                  f"{cached:.1f} us repeated (per-keyword scan {reference:.0f} us)")
+    logging.disable(logging.NOTSET)
+
+    checks = [
+        ("Results unchanged at every size", all(same for _, _, same in timings.values())),
+        ("New queries under 50 us with 20x the fields", timings[20][0] < 50),
+        ("Repeated queries under 10 us", all(cached < 10 for _, cached, _ in timings.values())),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all field detector tests."""
+    print("\n" + "="*70)
+    print("FIELD DETECTOR - TEST SUITE")
+    print("="*70 + "\n")
+
+    tests = [
+        test_equivalence,
+        test_memo_and_batch,
+        test_routing_speed,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Test suite for vectorized grant analytics.
+Uses synthetic NIH/NSF records, so no network access is needed.
+"""
+
+import copy
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent))
+from grant_analytics import GrantAnalytics
+from nih_reporter_search import NIHReporterSearch
+from nsf_awards_search import NSFAwardsSearch
+
+YEAR = datetime.now().year
+ACTIVITY_CODES = ['R01', 'R21', 'P50', 'K23', 'U01']
+AGENCY_SETS = [['NINDS'], ['NIMH'], ['NCI', 'NINDS'], [], ['NIA'], ['NHLBI']]
+
+
+def _nih(i):
+    core = f"{ACTIVITY_CODES[i % 5]}NS{100000 + i // 2}"
+    return {
+        'project_number': f"5{core}-0{1 + i % 2}",
+        'core_project_num': core,
+        'title': f'Project {i}',
+        'pi_name': f'PI {i % 40}',
+        'institution': f'Institution {i % 7}',
+        'year': YEAR - i % 12,
+        'fiscal_year': YEAR - i % 12 + i % 2,
+        'award_amount': (i % 9) * 125000,
+        'agencies': AGENCY_SETS[i % 6],
+        'activity_code': ACTIVITY_CODES[i % 5],
+        'source': 'nih_reporter',
+    }
+
+
+def _nsf(i):
+    return {
+        'award_number': str(2000000 + i),
+        'title': f'Award {i}',
+        'pi_name': f'NSF PI {i % 25}',
+        'institution': f'Institution {i % 5}',
+        'year': None if i % 13 == 0 else YEAR - i % 8,
+        'award_amount': (i % 5) * 200000,
+        'program': ['Computational Neuroscience', 'Ecology', 'MACHINE LEARNING'][i % 3],
+        'source': 'nsf',
+    }
+
+
+def test_scoring():
+    """Test that vectorized scores and ranking match the per-record scorers."""
+    print("=== TEST 1: Vectorized Scoring ===\n")
+    nih = [_nih(i) for i in range(600)]
+    nsf = [_nsf(i) for i in range(300)]
+
+    expected_nih = NIHReporterSearch()._sort_projects(copy.deepcopy(nih))
+    expected_nsf = NSFAwardsSearch()._sort_awards(copy.deepcopy(nsf))
+    expected = {g.get('project_number') or g['award_number']: g['impact_score']
+                for g in expected_nih + expected_nsf}
+
+    analytics = GrantAnalytics(copy.deepcopy(nih + nsf))
+    scores = {g.get('project_number') or g['award_number']: g['impact_score']
+              for g in analytics.ranked()}
+    nih_only = GrantAnalytics(copy.deepcopy(nih)).ranked()
+    empty = GrantAnalytics([])
+
+    checks = [
+        ("Scores match _sort_projects / _sort_awards",
+         max(abs(scores[k] - expected[k]) for k in expected) < 1e-12),
+        ("Ranking matches _sort_projects order", [g['project_number'] for g in nih_only]
+         == [g['project_number'] for g in expected_nih]),
+        ("ranked(limit) truncates", len(analytics.ranked(10)) == 10),
+        ("Empty input handled", empty.ranked() == [] and empty.timeseries().empty),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_aggregates():
+    """Test group-by aggregates, time series and the portfolio summary."""
+    print("=== TEST 2: Aggregates and Time Series ===\n")
+    nih = [_nih(i) for i in range(600)]
+    nsf = [_nsf(i) for i in range(300)]
+    analytics = GrantAnalytics(nih + nsf)
+
+    by_agency = analytics.summarize('agency')
+    ninds_records = [g for g in nih if 'NINDS' in g['agencies']]
+    by_activity = analytics.summarize('activity_code')
+    r01 = [g for g in nih if g['activity_code'] == 'R01']
+
+    yearly = analytics.timeseries()
+    split = analytics.timeseries(by='institution', top=3)
+    counts = analytics.timeseries(by='source', value='count')
+    summary = analytics.portfolio_summary(top=3)
+
+    total = sum(g['award_amount'] for g in nih + nsf)
+    # Awards without a year cannot be placed on the time axis
+    dated_total = sum(g['award_amount'] for g in nih + nsf if g['year'] is not None)
+    checks = [
+        ("Multi-institute grants count for each institute",
+         by_agency.loc['NINDS', 'total_funding'] == sum(g['award_amount'] for g in ninds_records)),
+        ("NSF awards grouped under NSF", by_agency.loc['NSF', 'records'] == len(nsf)),
+        ("Distinct grants vs records", by_activity.loc['R01', 'grants']
+         == len({g['core_project_num'] for g in r01}) and by_activity.loc['R01', 'records'] == len(r01)),
+        ("Largest total first", by_agency['total_funding'].is_monotonic_decreasing),
+        ("Time series sums to dated total", int(yearly['total'].sum()) == dated_total),
+        ("Years without gaps", list(yearly.index) == list(range(yearly.index.min(), yearly.index.max() + 1))),
+        ("Top groups plus Other", list(split.columns).count('Other') == 1 and len(split.columns) == 4
+         and int(split.values.sum()) == dated_total),
+        ("Record counts per source", int(counts['nsf'].sum()) == len(nsf) - len([g for g in nsf if g['year'] is None])),
+        ("Portfolio summary is JSON-friendly", json.loads(json.dumps(summary))['total_funding'] == total
+         and len(summary['institutes']) == 3),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_scale():
+    """Test that a 10k-grant portfolio summarizes in well under a second."""
+    print("=== TEST 3: Scale ===\n")
+    grants = [_nih(i) for i in range(8000)] + [_nsf(i) for i in range(2000)]
+
+    start = time.time()
+    analytics = GrantAnalytics(grants)
+    for by in ('agency', 'activity_code', 'pi_name', 'institution', 'fiscal_year'):
+        analytics.summarize(by)
+    analytics.timeseries(by='agency', top=5)
+    elapsed_ms = (time.time() - start) * 1000
+    print(f"Load, score and 6 aggregates over {len(grants)} grants: {elapsed_ms:.1f} ms")
+
+    checks = [
+        ("10k grants in under 500 ms", elapsed_ms < 500),
+        ("All rows scored", np.isfinite(analytics.frame['impact_score']).all()),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all grant analytics tests."""
+    print("\n" + "="*70)
+    print("GRANT ANALYTICS - TEST SUITE")
+    print("="*70 + "\n")
+
+    tests = [
+        test_scoring,
+        test_aggregates,
+        test_scale,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Test suite for the offline grant store (NIH ExPORTER + NSF award dumps).
+Builds tiny bulk files locally, so no network access is needed.
+"""
+
+import csv
+import io
+import json
+import sys
+import tempfile
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+import grant_store
+from grant_store import GrantStore
+from nih_reporter_search import NIHReporterSearch
+from nsf_awards_search import NSFAwardsSearch
+
+YEAR = datetime.now().year
+
+EXPORTER_COLUMNS = ['APPLICATION_ID', 'ACTIVITY', 'ADMINISTERING_IC', 'CORE_PROJECT_NUM',
+                    'FULL_PROJECT_NUM', 'FY', 'IC_NAME', 'ORG_CITY', 'ORG_COUNTRY', 'ORG_NAME',
+                    'ORG_STATE', 'PHR', 'PI_NAMEs', 'PROJECT_START', 'PROJECT_END',
+                    'PROJECT_TITLE', 'STUDY_SECTION_NAME', 'TOTAL_COST']
+
+
+def _exporter_row(i, title, pis, org, ic_name, activity, cost, start_year):
+    core = f"{activity}NS{100000 + i}"
+    return {
+        'APPLICATION_ID': str(10000000 + i), 'ACTIVITY': activity, 'ADMINISTERING_IC': 'NS',
+        'CORE_PROJECT_NUM': core, 'FULL_PROJECT_NUM': f"5{core}-02", 'FY': str(start_year + 1),
+        'IC_NAME': ic_name, 'ORG_CITY': 'BOSTON', 'ORG_COUNTRY': 'UNITED STATES',
+        'ORG_NAME': org, 'ORG_STATE': 'MA', 'PHR': f'Public health relevance of {title.lower()}.',
+        'PI_NAMEs': pis, 'PROJECT_START': f'04/01/{start_year}',
+        'PROJECT_END': f'03/31/{start_year + 5}', 'PROJECT_TITLE': title,
+        'STUDY_SECTION_NAME': 'Clinical Neuroplasticity', 'TOTAL_COST': str(cost),
+    }
+
+
+def _csv_text(rows):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=EXPORTER_COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue()
+
+
+def _nsf_xml(award_id, title, first, last, institution, amount, start_year, co_pi=None):
+    co = (f"<Investigator><FirstName>{co_pi[0]}</FirstName><LastName>{co_pi[1]}</LastName>"
+          f"<RoleCode>Co-Principal Investigator</RoleCode></Investigator>") if co_pi else ""
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rootTag><Award>
+  <AwardTitle>{title}</AwardTitle>
+  <AwardEffectiveDate>09/01/{start_year}</AwardEffectiveDate>
+  <AwardExpirationDate>08/31/{start_year + 3}</AwardExpirationDate>
+  <AwardTotalIntnAmount>{amount}.00</AwardTotalIntnAmount>
+  <AwardAmount>{amount}</AwardAmount>
+  <AbstractNarration>This award supports research on {title.lower()}.</AbstractNarration>
+  <MinAmdLetterDate>08/15/{start_year}</MinAmdLetterDate>
+  <AwardID>{award_id}</AwardID>
+  <Investigator><FirstName>{first}</FirstName><LastName>{last}</LastName>
+    <EmailAddress>{last.lower()}@example.edu</EmailAddress>
+    <RoleCode>Principal Investigator</RoleCode></Investigator>
+  {co}
+  <Institution><Name>{institution}</Name><CityName>Seattle</CityName>
+    <StateCode>WA</StateCode><CountryName>United States</CountryName></Institution>
+  <ProgramElement><Text>Computational Neuroscience</Text></ProgramElement>
+</Award></rootTag>"""
+
+
+def _write_fixture(root: Path):
+    nih, nsf = root / 'exporter', root / 'nsf'
+    nih.mkdir()
+    nsf.mkdir()
+
+    (nih / f'RePORTER_PRJ_C_FY{YEAR}.csv').write_text(_csv_text([
+        _exporter_row(1, 'Thalamic stimulation for drug-resistant epilepsy',
+                      'CASH, SYDNEY (contact); SMITH, JOHN;', 'MASSACHUSETTS GENERAL HOSPITAL',
+                      'NATIONAL INSTITUTE OF NEUROLOGICAL DISORDERS AND STROKE', 'R01', 650000, YEAR - 1),
+        _exporter_row(2, 'Seizure forecasting from wearable sensors', 'DOE, JANE;',
+                      'BOSTON CHILDRENS HOSPITAL', 'NATIONAL INSTITUTE OF NEUROLOGICAL DISORDERS AND STROKE',
+                      'R21', 200000, YEAR - 2),
+    ]))
+    with zipfile.ZipFile(nih / f'RePORTER_PRJ_C_FY{YEAR - 10}.zip', 'w') as archive:
+        archive.writestr(f'RePORTER_PRJ_C_FY{YEAR - 10}.csv', _csv_text([
+            _exporter_row(3, 'Epilepsy genetics in twins', 'CASH, SYDNEY (contact);',
+                          'MASSACHUSETTS GENERAL HOSPITAL', 'NATIONAL INSTITUTE OF MENTAL HEALTH',
+                          'R01', 400000, YEAR - 10),
+            # Institute outside MAJOR_INSTITUTES: only the two-letter IC code identifies it
+            dict(_exporter_row(4, 'Sleep spindles and memory in aging', 'LEE, ANNA (contact);',
+                               'JOHNS HOPKINS UNIVERSITY', 'NATIONAL INSTITUTE ON AGING',
+                               'R01', 300000, YEAR - 10), ADMINISTERING_IC='AG'),
+        ]))
+    (nih / f'RePORTER_PRJABS_C_FY{YEAR}.csv').write_text('APPLICATION_ID,ABSTRACT_TEXT\n1,text\n')
+
+    with zipfile.ZipFile(nsf / f'{YEAR}.zip', 'w') as archive:
+        archive.writestr('2400001.xml', _nsf_xml(2400001, 'Koopman operators for neural dynamics',
+                                                 'Steven', 'Brunton', 'University of Washington',
+                                                 900000, YEAR - 1, co_pi=('Nathan', 'Kutz')))
+        archive.writestr('2400002.xml', _nsf_xml(2400002, 'Sparse identification of epilepsy dynamics',
+                                                 'Bing', 'Brunton', 'University of Washington',
+                                                 300000, YEAR - 1))
+        archive.writestr('2400003.xml', 'not xml')
+    (nsf / '2400004.json').write_text(json.dumps({
+        'awd_id': '2400004', 'awd_titl_txt': 'Network control of seizure spread',
+        'awd_eff_date': f'{YEAR}-01-01', 'awd_exp_date': f'{YEAR + 2}-12-31',
+        'tot_intn_awd_amt': 750000, 'awd_amount': 250000,
+        'awd_abstract_narration': 'Control theory for epilepsy networks.',
+        'inst': {'inst_name': 'University of Pennsylvania', 'inst_city_name': 'Philadelphia',
+                 'inst_state_code': 'PA', 'inst_country_name': 'United States'},
+        'pi': [{'pi_role': 'Principal Investigator', 'pi_first_name': 'Danielle',
+                'pi_last_name': 'Bassett', 'pi_email_addr': 'db@example.edu'}],
+        'pgm_ele': [{'pgm_ele_name': 'Physics of Living Systems'}],
+    }))
+
+
+def test_ingest():
+    """Test parallel per-file ingest and the shared record shape."""
+    print("=== TEST 1: Ingest ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write_fixture(root)
+        grants = GrantStore(root / "grants.sqlite")
+
+        nih = grants.ingest_nih(root / 'exporter', workers=2)
+        nsf = grants.ingest_nsf(root / 'nsf', workers=2)
+        again = grants.ingest_nih(root / 'exporter', workers=2)
+
+        thalamic = grants.search("thalamic stimulation", source='nih_reporter')[0]
+        koopman = grants.search("koopman", source='nsf')[0]
+        aging = grants.search(None, source='nih_reporter', agency='NIA')
+        live_project = NIHReporterSearch()._parse_project({'project_num': '1R01NS1-01'})
+        live_award = NSFAwardsSearch()._parse_award({'id': '1'})
+
+        checks = [
+            ("NIH csv and zip ingested", nih['files'] == 3 and nih['grants'] == 4),
+            ("NSF zip, xml and json ingested", nsf['files'] == 2 and nsf['grants'] == 3),
+            ("Ingested files skipped", again['files'] == 0),
+            ("NIH records match _parse_project shape", set(thalamic) == set(live_project)),
+            ("NSF records match _parse_award shape", set(koopman) == set(live_award)),
+            ("ExPORTER fields mapped", thalamic['pi_name'] == 'CASH, SYDNEY'
+             and thalamic['agencies'] == ['NINDS'] and thalamic['award_amount'] == 650000
+             and thalamic['start_date'] == f'{YEAR - 1}-04-01'),
+            ("Two-letter IC codes mapped to RePORTER abbreviations",
+             [p['agencies'] for p in aging] == [['NIA']]),
+            ("NSF fields mapped", koopman['pi_name'] == 'Steven Brunton'
+             and koopman['co_pis'] == ['Nathan Kutz'] and koopman['award_amount'] == 900000
+             and koopman['year'] == YEAR - 1),
+        ]
+        grants.store.close()
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_offline_helpers():
+    """Test search_by_pi, search_by_institution and search_by_topic offline."""
+    print("=== TEST 2: Offline Search Helpers ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write_fixture(root)
+        grants = GrantStore(root / "grants.sqlite")
+        grants.ingest_nih(root / 'exporter', workers=2)
+        grants.ingest_nsf(root / 'nsf', workers=2)
+
+        # Funding and end dates are checked on candidates: grow the pool until enough pass
+        factor, grant_store.CANDIDATE_FACTOR = grant_store.CANDIDATE_FACTOR, 2
+        try:
+            richest = grants.search(None, limit=1, min_funding=800000)
+            active = grants.search(None, limit=5, source='nih_reporter',
+                                   active_on=datetime.now().strftime('%Y-%m-%d'))
+        finally:
+            grant_store.CANDIDATE_FACTOR = factor
+        grants.store.close()
+
+        # No mock is active: any live request would fail
+        nih = NIHReporterSearch(grant_store_path=root / "grants.sqlite")
+        nsf = NSFAwardsSearch(grant_store_path=root / "grants.sqlite")
+
+        by_pi = nih.search_by_pi("Sydney Cash", offline=True)
+        by_institution = nih.search_by_institution("Massachusetts General Hospital", offline=True)
+        nih_topic = nih.search_by_topic("epilepsy", min_funding=500000, offline=True)
+        nsf_pi = nsf.search_by_pi("Steven Brunton", offline=True)
+        nsf_co_pi = nsf.search_by_pi("Nathan Kutz", offline=True)
+        nsf_institution = nsf.search_by_institution("University of Washington", offline=True)
+        nsf_topic = nsf.search_by_topic("epilepsy", min_funding=500000, offline=True)
+        nih_text = nih.search_projects("seizure forecasting", offline=True)
+        unsafe = (nih.search_by_pi("'; DROP TABLE records; --", offline=True)
+                  + nsf.search_by_institution("'; DROP TABLE records; --", offline=True))
+
+        checks = [
+            ("NIH PI search", sorted(p['core_project_num'] for p in by_pi)
+             == ['R01NS100001', 'R01NS100003']),
+            ("NIH institution search (recent only)", [p['core_project_num'] for p in by_institution]
+             == ['R01NS100001']),
+            ("NIH topic search with funding floor", [p['core_project_num'] for p in nih_topic]
+             == ['R01NS100001']),
+            ("NSF PI search", [a['award_number'] for a in nsf_pi] == ['2400001']),
+            ("NSF co-PI search", [a['award_number'] for a in nsf_co_pi] == ['2400001']),
+            ("NSF institution search", sorted(a['award_number'] for a in nsf_institution)
+             == ['2400001', '2400002']),
+            ("NSF topic search with funding floor", [a['award_number'] for a in nsf_topic]
+             == ['2400004']),
+            ("Sources kept apart", all(p['source'] == 'nih_reporter' for p in nih_text)
+             and len(nih_text) == 1 and 'impact_score' in nih_text[0]),
+            ("Candidate pool grows until enough grants pass", [g['award_number'] for g in richest]
+             == ['2400001']),
+            ("Ended projects filtered in the store", sorted(g['core_project_num'] for g in active)
+             == ['R01NS100001', 'R21NS100002']),
+            ("Offline PI/institution queries sanitized", unsafe == []),
+        ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all grant store tests."""
+    print("\n" + "="*70)
+    print("OFFLINE GRANT STORE - TEST SUITE")
+    print("="*70 + "\n")
+
+    tests = [
+        test_ingest,
+        test_offline_helpers,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test suite for the in-memory inverted index used for client-side filtering.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from inverted_index import InvertedIndex, iter_bits, tokenize
+from biorxiv_search import BiorxivSearch
+
+DOCS = [
+    {'title': 'Functional connection strength in cortex', 'abstract': 'Graph analysis.',
+     'category': 'neuroscience'},
+    {'title': 'Ion channel gating', 'abstract': 'Sodium ion currents in neurons.',
+     'category': 'biophysics'},
+    {'title': 'Protein folding', 'abstract': 'Seizures are not discussed; ion mentioned once.',
+     'category': 'cell biology'},
+    {'title': 'Seizure onset zone localization', 'abstract': 'Intracranial EEG of seizures.',
+     'category': 'systems neuroscience'},
+]
+
+
+def test_matching():
+    """Test token matching, ranking and category bitmaps."""
+    print("=== TEST 1: Matching and Ranking ===\n")
+    index = InvertedIndex(DOCS)
+
+    def ids(results):
+        return [doc_id for doc_id, _ in results]
+
+    checks = [
+        ("Whole-token match ('ion' not in 'connection')", set(ids(index.search("ion"))) == {1, 2}),
+        ("Title hits rank above abstract hits", ids(index.search("ion"))[0] == 1),
+        ("Plurals folded", set(ids(index.search("seizures"))) == {2, 3}),
+        ("Intersection mode", ids(index.search("seizure onset", mode='all')) == [3]),
+        ("Stopwords ignored", tokenize("the seizure of epilepsy") == ['seizure', 'epilepsy']),
+        ("Category bitmap (substring)", list(iter_bits(index.category_mask(['neuroscience']))) == [0, 3]),
+        ("Unknown term", index.search("zebrafish") == []),
+    ]
+
+    papers = [dict(doc, doi=f'10.1101/{i}', authors='Cash, S.', date='2026-01-01', version=1)
+              for i, doc in enumerate(DOCS)]
+    filtered = BiorxivSearch()._filter_papers(papers, 'biorxiv', tokenize("ion channel gating"))
+    checks.append(("bioRxiv filter uses token matches", [p['doi'] for p in filtered]
+                   == ['10.1101/1', '10.1101/2']))
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_speed():
+    """Test that queries over thousands of preprints take under a millisecond."""
+    print("=== TEST 2: Query Speed ===\n")
+    # Realistic vocabulary: topic words are rare, filler words are many
+    topics = ['cortex', 'thalamus', 'protein', 'kinase', 'neuron', 'seizure', 'gene', 'cell']
+    filler = [f'term{i}' for i in range(3000)]
+    docs = [{'title': f'{topics[i % 8]} {topics[(i * 3) % 8]} {filler[(i * 7) % 3000]}',
+             'abstract': ' '.join(filler[(i * 31 + k * 97) % 3000] for k in range(150)),
+             'category': 'neuroscience' if i % 3 else 'genetics'} for i in range(5000)]
+    index = InvertedIndex(docs)
+
+    start = time.perf_counter()
+    for _ in range(100):
+        index.search("seizure thalamus", mode='all', limit=20)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / 100
+
+    checks = [("Sub-millisecond 'all' query over 5000 docs", elapsed_ms < 1.0)]
+    print(f"  Mean query time: {elapsed_ms:.3f} ms")
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all inverted index tests."""
+    print("\n" + "="*70)
+    print("INVERTED INDEX - TEST SUITE")
+    print("="*70 + "\n")
+
+    tests = [
+        test_matching,
+        test_speed,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
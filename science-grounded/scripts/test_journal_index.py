@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Test suite for the keyword automaton and the config-driven journal index.
+Runs offline against config/journals.json.
+"""
+
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from journal_index import JOURNALS_FILE, JournalIndex, get_journal_index, normalize_journal
+from keyword_automaton import KeywordAutomaton
+from paper_utils import JOURNAL_TIERS, calculate_impact_score, get_journal_tier
+
+
+def test_automaton():
+    """Test that one pass finds what per-keyword scans find."""
+    print("=== TEST 1: Keyword Automaton ===\n")
+
+    rng = random.Random(11)
+    mismatches = 0
+    for _ in range(200):
+        keywords = list({''.join(rng.choice('ab ') for _ in range(rng.randint(1, 4)))
+                         for _ in range(6)})
+        text = ''.join(rng.choice('abAB ') for _ in range(200))
+        expected = {k: text.lower().count(k.lower()) for k in keywords if k.lower() in text.lower()}
+        mismatches += KeywordAutomaton(keywords).counts(text) != expected
+
+    automaton = KeywordAutomaton(['seizure', 'seizure forecasting', 'EEG', 'iEEG', 'patient'])
+    words = KeywordAutomaton(['patient', 'EEG', 'ictal'], word_boundaries=True)
+    text = "Seizure forecasting from iEEG: 12 patients, interictal EEG and ictal onsets"
+
+    checks = [
+        ("counts() equals str.count per keyword (200 random sets)", mismatches == 0),
+        ("Overlapping keywords all found", automaton.counts(text)
+         == {'seizure': 1, 'seizure forecasting': 1, 'iEEG': 1, 'EEG': 2, 'patient': 1}),
+        ("Word boundaries skip matches inside words", words.counts(text) == {'EEG': 1, 'ictal': 1}),
+        ("Per-keyword cap", KeywordAutomaton(['a']).counts('a a a a', limit=2) == {'a': 2}),
+        ("Leftmost-longest match", automaton.longest_match(text) == (0, 19, 'seizure forecasting')),
+        ("Empty keyword set and text", KeywordAutomaton([]).counts(text) == {}
+         and automaton.counts('') == {} and automaton.longest_match('') is None),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_journal_lookup():
+    """Test tier lookup for journal strings as the searchers return them."""
+    print("=== TEST 2: Journal Lookup ===\n")
+
+    with open(JOURNALS_FILE) as f:
+        config = json.load(f)
+    index = get_journal_index()
+
+    cases = {
+        'Nature': 'tier1',
+        'Brain : a journal of neurology': 'tier2',
+        'The Journal of neuroscience : the official journal of the Society for Neuroscience': 'tier2',
+        'J Neurosci Methods': 'tier3',
+        'Journal of Neuroscience Methods': 'tier3',
+        'Proceedings of the National Academy of Sciences of the United States of America': 'tier1',
+        'Proc. Natl. Acad. Sci. U.S.A.': 'tier1',
+        'Nature reviews. Neuroscience': 'tier2',
+        'Epilepsy & behavior : E&B': 'tier3',
+        'Epilepsy and Behavior': 'tier3',
+        'Seizure': 'specialized',
+        'Cell Reports': 'default',
+        'Neuron glia biology': 'default',
+        'Brain sciences': 'default',
+        'Brain Research': 'default',
+        'Chaos, Solitons & Fractals': 'default',
+        'Frontiers in Neurology': 'default',
+        'Neuron (Cambridge, Mass.)': 'tier1',
+        'Neurology. Clinical practice': 'default',
+        'Neurology. Genetics': 'default',
+        'Neurology(R) neuroimmunology & neuroinflammation': 'default',
+        'IEEE transactions on bio-medical engineering': 'tier3',
+        'Molecular and cellular neuroscience': 'default',
+        'Neuronal Signaling': 'default',
+        'arXiv preprint': 'default',
+        '': 'default',
+        None: 'default',
+    }
+    wrong = {name: get_journal_tier(name) for name, tier in cases.items() if get_journal_tier(name) != tier}
+    if wrong:
+        print(f"Unexpected tiers: {wrong}")
+
+    checks = [
+        ("Tiers match expected journals", not wrong),
+        ("JOURNAL_TIERS built from config", JOURNAL_TIERS['tier1']['journals']
+         == [j['name'] for j in config['tier1']['journals']]
+         and JOURNAL_TIERS['specialized']['multiplier'] == config['specialized']['multiplier']
+         and JOURNAL_TIERS['default']['multiplier'] == 1.0),
+        ("Every configured journal maps to itself", all(
+            index.lookup(j['name'])['name'] == j['name'] and index.lookup(j['iso_abbreviation'])['name']
+            == j['name'] for section in config.values() for j in section.get('journals', []))),
+        ("Impact factor available", index.impact_factor('Brain Stimul') == 8.955),
+        ("Impact score uses the config multiplier",
+         calculate_impact_score({'citation_count': 10, 'journal': 'Seizure', 'year': 2000}) == 12.0),
+        ("Normalization", normalize_journal('Épilepsie & Behavior.') == 'epilepsie and behavior'),
+        ("Missing config leaves every journal default",
+         JournalIndex.from_file(Path('/nonexistent/journals.json')).tier('Nature') == 'default'),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_lookup_speed():
+    """Test memoized lookups over a large result set."""
+    print("=== TEST 3: Lookup Speed ===\n")
+
+    with open(JOURNALS_FILE) as f:
+        config = json.load(f)
+    names = [j['name'] for section in config.values() for j in section.get('journals', [])]
+    rng = random.Random(2)
+    journals = [rng.choice(names + ['Some Journal', 'Journal of Neurophysiology', 'eNeuro'])
+                for _ in range(100000)]
+
+    index = JournalIndex(config)
+    start = time.time()
+    tiers = [index.tier(j) for j in journals]
+    elapsed = time.time() - start
+
+    cold = JournalIndex(config)
+    start = time.time()
+    for name in set(journals):
+        cold.tier(name)
+    cold_ms = (time.time() - start) * 1000
+    print(f"100k lookups in {elapsed * 1000:.0f} ms; {len(set(journals))} distinct names "
+          f"uncached in {cold_ms:.1f} ms")
+
+    checks = [
+        ("100k lookups in under 0.5 s", elapsed < 0.5),
+        ("Repeated names served from the memo", index.lookup.cache_info().hits
+         >= len(journals) - len(set(journals))),
+        ("Same answers as the shared index", tiers[:100] == [get_journal_tier(j) for j in journals[:100]]),
+        ("Unlisted names stay default", all(t == 'default' for j, t in zip(journals, tiers)
+                                            if j in ('Some Journal', 'eNeuro'))),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all journal index tests."""
+    print("\n" + "="*70)
+    print("JOURNAL INDEX - TEST SUITE")
+    print("="*70 + "\n")
+
+    tests = [
+        test_automaton,
+        test_journal_lookup,
+        test_lookup_speed,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
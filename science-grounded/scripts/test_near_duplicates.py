@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Test suite for MinHash/LSH near-duplicate matching.
+Uses synthetic records and a temporary local KB, so no network access is needed.
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from biorxiv_search import BiorxivSearch
+from local_kb_search import LocalKBSearch
+from near_duplicates import (NearDuplicateIndex, find_near_duplicates, first_author_surname,
+                             jaccard, lsh_params, paper_shingles)
+from paper_merger import merge_papers
+
+# Synthetic vocabulary for the scale test (a real title corpus has thousands of words)
+_rng = random.Random(7)
+WORDS = [''.join(_rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(_rng.randint(4, 10)))
+         for _ in range(3000)]
+
+
+def test_matching():
+    """Test which title variants match and which stay apart."""
+    print("=== TEST 1: Near-Duplicate Matching ===\n")
+
+    papers = [
+        {'title': 'Seizure forecasting from wearable sensors', 'authors': ['Cash, Sydney']},
+        {'title': 'Seizure forecasting from wearable sensors: a multicentre cohort study',
+         'authors': ['Cash SS']},
+        {'title': 'Modelling the behaviour of cortical neurons in haemorrhagic stroke',
+         'authors': ['Jane Smith']},
+        {'title': 'Modeling the Behavior of Cortical Neurons in Hemorrhagic Stroke.',
+         'authors': ['Smith J']},
+        {'title': 'Responsive neurostimulation of the hippocampus for epilepsy',
+         'authors': ['Cash, Sydney']},
+        {'title': 'Deep brain stimulation of the anterior thalamus for epilepsy',
+         'authors': ['Cash, Sydney']},
+        {'title': 'Unknown Title'},
+    ]
+    pairs = {(i, j) for i, j, _ in find_near_duplicates(papers, threshold=0.6)}
+    strict = {(i, j) for i, j, _ in find_near_duplicates(papers, threshold=0.9)}
+
+    index = NearDuplicateIndex(threshold=0.6)
+    index.add_many(papers, keys=[f'kb{i}' for i in range(len(papers))])
+    hits = index.query({'title': 'Deep-brain stimulation of the anterior thalamus in epilepsy',
+                        'authors': ['Sydney S. Cash']})
+
+    checks = [
+        ("Subtitle and punctuation variants match", (0, 1) in pairs),
+        ("British and American spellings match", (2, 3) in pairs),
+        ("Different papers by one author stay apart", pairs == {(0, 1), (2, 3)}),
+        ("Threshold is tunable", strict == {(2, 3)}),
+        ("Index query returns keys by similarity", [k for k, _ in hits] == ['kb5']),
+        ("Surname formats", [first_author_surname({'authors': [a]}) for a in
+                             ('Cash, Sydney', 'Cash SS', 'Sydney S. Cash', 'van der Berg JA')]
+         == ['cash', 'cash', 'cash', 'vanderberg']),
+        ("Banding follows the threshold", lsh_params(0.8)[1] > lsh_params(0.6)[1] > lsh_params(0.4)[1]),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_merge_and_kb():
+    """Test fuzzy merging, the bioRxiv published DOI link and local KB matching."""
+    print("=== TEST 2: Merging and Local KB ===\n")
+
+    preprint = BiorxivSearch()._standardize_paper({
+        'doi': '10.1101/2023.05.01.538000', 'title': 'Thalamic stimulation modulates seizure networks',
+        'authors': 'Gregg, Nicholas; Worrell, Gregory', 'date': '2023-05-02', 'version': '2',
+        'published': '10.1093/brain/awad999', 'category': 'neuroscience',
+    }, 'biorxiv')
+    unpublished = BiorxivSearch()._standardize_paper({'doi': '10.1101/x', 'published': 'NA'}, 'biorxiv')
+    journal = {'title': 'Thalamic stimulation modulates human seizure networks', 'year': 2024,
+               'authors': ['Gregg NM'], 'doi': '10.1093/BRAIN/AWAD999', 'source': 'pubmed',
+               'journal': 'Brain', 'citation_count': 12}
+    renamed = {'title': 'Thalamic stimulation modulates seizure networks in humans', 'year': 2024,
+               'authors': ['Nicholas M. Gregg'], 'source': 'semantic_scholar', 'paper_id': 'abc',
+               'citation_count': 15}
+
+    linked = merge_papers([preprint, journal], use_titles=False)
+    fuzzy = merge_papers([preprint, renamed], fuzzy_threshold=0.6)
+    exact = merge_papers([preprint, renamed])
+    parts = merge_papers([dict(renamed, title=renamed['title'] + ': Part I', paper_id='p1'),
+                          dict(renamed, title=renamed['title'] + ': Part II', paper_id='p2')],
+                         fuzzy_threshold=0.6)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        papers_dir = Path(tmp) / 'raw' / 'papers'
+        for name, metadata in [
+            ('gregg_2024_thalamic', {'title': journal['title'], 'authors': ['Gregg NM'], 'doi': ''}),
+            ('khambhati_2024_forecasting', {'title': 'Hippocampal seizure forecasting with RNS',
+                                            'authors': ['Khambhati AN'], 'doi': '10.1/khambhati'}),
+        ]:
+            (papers_dir / name).mkdir(parents=True)
+            (papers_dir / name / 'extraction.json').write_text(json.dumps({'metadata': metadata}))
+
+        local = LocalKBSearch(kb_path=Path(tmp)).find_local_copies([
+            renamed, {'title': 'Unrelated', 'doi': 'https://doi.org/10.1/KHAMBHATI'}, preprint])
+
+    checks = [
+        ("published DOI recorded", preprint['published_doi'] == '10.1093/brain/awad999'
+         and unpublished['published_doi'] is None),
+        ("Preprint joins journal version via published DOI", len(linked) == 1
+         and linked[0]['journal'] == 'Brain' and linked[0]['sources'] == ['pubmed', 'biorxiv']),
+        ("Fuzzy merge catches changed titles", len(fuzzy) == 1 and fuzzy[0]['citation_count'] == 15),
+        ("Exact titles alone miss them", len(exact) == 2),
+        ("Numbered parts stay apart", len(parts) == 2),
+        ("Local KB copies found by title and DOI", sorted(local) == [0, 1, 2]
+         and local[0]['paper_id'] == 'gregg_2024_thalamic'
+         and local[1]['paper_id'] == 'khambhati_2024_forecasting' and local[1]['similarity'] == 1.0),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_scale():
+    """Test that planted duplicates are found among 20k papers without pairwise comparison."""
+    print("=== TEST 3: Scale ===\n")
+
+    rng = random.Random(7)
+    papers = [{'title': ' '.join(rng.sample(WORDS, 8)), 'authors': [f'Author{i % 500} X']}
+              for i in range(20000)]
+    # Every tenth paper gets a variant with one word swapped and a trailing period
+    planted = set()
+    for i in range(0, 20000, 10):
+        words = papers[i]['title'].split()
+        words[rng.randrange(8)] = rng.choice(WORDS)
+        papers.append({'title': ' '.join(words) + '.', 'authors': papers[i]['authors']})
+        planted.add((i, len(papers) - 1))
+
+    start = time.time()
+    found = find_near_duplicates(papers, threshold=0.6)
+    elapsed = time.time() - start
+    pairs = {(i, j) for i, j, _ in found}
+
+    # Recall of the LSH step: planted pairs that truly reach the threshold
+    qualifying = {(i, j) for i, j in planted
+                  if jaccard(paper_shingles(papers[i]), paper_shingles(papers[j])) >= 0.6}
+    recall = len(qualifying & pairs) / len(qualifying)
+    print(f"{len(papers)} papers: {len(found)} pairs in {elapsed:.2f} s, "
+          f"{len(qualifying)} planted pairs above threshold, LSH recall {recall:.3f}")
+
+    checks = [
+        ("Planted duplicates found (recall >= 0.95)", recall >= 0.95
+         and len(qualifying) > 0.8 * len(planted)),
+        ("Every reported pair meets the threshold", all(s >= 0.6 for _, _, s in found)),
+        ("22k papers in under 10 s", elapsed < 10),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all near-duplicate tests."""
+    print("\n" + "="*70)
+    print("NEAR-DUPLICATE MATCHING - TEST SUITE")
+    print("="*70 + "\n")
+
+    tests = [
+        test_matching,
+        test_merge_and_kb,
+        test_scale,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Test suite for deep NIH RePORTER pagination and portfolio retrieval.
+The projects/search endpoint is mocked with `responses`, so no network access is needed.
+"""
+
+import json
+import sys
+from itertools import islice
+from pathlib import Path
+
+import responses
+
+sys.path.append(str(Path(__file__).parent))
+import paper_utils
+from nih_reporter_search import NIHReporterSearch, PROJECTS_URL, MAX_LIMIT
+
+TOTAL = 1300  # 650 core projects, each with two fiscal-year records
+QUERY = "epilepsy"
+
+
+def _record(i):
+    core = f"R01NS{100000 + i // 2}"
+    fiscal_year = 2023 + i % 2
+    return {
+        'appl_id': 9000000 + i,
+        'project_num': f"{5 if i % 2 else 1}{core}-0{1 + i % 2}",
+        'core_project_num': core,
+        'project_title': f'Seizure network mapping {i // 2}',
+        'contact_pi_name': 'CASH, SYDNEY',
+        'org_name': 'MASSACHUSETTS GENERAL HOSPITAL',
+        'org_city': 'BOSTON', 'org_state': 'MA', 'org_country': 'UNITED STATES',
+        'project_start_date': '2023-04-01T00:00:00Z',
+        'project_end_date': '2028-03-31T00:00:00Z',
+        'award_amount': 400000 + 100000 * (i % 2),
+        'fiscal_year': fiscal_year,
+        'agency_ic_fundings': [{'code': 'NINDS'}],
+        'project_num_split': {'activity_code': 'R01'},
+    }
+
+
+class FakeReporter:
+    """Offset-paginated projects/search that records payloads."""
+
+    def __init__(self, fail_offset=None):
+        self.payloads = []
+        self.fail_offset = fail_offset
+
+    def __call__(self, request):
+        payload = json.loads(request.body)
+        self.payloads.append(payload)
+        offset, limit = payload['offset'], payload['limit']
+        if offset == self.fail_offset:
+            return 500, {}, ''
+        results = [_record(i) for i in range(offset, min(offset + limit, TOTAL))]
+        return 200, {}, json.dumps({'meta': {'total': TOTAL, 'offset': offset, 'limit': limit},
+                                    'results': results})
+
+
+def _walk(fake, count=None, **kwargs):
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as mock:
+        mock.add_callback(responses.POST, PROJECTS_URL, callback=fake)
+        projects = NIHReporterSearch().iter_projects(QUERY, **kwargs)
+        return list(islice(projects, count) if count else projects)
+
+
+def test_iter_projects():
+    """Test offset walking, dedupe, agency filter and resume."""
+    print("=== TEST 1: Deep Pagination ===\n")
+
+    full_fake = FakeReporter()
+    full = _walk(full_fake, agencies=['NINDS'], resume=False)
+    all_records = _walk(FakeReporter(), dedupe=False, resume=False)
+
+    # Interrupted walk, then a resumed one
+    first_fake, rest_fake = FakeReporter(), FakeReporter()
+    first = _walk(first_fake, count=760, dedupe=False, resume=False)
+    rest = _walk(rest_fake, dedupe=False)
+
+    # A failing page stops the walk at that page
+    failing = FakeReporter(fail_offset=1000)
+    partial = _walk(failing, dedupe=False, resume=False)
+    after_failure = FakeReporter()
+    _walk(after_failure, dedupe=False)
+
+    # max_results caps what is requested and yielded; the cursor stops there
+    small_fake, capped_fake, after_cap_fake = FakeReporter(), FakeReporter(), FakeReporter()
+    small = _walk(small_fake, max_results=10, dedupe=False, resume=False)
+    capped = _walk(capped_fake, max_results=1200, dedupe=False, resume=False)
+    after_cap = _walk(after_cap_fake, dedupe=False)
+
+    # Dedupe state is saved with the cursor
+    deduped_first = _walk(FakeReporter(), count=300, resume=False)
+    deduped_rest = _walk(FakeReporter())
+    first_keys = {p['core_project_num'] for p in deduped_first}
+    rest_keys = [p['core_project_num'] for p in deduped_rest]
+
+    checks = [
+        ("Every offset walked", sorted(p['offset'] for p in full_fake.payloads) == [0, 500, 1000]),
+        ("Full page size used", {p['limit'] for p in full_fake.payloads} == {MAX_LIMIT}),
+        ("Agency criteria sent", full_fake.payloads[0]['criteria'].get('agencies') == ['NINDS']),
+        ("Multi-year records deduped", len(full) == TOTAL // 2
+         and len({p['core_project_num'] for p in full}) == TOTAL // 2),
+        ("All records without dedupe", len(all_records) == TOTAL),
+        ("Resumed after the consumed page", [p['offset'] for p in rest_fake.payloads][0] == 500
+         and len(first) + len(rest) == TOTAL + 260),
+        ("Failed page ends the walk", len(partial) == 1000),
+        ("Failure keeps resume point", after_failure.payloads[0]['offset'] == 1000),
+        ("max_results=10 requests and yields 10", len(small) == 10
+         and [p['limit'] for p in small_fake.payloads] == [10]),
+        ("Last page shrunk to max_results", len(capped) == 1200
+         and sorted(p['limit'] for p in capped_fake.payloads) == [200, 500, 500]),
+        ("Walk continues after max_results", after_cap_fake.payloads[0]['offset'] == 1200
+         and len(capped) + len(after_cap) == TOTAL),
+        ("Resumed dedupe skips projects already yielded", len(deduped_rest) == 400
+         and len(set(rest_keys)) == len(rest_keys) and first_keys | set(rest_keys) == {
+             p['core_project_num'] for p in full}),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_portfolio():
+    """Test that a portfolio merges fiscal years per core project."""
+    print("=== TEST 2: Portfolio ===\n")
+    fake = FakeReporter()
+    with responses.RequestsMock() as mock:
+        mock.add_callback(responses.POST, PROJECTS_URL, callback=fake)
+        portfolio = NIHReporterSearch().get_portfolio(QUERY, agencies=['NINDS'])
+
+    first = next(p for p in portfolio if p['core_project_num'] == 'R01NS100000')
+    checks = [
+        ("One record per core project", len(portfolio) == TOTAL // 2),
+        ("Latest fiscal year kept", first['fiscal_year'] == 2024),
+        ("Fiscal years merged", first['fiscal_years'] == [2023, 2024]),
+        ("Awards summed", first['total_award_amount'] == 900000),
+        ("Portfolio sorted by impact", 'impact_score' in first),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all NIH pagination tests."""
+    print("\n" + "="*70)
+    print("NIH REPORTER PAGINATION - TEST SUITE")
+    print("="*70 + "\n")
+
+    # Requests are mocked, so skip the politeness delay
+    paper_utils.API_RATE_LIMITS['nih_reporter'] = (0.0, 1)
+
+    tests = [
+        test_iter_projects,
+        test_portfolio,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test suite for batch grant -> publication linkage.
+NIH RePORTER and PubMed EFetch are mocked with `responses`, so no network access is needed.
+"""
+
+import json
+import sys
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import responses
+
+sys.path.append(str(Path(__file__).parent))
+import paper_utils
+from paper_utils import cache, get_cache_key
+from nih_reporter_search import (
+    NIHReporterSearch, core_project_number, PUBLICATIONS_URL, PUBLICATIONS_CACHE_NAMESPACE
+)
+from pubmed_search import FETCH_URL, PAPER_CACHE_NAMESPACE
+
+# 120 grants; grant i has i % 4 papers, and the first grant has 700 (forces paging)
+CORES = [f"R01NS{200000 + i}" for i in range(120)]
+PMIDS = {core: [f"{35000000 + i * 1000 + k}" for k in range(700 if i == 0 else i % 4)]
+         for i, core in enumerate(CORES)}
+
+
+class FakePublications:
+    """publications/search over core_project_nums, paginated by offset."""
+
+    def __init__(self):
+        self.payloads = []
+
+    def __call__(self, request):
+        payload = json.loads(request.body)
+        self.payloads.append(payload)
+        links = [{'coreproject': core, 'pmid': int(pmid), 'applid': 1}
+                 for core in payload['criteria']['core_project_nums'] for pmid in PMIDS[core]]
+        offset, limit = payload['offset'], payload['limit']
+        return 200, {}, json.dumps({'meta': {'total': len(links)},
+                                    'results': links[offset:offset + limit]})
+
+
+class FakeEfetch:
+    """EFetch POST returning minimal PubmedArticle records."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, request):
+        pmids = parse_qs(request.body)['id'][0].split(',')
+        self.batches.append(len(pmids))
+        articles = ''.join(f"""
+  <PubmedArticle><MedlineCitation><PMID>{pmid}</PMID><Article>
+    <Journal><JournalIssue><PubDate><Year>{2015 + int(pmid) % 10}</Year></PubDate></JournalIssue>
+      <Title>Epilepsia</Title></Journal>
+    <ArticleTitle>Grant-funded seizure study {pmid}</ArticleTitle>
+    <AuthorList><Author><LastName>Cash</LastName><ForeName>Sydney</ForeName></Author></AuthorList>
+  </Article></MedlineCitation></PubmedArticle>""" for pmid in pmids)
+        return 200, {}, f"<PubmedArticleSet>{articles}</PubmedArticleSet>"
+
+
+def _clear_cache():
+    for core, pmids in PMIDS.items():
+        cache.delete(get_cache_key(core, PUBLICATIONS_CACHE_NAMESPACE))
+        for pmid in pmids:
+            cache.delete(get_cache_key(pmid, PAPER_CACHE_NAMESPACE))
+
+
+def test_linkage():
+    """Test chunked link lookup, paging, bulk PMID resolution and caching."""
+    print("=== TEST 1: Grant -> Publication Linkage ===\n")
+    _clear_cache()
+    publications, efetch = FakePublications(), FakeEfetch()
+    project_numbers = [f"5{core}-0{i % 5 + 1}" for i, core in enumerate(CORES)]
+
+    with responses.RequestsMock() as mock:
+        mock.add_callback(responses.POST, PUBLICATIONS_URL, callback=publications)
+        mock.add_callback(responses.POST, FETCH_URL, callback=efetch)
+        linked = NIHReporterSearch().link_publications(project_numbers)
+
+    # Second call is served from cache (no mock registered -> no network)
+    again = NIHReporterSearch().link_publications(project_numbers[:10])
+
+    total_pmids = sum(len(p) for p in PMIDS.values())
+    first_chunk = [p for p in publications.payloads
+                   if p['criteria']['core_project_nums'][0] == CORES[0]]
+    checks = [
+        ("Full project numbers reduced to core", core_project_number("5R01NS200001-03")
+         == "R01NS200001" and set(linked) == set(CORES)),
+        ("Projects looked up in chunks", sorted(len(p['criteria']['core_project_nums'])
+                                                for p in publications.payloads
+                                                if p['offset'] == 0) == [20, 50, 50]),
+        ("Link pages followed", [p['offset'] for p in first_chunk] == [0, 500]),
+        ("Every PMID resolved", sum(len(v) for v in linked.values()) == total_pmids),
+        ("PMIDs resolved in bulk", len(efetch.batches) == -(-total_pmids // 200)),
+        ("Papers annotated with grants", linked[CORES[1]][0]['grant_numbers'] == [CORES[1]]),
+        ("Grants without papers kept", linked[CORES[4]] == []),
+        ("Map cached", len(again[CORES[0]]) == 700),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all grant linkage tests."""
+    print("\n" + "="*70)
+    print("NIH GRANT -> PUBLICATION LINKAGE - TEST SUITE")
+    print("="*70 + "\n")
+
+    # Requests are mocked, so skip the politeness delays
+    paper_utils.API_RATE_LIMITS['nih_reporter'] = (0.0, 1)
+    paper_utils.API_RATE_LIMITS['pubmed'] = (0.0, 1)
+
+    tests = [
+        test_linkage,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
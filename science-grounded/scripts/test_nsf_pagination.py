@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test suite for pipelined NSF Awards pagination.
+The awards endpoint is mocked with `responses`, so no network access is needed.
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import responses
+
+sys.path.append(str(Path(__file__).parent))
+import paper_utils
+from nsf_awards_search import NSFAwardsSearch, AWARDS_URL, MAX_LIMIT, PAGE_WORKERS
+
+TOTAL = 510
+QUERY = "neural dynamics"
+
+
+class FakeAwards:
+    """Offset-paginated awards.json with a little latency per request."""
+
+    def __init__(self, fail_offset=None, latency=0.05):
+        self.offsets = []
+        self.fail_offset = fail_offset
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        params = {k: v[0] for k, v in parse_qs(urlparse(request.url).query).items()}
+        offset, rpp = int(params['offset']), int(params['rpp'])
+        with self.lock:
+            self.offsets.append(offset)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        with self.lock:
+            self.in_flight -= 1
+
+        if offset == self.fail_offset:
+            return 500, {}, ''
+        awards = [{'id': str(2000000 + i), 'title': f'Neural dynamics award {i}',
+                   'piFirstName': 'Ada', 'piLastName': 'Lovelace',
+                   'awardeeName': 'MIT', 'startDate': '09/01/2023',
+                   'estimatedTotalAmt': '500000'}
+                  for i in range(offset - 1, min(offset - 1 + rpp, TOTAL))]
+        return 200, {}, json.dumps({'response': {'award': awards}})
+
+
+def _walk(fake, **kwargs):
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as mock:
+        mock.add_callback(responses.GET, AWARDS_URL, callback=fake)
+        return list(NSFAwardsSearch().iter_awards(QUERY, **kwargs))
+
+
+def test_pipelined_walk():
+    """Test ordered streaming, prefetching, end detection and failures."""
+    print("=== TEST 1: Pipelined Walk ===\n")
+
+    full_fake = FakeAwards()
+    start = time.time()
+    full = _walk(full_fake)
+    elapsed = time.time() - start
+    pages = -(-TOTAL // MAX_LIMIT)
+
+    capped_fake = FakeAwards()
+    capped = _walk(capped_fake, max_results=60)
+
+    failing = FakeAwards(fail_offset=1 + 5 * MAX_LIMIT)
+    partial = _walk(failing)
+
+    small_fake = FakeAwards()
+    with responses.RequestsMock() as mock:
+        mock.add_callback(responses.GET, AWARDS_URL, callback=small_fake)
+        small = NSFAwardsSearch().search_awards(QUERY, limit=5, use_cache=False)
+
+    checks = [
+        ("Every award streamed in order", len(full) == TOTAL
+         and [a['award_number'] for a in full] == [str(2000000 + i) for i in range(TOTAL)]),
+        ("Pages prefetched concurrently", full_fake.max_in_flight == PAGE_WORKERS),
+        ("Faster than a sequential walk", elapsed < pages * full_fake.latency * 0.6),
+        ("Short page ends the walk", len(full_fake.offsets) <= pages + PAGE_WORKERS),
+        ("max_results caps the walk", len(capped) == 60 and sorted(capped_fake.offsets) == [1, 26, 51]),
+        ("Failed page ends the walk", len(partial) == 5 * MAX_LIMIT),
+        ("Small search uses one request", len(small) == 5 and small_fake.offsets == [1]),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all NSF pagination tests."""
+    print("\n" + "="*70)
+    print("NSF AWARDS PAGINATION - TEST SUITE")
+    print("="*70 + "\n")
+
+    # Requests are mocked, so skip the politeness delay
+    paper_utils.API_RATE_LIMITS['nsf_awards'] = (0.0, 1)
+
+    tests = [
+        test_pipelined_walk,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
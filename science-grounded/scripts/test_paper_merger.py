@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Test suite for cross-source paper deduplication and merging.
+Uses synthetic records shaped like each search module's output, so no
+network access is needed.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from paper_merger import merge_papers, normalize_arxiv_id, normalize_doi, paper_keys
+from paper_utils import sort_by_impact
+
+TITLE = 'Koopman operator theory for nonlinear neural dynamics'
+
+
+def _pubmed(i=0, **fields):
+    paper = {
+        'title': f'{TITLE} {i}' if i else TITLE, 'authors': ['Brunton SL', 'Kutz JN'],
+        'year': 2023, 'doi': f'10.1038/s41586-023-{i:05d}', 'abstract': 'Short abstract.',
+        'citation_count': 0, 'journal': 'Nature', 'mesh_terms': ['Neurons'],
+        'publication_types': ['Journal Article'], 'is_open_access': False,
+        'url': f'https://pubmed.ncbi.nlm.nih.gov/{37000000 + i}/', 'source': 'pubmed',
+        'pmid': str(37000000 + i), 'pmc_id': f'PMC{9000000 + i}',
+    }
+    paper.update(fields)
+    return paper
+
+
+def _s2(i=0, **fields):
+    paper = {
+        'title': (f'{TITLE} {i}' if i else TITLE).upper(), 'authors': ['Steven L. Brunton'],
+        'year': 2023, 'doi': None, 'abstract': 'A much longer abstract from Semantic Scholar.',
+        'citation_count': 120 + i, 'journal': 'Nature', 'is_open_access': True,
+        'url': f'https://www.semanticscholar.org/paper/s2id{i}', 'source': 'semantic_scholar',
+        'paper_id': f's2id{i}', 'fields_of_study': ['Biology'],
+        'publication_types': ['JournalArticle'],
+        'external_ids': {'DOI': f'10.1038/S41586-023-{i:05d}', 'PubMed': str(37000000 + i),
+                         'ArXiv': f'2301.{i:05d}', 'CorpusId': 250000000 + i},
+    }
+    paper.update(fields)
+    return paper
+
+
+def _arxiv(i=0, **fields):
+    paper = {
+        'title': f'{TITLE} {i}' if i else TITLE, 'authors': ['Steven L. Brunton'],
+        'year': 2022, 'doi': None, 'abstract': 'Preprint abstract.', 'citation_count': 0,
+        'journal': 'arXiv preprint', 'is_open_access': True, 'categories': ['math.DS'],
+        'url': f'http://arxiv.org/abs/2301.{i:05d}v2', 'source': 'arxiv',
+        'pdf_url': f'http://arxiv.org/pdf/2301.{i:05d}v2', 'arxiv_id': f'2301.{i:05d}v2',
+    }
+    paper.update(fields)
+    return paper
+
+
+def test_identifier_merge():
+    """Test merging PubMed, S2 and arXiv records of one paper by identifier."""
+    print("=== TEST 1: Identifier Merge ===\n")
+
+    # The arXiv title differs, so only the S2 externalIds link it
+    papers = [_pubmed(), _s2(), _arxiv(title='Koopman theory for neural dynamics (preprint)')]
+    merged = merge_papers(papers, use_titles=False)
+    paper = merged[0] if merged else {}
+
+    chained = merge_papers([
+        {'title': 'A', 'doi': 'https://doi.org/10.1/X', 'source': 'semantic_scholar'},
+        {'title': 'B', 'doi': '10.1/x', 'pmid': '42', 'source': 'pubmed'},
+        {'title': 'C', 'external_ids': {'PubMed': '42'}, 'source': 'semantic_scholar'},
+        {'title': 'D', 'doi': '10.48550/arXiv.2401.00001', 'source': 'semantic_scholar'},
+        {'title': 'E', 'arxiv_id': '2401.00001v3', 'source': 'arxiv'},
+    ], use_titles=False)
+
+    checks = [
+        ("Three sources merge into one paper", len(merged) == 1),
+        ("Base metadata from PubMed", paper.get('source') == 'pubmed' and paper.get('title') == TITLE
+         and paper.get('journal') == 'Nature' and paper.get('year') == 2023),
+        ("S2 citation count carried over", paper.get('citation_count') == 120),
+        ("Open access if any source says so", paper.get('is_open_access') is True
+         and paper.get('pmc_id') == 'PMC9000000'),
+        ("arXiv PDF URL carried over", paper.get('pdf_url') == 'http://arxiv.org/pdf/2301.00000v2'),
+        ("Longest abstract kept", paper.get('abstract') == _s2()['abstract']),
+        ("Identifiers from every source", paper.get('pmid') == '37000000'
+         and paper.get('paper_id') == 's2id0' and paper.get('arxiv_id') == '2301.00000v2'),
+        ("Sources and URLs recorded", paper.get('sources') == ['pubmed', 'semantic_scholar', 'arxiv']
+         and set(paper.get('urls', {})) == set(paper.get('sources', []))),
+        ("List fields unioned", paper.get('mesh_terms') == ['Neurons'] and paper.get('categories')
+         == ['math.DS'] and paper.get('publication_types') == ['Journal Article', 'JournalArticle']),
+        ("Transitive and arXiv-DOI links", [p['title'] for p in chained] == ['B', 'D']),
+        ("Normalizers", normalize_doi('doi: 10.1/ABC') == '10.1/abc'
+         and normalize_arxiv_id('arXiv:2301.00001v12') == '2301.00001'
+         and 'pmc:PMC9000000' in paper_keys(_pubmed())),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_title_fallback():
+    """Test the normalized-title fallback and its guards."""
+    print("=== TEST 2: Title Fallback ===\n")
+
+    preprint = {'title': 'Seizure forecasting from wearable sensors: a cohort study',
+                'year': 2022, 'doi': '10.1101/2022.01.01.000001', 'source': 'medrxiv',
+                'journal': 'medRxiv', 'citation_count': 3, 'url': 'https://www.medrxiv.org/x'}
+    published = {'title': 'Seizure Forecasting from Wearable Sensors — A Cohort Study.',
+                 'year': 2023, 'doi': '10.1212/wnl.000001', 'source': 'pubmed',
+                 'journal': 'Neurology', 'citation_count': 0, 'pmid': '1'}
+    merged = merge_papers([preprint, published])
+
+    reissued = [dict(published, doi=None, pmid=None, year=2001), dict(published, pmid='2')]
+    generic = [{'title': 'Editorial', 'year': 2020, 'source': 'pubmed', 'pmid': str(i)}
+               for i in range(3)]
+    unknown = [{'title': 'Unknown Title', 'source': 'arxiv'}, {'title': 'Unknown Title', 'source': 'arxiv'}]
+    # Local KB years are free-form strings
+    local = [dict(preprint, year='in press', doi=None, source='local_kb'), dict(preprint, year='2022-01')]
+
+    checks = [
+        ("Preprint merges with journal version", len(merged) == 1
+         and merged[0]['journal'] == 'Neurology' and merged[0]['citation_count'] == 3
+         and merged[0]['sources'] == ['pubmed', 'medrxiv']),
+        ("Same title years apart stays apart", len(merge_papers(reissued)) == 2),
+        ("Short titles never merge", len(merge_papers(generic)) == 3),
+        ("Placeholder titles never merge", len(merge_papers(unknown)) == 2),
+        ("Free-form years parsed or skipped", len(merge_papers(local)) == 1
+         and len(merge_papers(local + [dict(reissued[0], year='2001 (reprint)')])) == 2),
+        ("use_titles=False disables fallback", len(merge_papers([preprint, published],
+                                                                use_titles=False)) == 2),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_scale():
+    """Test near-linear merging of a large multi-source result set."""
+    print("=== TEST 3: Scale ===\n")
+
+    n = 10000
+    papers = ([_pubmed(i) for i in range(1, n + 1)] + [_s2(i) for i in range(1, n + 1)]
+              + [_arxiv(i, title=f'Preprint {i}') for i in range(1, n + 1)])
+
+    start = time.time()
+    merged = merge_papers(papers)
+    elapsed_ms = (time.time() - start) * 1000
+    ranked = sort_by_impact(merged)
+    print(f"Merged {len(papers)} records in {elapsed_ms:.1f} ms")
+
+    checks = [
+        ("One record per paper", len(merged) == n
+         and all(len(p['sources']) == 3 for p in merged)),
+        ("Order of first appearance kept", [p['pmid'] for p in merged[:3]]
+         == ['37000001', '37000002', '37000003']),
+        ("Ranked once over unique papers", ranked[0]['citation_count'] == 120 + n),
+        ("30k records in under 3 s", elapsed_ms < 3000),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all paper merger tests."""
+    print("\n" + "="*70)
+    print("PAPER MERGER - TEST SUITE")
+    print("="*70 + "\n")
+
+    tests = [
+        test_identifier_merge,
+        test_title_fallback,
+        test_scale,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test suite for PubMed citation-count enrichment.
+E-utilities responses are mocked with `responses`, so no network access is needed.
+"""
+
+import json
+import sys
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import responses
+
+sys.path.append(str(Path(__file__).parent))
+from paper_utils import cache, get_cache_key
+import pubmed_search
+from pubmed_search import PubMedSearch, CITATION_CACHE_NAMESPACE
+
+PMIDS = ["900001", "900002", "900003"]
+CITED_BY = {"900001": ["1", "2", "3"], "900002": [], "900003": ["4"]}
+
+
+def _article_xml(pmid, year):
+    """Build a minimal PubmedArticle for efetch."""
+    return f"""
+  <PubmedArticle>
+    <MedlineCitation>
+      <PMID>{pmid}</PMID>
+      <Article>
+        <Journal><JournalIssue><PubDate><Year>{year}</Year></PubDate></JournalIssue>
+          <Title>Epilepsy Research</Title></Journal>
+        <ArticleTitle>Seizure study {pmid}</ArticleTitle>
+        <Abstract><AbstractText>Seizure onset zone analysis.</AbstractText></Abstract>
+        <AuthorList><Author><LastName>Cash</LastName><ForeName>Sydney</ForeName></Author></AuthorList>
+      </Article>
+    </MedlineCitation>
+  </PubmedArticle>"""
+
+
+def _elink_callback(request):
+    """Answer ELink with one linkset per id parameter."""
+    ids = parse_qs(request.body)['id']
+    linksets = []
+    for pmid in ids:
+        linkset = {'dbfrom': 'pubmed', 'ids': [pmid]}
+        if CITED_BY[pmid]:
+            linkset['linksetdbs'] = [{'dbto': 'pubmed', 'linkname': 'pubmed_pubmed_citedin',
+                                      'links': CITED_BY[pmid]}]
+        linksets.append(linkset)
+    return 200, {}, json.dumps({'linksets': linksets})
+
+
+def _clear_cached_counts():
+    for pmid in PMIDS:
+        cache.delete(get_cache_key(pmid, CITATION_CACHE_NAMESPACE))
+
+
+def test_bulk_counts():
+    """Test batched ELink lookup and per-PMID caching."""
+    print("=== TEST 1: Bulk Citation Counts ===\n")
+    _clear_cached_counts()
+    searcher = PubMedSearch()
+
+    with responses.RequestsMock() as mock:
+        mock.add_callback(responses.POST, pubmed_search.ELINK_URL, callback=_elink_callback)
+        original_batch = pubmed_search.ELINK_BATCH_SIZE
+        pubmed_search.ELINK_BATCH_SIZE = 2
+        try:
+            counts = searcher.fetch_citation_counts(PMIDS)
+        finally:
+            pubmed_search.ELINK_BATCH_SIZE = original_batch
+        elink_calls = len(mock.calls)
+
+    # Second lookup must be served from cache (no mock registered -> no network)
+    cached = searcher.fetch_citation_counts(PMIDS, cached_only=True)
+
+    checks = [
+        ("Counts per PMID", counts == {"900001": 3, "900002": 0, "900003": 1}),
+        ("One ELink call per batch", elink_calls == 2),
+        ("Counts cached per PMID", cached == counts),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    _clear_cached_counts()
+    return passed == len(checks)
+
+
+def test_search_ranking():
+    """Test that search results carry citation counts and rank by them."""
+    print("=== TEST 2: Enriched Search Ranking ===\n")
+    _clear_cached_counts()
+    searcher = PubMedSearch()
+    efetch = "<PubmedArticleSet>" + "".join(
+        _article_xml(pmid, 2015) for pmid in PMIDS) + "</PubmedArticleSet>"
+
+    with responses.RequestsMock() as mock:
+        mock.add(responses.GET, pubmed_search.SEARCH_URL,
+                 json={'esearchresult': {'idlist': PMIDS, 'count': '3'}})
+        mock.add(responses.GET, pubmed_search.FETCH_URL, body=efetch)
+        mock.add_callback(responses.POST, pubmed_search.ELINK_URL, callback=_elink_callback)
+        papers = searcher.search("seizure onset zone citation test", limit=3, use_cache=False)
+
+    checks = [
+        ("All papers returned", len(papers) == 3),
+        ("Citation counts attached", {p['pmid']: p['citation_count'] for p in papers}
+         == {"900001": 3, "900002": 0, "900003": 1}),
+        ("Most cited ranked first", [p['pmid'] for p in papers] == ["900001", "900003", "900002"]),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    _clear_cached_counts()
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all citation enrichment tests."""
+    print("\n" + "="*70)
+    print("PUBMED CITATION ENRICHMENT - TEST SUITE")
+    print("="*70 + "\n")
+
+    tests = [
+        test_bulk_counts,
+        test_search_ranking,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test suite for the offline PubMed baseline mirror.
+Builds a tiny baseline + update file set, so no network access is needed.
+"""
+
+import gzip
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from pubmed_mirror import PubMedMirror
+from pubmed_search import PubMedSearch
+
+
+def _article(pmid, title, abstract, journal, iso, year, mesh, pub_types=("Journal Article",)):
+    """Build one PubmedArticle XML snippet."""
+    mesh_xml = ''.join(
+        f'<MeshHeading><DescriptorName UI="D0">{m}</DescriptorName></MeshHeading>' for m in mesh
+    )
+    pt_xml = ''.join(f'<PublicationType UI="D0">{p}</PublicationType>' for p in pub_types)
+    return f"""
+  <PubmedArticle>
+    <MedlineCitation Status="MEDLINE" Owner="NLM">
+      <PMID Version="1">{pmid}</PMID>
+      <Article PubModel="Print">
+        <Journal>
+          <JournalIssue CitedMedium="Internet"><PubDate><Year>{year}</Year></PubDate></JournalIssue>
+          <Title>{journal}</Title>
+          <ISOAbbreviation>{iso}</ISOAbbreviation>
+        </Journal>
+        <ArticleTitle>{title}</ArticleTitle>
+        <Abstract><AbstractText>{abstract}</AbstractText></Abstract>
+        <AuthorList><Author><LastName>Cash</LastName><ForeName>Sydney</ForeName></Author></AuthorList>
+        <PublicationTypeList>{pt_xml}</PublicationTypeList>
+      </Article>
+      <MeshHeadingList>{mesh_xml}</MeshHeadingList>
+    </MedlineCitation>
+    <PubmedData>
+      <ArticleIdList>
+        <ArticleId IdType="pubmed">{pmid}</ArticleId>
+        <ArticleId IdType="doi">10.1000/{pmid}</ArticleId>
+      </ArticleIdList>
+    </PubmedData>
+  </PubmedArticle>"""
+
+
+def _write_fixture(directory: Path):
+    """Write one gzipped baseline file and one plain update file."""
+    baseline = ''.join([
+        _article("1001", "Seizure prediction from intracranial EEG",
+                 "Deep learning forecasts seizures in epilepsy patients.",
+                 "Epilepsia", "Epilepsia", 2023, ["Epilepsy", "Electroencephalography"]),
+        _article("1002", "Thalamic stimulation for drug-resistant epilepsy",
+                 "Deep brain stimulation of the anterior nucleus reduces seizures.",
+                 "Annals of Neurology", "Ann Neurol", 2019, ["Epilepsy", "Deep Brain Stimulation"],
+                 ("Journal Article", "Review")),
+        _article("1003", "Cardiac arrhythmia detection",
+                 "Wearable ECG monitoring of atrial fibrillation.",
+                 "Circulation", "Circulation", 2022, ["Atrial Fibrillation"]),
+    ])
+    with gzip.open(directory / "pubmed25n0001.xml.gz", "wt") as f:
+        f.write(f"<PubmedArticleSet>{baseline}</PubmedArticleSet>")
+
+    update = _article("1001", "Seizure prediction from intracranial EEG (revised)",
+                      "Deep learning forecasts seizures in epilepsy patients.",
+                      "Epilepsia", "Epilepsia", 2023, ["Epilepsy"])
+    with open(directory / "pubmed25n0002.xml", "w") as f:
+        f.write(f"<PubmedArticleSet>{update}"
+                f"<DeleteCitation><PMID Version=\"1\">1003</PMID></DeleteCitation>"
+                f"</PubmedArticleSet>")
+
+
+def test_ingest():
+    """Test parallel ingestion, update replacement and deletions."""
+    print("=== TEST 1: Ingestion ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _write_fixture(tmp)
+        mirror = PubMedMirror(tmp / "pubmed.sqlite")
+        summary = mirror.ingest(tmp, workers=2)
+
+        checks = [
+            ("Two files ingested", summary['files'] == 2),
+            ("Deleted citation removed", mirror.get("1003") is None),
+            ("Update replaced baseline record", "(revised)" in mirror.get("1001")['title']),
+            ("MeSH terms parsed", "Deep Brain Stimulation" in mirror.get("1002")['mesh_terms']),
+            ("Re-ingest skips known files", mirror.ingest(tmp, workers=2)['files'] == 0),
+        ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_search():
+    """Test text, field-tag and filter queries against the mirror."""
+    print("=== TEST 2: Offline Search ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _write_fixture(tmp)
+        mirror = PubMedMirror(tmp / "pubmed.sqlite")
+        mirror.ingest(tmp, workers=2)
+
+        def pmids(papers):
+            return [p['pmid'] for p in papers]
+
+        start = time.time()
+        text_hits = pmids(mirror.search("seizures epilepsy"))
+        elapsed_ms = (time.time() - start) * 1000
+
+        test_cases = [
+            ("Free text (stemmed)", set(text_hits) == {"1001", "1002"}),
+            ("MeSH tag", pmids(mirror.search("stimulation AND deep brain stimulation[MeSH]")) == ["1002"]),
+            ("Journal ISO abbreviation", pmids(mirror.search("epilepsy", journal="Ann Neurol")) == ["1002"]),
+            ("Publication type tag", pmids(mirror.search("epilepsy AND (Review[PT])")) == ["1002"]),
+            ("Author tag", set(pmids(mirror.search("Cash S[Author]"))) == {"1001", "1002"}),
+            ("AND'ed tags intersect", pmids(mirror.search("Epilepsy[MeSH] AND Deep Brain Stimulation[MeSH]"))
+             == ["1002"] and pmids(mirror.search("Cash S[Author] AND thalamic[Title]")) == ["1002"]),
+            ("OR'ed tags match either", set(pmids(mirror.search(
+                "(Deep Brain Stimulation[MeSH] OR Epilepsy[MeSH])"))) == {"1001", "1002"}),
+            ("Filters add to query tags", pmids(mirror.search("Epilepsy[MeSH]", mesh="Deep Brain Stimulation"))
+             == ["1002"]),
+            ("Year filter", pmids(mirror.search("epilepsy", min_year=2020)) == ["1001"]),
+            ("Sub-50ms query", elapsed_ms < 50),
+        ]
+
+        searcher = PubMedSearch(mirror_path=tmp / "pubmed.sqlite")
+        offline = searcher.search("thalamic stimulation", offline=True)
+        test_cases.append(("PubMedSearch offline=True", pmids(offline) == ["1002"]))
+
+    passed = 0
+    for description, ok in test_cases:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(test_cases)}\n")
+    return passed == len(test_cases)
+
+
+def run_all_tests():
+    """Run all PubMed mirror tests."""
+    print("\n" + "="*70)
+    print("PUBMED OFFLINE MIRROR - TEST SUITE")
+    print("="*70 + "\n")
+
+    tests = [
+        test_ingest,
+        test_search,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Test suite for the unified cross-source ranking.
+Uses synthetic records from each source, so no network access is needed.
+"""
+
+import copy
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent))
+from paper_merger import merge_papers
+from ranking import FEATURES, Ranker, rank_papers, top_k_indices
+from records import to_records
+
+YEAR = 2026
+
+
+def _synthetic(n, seed=3):
+    rng = random.Random(seed)
+    journals = ['Nature', 'Brain', 'PLOS ONE', 'Journal of Neural Engineering', 'bioRxiv', None]
+    sources = ['pubmed', 'semantic_scholar', 'arxiv', 'biorxiv', 'local_kb']
+    return [{'title': f'Paper {i}', 'citation_count': rng.randint(0, 500),
+             'journal': rng.choice(journals), 'year': rng.randint(2005, YEAR),
+             'is_open_access': rng.random() < 0.3, 'source': rng.choice(sources)}
+            for i in range(n)]
+
+
+def test_scoring():
+    """Test the feature formula, weights and cross-source ordering."""
+    print("=== TEST 1: Scoring ===\n")
+
+    ranker = Ranker(current_year=YEAR)
+    cited = {'title': 'Cited journal paper', 'citation_count': 9, 'journal': 'Some Journal',
+             'year': 2015, 'source': 'pubmed'}
+    preprint = {'title': 'New preprint', 'citation_count': 0, 'journal': 'bioRxiv',
+                'year': YEAR, 'source': 'biorxiv', 'is_open_access': True}
+    merged = dict(preprint, sources=['pubmed', 'biorxiv'])
+    local = {'title': 'Local copy', 'year': '', 'source': 'local_kb'}
+
+    scores = ranker.scores([cited, preprint, merged, local])
+    features = ranker.features([cited, preprint])
+
+    try:
+        Ranker(weights={'impact': 1.0})
+        rejected = False
+    except ValueError:
+        rejected = True
+
+    citations_only = Ranker(weights={name: float(name == 'citations') for name in FEATURES},
+                            current_year=YEAR)
+    by_relevance = Ranker(weights={'relevance': 5.0}, current_year=YEAR).rank(
+        [copy.copy(cited), copy.copy(preprint)], relevance=[0.0, 40.0])
+
+    checks = [
+        ("Score is the product of boosts", np.isclose(scores[0], 10.0)
+         and np.isclose(scores[1], 1.5 * 1.1 * 0.8)),
+        ("Feature matrix has one column per feature", features.shape == (2, len(FEATURES))),
+        ("Merged paper takes its best source prior", np.isclose(scores[2], 1.5 * 1.1)),
+        ("String and missing years are tolerated", np.isclose(scores[3], 1.0)),
+        ("Unknown feature weights rejected", rejected),
+        ("Zero weights switch features off", np.allclose(citations_only.scores([cited, preprint]),
+                                                         [10.0, 1.0])),
+        ("Relevance argument reorders results", by_relevance[0]['title'] == 'New preprint'),
+        ("Cross-source ranking", [p['title'] for p in rank_papers([copy.copy(preprint),
+                                                                    copy.copy(cited)])]
+         == ['Cited journal paper', 'New preprint']),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_top_k():
+    """Test partial-sort selection against a full sort."""
+    print("=== TEST 2: Top-k Selection ===\n")
+
+    rng = np.random.default_rng(5)
+    scores = rng.random(1000)
+    ties = np.array([1.0, 3.0, 3.0, 2.0, 3.0])
+    full = np.argsort(-scores, kind='stable')
+    # Ties straddling k: which tied scores make the cut is decided by position
+    straddle = np.array([1.0] * 19 + [2.0])
+    coarse = [rng.integers(0, 5, 50).astype(float) for _ in range(200)]
+
+    papers = _synthetic(200)
+    ranked = rank_papers(copy.deepcopy(papers), k=10)
+    ranked_all = rank_papers(copy.deepcopy(papers))
+    records = rank_papers(to_records(copy.deepcopy(papers)), k=10)
+
+    checks = [
+        ("Top 50 equals the head of a full sort", list(top_k_indices(scores, 50)) == list(full[:50])),
+        ("Ties keep input order", list(top_k_indices(ties, 2)) == [1, 2]
+         and list(top_k_indices(ties)) == [1, 2, 4, 3, 0]),
+        ("Ties straddling k keep input order", list(top_k_indices(straddle, 3)) == [19, 0, 1]
+         and all(list(top_k_indices(c, 7)) == list(np.argsort(-c, kind='stable')[:7]) for c in coarse)),
+        ("k of 0 and k beyond n", len(top_k_indices(scores, 0)) == 0
+         and len(top_k_indices(scores, 5000)) == 1000),
+        ("rank(k) is the head of the full ranking", [p['title'] for p in ranked]
+         == [p['title'] for p in ranked_all[:10]]),
+        ("impact_score set, best first", all(a['impact_score'] >= b['impact_score']
+                                             for a, b in zip(ranked, ranked[1:]))),
+        ("Works on Paper records", [p['title'] for p in records] == [p['title'] for p in ranked]),
+        ("Empty input", rank_papers([], k=5) == []),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_merged_scale():
+    """Test ranking of a large merged candidate set."""
+    print("=== TEST 3: Merged Scale ===\n")
+
+    papers = _synthetic(10000)
+    # Every fifth paper also arrives from a second source under the same DOI
+    for i, paper in enumerate(papers):
+        paper['doi'] = f'10.1/{i}'
+    twins = [dict(p, source='semantic_scholar', citation_count=p['citation_count'] + 1)
+             for p in papers[::5]]
+    merged = merge_papers(papers + twins, use_titles=False)
+
+    start = time.time()
+    ranked = rank_papers(merged, k=20)
+    rank_ms = (time.time() - start) * 1000
+    print(f"{len(merged)} merged candidates: top 20 in {rank_ms:.1f} ms")
+
+    checks = [
+        ("Duplicates merged before ranking", len(merged) == 10000),
+        ("Top 20 returned", len(ranked) == 20),
+        ("10k candidates ranked in under 200 ms", rank_ms < 200),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all ranking tests."""
+    print("\n" + "="*70)
+    print("CROSS-SOURCE RANKING - TEST SUITE")
+    print("="*70 + "\n")
+
+    tests = [
+        test_scoring,
+        test_top_k,
+        test_merged_scale,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Test suite for the slotted Paper/Grant record types and packed caching.
+Uses synthetic records shaped like each searcher's output, so no network
+access is needed.
+"""
+
+import copy
+import json
+import pickle
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+import paper_utils
+from paper_utils import cache_results, get_cache_key, get_cached_results, sort_by_impact
+from records import Grant, Paper, pack_records, to_dicts, to_records, unpack_records
+
+PUBMED = {
+    'title': 'Thalamic stimulation for epilepsy', 'authors': ['Gregg NM', 'Worrell GA'],
+    'year': 2024, 'doi': '10.1093/brain/awad001', 'abstract': 'Background: ...',
+    'citation_count': 12, 'journal': 'Brain', 'journal_abbreviation': 'Brain',
+    'mesh_terms': ['Epilepsy', 'Humans'], 'publication_types': ['Journal Article'],
+    'is_open_access': True, 'url': 'https://pubmed.ncbi.nlm.nih.gov/38000001/',
+    'source': 'pubmed', 'pmid': '38000001', 'pmc_id': 'PMC1000001',
+}
+S2 = {
+    'title': 'Koopman operators for neural dynamics', 'authors': ['Steven L. Brunton'],
+    'year': 2022, 'doi': None, 'abstract': None, 'citation_count': 40, 'journal': 'Neuron',
+    'is_open_access': False, 'url': 'https://www.semanticscholar.org/paper/abc',
+    'source': 'semantic_scholar', 'paper_id': 'abc', 'fields_of_study': ['Biology'],
+    'publication_types': None, 'external_ids': {'DOI': '10.1/x', 'CorpusId': 1},
+    'impact_score': 48.0,
+}
+NIH = {
+    'project_number': '5R01NS100001-02', 'core_project_num': 'R01NS100001',
+    'title': 'Seizure forecasting', 'pi_name': 'CASH, SYDNEY', 'institution': 'MGH',
+    'location': 'Boston, MA', 'year': 2023, 'start_date': '2023-04-01', 'end_date': '2028-03-31',
+    'fiscal_year': 2024, 'award_amount': 650000, 'agencies': ['NINDS'], 'abstract': '...',
+    'study_section': 'CNNT', 'project_type': 'Research Project', 'activity_code': 'R01',
+    'source': 'nih_reporter', 'url': 'https://reporter.nih.gov/project-details/5R01NS100001-02',
+}
+NSF = {
+    'award_number': '2400001', 'title': 'Koopman operators', 'pi_name': 'Steven Brunton',
+    'pi_email': 'sb@example.edu', 'co_pis': ['Nathan Kutz'], 'institution': 'UW',
+    'location': 'Seattle, WA', 'year': 2024, 'award_date': '2024-08-15',
+    'start_date': '2024-09-01', 'expiration_date': '2027-08-31', 'award_amount': 900000,
+    'program': 'Computational Neuroscience', 'abstract': '...', 'source': 'nsf',
+    'url': 'https://www.nsf.gov/awardsearch/showAward?AWD_ID=2400001',
+}
+
+
+def _pubmed(i):
+    paper = copy.deepcopy(PUBMED)
+    paper.update(title=f'Paper {i} on epilepsy networks', pmid=str(38000000 + i),
+                 doi=f'10.1093/brain/{i}', citation_count=i, abstract='',
+                 mesh_terms=['Epilepsy', 'Humans', 'Brain', 'Seizures'][:1 + i % 4])
+    return paper
+
+
+def test_round_trip():
+    """Test exact dictionary round trips and the dict compatibility shims."""
+    print("=== TEST 1: Round Trip and Shims ===\n")
+
+    originals = [PUBMED, S2, NIH, NSF, {'title': 'Local paper', 'source': 'local_kb', 'score': 3}]
+    records = to_records(copy.deepcopy(originals))
+    paper = records[0]
+
+    # Categorical values parsed separately still end up as one object
+    journals = [Paper.from_dict(json.loads(json.dumps(PUBMED))).journal for _ in range(2)]
+
+    calls = []
+    lazy = Paper.from_dict({'title': 'Lazy', 'source': 'pubmed'},
+                           loaders={'abstract': lambda: calls.append(1) or 'Loaded abstract'})
+    untouched = Paper.from_dict({'title': 'Lazy', 'source': 'pubmed'},
+                                loaders={'abstract': lambda: calls.append(1) or 'never'})
+
+    ranked = sort_by_impact(to_records([_pubmed(i) for i in range(3)]))
+
+    checks = [
+        ("Paper and Grant chosen by source", [type(r).__name__ for r in records]
+         == ['Paper', 'Paper', 'Grant', 'Grant', 'Paper']),
+        ("to_dict() round-trips every shape", to_dicts(records) == originals),
+        ("Unknown keys kept in extra", records[1].extra == {'impact_score': 48.0}
+         and records[4]['score'] == 3),
+        ("Attribute and dict access", paper.title == PUBMED['title'] and paper['pmid'] == '38000001'
+         and paper.get('arxiv_id', 'none') == 'none' and 'pmc_id' in paper and 'arxiv_id' not in paper),
+        ("Lists stored as tuples", paper.authors == ('Gregg NM', 'Worrell GA')
+         and records[3].co_pis == ('Nathan Kutz',)),
+        ("dict(record) works (list fields as tuples)",
+         dict(records[3]) == dict(NSF, co_pis=('Nathan Kutz',))),
+        ("Categorical strings interned", journals[0] is journals[1]),
+        ("Abstract loaded lazily, once", calls == [] and lazy.abstract == 'Loaded abstract'
+         and lazy.to_dict()['abstract'] == 'Loaded abstract' and calls == [1]),
+        ("Pickle round trip", pickle.loads(pickle.dumps(records)) == records
+         and pickle.loads(pickle.dumps(untouched)).abstract == 'never'),
+        ("Item assignment (e.g. impact_score)", ranked[0]['citation_count'] == 2
+         and 'impact_score' in ranked[0] and isinstance(ranked[0], Paper)),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_compaction():
+    """Test memory use and packed payloads for a large result set."""
+    print("=== TEST 2: Compaction ===\n")
+
+    raw = json.dumps([_pubmed(i) for i in range(20000)])
+
+    tracemalloc.start()
+    dicts = json.loads(raw)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    records = to_records(json.loads(raw))
+    record_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.time()
+    packed_bytes = pickle.dumps(pack_records(dicts), protocol=pickle.HIGHEST_PROTOCOL)
+    pack_ms = (time.time() - start) * 1000
+    plain_bytes = pickle.dumps(dicts, protocol=pickle.HIGHEST_PROTOCOL)
+
+    mixed = [PUBMED, NIH, S2, NSF]
+    print(f"20k papers: dicts {dict_bytes / 1e6:.1f} MB, records {record_bytes / 1e6:.1f} MB; "
+          f"pickled {len(plain_bytes) / 1e6:.2f} MB vs packed {len(packed_bytes) / 1e6:.2f} MB "
+          f"({pack_ms:.0f} ms)")
+
+    checks = [
+        ("Records use under 75% of dict memory", record_bytes < 0.75 * dict_bytes),
+        ("Packed payload under 80% of pickled dicts", len(packed_bytes) < 0.8 * len(plain_bytes)),
+        ("Packed round trip", unpack_records(pickle.loads(packed_bytes)) == dicts
+         and len(records) == len(dicts)),
+        ("Mixed papers and grants keep their order", unpack_records(pack_records(mixed)) == mixed
+         and [type(r) for r in unpack_records(pack_records(mixed), as_dicts=False)]
+         == [Paper, Grant, Paper, Grant]),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_result_cache():
+    """Test packed storage in cache_results() and legacy cache entries."""
+    print("=== TEST 3: Result Cache ===\n")
+
+    query, legacy_query, source = 'records test query', 'records legacy query', 'test_records'
+    results = [PUBMED, S2, NIH]
+    try:
+        cache_results(query, copy.deepcopy(results), source, topic='general')
+        stored = paper_utils.cache.get(get_cache_key(query, source))['results']
+        cached = get_cached_results(query, source)
+
+        legacy = {'results': results, 'timestamp': paper_utils.datetime.now().isoformat()}
+        paper_utils.cache.set(get_cache_key(legacy_query, source), legacy)
+        legacy_cached = get_cached_results(legacy_query, source)
+    finally:
+        paper_utils.cache.delete(get_cache_key(query, source))
+        paper_utils.cache.delete(get_cache_key(legacy_query, source))
+
+    checks = [
+        ("Results stored packed", isinstance(stored, dict) and len(stored['papers']) == 2
+         and len(stored['grants']) == 1),
+        ("Cache hit returns the same dictionaries", cached == results),
+        ("Legacy dictionary entries still read", legacy_cached == results),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all record type tests."""
+    print("\n" + "="*70)
+    print("PAPER/GRANT RECORDS - TEST SUITE")
+    print("="*70 + "\n")
+
+    tests = [
+        test_round_trip,
+        test_compaction,
+        test_result_cache,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Test suite for RelevanceScorer keyword matching.
+Compares the compiled matcher against the per-keyword str.count() scoring
+it replaces, on synthetic text (no network or PDFs needed).
+"""
+
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from relevance_scorer import KEYWORD_WEIGHTS, RelevanceScorer
+
+_rng = random.Random(13)
+FILLER = ['the', 'patients', 'were', 'recorded', 'with', 'patterns', 'of', 'activity',
+          'returns', 'in', 'cohort', 'results', 'interictal', 'spikes', 'summitted']
+# Running text without keyword look-alikes
+PROSE = ['we', 'found', 'that', 'the', 'model', 'improved', 'over', 'baseline', 'across',
+         'all', 'groups', 'and', 'this', 'effect', 'was', 'robust', 'to', 'choice', 'of',
+         'window', 'length', 'or', 'filter', 'order', 'as', 'shown', 'below']
+# A large custom profile, e.g. a lab's own vocabulary
+LARGE_PROFILE = {
+    f'group{i}': {'weight': 5, 'keywords': [
+        ''.join(_rng.choice(string.ascii_lowercase) for _ in range(_rng.randint(5, 12)))
+        for _ in range(60)]}
+    for i in range(10)
+}
+
+
+def _reference_score(weights, title, abstract, full_text=""):
+    """The per-keyword str.count() scoring RelevanceScorer used before."""
+    title_lower, abstract_lower = title.lower(), abstract.lower()
+    full_text_lower = full_text.lower() if full_text else ""
+    total_score, matched = 0, set()
+    for category in weights.values():
+        category_matches = 0
+        for keyword in category['keywords']:
+            keyword_lower = keyword.lower()
+            matches = (title_lower.count(keyword_lower) * 3 + abstract_lower.count(keyword_lower) * 2
+                       + (min(full_text_lower.count(keyword_lower), 10) if full_text else 0))
+            if matches:
+                category_matches += matches
+                matched.add(keyword)
+        if category_matches:
+            total_score += min(category_matches * category['weight'], category['weight'] * 5)
+    return min(int((total_score / 400) * 100), 100), matched
+
+
+def _document(rng, n_words, keywords, density=0.2, filler=FILLER):
+    words = [rng.choice(keywords) if rng.random() < density else rng.choice(filler)
+             for _ in range(n_words)]
+    return ' '.join(w.upper() if rng.random() < 0.1 else w for w in words)
+
+
+def test_equivalence():
+    """Test that default scores are unchanged."""
+    print("=== TEST 1: Score Equivalence ===\n")
+
+    rng = random.Random(5)
+    keywords = [k for c in KEYWORD_WEIGHTS.values() for k in c['keywords']]
+    scorer = RelevanceScorer()
+    mismatches = 0
+    for _ in range(300):
+        title, abstract = _document(rng, 10, keywords), _document(rng, 60, keywords)
+        full_text = _document(rng, 800, keywords) if rng.random() < 0.5 else ""
+        score, _ = scorer.score_paper(title, abstract, full_text)
+        expected, _ = _reference_score(KEYWORD_WEIGHTS, title, abstract, full_text)
+        mismatches += score != expected
+
+    custom = {'a': {'weight': 10, 'keywords': ['EEG', 'eeg', 'seizure']},
+              'b': {'weight': 3, 'keywords': ['seizure', 'seizure onset']}}
+    text = "Seizure onset zones in EEG and iEEG; seizure onset seizure"
+    custom_score = RelevanceScorer(custom).score_paper(text, text)[0]
+
+    score, reasons = scorer.score_paper(
+        'Foundation Models for Seizure Prediction from Intracranial EEG',
+        'Transformer-based foundation model trained on 1000 hours of sEEG from epilepsy patients.',
+        'Methods involved recording from hippocampus and thalamus with closed-loop responsive neurostimulation.')
+
+    checks = [
+        ("300 random papers score as before", mismatches == 0),
+        ("Duplicate and overlapping keywords", custom_score == _reference_score(custom, text, text)[0]),
+        ("Example paper unchanged", score == 45 and "Contains 'closed-loop'" in reasons),
+        ("Empty text", scorer.score_paper('', '') == (0, ["No matches found"])),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_word_boundaries():
+    """Test whole-word matching and per-profile compilation."""
+    print("=== TEST 2: Word Boundaries ===\n")
+
+    title = "Spiking patterns and returns in a patient cohort"
+    abstract = "Interictal spikes were summitted to review; RNS and DBS were used."
+    substring = RelevanceScorer()
+    words = RelevanceScorer(word_boundaries=True)
+
+    loose = substring._automaton.counts(title + ' ' + abstract)
+    strict = words._automaton.counts(title + ' ' + abstract)
+
+    checks = [
+        ("Substring mode matches inside words (as before)",
+         loose.get('RNS') == 3 and loose.get('ictal') == 1 and loose.get('Summit') == 1),
+        ("Whole-word mode skips them", strict.get('RNS') == 1 and 'ictal' not in strict
+         and 'Summit' not in strict and strict.get('interictal') == 1),
+        ("Whole-word mode lowers the score of false hits",
+         words.score_paper(title, abstract)[0] < substring.score_paper(title, abstract)[0]),
+        ("Automaton compiled once per weight profile",
+         RelevanceScorer()._automaton is substring._automaton
+         and words._automaton is not substring._automaton),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_full_text_speed():
+    """Test full-text screening time against per-keyword scans."""
+    print("=== TEST 3: Full-Text Speed ===\n")
+
+    rng = random.Random(9)
+    default_keywords = [k for c in KEYWORD_WEIGHTS.values() for k in c['keywords']]
+    large_keywords = [k for c in LARGE_PROFILE.values() for k in c['keywords']]
+    # About a 20-page PDF worth of text, 2% of it keywords
+    texts = {'default': _document(rng, 25000, default_keywords, density=0.02, filler=PROSE),
+             'large': _document(rng, 25000, large_keywords, density=0.02, filler=PROSE)}
+
+    timings = {}
+    for name, weights in [('default', KEYWORD_WEIGHTS), ('large', LARGE_PROFILE)]:
+        scorer = RelevanceScorer(weights)
+        start = time.time()
+        for _ in range(5):
+            score = scorer.score_paper('Title', 'Abstract', texts[name])[0]
+        compiled = (time.time() - start) / 5
+        start = time.time()
+        for _ in range(5):
+            expected = _reference_score(weights, 'Title', 'Abstract', texts[name])[0]
+        reference = (time.time() - start) / 5
+        timings[name] = (compiled, reference, score == expected)
+        print(f"{name} profile ({sum(len(c['keywords']) for c in weights.values())} keywords): "
+              f"{compiled * 1000:.1f} ms vs {reference * 1000:.1f} ms per-keyword")
+
+    checks = [
+        ("Scores agree on full text", all(same for _, _, same in timings.values())),
+        ("Default profile on par with per-keyword scans (within 1.5x)",
+         timings['default'][0] < 1.5 * timings['default'][1]),
+        ("600-keyword profile at least 2x faster", timings['large'][0] * 2 < timings['large'][1]),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_batch():
+    """Test score_batch() against per-paper scoring."""
+    print("=== TEST 4: Batch Scoring ===\n")
+
+    rng = random.Random(21)
+    keywords = [k for c in KEYWORD_WEIGHTS.values() for k in c['keywords']]
+    papers = [{'title': _document(rng, 12, keywords, density=0.1, filler=PROSE),
+               'abstract': _document(rng, 200, keywords, density=0.02, filler=PROSE)}
+              for _ in range(5000)]
+    mixed = [{'title': _document(rng, 10, keywords), 'abstract': _document(rng, 60, keywords),
+              'full_text': _document(rng, 800, keywords) if i % 3 == 0 else None}
+             for i in range(200)]
+    mixed.append({'title': None})
+    custom = {'a': {'weight': 10, 'keywords': ['EEG', 'eeg', 'seizure']},
+              'b': {'weight': 3.3, 'keywords': ['seizure', 'seizure onset', 'seizure']}}
+
+    agree = True
+    for weights in (None, custom, LARGE_PROFILE):
+        for word_boundaries in (False, True):
+            scorer = RelevanceScorer(weights, word_boundaries=word_boundaries)
+            agree &= scorer.score_batch(mixed) == [
+                scorer.score_paper(p.get('title') or '', p.get('abstract') or '', p.get('full_text') or '')
+                for p in mixed]
+
+    scorer = RelevanceScorer()
+    start = time.time()
+    batch = scorer.score_batch(papers)
+    batch_ms = (time.time() - start) * 1000
+    start = time.time()
+    expected = [_reference_score(KEYWORD_WEIGHTS, p['title'], p['abstract'])[0] for p in papers]
+    reference_ms = (time.time() - start) * 1000
+    print(f"5000 abstracts: score_batch {batch_ms:.0f} ms, per-keyword loop {reference_ms:.0f} ms")
+
+    checks = [
+        ("Batch equals score_paper (profiles x boundary modes)", agree),
+        ("Large batch matches the per-keyword scores", [score for score, _ in batch] == expected),
+        ("Empty batch", scorer.score_batch([]) == []),
+        ("5000 abstracts in under 1 s", batch_ms < 1000),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all relevance scorer tests."""
+    print("\n" + "="*70)
+    print("RELEVANCE SCORER - TEST SUITE")
+    print("="*70 + "\n")
+
+    tests = [
+        test_equivalence,
+        test_word_boundaries,
+        test_full_text_speed,
+        test_batch,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test suite for the offline Semantic Scholar dataset store.
+Builds tiny papers/abstracts/citations shards, so no network access is needed.
+"""
+
+import gzip
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from s2_dataset import S2Dataset
+from semantic_scholar_search import SemanticScholarSearch
+
+
+def _paper(corpus_id, title, fields, year=2021, citations=10, doi=None, pmid=None):
+    return {
+        'corpusid': corpus_id,
+        'externalids': {'DOI': doi, 'PubMed': pmid, 'CorpusId': str(corpus_id)},
+        'url': f'https://www.semanticscholar.org/paper/{corpus_id:040x}',
+        'title': title,
+        'authors': [{'authorId': '1', 'name': 'Sydney Cash'}],
+        'venue': 'Epilepsia',
+        'year': year,
+        'citationcount': citations,
+        'isopenaccess': True,
+        's2fieldsofstudy': [{'category': f, 'source': 's2-fos-model'} for f in fields],
+        'publicationtypes': ['JournalArticle'],
+        'publicationdate': f'{year}-03-01',
+        'journal': {'name': 'Epilepsia'},
+    }
+
+
+def _write_shard(path: Path, records, gzipped=True):
+    lines = '\n'.join(json.dumps(r) for r in records) + '\n'
+    if gzipped:
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write(lines)
+    else:
+        path.write_text(lines + 'not json\n')
+
+
+def _write_fixture(root: Path):
+    for name in ('papers', 'abstracts', 'citations'):
+        (root / name).mkdir()
+
+    _write_shard(root / 'papers' / 'papers-part0.jsonl.gz', [
+        _paper(101, 'Thalamic stimulation reduces seizures', ['Medicine'], 2019, 120,
+               doi='10.1000/THAL', pmid='31000001'),
+        _paper(102, 'Seizure forecasting from intracranial EEG', ['Medicine', 'Computer Science'],
+               2022, 45),
+    ])
+    _write_shard(root / 'papers' / 'papers-part1.jsonl', [
+        _paper(103, 'Koopman operators for neural dynamics', ['Mathematics'], 2020, 0),
+        _paper(104, 'Medieval trade routes', ['History'], 2018, 300),
+    ], gzipped=False)
+    _write_shard(root / 'abstracts' / 'abstracts-part0.jsonl.gz', [
+        {'corpusid': 101, 'abstract': 'Anterior nucleus deep brain stimulation in epilepsy.'},
+        {'corpusid': 104, 'abstract': 'Trade in the twelfth century.'},
+    ])
+    _write_shard(root / 'citations' / 'citations-part0.jsonl.gz', [
+        {'citationid': 1, 'citingcorpusid': 102, 'citedcorpusid': 101},
+        {'citationid': 2, 'citingcorpusid': 999, 'citedcorpusid': 103},
+        {'citationid': 3, 'citingcorpusid': 998, 'citedcorpusid': 103},
+        {'citationid': 4, 'citingcorpusid': 997, 'citedcorpusid': 996},
+        {'citationid': 5, 'citingcorpusid': 102, 'citedcorpusid': None},
+    ])
+
+
+def test_ingest():
+    """Test parallel shard ingest, field filtering, abstract join and edge filtering."""
+    print("=== TEST 1: Ingest ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write_fixture(root)
+        dataset = S2Dataset(root / "s2.sqlite")
+
+        papers = dataset.ingest(root / 'papers', 'papers', workers=2)
+        abstracts = dataset.ingest(root / 'abstracts', 'abstracts', workers=2)
+        citations = dataset.ingest(root / 'citations', 'citations', workers=2)
+        again = dataset.ingest(root / 'papers', 'papers', workers=2)
+
+        checks = [
+            ("Both shards ingested", papers['shards'] == 2),
+            ("Filtered to fields of study", papers['stored'] == 3 and dataset.store.get('104') is None),
+            ("Malformed line does not fail the shard", papers['parsed'] == 3),
+            ("Abstracts joined to stored papers", abstracts['stored'] == 1
+             and dataset.store.get('101')['abstract'].startswith('Anterior nucleus')),
+            ("Edges touching stored papers kept", citations['stored'] == 3),
+            ("Edges queryable", dataset.get_citing('101') == ['102']
+             and sorted(dataset.get_citing('103')) == ['998', '999']),
+            ("Ingested shards skipped", again['shards'] == 0),
+        ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_offline_backend():
+    """Test SemanticScholarSearch search, details and counts against the store."""
+    print("=== TEST 2: Offline Backend ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write_fixture(root)
+        dataset = S2Dataset(root / "s2.sqlite")
+        for name in ('papers', 'abstracts', 'citations'):
+            dataset.ingest(root / name, name, workers=2)
+
+        # No mock is active: any live request would fail
+        searcher = SemanticScholarSearch(dataset_path=root / "s2.sqlite")
+        start = time.time()
+        results = searcher.search("deep brain stimulation", limit=5, offline=True)
+        elapsed_ms = (time.time() - start) * 1000
+        details = searcher.get_papers_batch(
+            ["DOI:10.1000/thal", "PMID:31000001", "CorpusId:102", "CorpusId:104"], offline=True)
+        single = searcher.get_paper_details("10.1000/THAL", offline=True)
+        counts = searcher.get_citation_counts(["CorpusId:101", "CorpusId:103"], offline=True)
+
+        checks = [
+            ("Abstract text searchable", [p['corpus_id'] for p in results] == ['101']),
+            ("Sub-50ms offline query", elapsed_ms < 50),
+            ("Lookup by DOI, PMID and corpus ID", set(details)
+             == {"DOI:10.1000/thal", "PMID:31000001", "CorpusId:102"}),
+            ("Standardized like API results", single is not None and single['journal'] == 'Epilepsia'
+             and single['doi'] == '10.1000/THAL' and single['source'] == 'semantic_scholar'),
+            ("Citation counts (dataset count, edge fallback)",
+             counts == {"CorpusId:101": 120, "CorpusId:103": 2}),
+        ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all S2 dataset tests."""
+    print("\n" + "="*70)
+    print("SEMANTIC SCHOLAR DATASET STORE - TEST SUITE")
+    print("="*70 + "\n")
+
+    tests = [
+        test_ingest,
+        test_offline_backend,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
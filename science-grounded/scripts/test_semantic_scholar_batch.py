@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test suite for Semantic Scholar batch paper details.
+The /paper/batch endpoint is mocked with `responses`, so no network access is needed.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import responses
+
+sys.path.append(str(Path(__file__).parent))
+import paper_utils
+from paper_utils import cache, get_cache_key, get_cached_value
+from semantic_scholar_search import (
+    SemanticScholarSearch, normalize_paper_id, DETAILS_CACHE_NAMESPACE, NOT_FOUND_CACHE_NAMESPACE,
+    PAPER_BATCH_URL
+)
+
+# Identifiers the fake API knows about
+KNOWN = {f"CorpusId:{900000 + i}" for i in range(1100)}
+KNOWN |= {"DOI:10.1016/j.neuron.2020.01.001", "PMID:31000001", "ARXIV:2101.00001"}
+
+
+def _paper(key):
+    return {
+        'paperId': key.replace(':', '_'),
+        'title': f'Seizure network study {key}',
+        'authors': [{'name': 'Sydney Cash'}],
+        'year': 2021,
+        'abstract': 'Seizure onset zone analysis.',
+        'citationCount': 12,
+        'journal': {'name': 'Neuron'},
+        'externalIds': {'DOI': key[4:]} if key.startswith('DOI:') else {},
+    }
+
+
+class FakeBatch:
+    """Answers /paper/batch with null for unknown IDs and records batch sizes."""
+
+    def __init__(self):
+        self.sizes = []
+
+    def __call__(self, request):
+        ids = json.loads(request.body)['ids']
+        self.sizes.append(len(ids))
+        return 200, {}, json.dumps([_paper(i) if i in KNOWN else None for i in ids])
+
+
+def _clear_cached(keys):
+    for key in keys:
+        cache.delete(get_cache_key(key, DETAILS_CACHE_NAMESPACE))
+        cache.delete(get_cache_key(key, NOT_FOUND_CACHE_NAMESPACE))
+
+
+def test_batch_details():
+    """Test chunking, mixed ID types, missing papers and per-ID caching."""
+    print("=== TEST 1: Batch Details ===\n")
+    ids = [f"corpusid:{900000 + i}" for i in range(1100)]
+    ids += ["10.1016/j.neuron.2020.01.001", "PMID:31000001", "arXiv:2101.00001", "PMID:39999999"]
+    _clear_cached([normalize_paper_id(i) for i in ids])
+
+    searcher = SemanticScholarSearch()
+    fake = FakeBatch()
+    with responses.RequestsMock() as mock:
+        mock.add_callback(responses.POST, PAPER_BATCH_URL, callback=fake)
+        start = time.time()
+        papers = searcher.get_papers_batch(ids)
+        elapsed = time.time() - start
+
+    # Second lookup must be served from cache, unknown IDs included
+    again = FakeBatch()
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as mock:
+        mock.add_callback(responses.POST, PAPER_BATCH_URL, callback=again)
+        cached = searcher.get_papers_batch(ids[-4:])
+        single = searcher.get_paper_details("DOI:10.1016/j.neuron.2020.01.001")
+
+    # A failed batch is not remembered as "not found"
+    _clear_cached(["PMID:39999998"])
+    with responses.RequestsMock() as mock:
+        mock.add(responses.POST, PAPER_BATCH_URL, status=500)
+        searcher.get_papers_batch(["PMID:39999998"])
+    failed_cached = get_cached_value("PMID:39999998", NOT_FOUND_CACHE_NAMESPACE)
+
+    checks = [
+        ("Chunked to the API maximum", sorted(fake.sizes) == [104, 500, 500]),
+        ("All known papers returned", len(papers) == 1103),
+        ("Keyed by the ID as given", papers["arXiv:2101.00001"]['title'].endswith("ARXIV:2101.00001")),
+        ("Unknown IDs omitted", "PMID:39999999" not in papers),
+        ("Batches fetched concurrently", elapsed < 3.0),
+        ("Papers cached per ID", len(cached) == 3),
+        ("Unknown IDs cached as not found", again.sizes == []),
+        ("Failed batches not cached as not found", failed_cached is None),
+        ("Single lookups share the cache", single is not None and single['journal'] == 'Neuron'),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def test_id_normalization():
+    """Test normalization of mixed identifier types."""
+    print("=== TEST 2: ID Normalization ===\n")
+    checks = [
+        ("Bare DOI prefixed", normalize_paper_id("10.1038/nn.4502") == "DOI:10.1038/nn.4502"),
+        ("Prefix case fixed", normalize_paper_id("arxiv:1706.03762") == "ARXIV:1706.03762"),
+        ("CorpusId prefix", normalize_paper_id("CORPUSID:215416146") == "CorpusId:215416146"),
+        ("S2 paper ID unchanged", normalize_paper_id(" 649def34f8be52c8b66281af98ae884c09aef38b ")
+         == "649def34f8be52c8b66281af98ae884c09aef38b"),
+        ("Empty ID dropped", normalize_paper_id("  ") is None),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all Semantic Scholar batch tests."""
+    print("\n" + "="*70)
+    print("SEMANTIC SCHOLAR BATCH DETAILS - TEST SUITE")
+    print("="*70 + "\n")
+
+    # Requests are mocked, so skip the politeness delay
+    paper_utils.API_RATE_LIMITS['semantic_scholar'] = (0.0, 1)
+
+    tests = [
+        test_batch_details,
+        test_id_normalization,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test suite for Semantic Scholar bulk search.
+The /paper/search/bulk endpoint is mocked with `responses`, so no network access is needed.
+"""
+
+import json
+import sys
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import responses
+
+sys.path.append(str(Path(__file__).parent))
+import paper_utils
+from semantic_scholar_search import SemanticScholarSearch, PAPER_BULK_SEARCH_URL, BULK_RETRIES
+
+TOTAL = 2500
+PAGE = 1000
+QUERY = "thalamic stimulation epilepsy"
+
+
+class FakeBulk:
+    """Token-paginated bulk search that records the requests it receives."""
+
+    def __init__(self, fail_token=None):
+        self.requests = []
+        self.fail_token = fail_token
+
+    def __call__(self, request):
+        params = {k: v[0] for k, v in parse_qs(urlparse(request.url).query).items()}
+        self.requests.append(params)
+        token = params.get('token')
+        if token is not None and token == self.fail_token:
+            return 503, {}, ''
+
+        offset = int(token or 0)
+        data = [{'paperId': f'p{i:05d}', 'title': f'Thalamic stimulation study {i}',
+                 'authors': [{'name': 'Sydney Cash'}], 'year': 2015 + i % 10,
+                 'citationCount': TOTAL - i}
+                for i in range(offset, min(offset + PAGE, TOTAL))]
+        body = {'total': TOTAL, 'data': data}
+        if offset + PAGE < TOTAL:
+            body['token'] = str(offset + PAGE)
+        return 200, {}, json.dumps(body)
+
+
+def _sweep(fake, **kwargs):
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as mock:
+        mock.add_callback(responses.GET, PAPER_BULK_SEARCH_URL, callback=fake)
+        return list(SemanticScholarSearch().iter_search_bulk(QUERY, **kwargs))
+
+
+def test_bulk_sweep():
+    """Test token paging, server-side parameters and resumable progress."""
+    print("=== TEST 1: Bulk Sweep ===\n")
+    searcher = SemanticScholarSearch()
+    searcher.reset_bulk_cursor(QUERY, sort="citationCount:desc", min_year=2015)
+
+    full_fake = FakeBulk()
+    full = _sweep(full_fake, sort="citationCount:desc", min_year=2015, resume=False)
+
+    # Interrupted sweep, then a resumed one
+    first_fake, rest_fake = FakeBulk(), FakeBulk()
+    first = _sweep(first_fake, max_results=1500)
+    rest = _sweep(rest_fake)
+    restarted = FakeBulk()
+    _sweep(restarted, max_results=10)
+
+    # A page that keeps failing stops the sweep without losing its place
+    failing = FakeBulk(fail_token='1000')
+    partial = _sweep(failing)
+    after_failure = FakeBulk()
+    resumed = _sweep(after_failure)
+
+    checks = [
+        ("Every match streamed", len(full) == TOTAL and full[-1]['paper_id'] == 'p02499'),
+        ("Continuation tokens followed", [r.get('token') for r in full_fake.requests]
+         == [None, '1000', '2000']),
+        ("Sort and year sent to the server", full_fake.requests[0].get('sort') == "citationCount:desc"
+         and full_fake.requests[0].get('year') == "2015-"),
+        ("Interrupted sweep stops at max_results", len(first) == 1500),
+        ("Resumed at the unfinished page", rest_fake.requests[0].get('token') == '1000'
+         and rest[0]['paper_id'] == 'p01000' and len(rest) == 1500),
+        ("Finished sweep starts over", restarted.requests[0].get('token') is None),
+        ("Failing page retried", len(failing.requests) == 1 + BULK_RETRIES and len(partial) == 1000),
+        ("Failure keeps resume point", after_failure.requests[0].get('token') == '1000'
+         and len(resumed) == 1500),
+    ]
+
+    passed = 0
+    for description, ok in checks:
+        print(f"{'✓ PASS' if ok else '✗ FAIL'}: {description}")
+        passed += ok
+
+    print(f"\nPassed: {passed}/{len(checks)}\n")
+    return passed == len(checks)
+
+
+def run_all_tests():
+    """Run all Semantic Scholar bulk search tests."""
+    print("\n" + "="*70)
+    print("SEMANTIC SCHOLAR BULK SEARCH - TEST SUITE")
+    print("="*70 + "\n")
+
+    # Requests are mocked, so skip the politeness delay
+    paper_utils.API_RATE_LIMITS['semantic_scholar'] = (0.0, 1)
+
+    tests = [
+        test_bulk_sweep,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            passed = test()
+            results.append(passed)
+        except Exception as e:
+            print(f"✗ EXCEPTION: {test.__name__} - {e}\n")
+            results.append(False)
+
+    print("="*70)
+    print(f"OVERALL: {sum(results)}/{len(results)} test suites passed")
+    print("="*70 + "\n")
+
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)